@@ -6,6 +6,7 @@ This script sets up the environment and runs the application.
 """
 
 import os
+import multiprocessing
 import sys
 
 def main():
@@ -33,4 +34,6 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # Needed by the QR batch process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -1,5 +1,5 @@
 # Initialize the config package
-from .database import engine, DATABASE_CONFIG, load_db_config, resource_path, prompt_for_db_config
+from .database import get_engine, DATABASE_CONFIG, load_db_config, resource_path, prompt_for_db_config
 from .logging import logger
 from .settings import settings, get_settings, Settings
 from .path_manager import (
@@ -16,3 +16,10 @@ from .path_manager import (
 
 # Initialize path manager with application name
 initialize_path_manager("School System Management")
+
+
+def __getattr__(name):
+    """Resolve ``engine`` on first use (see config.database.get_engine)."""
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
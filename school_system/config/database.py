@@ -3,9 +3,6 @@ import sys
 import json
 import logging
 import sqlite3
-import tkinter as tk
-from tkinter import messagebox, simpledialog
-from sqlalchemy import create_engine
 
 from .path_manager import (
     get_path_manager, 
@@ -36,6 +33,29 @@ DATABASE_CONFIG = {
         'timeout': 10.0
     },
     
+    # Connection profile applied to every new connection
+    'pragmas': {
+        'journal_mode': 'WAL',  # Readers no longer block while a writer commits
+        'synchronous': 'NORMAL',  # Safe with WAL; avoids an fsync per commit
+        'cache_size': -20000,  # Negative means KiB, so roughly 20 MB of page cache
+        'mmap_size': 268435456,  # 256 MB memory-mapped I/O
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000  # Milliseconds to wait on a locked database
+    },
+
+    # Scheduled maintenance (intervals in seconds, 0 disables)
+    'maintenance': {
+        'checkpoint_interval': 300,
+        'checkpoint_mode': 'PASSIVE',
+        'optimize_interval': 3600
+    },
+
+    # Batched audit/activity log writes (flush_interval in seconds)
+    'audit': {
+        'batch_size': 100,
+        'flush_interval': 2.0
+    },
+    
     # Backup settings
     'backup': {
         'enabled': True,
@@ -132,6 +152,10 @@ def load_db_config(config_file: str = 'config.json') -> dict:
 
 def prompt_for_db_config(config_file):
     """Prompts for database config (SQLite file path)."""
+    # Only reached when the database cannot be opened, so tkinter is not loaded on a normal start
+    import tkinter as tk
+    from tkinter import messagebox, simpledialog
+
     root = tk.Tk()
     root.withdraw()
     messagebox.showinfo("Setup", "Please specify the SQLite database file location.")
@@ -155,6 +179,25 @@ def prompt_for_db_config(config_file):
         messagebox.showerror("Connection Error", f"Invalid SQLite file path: {e}")
         return None
 
-# Now that load_db_config is defined, we can call it
-db_config = load_db_config()
-engine = create_engine(f"sqlite:///{db_config['database']}")
+_engine = None
+
+
+def get_engine():
+    """
+    Get the SQLAlchemy engine for the configured database file.
+
+    The application talks to SQLite directly; the engine is created on
+    first use so SQLAlchemy is not imported at startup.
+    """
+    global _engine
+    if _engine is None:
+        from sqlalchemy import create_engine
+        _engine = create_engine(f"sqlite:///{load_db_config()['database']}")
+    return _engine
+
+
+def __getattr__(name):
+    """Create the module-level ``engine`` lazily for code that still imports it."""
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,53 @@
+"""
+Startup timeline.
+
+Records how long each startup stage takes, from launch to the login window
+and from login to the main window, and writes it to the application log so
+slow starts can be traced to a stage.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+from .logging import logger
+
+
+class StartupTimeline:
+    """Named checkpoints measured from process launch."""
+
+    def __init__(self):
+        # Imported before PyQt and the database by the entry points, so this is close to launch
+        self._start = time.perf_counter()
+        self._marks: List[Tuple[str, float]] = []
+        self._logged = 0
+
+    def mark(self, stage: str):
+        """Record that a stage finished now."""
+        self._marks.append((stage, time.perf_counter()))
+
+    def elapsed_ms(self, stage: Optional[str] = None) -> float:
+        """Milliseconds from launch to the last mark of stage, or to now if stage is None."""
+        if stage is None:
+            return (time.perf_counter() - self._start) * 1000
+        for name, at in reversed(self._marks):
+            if name == stage:
+                return (at - self._start) * 1000
+        raise KeyError(stage)
+
+    def log(self, title: str = "Startup"):
+        """Write the stages marked since the previous log call, with their durations."""
+        marks = self._marks[self._logged:]
+        if not marks:
+            return
+        previous = self._marks[self._logged - 1][1] if self._logged else self._start
+        parts = []
+        for stage, at in marks:
+            parts.append(f"{stage} +{(at - previous) * 1000:.0f} ms")
+            previous = at
+        self._logged = len(self._marks)
+        logger.info(f"{title} timeline ({(marks[-1][1] - self._start) * 1000:.0f} ms since launch): "
+                    + ", ".join(parts))
+
+
+# Global timeline, started when the entry point first imports this module
+startup_timeline = StartupTimeline()
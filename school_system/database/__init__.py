@@ -12,6 +12,7 @@ from .connection import (
     get_db_session,
     db_connection
 )
+from .pool import ConnectionPool
 
 from .repositories.base import BaseRepository
 from .repositories.student_repo import StudentRepository
@@ -26,6 +27,7 @@ __all__ = [
     'initialize_database',
     'get_db_session',
     'db_connection',
+    'ConnectionPool',
     'BaseRepository',
     'StudentRepository',
     'TeacherRepository', 
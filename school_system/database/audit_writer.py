@@ -0,0 +1,202 @@
+"""
+Batched background writer for audit logs and user activities.
+
+Services queue ``AuditLog`` and ``UserActivity`` records instead of
+inserting and committing each one inside the operation being audited. A
+writer thread flushes the queue in one transaction per batch, when
+``batch_size`` records are waiting or ``flush_interval`` seconds have
+passed, so a borrow or return no longer waits for an audit commit.
+
+Each record is queued with the repository it belongs to and written
+through it, so a repository bound to a specific connection keeps writing
+there. Records keep the time they were queued as ``created_at``.
+Pending records are flushed when the writer stops, which
+``DatabaseConnection.close_connection`` does on shutdown.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.logging import logger
+from ..core.exceptions import DatabaseException
+
+# Same format as SQLite's CURRENT_TIMESTAMP, which the columns default to
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class AuditLogWriter:
+    """Queues audit records in memory and writes them in batches on a background thread."""
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 2.0):
+        """
+        Initialize the writer. The thread starts with the first queued record.
+
+        Args:
+            batch_size: Pending records that trigger a flush before the interval ends.
+            flush_interval: Longest time in seconds a record waits to be written.
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: List[Tuple[Any, Dict[str, Any]]] = []  # (repository, column values)
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'queued': 0,
+            'written': 0,
+            'dropped': 0,
+            'flushes': 0,
+            'last_flush_ms': 0.0,
+            'avg_flush_ms': 0.0,
+            'max_flush_ms': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'AuditLogWriter':
+        """Build a writer from a DATABASE_CONFIG-style dictionary."""
+        audit = config.get('audit', {})
+        return cls(batch_size=audit.get('batch_size', 100), flush_interval=audit.get('flush_interval', 2.0))
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the writer thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def queue_length(self) -> int:
+        """Records waiting to be written."""
+        with self._condition:
+            return len(self._queue)
+
+    def enqueue(self, repository, record) -> None:
+        """
+        Queue a record to be written through repository.
+
+        Args:
+            repository: Repository for the record's table, e.g. an AuditLogRepository.
+            record: Model instance; its attributes are the column values.
+        """
+        values = {key: value for key, value in vars(record).items() if key != 'updated_at'}
+        created_at = values.get('created_at')
+        if isinstance(created_at, datetime):
+            values['created_at'] = created_at.strftime(_TIMESTAMP_FORMAT)
+        elif created_at is None:
+            values['created_at'] = datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
+
+        with self._condition:
+            self._queue.append((repository, values))
+            self.stats['queued'] += 1
+            if not self.is_running:
+                self._start()
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+
+    def flush(self) -> int:
+        """
+        Write every pending record now, on the calling thread.
+
+        Returns:
+            The number of records written.
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch, self._queue = self._queue, []
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            groups: Dict[Tuple[int, Tuple[str, ...]], Tuple[Any, List[tuple]]] = {}
+            for repository, values in batch:
+                columns = tuple(values)
+                groups.setdefault((id(repository), columns), (repository, []))[1].append(tuple(values.values()))
+
+            written = 0
+            for (_, columns), (repository, rows) in groups.items():
+                written += self._write(repository, columns, rows)
+            self._record_flush(written, len(batch) - written, (time.perf_counter() - started) * 1000)
+            return written
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread after it has flushed every pending record."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            thread.join(timeout)
+        self._thread = None
+        # Anything queued while stopping, or with no thread running
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, flush latency and the current queue length."""
+        return dict(self.stats, queue_length=self.queue_length, running=self.is_running)
+
+    def _start(self) -> None:
+        """Start the writer thread; called with the condition held."""
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="AuditLogWriter", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Thread body: flush when a batch is full, the interval passes, or on stop."""
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._stopping or len(self._queue) >= self.batch_size,
+                                             timeout=self.flush_interval)
+                    stopping = self._stopping
+                self.flush()
+                if stopping:
+                    return
+        finally:
+            from .connection import db_connection
+            db_connection.release_thread_connection()
+
+    def _write(self, repository, columns: Tuple[str, ...], rows: List[tuple]) -> int:
+        """Insert rows in one transaction, falling back to one at a time to isolate bad rows."""
+        try:
+            return repository.insert_many(columns, rows)
+        except DatabaseException as e:
+            if len(rows) == 1:
+                logger.error(f"Dropped audit record for {repository.model.__tablename__}: {e}")
+                return 0
+            logger.warning(f"Batched audit write failed, retrying rows one by one: {e}")
+            return sum(self._write(repository, columns, [row]) for row in rows)
+
+    def _record_flush(self, written: int, dropped: int, elapsed_ms: float) -> None:
+        """Update the flush counters and latency."""
+        stats = self.stats
+        stats['flushes'] += 1
+        stats['written'] += written
+        stats['dropped'] += dropped
+        stats['last_flush_ms'] = round(elapsed_ms, 1)
+        stats['max_flush_ms'] = round(max(stats['max_flush_ms'], elapsed_ms), 1)
+        stats['avg_flush_ms'] = round(stats['avg_flush_ms'] + (elapsed_ms - stats['avg_flush_ms']) / stats['flushes'], 1)
+        logger.debug(f"Flushed {written} audit records in {elapsed_ms:.1f} ms")
+
+
+_audit_writer: Optional[AuditLogWriter] = None
+_audit_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Get the shared audit writer, configured from DATABASE_CONFIG."""
+    global _audit_writer
+    if _audit_writer is None:
+        with _audit_writer_lock:
+            if _audit_writer is None:
+                from ..config.database import DATABASE_CONFIG
+                _audit_writer = AuditLogWriter.from_config(DATABASE_CONFIG)
+    return _audit_writer
+
+
+def stop_audit_writer() -> None:
+    """Flush and stop the shared writer, if it was ever used."""
+    if _audit_writer is not None:
+        _audit_writer.stop()
@@ -0,0 +1,196 @@
+"""
+Table-version change tracking for cache invalidation.
+
+Triggers on the tracked tables bump a per-table counter in ``table_versions``
+on every insert, update and delete, whichever connection or process makes
+the change. ``ChangeTracker`` watches ``PRAGMA data_version`` on its own
+connection. That value only moves when some other connection commits, so a
+poll with nothing new costs one PRAGMA, and the counters are re-read only
+after a commit.
+
+Caches record the versions of the tables an entry was built from
+(``versions(tables)``) and treat it as current while ``is_current`` holds, so
+an entry is dropped exactly when one of its tables changes, including
+changes made by another desk writing to the same database file.
+"""
+
+import inspect
+import sqlite3
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from ..config.logging import logger
+
+# Tables whose changes invalidate cached counts, lists and search results
+TRACKED_TABLES = (
+    'books', 'students', 'teachers',
+    'borrowed_books_student', 'borrowed_books_teacher',
+    'chairs', 'lockers', 'chair_assignments', 'locker_assignments',
+    'ream_entries', 'distribution_sessions', 'distribution_students',
+)
+
+
+def create_change_triggers(cursor):
+    """Create ``table_versions`` and the triggers that bump it for each tracked table."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    for table in TRACKED_TABLES:
+        cursor.execute("INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)", (table,))
+        for suffix, event in (('ai', 'INSERT'), ('au', 'UPDATE'), ('ad', 'DELETE')):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+                END
+            """)
+
+
+class ChangeTracker:
+    """Reports which tracked tables changed since the last poll."""
+
+    def __init__(self, connection_factory: Callable[[], sqlite3.Connection]):
+        """
+        Initialize the tracker.
+
+        Args:
+            connection_factory: Opens the dedicated connection the tracker polls on.
+                It must not be used for writes, or the tracker misses them.
+        """
+        self._connection_factory = connection_factory
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._data_version: Optional[int] = None
+        self._versions: Dict[str, int] = {}
+        self._available = False
+        # Bound methods are held weakly so subscribing does not keep a cache alive
+        self._listeners: List[Callable[[], Optional[Callable]]] = []
+
+        self.stats = {
+            'polls': 0,
+            'version_reads': 0,
+            'changes': 0,
+            'errors': 0
+        }
+
+    @property
+    def is_available(self) -> bool:
+        """Whether the database has ``table_versions``; callers fall back to TTLs if not."""
+        with self._lock:
+            if self._data_version is None:
+                self._poll()
+            return self._available
+
+    def add_listener(self, callback: Callable[[Set[str]], None]) -> None:
+        """
+        Register a callback for table changes.
+
+        The callback receives the set of changed table names and runs on the
+        thread that called ``poll``.
+        """
+        if inspect.ismethod(callback):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            self._listeners.append(ref)
+
+    def remove_listener(self, callback: Callable[[Set[str]], None]) -> None:
+        """Unregister a callback added with add_listener."""
+        with self._lock:
+            self._listeners[:] = [ref for ref in self._listeners if ref() not in (None, callback)]
+
+    def poll(self) -> Set[str]:
+        """
+        Check for committed changes and notify listeners.
+
+        Returns:
+            Names of the tracked tables that changed since the previous poll.
+        """
+        with self._lock:
+            changed = self._poll()
+            listeners = list(self._listeners) if changed else []
+
+        for ref in listeners:
+            callback = ref()
+            if callback is None:
+                with self._lock:
+                    if ref in self._listeners:
+                        self._listeners.remove(ref)
+                continue
+            try:
+                callback(changed)
+            except Exception as e:
+                logger.error(f"Table change listener failed: {e}")
+        return changed
+
+    def versions(self, tables: Iterable[str]) -> Optional[Dict[str, int]]:
+        """
+        Current versions of the given tables, polling first.
+
+        Returns:
+            Mapping of table name to version, or None if tracking is unavailable.
+        """
+        self.poll()
+        with self._lock:
+            if not self._available:
+                return None
+            return {table: self._versions.get(table, 0) for table in tables}
+
+    def is_current(self, recorded: Optional[Dict[str, int]]) -> bool:
+        """Whether none of the tables in a ``versions()`` result has changed since."""
+        if recorded is None:
+            return False
+        current = self.versions(recorded)
+        return current is not None and current == recorded
+
+    def close(self) -> None:
+        """Close the polling connection; the next poll reopens it and re-reads every version."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Error closing change tracker connection: {e}")
+            self._conn = None
+            self._data_version = None
+
+    def _poll(self) -> Set[str]:
+        """Poll under the lock; returns the changed tables."""
+        self.stats['polls'] += 1
+        try:
+            if self._conn is None:
+                self._conn = self._connection_factory()
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return set()
+
+            self.stats['version_reads'] += 1
+            try:
+                versions = dict(self._conn.execute("SELECT table_name, version FROM table_versions"))
+            except sqlite3.OperationalError:
+                # Database has not been migrated to change tracking
+                versions = None
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Change tracker poll failed: {e}")
+            self.close()
+            return set()
+
+        self._data_version = data_version
+        self._available = versions is not None
+        if versions is None:
+            return set()
+
+        previous, self._versions = self._versions, versions
+        if not previous:
+            # First read: there is nothing cached against older versions yet
+            return set()
+        changed = {table for table, version in versions.items() if previous.get(table) != version}
+        if changed:
+            self.stats['changes'] += 1
+            logger.debug(f"Tables changed: {', '.join(sorted(changed))}")
+        return changed
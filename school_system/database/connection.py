@@ -1,11 +1,17 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from sqlite3 import Error as SQLiteError
-from typing import Optional
+from typing import Optional, Dict, Any
 from ..config.database import DATABASE_CONFIG, load_db_config, resource_path, prompt_for_db_config
 from ..config.logging import logger
 from ..core.exceptions import DatabaseException, ConfigurationError
-from ..core.utils import HashUtils
 from ..core.validators import UserValidator
+from .pool import ConnectionPool
+from .profile import ConnectionProfile, DatabaseMaintenance
+from .audit_writer import stop_audit_writer
+from .change_tracking import ChangeTracker
+from .migrations.migration_manager import MigrationManager
 import os
 import sys
 import json
@@ -13,21 +19,128 @@ from datetime import datetime, date
 
 
 class DatabaseConnection:
-    """Database connection manager using SQLite."""
+    """
+    Database connection manager using SQLite.
+
+    Each thread gets its own read-write connection checked out from a bounded
+    writer pool, so repositories used from worker threads never share a
+    cursor with the GUI thread. Pure read workloads (dashboard fetches,
+    reports) can use ``read_connection()``, which hands out query-only
+    connections from a separate reader pool. ``change_tracker`` reports which
+    tables have changed, from any connection or process, so caches can drop
+    exactly the entries built from them.
+    """
     
     def __init__(self):
-        self._connection = None
         # Use load_db_config to get the full database path
         self._db_config = load_db_config()
         self._config = DATABASE_CONFIG
+
+        # Connections bound to individual threads
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_connections: Dict[int, sqlite3.Connection] = {}
+        # Bumped by close_connection() so threads drop connections closed under them
+        self._generation = 0
+
+        self._profile = ConnectionProfile.from_config(self._config)
+        self._maintenance = DatabaseMaintenance.from_config(self._create_connection, self._config)
+        self.change_tracker = ChangeTracker(lambda: self._create_connection(read_only=True))
+
+        pool_size = self._config.get('connection_pool_size', 5)
+        max_overflow = self._config.get('max_overflow', 10)
+        timeout = self._config.get('connection_timeout', 30)
+        self._writer_pool = ConnectionPool(
+            'writer', self._create_connection, pool_size, max_overflow, timeout
+        )
+        self._reader_pool = ConnectionPool(
+            'reader', lambda: self._create_connection(read_only=True), pool_size, max_overflow, timeout
+        )
            
     def get_connection(self) -> Optional[sqlite3.Connection]:
-        """Get a database connection, creating one if necessary."""
-        if self._connection is None:
-            self._connection = self._create_connection()
-        return self._connection
+        """Get the calling thread's connection, checking one out of the pool if necessary."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None and getattr(self._local, 'generation', None) != self._generation:
+            conn = None
+        if conn is None:
+            conn = self._writer_pool.acquire()
+            self._local.connection = conn
+            self._local.generation = self._generation
+            with self._lock:
+                self._thread_connections[threading.get_ident()] = conn
+        return conn
+
+    def release_thread_connection(self):
+        """Return the calling thread's connection to the pool.
+
+        Worker threads should call this when they finish so their connection
+        can be reused by the next worker.
+        """
+        conn = getattr(self._local, 'connection', None)
+        if conn is None or getattr(self._local, 'generation', None) != self._generation:
+            self._local.connection = None
+            return
+        self._local.connection = None
+        with self._lock:
+            self._thread_connections.pop(threading.get_ident(), None)
+        self._writer_pool.release(conn)
+
+    @contextmanager
+    def read_connection(self):
+        """Check out a query-only connection from the reader pool for the duration of the block."""
+        conn = self._reader_pool.acquire()
+        try:
+            yield conn
+        finally:
+            self._reader_pool.release(conn)
+
+    @contextmanager
+    def reader_session(self):
+        """Bind a query-only connection as the calling thread's connection.
+
+        Repository calls made inside the block read through the reader pool
+        instead of taking a writer connection.
+        """
+        previous = getattr(self._local, 'connection', None)
+        previous_generation = getattr(self._local, 'generation', None)
+        with self.read_connection() as conn:
+            self._local.connection = conn
+            self._local.generation = self._generation
+            try:
+                yield conn
+            finally:
+                self._local.connection = previous
+                self._local.generation = previous_generation
+
+    def start_maintenance(self) -> Dict[str, Any]:
+        """Log the effective connection profile and start scheduled maintenance.
+
+        Returns:
+            The PRAGMA values SQLite reports for the calling thread's connection.
+        """
+        settings = self._profile.log_effective_settings(self.get_connection())
+        self._maintenance.start()
+        return settings
+
+    def stop_maintenance(self):
+        """Stop scheduled maintenance, running a final ``PRAGMA optimize``."""
+        self._maintenance.stop()
+
+    def get_maintenance_stats(self) -> Dict[str, Any]:
+        """Get checkpoint and optimize counters."""
+        return dict(self._maintenance.stats, running=self._maintenance.is_running)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get checkout/return timing statistics for both pools."""
+        with self._lock:
+            bound = len(self._thread_connections)
+        return {
+            'writer': self._writer_pool.get_stats(),
+            'reader': self._reader_pool.get_stats(),
+            'thread_bound_connections': bound
+        }
        
-    def _create_connection(self) -> Optional[sqlite3.Connection]:
+    def _create_connection(self, read_only: bool = False) -> Optional[sqlite3.Connection]:
         """Create a new database connection."""
         try:
             # Use the full database path from config
@@ -41,8 +154,14 @@ class DatabaseConnection:
             
             # Enable foreign key support
             conn.execute("PRAGMA foreign_keys = ON")
+
+            # WAL, cache and sync settings from DATABASE_CONFIG['pragmas']
+            self._profile.apply(conn, read_only=read_only)
+
+            if read_only:
+                conn.execute("PRAGMA query_only = ON")
             
-            logger.info(f"Database connection established to {db_path}")
+            logger.info(f"Database {'reader' if read_only else 'writer'} connection established to {db_path}")
             return conn
             
         except SQLiteError as e:
@@ -50,16 +169,28 @@ class DatabaseConnection:
             raise DatabaseException(f"Failed to create database connection: {e}")
        
     def close_connection(self):
-        """Close the database connection."""
-        if self._connection is not None:
-            try:
-                self._connection.close()
-                logger.info("Database connection closed")
-            except SQLiteError as e:
-                logger.error(f"Error closing database connection: {e}")
-                raise DatabaseException(f"Error closing database connection: {e}")
-            finally:
-                self._connection = None
+        """Close all pooled and thread-bound database connections."""
+        # Write queued audit records while the pools are still open
+        stop_audit_writer()
+        self._local.connection = None
+        with self._lock:
+            bound = list(self._thread_connections.values())
+            self._thread_connections.clear()
+            self._generation += 1
+        try:
+            for conn in bound:
+                self._writer_pool.release(conn)
+            self._writer_pool.close_all()
+            self._reader_pool.close_all()
+            self.change_tracker.close()
+            logger.info("Database connections closed")
+        except SQLiteError as e:
+            logger.error(f"Error closing database connection: {e}")
+            raise DatabaseException(f"Error closing database connection: {e}")
+        finally:
+            # Allow the manager to be used again after an explicit close
+            self._writer_pool.reopen()
+            self._reader_pool.reopen()
      
     def __enter__(self):
         """Context manager entry."""
@@ -101,7 +232,7 @@ def close_db_connection(conn):
 
 
 def initialize_database():
-    """Initializes the SQLite database by creating necessary tables with all updates included."""
+    """Initializes the SQLite database by applying any pending schema migrations."""
     logger.info("Initializing database tables")
     config = load_db_config()
     if not config:
@@ -121,390 +252,16 @@ def initialize_database():
             # The calling code should handle user-facing error messages
             return False
     
-    cursor = None
     try:
-        cursor = mydb.cursor()
-        
-        # Create all tables with updated schema from the start
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                username TEXT PRIMARY KEY,
-                password TEXT NOT NULL,
-                role TEXT DEFAULT 'student' CHECK (role IN ('admin', 'librarian', 'student')),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS students (
-                student_id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                stream TEXT NOT NULL,
-                admission_number TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                qr_code TEXT UNIQUE,
-                qr_generated_at TIMESTAMP,
-                class TEXT,
-                stream_name TEXT,
-                FOREIGN KEY (stream) REFERENCES short_form_mappings(short_form)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS books (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                book_number TEXT NOT NULL UNIQUE,
-                title TEXT NOT NULL,
-                author TEXT NOT NULL,
-                category TEXT,
-                isbn TEXT,
-                publication_date TEXT,
-                available INTEGER DEFAULT 1,
-                revision INTEGER DEFAULT 0,
-                book_condition TEXT DEFAULT 'New',
-                subject TEXT,
-                class TEXT,
-                qr_code TEXT UNIQUE,
-                qr_generated_at TIMESTAMP,
-                FOREIGN KEY (subject) REFERENCES short_form_mappings(short_form),
-                FOREIGN KEY (class) REFERENCES short_form_mappings(short_form)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS short_form_mappings (
-                short_form TEXT PRIMARY KEY,
-                full_name TEXT NOT NULL,
-                type TEXT NOT NULL CHECK (type IN ('class', 'subject'))
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS book_tags (  -- Added from update schema
-                book_id INTEGER,
-                tag TEXT,
-                PRIMARY KEY (book_id, tag),
-                FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS borrowed_books_student (
-                student_id TEXT,
-                book_id INTEGER,
-                borrowed_on DATE,
-                reminder_days INTEGER DEFAULT NULL,
-                returned_on DATE DEFAULT NULL,
-                return_condition TEXT DEFAULT NULL,
-                fine_amount REAL DEFAULT 0,
-                returned_by TEXT DEFAULT NULL,
-                PRIMARY KEY (student_id, book_id, borrowed_on),
-                FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
-                FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Add index on student_id for faster lookups
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_student_id ON borrowed_books_student(student_id)")
-        
-        # Add index on book_id for faster lookups
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_book_id ON borrowed_books_student(book_id)")
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS teachers (
-                teacher_id TEXT PRIMARY KEY,
-                teacher_name TEXT,
-                department TEXT DEFAULT NULL
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS settings (
-                user_id TEXT PRIMARY KEY,
-                reminder_frequency TEXT DEFAULT 'daily' CHECK (reminder_frequency IN ('daily', 'weekly', 'disabled')),
-                sound_enabled INTEGER DEFAULT 1,
-                settings_json TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(username) ON DELETE CASCADE
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS global_settings (
-                key TEXT PRIMARY KEY,
-                value_json TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS borrowed_books_teacher (
-                teacher_id TEXT,
-                book_id INTEGER,
-                borrowed_on DATE,
-                returned_on DATE DEFAULT NULL,
-                PRIMARY KEY (teacher_id, book_id, borrowed_on),
-                FOREIGN KEY (teacher_id) REFERENCES teachers(teacher_id) ON DELETE CASCADE,
-                FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Add index on teacher_id for faster lookups
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_teacher_id ON borrowed_books_teacher(teacher_id)")
-        
-        # Add index on book_id for faster lookups
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_teacher_book_id ON borrowed_books_teacher(book_id)")
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chairs (
-                chair_id TEXT PRIMARY KEY,
-                location TEXT NULL,
-                form TEXT NULL,
-                color TEXT NOT NULL,
-                cond TEXT DEFAULT 'Good',
-                assigned INTEGER DEFAULT 0
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS lockers (
-                locker_id TEXT NOT NULL PRIMARY KEY,
-                location TEXT NULL,
-                form TEXT NULL,
-                color TEXT NOT NULL,
-                cond TEXT DEFAULT 'Good',
-                assigned INTEGER DEFAULT 0
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS locker_assignments (
-                student_id TEXT,
-                locker_id TEXT,
-                assigned_date DATE DEFAULT (DATE('now')),
-                PRIMARY KEY (student_id, locker_id),
-                FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
-                FOREIGN KEY (locker_id) REFERENCES lockers(locker_id) ON DELETE CASCADE
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chair_assignments (
-                student_id TEXT,
-                chair_id TEXT,
-                assigned_date DATE DEFAULT (DATE('now')),
-                PRIMARY KEY (student_id, chair_id),
-                FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
-                FOREIGN KEY (chair_id) REFERENCES chairs(chair_id) ON DELETE CASCADE
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS furniture_categories (
-                category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category_name TEXT NOT NULL UNIQUE,
-                total_count INTEGER NOT NULL DEFAULT 0,
-                needs_repair INTEGER NOT NULL DEFAULT 0,
-                CHECK (total_count >= needs_repair)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ream_entries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id TEXT,
-                reams_count INTEGER NOT NULL,
-                date_added DATE DEFAULT (DATE('now')),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS total_reams (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                total_available INTEGER NOT NULL DEFAULT 0
-            )
-        """)
-
-        cursor.execute("""
-                CREATE TABLE IF NOT EXISTS qr_books (
-                    book_number TEXT PRIMARY KEY,
-                    details TEXT,
-                    added_date TEXT
-                )
-            """)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS qr_borrow_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                book_number TEXT,
-                student_id TEXT,
-                borrow_date TEXT,
-                return_date TEXT,
-                FOREIGN KEY (book_number) REFERENCES qr_books(book_number) ON DELETE CASCADE,
-                FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE SET NULL
-            )
-        """)
-
-        # Distribution tables
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS distribution_sessions (
-                session_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                class TEXT NOT NULL,
-                stream TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                term TEXT NOT NULL,
-                created_by TEXT NOT NULL,
-                distributed_by TEXT,
-                status TEXT DEFAULT 'DRAFT'
-                    CHECK (status IN ('DRAFT', 'IN_PROGRESS', 'FINALIZED')),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                finalized_at TIMESTAMP
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS distribution_students (
-                session_id INTEGER,
-                student_id TEXT,
-                book_id INTEGER DEFAULT NULL,
-                book_number TEXT DEFAULT NULL,
-                notes TEXT,
-                PRIMARY KEY (session_id, student_id),
-                FOREIGN KEY (session_id)
-                    REFERENCES distribution_sessions(session_id)
-                    ON DELETE CASCADE,
-                FOREIGN KEY (student_id)
-                    REFERENCES students(student_id)
-                    ON DELETE CASCADE,
-                FOREIGN KEY (book_id)
-                    REFERENCES books(id)
-                    ON DELETE SET NULL
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS distribution_import_logs (
-                log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER,
-                file_name TEXT,
-                imported_by TEXT,
-                imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT,
-                message TEXT,
-                FOREIGN KEY (session_id)
-                    REFERENCES distribution_sessions(session_id)
-                    ON DELETE CASCADE
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_sessions (
-                session_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                ip_address TEXT NOT NULL,
-                is_active INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (username) REFERENCES users(username) ON DELETE CASCADE
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT NOT NULL,
-                action TEXT NOT NULL,
-                details TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(username) ON DELETE CASCADE
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_activities (
-                activity_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                activity_type TEXT NOT NULL,
-                details TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (username) REFERENCES users(username) ON DELETE CASCADE
-            )
-        """)
-        
-        # Insert initial total_reams value
-        cursor.execute("SELECT SUM(reams_count) FROM ream_entries")
-        initial_total = cursor.fetchone()[0] or 0
-        cursor.execute("INSERT OR IGNORE INTO total_reams (id, total_available) VALUES (1, ?)", (initial_total,))
-        
-        # Set reminder_days to 7 for revision books during initialization
-        cursor.execute("""
-            UPDATE borrowed_books_student
-            SET reminder_days =7
-            WHERE reminder_days IS NULL AND book_id IN (SELECT book_id FROM books WHERE revision = 1)
-        """)
-        affected_rows = cursor.rowcount
-        if affected_rows > 0:
-            logger.info(f"Initialized {affected_rows} reminder_days to 7 for revision books")
-        
-        # Insert default admin user with password
-        default_username = "admin"
-        default_password = HashUtils.hash_password("harry123")
-        cursor.execute("""
-            INSERT OR IGNORE INTO users (username, password, role)
-            VALUES (?, ?, 'admin')
-        """, (default_username, default_password))
-        if cursor.rowcount > 0:
-            logger.info("Default admin user created with password")
-
-        # Insert default global settings
-        cursor.execute("SELECT COUNT(*) FROM global_settings WHERE key = 'global_settings'")
-        if cursor.fetchone()[0] == 0:
-            default_global_settings = {
-                "application": {
-                    "app_name": "School System Management",
-                    "app_version": "1.0.0",
-                    "maintenance_mode": False,
-                    "debug_mode": False
-                },
-                "database": {
-                    "backup_enabled": True,
-                    "backup_interval_hours": 24,
-                    "max_backup_files": 30,
-                    "auto_cleanup_backups": True
-                },
-                "security": {
-                    "max_login_attempts": 3,
-                    "session_timeout_minutes": 60,
-                    "password_min_length": 8,
-                    "require_special_chars": True,
-                    "password_expiry_days": 90
-                },
-                "system": {
-                    "log_level": "INFO",
-                    "max_file_size_mb": 100,
-                    "temp_file_cleanup_hours": 24,
-                    "system_notifications": True
-                },
-                "features": {
-                    "qr_codes_enabled": True,
-                    "bulk_operations_enabled": True,
-                    "advanced_reporting": True,
-                    "api_access_enabled": False
-                }
-            }
-
-            import json
-            cursor.execute(
-                "INSERT INTO global_settings (key, value_json, created_at, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
-                ("global_settings", json.dumps(default_global_settings))
-            )
-            logger.info("Default global settings inserted")
-        
-        mydb.commit()
-        logger.info("Database initialized successfully with all updates")
+        # One read when the schema is current; otherwise only the pending migrations run
+        applied = MigrationManager(mydb).migrate()
+        if applied:
+            logger.info(f"Database migrated to schema version {applied[-1]}")
+        else:
+            logger.info("Database schema is current")
         return mydb
+    except DatabaseException:
+        raise
     except SQLiteError as e:
         logger.error(f"SQLite error during initialization: {e}")
         # Note: QMessageBox requires QApplication instance, so we log the error instead
@@ -515,9 +272,6 @@ def initialize_database():
         # Note: QMessageBox requires QApplication instance, so we log the error instead
         # The calling code should handle user-facing error messages
         raise DatabaseException(f"Unexpected error during initialization: {e}")
-    finally:
-        if cursor:
-            cursor.close()
 
 
 # Global database connection instance
@@ -2,11 +2,9 @@
 Database migration classes and utilities.
 """
 
-# Future migration classes will be imported here
-# from .migration_manager import MigrationManager
-# from .schema_migrations import SchemaMigration
+from .migration_manager import Migration, MigrationManager
 
 __all__ = [
-    # 'MigrationManager',
-    # 'SchemaMigration'
+    'Migration',
+    'MigrationManager'
 ]
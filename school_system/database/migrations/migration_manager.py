@@ -0,0 +1,110 @@
+"""
+Migration engine for the SQLite schema.
+
+Applied migrations are recorded in the ``schema_version`` table. When the
+database is current, checking it costs a single ``SELECT``; otherwise the
+pending migrations run in order inside one IMMEDIATE transaction, so a
+failed step leaves the schema exactly as it was.
+"""
+
+import sqlite3
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+from school_system.config.logging import logger
+from school_system.core.exceptions import DatabaseException
+
+
+class Migration(NamedTuple):
+    """One schema change: ``apply`` gets a cursor inside the migration transaction."""
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+class MigrationManager:
+    """Brings a database up to the latest schema version."""
+
+    CREATE_VERSION_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+
+    def __init__(self, conn: sqlite3.Connection, migrations: Optional[Sequence[Migration]] = None):
+        """
+        Initialize the manager.
+
+        Args:
+            conn: Connection to the database to migrate.
+            migrations: Migrations to apply; the application schema if None.
+        """
+        if migrations is None:
+            from .schema_migrations import SCHEMA_MIGRATIONS
+            migrations = SCHEMA_MIGRATIONS
+        self.conn = conn
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    @property
+    def latest_version(self) -> int:
+        """Version of the newest known migration."""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self) -> int:
+        """Highest applied version, or 0 for a database that has never been migrated."""
+        try:
+            row = self.conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        except sqlite3.OperationalError:
+            # No schema_version table yet
+            return 0
+        return row[0] or 0
+
+    def pending(self, current: Optional[int] = None) -> List[Migration]:
+        """Migrations newer than the given (or current) version."""
+        if current is None:
+            current = self.current_version()
+        return [migration for migration in self.migrations if migration.version > current]
+
+    def migrate(self) -> List[int]:
+        """
+        Apply every pending migration.
+
+        Returns:
+            The versions applied, empty if the database was already current.
+
+        Raises:
+            DatabaseException: If a migration fails; nothing is applied.
+        """
+        current = self.current_version()
+        if current >= self.latest_version:
+            if current > self.latest_version:
+                logger.warning(f"Database schema version {current} is newer than this release "
+                               f"({self.latest_version})")
+            return []
+
+        applied = []
+        migration = None
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            cursor = self.conn.cursor()
+            cursor.execute(self.CREATE_VERSION_TABLE_SQL)
+            # Re-read under the write lock in case another process migrated first
+            current = self.current_version()
+            for migration in self.pending(current):
+                started = time.perf_counter()
+                migration.apply(cursor)
+                cursor.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                               (migration.version, migration.description))
+                applied.append(migration.version)
+                logger.info(f"Applied schema migration {migration.version} ({migration.description}) "
+                            f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+            self.conn.commit()
+        except Exception as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            step = f"{migration.version} ({migration.description})" if migration else "setup"
+            logger.error(f"Schema migration {step} failed: {e}")
+            raise DatabaseException(f"Schema migration {step} failed: {e}")
+        return applied
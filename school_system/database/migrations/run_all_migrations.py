@@ -2,53 +2,43 @@
 """
 Master migration script to run all pending migrations.
 This ensures the database schema is up-to-date with all model requirements.
+
+Versioned migrations live in schema_migrations.py and are also applied on
+every start by initialize_database(). The older add_*_migration modules
+remain runnable on their own for one-off data backfills.
 """
 
+import sqlite3
 import sys
 from school_system.config.logging import logger
+from school_system.config.database import load_db_config
+from school_system.core.exceptions import DatabaseException
+from school_system.database.migrations.migration_manager import MigrationManager
+
 
 def run_all_migrations():
     """Run all database migrations to ensure schema is current."""
     logger.info("Starting comprehensive database migration...")
-    
-    migrations = [
-        ('add_books_subject_class_migration', 'migrate_books_table'),
-        ('ensure_all_student_columns_migration', 'migrate_students_table'),
-        ('add_qr_codes_migration', 'migrate_qr_codes'),
-        ('add_class_stream_to_students_migration', 'migrate_students_table'),
-        ('add_global_settings_migration', 'migrate_global_settings'),
-        ('add_settings_columns_migration', 'migrate_settings_table'),
-    ]
-    
-    results = []
-    
-    for module_name, function_name in migrations:
-        try:
-            module = __import__(f'school_system.database.migrations.{module_name}', 
-                              fromlist=[function_name])
-            migrate_func = getattr(module, function_name)
-            result = migrate_func()
-            results.append((module_name, result))
-            if result:
-                logger.info(f"✓ {module_name} completed successfully")
-            else:
-                logger.warning(f"✗ {module_name} completed with warnings")
-        except Exception as e:
-            logger.error(f"✗ {module_name} failed: {e}")
-            results.append((module_name, False))
-    
-    # Summary
-    successful = sum(1 for _, result in results if result)
-    total = len(results)
-    
-    logger.info(f"Migration summary: {successful}/{total} migrations completed successfully")
-    
-    if successful == total:
-        logger.info("All migrations completed successfully!")
+
+    config = load_db_config()
+    if not config:
+        logger.error("Cannot migrate: No valid database configuration")
+        return False
+
+    conn = sqlite3.connect(config['database'])
+    try:
+        manager = MigrationManager(conn)
+        applied = manager.migrate()
+        if applied:
+            logger.info(f"Applied migrations {applied}; schema is at version {manager.latest_version}")
+        else:
+            logger.info(f"Schema is already at version {manager.current_version()}")
         return True
-    else:
-        logger.warning("Some migrations had issues. Check logs for details.")
+    except DatabaseException as e:
+        logger.error(f"Migration failed: {e}")
         return False
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,526 @@
+"""
+Versioned schema migrations.
+
+Each entry in ``SCHEMA_MIGRATIONS`` is applied once, in version order, by
+``MigrationManager`` and recorded in the ``schema_version`` table. Steps get
+a cursor inside the migration transaction and must not commit.
+
+Append new steps with the next version number; never renumber or edit a
+step that has shipped. Versions 1-4 are the schema and start-up fixes that
+``initialize_database`` used to re-run on every launch. Their statements are
+idempotent, so databases created before ``schema_version`` existed upgrade
+through them safely.
+"""
+
+import json
+
+from school_system.config.logging import logger
+from school_system.core.utils import HashUtils
+from school_system.database.change_tracking import create_change_triggers
+from school_system.database.search import create_search_indexes
+from school_system.database.stats_counters import create_stats_counters
+from .migration_manager import Migration
+
+# table -> columns added by releases after the table was first created, with their declarations.
+# ALTER TABLE cannot add UNIQUE or non-constant defaults, so those are left to the CREATE TABLE.
+LEGACY_COLUMNS = {
+    'students': (('admission_number', 'TEXT'), ('created_at', 'TIMESTAMP'), ('qr_code', 'TEXT'),
+                 ('qr_generated_at', 'TIMESTAMP'), ('class', 'TEXT'), ('stream_name', 'TEXT')),
+    'books': (('category', 'TEXT'), ('isbn', 'TEXT'), ('publication_date', 'TEXT'), ('subject', 'TEXT'),
+              ('class', 'TEXT'), ('qr_code', 'TEXT'), ('qr_generated_at', 'TIMESTAMP')),
+    'teachers': (('department', 'TEXT DEFAULT NULL'),),
+    'ream_entries': (('created_at', 'TIMESTAMP'),),
+    'settings': (('settings_json', 'TEXT'), ('created_at', 'TIMESTAMP'), ('updated_at', 'TIMESTAMP')),
+    'borrowed_books_student': (('returned_on', 'DATE DEFAULT NULL'), ('return_condition', 'TEXT DEFAULT NULL'),
+                               ('fine_amount', 'REAL DEFAULT 0'), ('returned_by', 'TEXT DEFAULT NULL')),
+    'borrowed_books_teacher': (('returned_on', 'DATE DEFAULT NULL'),),
+}
+
+
+def create_base_tables(cursor):
+    """Create every application table and its lookup indexes."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            role TEXT DEFAULT 'student' CHECK (role IN ('admin', 'librarian', 'student')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS students (
+            student_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            stream TEXT NOT NULL,
+            admission_number TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            qr_code TEXT UNIQUE,
+            qr_generated_at TIMESTAMP,
+            class TEXT,
+            stream_name TEXT,
+            FOREIGN KEY (stream) REFERENCES short_form_mappings(short_form)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS books (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_number TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            category TEXT,
+            isbn TEXT,
+            publication_date TEXT,
+            available INTEGER DEFAULT 1,
+            revision INTEGER DEFAULT 0,
+            book_condition TEXT DEFAULT 'New',
+            subject TEXT,
+            class TEXT,
+            qr_code TEXT UNIQUE,
+            qr_generated_at TIMESTAMP,
+            FOREIGN KEY (subject) REFERENCES short_form_mappings(short_form),
+            FOREIGN KEY (class) REFERENCES short_form_mappings(short_form)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS short_form_mappings (
+            short_form TEXT PRIMARY KEY,
+            full_name TEXT NOT NULL,
+            type TEXT NOT NULL CHECK (type IN ('class', 'subject'))
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS book_tags (  -- Added from update schema
+            book_id INTEGER,
+            tag TEXT,
+            PRIMARY KEY (book_id, tag),
+            FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS borrowed_books_student (
+            student_id TEXT,
+            book_id INTEGER,
+            borrowed_on DATE,
+            reminder_days INTEGER DEFAULT NULL,
+            returned_on DATE DEFAULT NULL,
+            return_condition TEXT DEFAULT NULL,
+            fine_amount REAL DEFAULT 0,
+            returned_by TEXT DEFAULT NULL,
+            PRIMARY KEY (student_id, book_id, borrowed_on),
+            FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+            FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Add index on student_id for faster lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_student_id ON borrowed_books_student(student_id)")
+
+    # Add index on book_id for faster lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_book_id ON borrowed_books_student(book_id)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS teachers (
+            teacher_id TEXT PRIMARY KEY,
+            teacher_name TEXT,
+            department TEXT DEFAULT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+            user_id TEXT PRIMARY KEY,
+            reminder_frequency TEXT DEFAULT 'daily' CHECK (reminder_frequency IN ('daily', 'weekly', 'disabled')),
+            sound_enabled INTEGER DEFAULT 1,
+            settings_json TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(username) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS global_settings (
+            key TEXT PRIMARY KEY,
+            value_json TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS borrowed_books_teacher (
+            teacher_id TEXT,
+            book_id INTEGER,
+            borrowed_on DATE,
+            returned_on DATE DEFAULT NULL,
+            PRIMARY KEY (teacher_id, book_id, borrowed_on),
+            FOREIGN KEY (teacher_id) REFERENCES teachers(teacher_id) ON DELETE CASCADE,
+            FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE CASCADE
+        )
+    """)
+
+    # Add index on teacher_id for faster lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_teacher_id ON borrowed_books_teacher(teacher_id)")
+
+    # Add index on book_id for faster lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_borrowed_books_teacher_book_id ON borrowed_books_teacher(book_id)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chairs (
+            chair_id TEXT PRIMARY KEY,
+            location TEXT NULL,
+            form TEXT NULL,
+            color TEXT NOT NULL,
+            cond TEXT DEFAULT 'Good',
+            assigned INTEGER DEFAULT 0
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS lockers (
+            locker_id TEXT NOT NULL PRIMARY KEY,
+            location TEXT NULL,
+            form TEXT NULL,
+            color TEXT NOT NULL,
+            cond TEXT DEFAULT 'Good',
+            assigned INTEGER DEFAULT 0
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS locker_assignments (
+            student_id TEXT,
+            locker_id TEXT,
+            assigned_date DATE DEFAULT (DATE('now')),
+            PRIMARY KEY (student_id, locker_id),
+            FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+            FOREIGN KEY (locker_id) REFERENCES lockers(locker_id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chair_assignments (
+            student_id TEXT,
+            chair_id TEXT,
+            assigned_date DATE DEFAULT (DATE('now')),
+            PRIMARY KEY (student_id, chair_id),
+            FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+            FOREIGN KEY (chair_id) REFERENCES chairs(chair_id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS furniture_categories (
+            category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_name TEXT NOT NULL UNIQUE,
+            total_count INTEGER NOT NULL DEFAULT 0,
+            needs_repair INTEGER NOT NULL DEFAULT 0,
+            CHECK (total_count >= needs_repair)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ream_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT,
+            reams_count INTEGER NOT NULL,
+            date_added DATE DEFAULT (DATE('now')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS total_reams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            total_available INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    cursor.execute("""
+            CREATE TABLE IF NOT EXISTS qr_books (
+                book_number TEXT PRIMARY KEY,
+                details TEXT,
+                added_date TEXT
+            )
+        """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS qr_borrow_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_number TEXT,
+            student_id TEXT,
+            borrow_date TEXT,
+            return_date TEXT,
+            FOREIGN KEY (book_number) REFERENCES qr_books(book_number) ON DELETE CASCADE,
+            FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE SET NULL
+        )
+    """)
+
+    # Distribution tables
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS distribution_sessions (
+            session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            class TEXT NOT NULL,
+            stream TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            term TEXT NOT NULL,
+            created_by TEXT NOT NULL,
+            distributed_by TEXT,
+            status TEXT DEFAULT 'DRAFT'
+                CHECK (status IN ('DRAFT', 'IN_PROGRESS', 'FINALIZED')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finalized_at TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS distribution_students (
+            session_id INTEGER,
+            student_id TEXT,
+            book_id INTEGER DEFAULT NULL,
+            book_number TEXT DEFAULT NULL,
+            notes TEXT,
+            PRIMARY KEY (session_id, student_id),
+            FOREIGN KEY (session_id)
+                REFERENCES distribution_sessions(session_id)
+                ON DELETE CASCADE,
+            FOREIGN KEY (student_id)
+                REFERENCES students(student_id)
+                ON DELETE CASCADE,
+            FOREIGN KEY (book_id)
+                REFERENCES books(id)
+                ON DELETE SET NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS distribution_import_logs (
+            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            file_name TEXT,
+            imported_by TEXT,
+            imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT,
+            message TEXT,
+            FOREIGN KEY (session_id)
+                REFERENCES distribution_sessions(session_id)
+                ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_sessions (
+            session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            ip_address TEXT NOT NULL,
+            is_active INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (username) REFERENCES users(username) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            action TEXT NOT NULL,
+            details TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(username) ON DELETE CASCADE
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_activities (
+            activity_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            activity_type TEXT NOT NULL,
+            details TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (username) REFERENCES users(username) ON DELETE CASCADE
+        )
+    """)
+
+
+def add_legacy_columns(cursor):
+    """Add columns missing from tables created by older releases."""
+    for table, columns in LEGACY_COLUMNS.items():
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, declaration in columns:
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+                logger.info(f"Added {column} column to {table} table")
+
+
+def seed_defaults(cursor):
+    """Insert the default rows and convert data left in old formats."""
+    # Insert initial total_reams value
+    cursor.execute("SELECT SUM(reams_count) FROM ream_entries")
+    initial_total = cursor.fetchone()[0] or 0
+    cursor.execute("INSERT OR IGNORE INTO total_reams (id, total_available) VALUES (1, ?)", (initial_total,))
+
+    fill_revision_reminder_days(cursor)
+
+    # Replace QR images stored inline by older versions with short codes; the
+    # images are rendered on demand into the QR image cache instead
+    cursor.execute("""
+        UPDATE books SET qr_code = 'BK' || substr(hex(randomblob(7)), 1, 14)
+        WHERE qr_code LIKE 'data:image/%'
+    """)
+    converted = cursor.rowcount
+    cursor.execute("""
+        UPDATE students SET qr_code = hex(randomblob(8))
+        WHERE qr_code LIKE 'data:image/%'
+    """)
+    converted += cursor.rowcount
+    if converted > 0:
+        logger.info(f"Replaced {converted} inline QR images with short QR codes")
+
+    # Insert default admin user with password
+    default_username = "admin"
+    default_password = HashUtils.hash_password("harry123")
+    cursor.execute("""
+        INSERT OR IGNORE INTO users (username, password, role)
+        VALUES (?, ?, 'admin')
+    """, (default_username, default_password))
+    if cursor.rowcount > 0:
+        logger.info("Default admin user created with password")
+
+    # Insert default global settings
+    cursor.execute("SELECT COUNT(*) FROM global_settings WHERE key = 'global_settings'")
+    if cursor.fetchone()[0] == 0:
+        default_global_settings = {
+            "application": {
+                "app_name": "School System Management",
+                "app_version": "1.0.0",
+                "maintenance_mode": False,
+                "debug_mode": False
+            },
+            "database": {
+                "backup_enabled": True,
+                "backup_interval_hours": 24,
+                "max_backup_files": 30,
+                "auto_cleanup_backups": True
+            },
+            "security": {
+                "max_login_attempts": 3,
+                "session_timeout_minutes": 60,
+                "password_min_length": 8,
+                "require_special_chars": True,
+                "password_expiry_days": 90
+            },
+            "system": {
+                "log_level": "INFO",
+                "max_file_size_mb": 100,
+                "temp_file_cleanup_hours": 24,
+                "system_notifications": True
+            },
+            "features": {
+                "qr_codes_enabled": True,
+                "bulk_operations_enabled": True,
+                "advanced_reporting": True,
+                "api_access_enabled": False
+            }
+        }
+
+        cursor.execute(
+            "INSERT INTO global_settings (key, value_json, created_at, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+            ("global_settings", json.dumps(default_global_settings))
+        )
+        logger.info("Default global settings inserted")
+
+
+# name -> CREATE INDEX statement for the hot query shapes. Partial indexes on
+# "returned_on IS NULL" hold only open loans, so they stay small as history grows.
+HOT_QUERY_INDEXES = {
+    # Open-loan checks by book: availability EXISTS probes, scan lending, loan lists
+    'idx_bbs_open_by_book': """
+        CREATE INDEX IF NOT EXISTS idx_bbs_open_by_book
+        ON borrowed_books_student(book_id, student_id) WHERE returned_on IS NULL
+    """,
+    # A student's open loans and per-student loan counts in the class reports
+    'idx_bbs_open_by_student': """
+        CREATE INDEX IF NOT EXISTS idx_bbs_open_by_student
+        ON borrowed_books_student(student_id, book_id) WHERE returned_on IS NULL
+    """,
+    # Overdue queries and the open-loan list ordered by borrow date
+    'idx_bbs_open_by_borrowed_on': """
+        CREATE INDEX IF NOT EXISTS idx_bbs_open_by_borrowed_on
+        ON borrowed_books_student(borrowed_on) WHERE returned_on IS NULL
+    """,
+    'idx_bbt_open_by_book': """
+        CREATE INDEX IF NOT EXISTS idx_bbt_open_by_book
+        ON borrowed_books_teacher(book_id, teacher_id) WHERE returned_on IS NULL
+    """,
+    'idx_bbt_open_by_teacher': """
+        CREATE INDEX IF NOT EXISTS idx_bbt_open_by_teacher
+        ON borrowed_books_teacher(teacher_id, book_id) WHERE returned_on IS NULL
+    """,
+    'idx_books_available': "CREATE INDEX IF NOT EXISTS idx_books_available ON books(available)",
+    # Catalog filters; subject and category are both indexed so "subject = ? OR category = ?" can use them
+    'idx_books_subject': "CREATE INDEX IF NOT EXISTS idx_books_subject ON books(subject)",
+    'idx_books_category': "CREATE INDEX IF NOT EXISTS idx_books_category ON books(category)",
+    'idx_books_class': "CREATE INDEX IF NOT EXISTS idx_books_class ON books(class)",
+    # Class/stream filters and the class-stream report; student_id makes it covering
+    'idx_students_class_stream': """
+        CREATE INDEX IF NOT EXISTS idx_students_class_stream
+        ON students(class, stream_name, student_id)
+    """,
+    'idx_students_admission_number': """
+        CREATE INDEX IF NOT EXISTS idx_students_admission_number ON students(admission_number)
+    """,
+}
+
+
+def fill_revision_reminder_days(cursor):
+    """Set reminder_days to 7 for loans of revision books that have none."""
+    cursor.execute("""
+        UPDATE borrowed_books_student
+        SET reminder_days =7
+        WHERE reminder_days IS NULL AND book_id IN (SELECT id FROM books WHERE revision = 1)
+    """)
+    affected_rows = cursor.rowcount
+    if affected_rows > 0:
+        logger.info(f"Initialized {affected_rows} reminder_days to 7 for revision books")
+
+
+def create_revision_reminder_trigger(cursor):
+    """
+    Default reminder_days to 7 for every new loan of a revision book.
+    
+    Loans are inserted from several services, so a trigger covers all of them;
+    loans written before the trigger existed are filled once here.
+    """
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS borrowed_books_student_revision_reminder
+        AFTER INSERT ON borrowed_books_student
+        WHEN NEW.reminder_days IS NULL AND NEW.book_id IN (SELECT id FROM books WHERE revision = 1)
+        BEGIN
+            UPDATE borrowed_books_student SET reminder_days = 7 WHERE rowid = NEW.rowid;
+        END
+    """)
+    fill_revision_reminder_days(cursor)
+
+
+def create_hot_query_indexes(cursor):
+    """Create the indexes behind the most frequent lookups and reports."""
+    for statement in HOT_QUERY_INDEXES.values():
+        cursor.execute(statement)
+
+
+SCHEMA_MIGRATIONS = [
+    Migration(1, "create base tables", create_base_tables),
+    Migration(2, "add columns missing from older databases", add_legacy_columns),
+    Migration(3, "create full-text search indexes", create_search_indexes),
+    Migration(4, "seed defaults and convert legacy data", seed_defaults),
+    Migration(5, "add indexes for hot query shapes", create_hot_query_indexes),
+    Migration(6, "add table version counters for cache invalidation", create_change_triggers),
+    Migration(7, "add trigger-maintained summary counters", create_stats_counters),
+    Migration(8, "default reminder_days for revision book loans", create_revision_reminder_trigger),
+]
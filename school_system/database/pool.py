@@ -0,0 +1,179 @@
+"""
+Bounded SQLite connection pool.
+
+Connections are created lazily by a factory up to ``pool_size`` idle
+connections plus ``max_overflow`` temporary ones. Checkout and return
+times are recorded so contention can be diagnosed from the log.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any
+
+from ..config.logging import logger
+from ..core.exceptions import DatabaseException
+
+
+class ConnectionPool:
+    """Thread-safe bounded pool of SQLite connections."""
+
+    def __init__(self, name: str, factory: Callable[[], sqlite3.Connection],
+                 pool_size: int = 5, max_overflow: int = 10, timeout: float = 30.0):
+        """
+        Initialize the pool.
+
+        Args:
+            name: Pool name used in log messages and stats.
+            factory: Callable that opens a new configured connection.
+            pool_size: Number of idle connections kept open.
+            max_overflow: Extra connections allowed under load, closed on return.
+            timeout: Seconds to wait for a free connection before failing.
+        """
+        self.name = name
+        self._factory = factory
+        self._pool_size = max(1, int(pool_size))
+        self._max_overflow = max(0, int(max_overflow))
+        self._timeout = timeout
+
+        self._idle = deque()
+        self._checked_out: Dict[int, float] = {}  # id(conn) -> checkout time
+        self._total = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._stats = {
+            'checkouts': 0,
+            'connections_created': 0,
+            'timeouts': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'total_hold_time': 0.0,
+            'max_hold_time': 0.0
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of connections the pool will open."""
+        return self._pool_size + self._max_overflow
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, waiting up to the pool timeout."""
+        start = time.perf_counter()
+        deadline = start + self._timeout
+        conn = None
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise DatabaseException(f"Connection pool '{self.name}' is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._total < self.capacity:
+                    # Reserve a slot, open the connection outside the lock
+                    self._total += 1
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise DatabaseException(
+                        f"Timed out after {self._timeout}s waiting for a '{self.name}' connection "
+                        f"({self.capacity} in use)"
+                    )
+                self._condition.wait(remaining)
+
+        if conn is None:
+            try:
+                conn = self._factory()
+            except Exception:
+                with self._condition:
+                    self._total -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._stats['connections_created'] += 1
+
+        now = time.perf_counter()
+        wait_time = now - start
+        with self._condition:
+            self._checked_out[id(conn)] = now
+            self._stats['checkouts'] += 1
+            self._stats['total_wait_time'] += wait_time
+            self._stats['max_wait_time'] = max(self._stats['max_wait_time'], wait_time)
+
+        if wait_time > 1.0:
+            logger.warning(f"Waited {wait_time:.2f}s for a '{self.name}' database connection")
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool."""
+        if conn is None:
+            return
+
+        # Never hand a connection with an open transaction to another caller
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning(f"Error resetting '{self.name}' connection on release: {e}")
+
+        to_close = None
+        with self._condition:
+            checkout_time = self._checked_out.pop(id(conn), None)
+            if checkout_time is not None:
+                hold_time = time.perf_counter() - checkout_time
+                self._stats['total_hold_time'] += hold_time
+                self._stats['max_hold_time'] = max(self._stats['max_hold_time'], hold_time)
+
+            if self._closed or len(self._idle) >= self._pool_size:
+                # Overflow connection (or pool shut down): close instead of keeping it
+                to_close = conn
+                self._total -= 1
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+        if to_close is not None:
+            self._close_quietly(to_close)
+
+    def close_all(self) -> None:
+        """Close idle connections and refuse further checkouts."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._condition.notify_all()
+
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def reopen(self) -> None:
+        """Allow checkouts again after close_all()."""
+        with self._condition:
+            self._closed = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage and timing statistics."""
+        with self._condition:
+            checkouts = self._stats['checkouts']
+            return {
+                'name': self.name,
+                'pool_size': self._pool_size,
+                'max_overflow': self._max_overflow,
+                'open_connections': self._total,
+                'idle_connections': len(self._idle),
+                'in_use': len(self._checked_out),
+                **self._stats,
+                'avg_wait_time': self._stats['total_wait_time'] / checkouts if checkouts else 0.0,
+                'avg_hold_time': self._stats['total_hold_time'] / checkouts if checkouts else 0.0
+            }
+
+    def _close_quietly(self, conn: sqlite3.Connection) -> None:
+        """Close a connection, logging instead of raising on failure."""
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing '{self.name}' connection: {e}")
@@ -0,0 +1,215 @@
+"""
+Connection profile and scheduled maintenance for the SQLite database.
+
+The profile applies the PRAGMAs from ``DATABASE_CONFIG['pragmas']`` to every
+new connection and can report the values SQLite actually put in effect.
+``DatabaseMaintenance`` runs ``wal_checkpoint`` and ``PRAGMA optimize`` on
+the intervals from ``DATABASE_CONFIG['maintenance']``.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..config.logging import logger
+from ..core.exceptions import DatabaseException
+
+
+class ConnectionProfile:
+    """PRAGMA settings applied to each new SQLite connection."""
+
+    # Order matters: journal_mode must be set before anything opens a transaction
+    PRAGMA_ORDER = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout')
+
+    # Database-wide settings that a query-only connection cannot (and need not) change
+    WRITER_ONLY_PRAGMAS = ('journal_mode',)
+
+    def __init__(self, pragmas: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the profile.
+
+        Args:
+            pragmas: Mapping of PRAGMA name to value, e.g. ``{'journal_mode': 'WAL'}``.
+        """
+        self.pragmas = dict(pragmas or {})
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ConnectionProfile':
+        """Build a profile from a DATABASE_CONFIG-style dictionary."""
+        return cls(config.get('pragmas', {}))
+
+    def apply(self, conn: sqlite3.Connection, read_only: bool = False) -> None:
+        """Apply the configured PRAGMAs to a connection."""
+        for name in self._ordered_names():
+            if read_only and name in self.WRITER_ONLY_PRAGMAS:
+                continue
+            value = self.pragmas[name]
+            try:
+                conn.execute(f"PRAGMA {name} = {self._format_value(value)}")
+            except (sqlite3.Error, ValueError) as e:
+                # A bad setting should degrade performance, not stop the application
+                logger.warning(f"Could not apply PRAGMA {name} = {value}: {e}")
+
+    def effective_settings(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Read back the values SQLite is actually using on this connection."""
+        settings = {}
+        for name in self._ordered_names() + ('foreign_keys',):
+            try:
+                row = conn.execute(f"PRAGMA {name}").fetchone()
+                settings[name] = row[0] if row else None
+            except sqlite3.Error as e:
+                settings[name] = f"error: {e}"
+        return settings
+
+    def log_effective_settings(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Log the effective settings and warn where they differ from the profile."""
+        settings = self.effective_settings(conn)
+        logger.info("Database connection profile in effect: " +
+                    ", ".join(f"{name}={value}" for name, value in settings.items()))
+
+        requested_mode = str(self.pragmas.get('journal_mode', '')).lower()
+        actual_mode = str(settings.get('journal_mode', '')).lower()
+        if requested_mode and actual_mode != requested_mode:
+            logger.warning(f"Requested journal_mode={requested_mode} but SQLite is using {actual_mode}")
+        return settings
+
+    def _ordered_names(self):
+        """PRAGMA names in application order, followed by any extra configured names."""
+        known = tuple(name for name in self.PRAGMA_ORDER if name in self.pragmas)
+        extra = tuple(name for name in self.pragmas if name not in self.PRAGMA_ORDER)
+        return known + extra
+
+    @staticmethod
+    def _format_value(value: Any) -> str:
+        """Render a PRAGMA value; PRAGMA arguments cannot be bound as parameters."""
+        if isinstance(value, bool):
+            return '1' if value else '0'
+        if isinstance(value, (int, float)):
+            return str(int(value))
+        text = str(value)
+        # Allow a leading minus so negative (KiB) cache sizes work as strings
+        if not text.removeprefix('-').replace('_', '').isalnum():
+            raise ValueError(f"Invalid PRAGMA value: {value!r}")
+        return text
+
+
+class DatabaseMaintenance:
+    """Background scheduler for WAL checkpoints and ``PRAGMA optimize``."""
+
+    def __init__(self, connection_factory: Callable[[], sqlite3.Connection],
+                 checkpoint_interval: int = 300, optimize_interval: int = 3600,
+                 checkpoint_mode: str = 'PASSIVE'):
+        """
+        Initialize the scheduler.
+
+        Args:
+            connection_factory: Opens a dedicated connection for maintenance work.
+            checkpoint_interval: Seconds between WAL checkpoints (0 disables).
+            optimize_interval: Seconds between ``PRAGMA optimize`` runs (0 disables).
+            checkpoint_mode: PASSIVE, FULL, RESTART or TRUNCATE.
+        """
+        self._connection_factory = connection_factory
+        self.checkpoint_interval = checkpoint_interval
+        self.optimize_interval = optimize_interval
+        self.checkpoint_mode = checkpoint_mode.upper()
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_checkpoint = time.monotonic()
+        self._last_optimize = time.monotonic()
+
+        self.stats = {
+            'checkpoints': 0,
+            'optimize_runs': 0,
+            'last_checkpoint_result': None,
+            'errors': 0
+        }
+
+    @classmethod
+    def from_config(cls, connection_factory: Callable[[], sqlite3.Connection],
+                    config: Dict[str, Any]) -> 'DatabaseMaintenance':
+        """Build a scheduler from a DATABASE_CONFIG-style dictionary."""
+        maintenance = config.get('maintenance', {})
+        return cls(
+            connection_factory,
+            checkpoint_interval=maintenance.get('checkpoint_interval', 300),
+            optimize_interval=maintenance.get('optimize_interval', 3600),
+            checkpoint_mode=maintenance.get('checkpoint_mode', 'PASSIVE')
+        )
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background maintenance thread."""
+        if self.is_running:
+            return
+        intervals = [i for i in (self.checkpoint_interval, self.optimize_interval) if i]
+        if not intervals:
+            logger.info("Database maintenance disabled by configuration")
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(min(intervals),), name="DatabaseMaintenance", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Database maintenance scheduled (checkpoint every {self.checkpoint_interval}s, "
+                    f"optimize every {self.optimize_interval}s)")
+
+    def stop(self, run_final_optimize: bool = True) -> None:
+        """Stop the background thread, optionally running a last optimize pass."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if run_final_optimize and self.optimize_interval:
+            # SQLite recommends PRAGMA optimize just before closing long-lived connections
+            self.run_optimize()
+
+    def run_checkpoint(self) -> Optional[tuple]:
+        """Run a WAL checkpoint now and return SQLite's (busy, log, checkpointed) result."""
+        return self._with_connection(
+            lambda conn: conn.execute(f"PRAGMA wal_checkpoint({self.checkpoint_mode})").fetchone(),
+            'checkpoints', 'last_checkpoint_result'
+        )
+
+    def run_optimize(self) -> None:
+        """Run ``PRAGMA optimize`` now."""
+        self._with_connection(lambda conn: conn.execute("PRAGMA optimize").fetchall(), 'optimize_runs')
+
+    def _with_connection(self, action: Callable[[sqlite3.Connection], Any],
+                         counter: str, result_key: Optional[str] = None) -> Any:
+        """Run a maintenance action on a short-lived dedicated connection."""
+        conn = None
+        try:
+            conn = self._connection_factory()
+            result = action(conn)
+            self.stats[counter] += 1
+            if result_key:
+                self.stats[result_key] = tuple(result) if result else None
+            return result
+        except (sqlite3.Error, DatabaseException) as e:
+            # The factory wraps connection failures in DatabaseException
+            self.stats['errors'] += 1
+            logger.warning(f"Database maintenance '{counter}' failed: {e}")
+            return None
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _run(self, tick: int) -> None:
+        """Thread body: wake up periodically and run whatever is due."""
+        while not self._stop_event.wait(tick):
+            now = time.monotonic()
+            if self.checkpoint_interval and now - self._last_checkpoint >= self.checkpoint_interval:
+                result = self.run_checkpoint()
+                self._last_checkpoint = now
+                logger.debug(f"WAL checkpoint ({self.checkpoint_mode}) result: {result}")
+            if self.optimize_interval and now - self._last_optimize >= self.optimize_interval:
+                self.run_optimize()
+                self._last_optimize = now
+                logger.debug("PRAGMA optimize completed")
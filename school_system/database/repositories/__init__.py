@@ -18,6 +18,7 @@ from .furniture_repo import (
 from .session_repo import UserSessionRepository
 from .audit_log_repo import AuditLogRepository
 from .user_activity_repo import UserActivityRepository
+from .stats_repo import StatsCounterRepository
 
 __all__ = [
     'BaseRepository',
@@ -29,5 +30,6 @@ __all__ = [
     'DistributionSessionRepository', 'DistributionStudentRepository', 'DistributionImportLogRepository',
     'ChairRepository', 'LockerRepository', 'FurnitureCategoryRepository',
     'LockerAssignmentRepository', 'ChairAssignmentRepository',
-    'UserSessionRepository', 'AuditLogRepository', 'UserActivityRepository'
+    'UserSessionRepository', 'AuditLogRepository', 'UserActivityRepository',
+    'StatsCounterRepository'
 ]
@@ -1,6 +1,9 @@
-from typing import List, Optional, Type, TypeVar, Generic
+import inspect
+from itertools import islice
+from typing import List, Optional, Type, TypeVar, Generic, Dict, Tuple, Any, Callable, Iterator, Iterable, Sequence
 from contextlib import contextmanager
 from ...core.exceptions import DatabaseException
+from ..search import FTS_TABLES, build_match_query
 from ...core.validators import StudentValidator, TeacherValidator, BookValidator, UserValidator
 
 T = TypeVar('T')
@@ -9,17 +12,104 @@ T = TypeVar('T')
 class BaseRepository(Generic[T]):
     """Base repository class implementing CRUD operations."""
     
+    # Rows fetched per round trip by the streaming iterators
+    DEFAULT_BATCH_SIZE = 500
+    
+    # Read-only row type (see models/rows.py) returned by the *_rows methods; None uses the model
+    row_type: Optional[type] = None
+    
+    # (model or row type, result columns) -> row builder, shared by all repositories
+    _row_builders: Dict[Tuple[type, Tuple[str, ...]], Callable[[tuple], Any]] = {}
+    
     def __init__(self, model: Type[T]):
         self.model = model
-        self._db = None  # Lazy initialization
+        self._db = None  # Explicit connection override; None means per-thread pooled connection
     
     @property
     def db(self):
-        """Lazy import database connection to avoid circular imports."""
-        if self._db is None:
-            from ..connection import get_db_session
-            self._db = get_db_session()
-        return self._db
+        """Connection for the calling thread (lazy import to avoid circular imports).
+
+        The connection is resolved on every access rather than cached, so a
+        repository created on the GUI thread and used from a worker thread
+        reads through that worker's own pooled connection.
+        """
+        if self._db is not None:
+            return self._db
+        from ..connection import get_db_session
+        return get_db_session()
+    
+    def _row_builder(self, description, read_only: bool = False) -> Callable[[tuple], T]:
+        """Get the function that turns a result row into a model for this column layout.
+
+        The column-to-constructor mapping is worked out once per model and
+        result shape, instead of zipping cursor.description for every row.
+        Columns the constructor cannot accept are dropped. With ``read_only``
+        the repository's ``row_type`` is built instead, if it has one.
+        """
+        columns = tuple(column[0] for column in description)
+        target = self.row_type if read_only and self.row_type is not None else self.model
+        key = (target, columns)
+        builder = self._row_builders.get(key)
+        if builder is None:
+            if target is self.model:
+                builder = self._make_row_builder(columns)
+            else:
+                from ...models.rows import make_row_builder
+                builder = make_row_builder(target, columns)
+            self._row_builders[key] = builder
+        return builder
+    
+    def _make_row_builder(self, columns: Tuple[str, ...]) -> Callable[[tuple], T]:
+        """Build a row-to-model function for the given result columns."""
+        model = self.model
+        parameters = inspect.signature(model.__init__).parameters.values()
+        if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+            return lambda row: model(**dict(zip(columns, row)))
+        
+        accepted = {p.name for p in parameters}
+        mapping = tuple((index, name) for index, name in enumerate(columns) if name in accepted)
+        return lambda row: model(**{name: row[index] for index, name in mapping})
+    
+    def _build_models(self, cursor, read_only: bool = False) -> List[T]:
+        """Build models (or read-only rows) from all remaining rows of an executed cursor."""
+        build = self._row_builder(cursor.description, read_only)
+        return [build(row) for row in cursor.fetchall()]
+    
+    def _iter_models(self, sql: str, params: tuple = (), batch_size: Optional[int] = None,
+                     read_only: bool = False) -> Iterator[T]:
+        """Stream models for a query, fetching ``cursor.arraysize`` rows per round trip."""
+        cursor = self.db.cursor()
+        cursor.arraysize = batch_size or self.DEFAULT_BATCH_SIZE
+        try:
+            cursor.execute(sql, params)
+            build = self._row_builder(cursor.description, read_only)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                for row in rows:
+                    yield build(row)
+        except Exception as e:
+            raise DatabaseException(f"Error streaming entities: {e}")
+        finally:
+            # Closing ends the read statement even if the caller stops early
+            cursor.close()
+    
+    def _iter_tuples(self, sql: str, params: tuple = (), batch_size: Optional[int] = None) -> Iterator[tuple]:
+        """Stream raw result tuples for a query, fetching ``cursor.arraysize`` rows per round trip."""
+        cursor = self.db.cursor()
+        cursor.arraysize = batch_size or self.DEFAULT_BATCH_SIZE
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                yield from rows
+        except Exception as e:
+            raise DatabaseException(f"Error streaming rows: {e}")
+        finally:
+            cursor.close()
     
     def get_by_id(self, id: int) -> Optional[T]:
         """Get entity by primary key."""
@@ -29,7 +119,7 @@ class BaseRepository(Generic[T]):
             cursor.execute(f"SELECT * FROM {self.model.__tablename__} WHERE {pk} = ?", (id,))
             result = cursor.fetchone()
             if result:
-                return self.model(**dict(zip([column[0] for column in cursor.description], result)))
+                return self._row_builder(cursor.description)(result)
             return None
         except Exception as e:
             raise DatabaseException(f"Error retrieving entity by ID: {e}")
@@ -39,8 +129,7 @@ class BaseRepository(Generic[T]):
         try:
             cursor = self.db.cursor()
             cursor.execute(f"SELECT * FROM {self.model.__tablename__}")
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving all entities: {e}")
 
@@ -111,8 +200,7 @@ class BaseRepository(Generic[T]):
         try:
             cursor = self.db.cursor()
             cursor.execute(f"SELECT * FROM {self.model.__tablename__} WHERE {field_name} = ?", (value,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error finding entities by field: {e}")
 
@@ -149,7 +237,7 @@ class BaseRepository(Generic[T]):
             )
             row = cursor.fetchone()
             if row:
-                return self.model(**dict(zip([c[0] for c in cursor.description], row)))
+                return self._row_builder(cursor.description)(row)
             return None
         except Exception as e:
             raise DatabaseException(f"Error retrieving entity by fields: {e}")
@@ -176,6 +264,45 @@ class BaseRepository(Generic[T]):
         except Exception as e:
             raise DatabaseException(f"Error bulk creating entities: {e}")
 
+    def insert_many(self, columns: Sequence[str], rows: Iterable[Sequence[Any]],
+                    chunk_size: Optional[int] = None,
+                    progress_callback: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Insert rows from any iterable in chunks, all inside one transaction.
+
+        Rows are pulled lazily, so a generator over an import file is never
+        materialised: only one chunk is held at a time. If any chunk fails the
+        whole insert is rolled back.
+
+        Args:
+            columns: Table columns, in the order of the values in each row.
+            rows: Value sequences to insert.
+            chunk_size: Rows per executemany call, defaults to DEFAULT_BATCH_SIZE.
+            progress_callback: Called with the running row count after each chunk.
+
+        Returns:
+            The number of rows inserted.
+        """
+        chunk_size = chunk_size or self.DEFAULT_BATCH_SIZE
+        sql = (f"INSERT INTO {self.model.__tablename__} ({', '.join(columns)}) "
+               f"VALUES ({', '.join('?' * len(columns))})")
+        rows = iter(rows)
+        inserted = 0
+        try:
+            with self.transaction():
+                cursor = self.db.cursor()
+                while True:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    cursor.executemany(sql, chunk)
+                    inserted += len(chunk)
+                    if progress_callback:
+                        progress_callback(inserted)
+            return inserted
+        except Exception as e:
+            raise DatabaseException(f"Error inserting rows into {self.model.__tablename__}: {e}")
+
     def bulk_update(self, updates: List[dict], where_field: str):
         """
         Bulk update rows.
@@ -213,28 +340,214 @@ class BaseRepository(Generic[T]):
             raise DatabaseException(f"Error deleting by fields: {e}")
 
     def paginate(self, limit: int, offset: int = 0) -> List[T]:
-        """Paginated retrieval."""
+        """Paginated retrieval in rowid order.
+
+        OFFSET still has to step over every skipped row; use paginate_keyset
+        when walking a large table page by page.
+        """
         try:
             cursor = self.db.cursor()
             cursor.execute(
-                f"SELECT * FROM {self.model.__tablename__} LIMIT ? OFFSET ?",
+                f"SELECT * FROM {self.model.__tablename__} ORDER BY rowid LIMIT ? OFFSET ?",
                 (limit, offset)
             )
-            rows = cursor.fetchall()
-            return [
-                self.model(**dict(zip([c[0] for c in cursor.description], row)))
-                for row in rows
-            ]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error paginating entities: {e}")
 
+    def paginate_keyset(self, after: Optional[tuple] = None, limit: int = 100) -> Tuple[List[T], Optional[tuple]]:
+        """Keyset-paginated retrieval in rowid order.
+
+        Rowid is the table's integer primary key where it has one, and stays
+        unique where the model's ``__pk__`` is not (e.g. loan tables keyed by
+        student_id).
+
+        Args:
+            after: Cursor returned with the previous page, None for the first page.
+            limit: Page size.
+
+        Returns:
+            The page and the cursor for the next page (None at the end).
+        """
+        try:
+            return self._fetch_keyset_page([], [], 'rowid', after=after, limit=limit)
+        except Exception as e:
+            raise DatabaseException(f"Error paginating entities: {e}")
+
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[T]:
+        """Stream every entity in constant memory.
+
+        Args:
+            batch_size: Rows fetched per round trip (cursor.arraysize).
+        """
+        return self._iter_models(f"SELECT * FROM {self.model.__tablename__}", batch_size=batch_size)
+
+    def iter_where(self, batch_size: Optional[int] = None, **conditions) -> Iterator[T]:
+        """Stream the entities matching all field conditions in constant memory.
+
+        Args:
+            batch_size: Rows fetched per round trip (cursor.arraysize).
+            **conditions: Column equality conditions.
+        """
+        return self._iter_models(*self._where_query(conditions), batch_size)
+
+    def get_all_rows(self) -> List[Any]:
+        """Get all entities as read-only rows (see ``row_type``) for bulk reads."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute(f"SELECT * FROM {self.model.__tablename__}")
+            return self._build_models(cursor, read_only=True)
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving all rows: {e}")
+
+    def find_rows_by_field(self, field_name: str, value) -> List[Any]:
+        """Find entities by a specific field, as read-only rows."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute(f"SELECT * FROM {self.model.__tablename__} WHERE {field_name} = ?", (value,))
+            return self._build_models(cursor, read_only=True)
+        except Exception as e:
+            raise DatabaseException(f"Error finding rows by field: {e}")
+
+    def iter_rows(self, batch_size: Optional[int] = None, **conditions) -> Iterator[Any]:
+        """Stream read-only rows matching all field conditions (every row if none)."""
+        return self._iter_models(*self._where_query(conditions), batch_size, read_only=True)
+
+    def _where_query(self, conditions: Dict[str, Any]) -> Tuple[str, tuple]:
+        """SELECT * with an equality WHERE clause for the given conditions."""
+        sql = f"SELECT * FROM {self.model.__tablename__}"
+        if conditions:
+            sql += " WHERE " + " AND ".join([f"{k} = ?" for k in conditions.keys()])
+        return sql, tuple(conditions.values())
+
+    def full_text_search(self, text: str, limit: int = 50) -> List[T]:
+        """
+        Ranked prefix search over this table's FTS5 index (see database/search.py).
+
+        Every token in the text must prefix-match an indexed column. Returns an
+        empty list if the text has no searchable tokens.
+        """
+        match = build_match_query(text)
+        if match is None:
+            return []
+        try:
+            table = self.model.__tablename__
+            fts_table, rowid, _ = FTS_TABLES[table]
+            cursor = self.db.cursor()
+            cursor.execute(f"""
+                SELECT t.* FROM {fts_table}
+                JOIN {table} t ON t.{rowid} = {fts_table}.rowid
+                WHERE {fts_table} MATCH ?
+                ORDER BY {fts_table}.rank
+                LIMIT ?
+            """, (match, limit))
+            return self._build_models(cursor)
+        except Exception as e:
+            raise DatabaseException(f"Error searching {self.model.__tablename__}: {e}")
+
+    def find_containing(self, columns: Sequence[str], text: str) -> List[T]:
+        """
+        Case-insensitive substring search over a few columns, run in SQL.
+
+        For small tables without an FTS index. ``columns`` must come from
+        code, never from user input.
+        """
+        try:
+            pattern = '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            condition = ' OR '.join(f"{column} LIKE ? ESCAPE '\\'" for column in columns)
+            cursor = self.db.cursor()
+            cursor.execute(f"SELECT * FROM {self.model.__tablename__} WHERE {condition}",
+                           (pattern,) * len(columns))
+            return self._build_models(cursor)
+        except Exception as e:
+            raise DatabaseException(f"Error searching {self.model.__tablename__}: {e}")
+
+    def _search_condition(self, text: str) -> Optional[Tuple[str, tuple]]:
+        """
+        WHERE clause and parameters limiting a query to rows matching search text.
+
+        For the keyset page queries, which keep their own sort order. Returns
+        None for blank text. Text with no searchable tokens, such as bare
+        punctuation, gets a clause that matches nothing, like full_text_search.
+        """
+        if not text or not text.strip():
+            return None
+        match = build_match_query(text)
+        if match is None:
+            return "0", ()
+        fts_table, rowid, _ = FTS_TABLES[self.model.__tablename__]
+        return f"{rowid} IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)", (match,)
+
+    def _fetch_keyset_page(self, where: List[str], params: List[Any], key_column: str,
+                           sort_expression: Optional[str] = None, descending: bool = False,
+                           after: Optional[tuple] = None, limit: int = 200) -> Tuple[List[T], Optional[tuple]]:
+        """
+        Fetch one page of rows using keyset (seek) pagination.
+
+        Rows are ordered by ``sort_expression`` with ``key_column`` as a unique
+        tiebreaker, and the next page starts strictly after the ``after``
+        cursor, so the cost of a page does not grow with how far the caller
+        has scrolled. ``sort_expression`` must come from a whitelist, never
+        from user input.
+
+        Returns:
+            The page as models, and the cursor for the next page (None once
+            the last page has been returned).
+        """
+        sort_expression = sort_expression or key_column
+        direction = "DESC" if descending else "ASC"
+        comparison = "<" if descending else ">"
+        where = list(where)
+        params = list(params)
+
+        single_key = sort_expression == key_column
+        if after is not None:
+            if single_key:
+                where.append(f"{key_column} {comparison} ?")
+                params.append(after[-1])
+            else:
+                where.append(f"({sort_expression}, {key_column}) {comparison} (?, ?)")
+                params.extend(after)
+
+        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+        order_clause = (f"{key_column} {direction}" if single_key
+                        else f"{sort_expression} {direction}, {key_column} {direction}")
+        cursor = self.db.cursor()
+        cursor.execute(
+            f"""
+            SELECT *, {sort_expression} AS _keyset_sort, {key_column} AS _keyset_key
+            FROM {self.model.__tablename__}
+            {where_clause}
+            ORDER BY {order_clause}
+            LIMIT ?
+            """,
+            (*params, limit)
+        )
+        rows = cursor.fetchall()
+        # The two trailing cursor columns are not model fields
+        build = self._row_builder(cursor.description[:-2])
+        next_after = tuple(rows[-1][-2:]) if len(rows) == limit else None
+        return [build(row[:-2]) for row in rows], next_after
+
     @contextmanager
     def transaction(self):
-        """Transaction context manager for atomic operations."""
+        """
+        Transaction context manager for atomic operations.
+
+        Connections run in autocommit mode, so the transaction is opened
+        explicitly with BEGIN IMMEDIATE: the write lock is taken up front and
+        reads made inside the block cannot be invalidated by another writer
+        before the block commits. Nested use joins the outer transaction.
+        """
+        conn = self.db
+        if conn.in_transaction:
+            yield
+            return
+        conn.execute("BEGIN IMMEDIATE")
         try:
             yield
-            self.db.commit()
+            conn.commit()
         except Exception:
-            self.db.rollback()
+            conn.rollback()
             raise
 
@@ -2,15 +2,42 @@
 Repository for book operations.
 """
 
-from typing import Optional, List
+import json
+from typing import Optional, List, Dict, Iterator, Set, Tuple
 from .base import BaseRepository
 from ...models.book import Book, BookTag, BorrowedBookStudent, BorrowedBookTeacher, QRBook, QRBorrowLog, DistributionSession, DistributionStudent, DistributionImportLog
+from ...models.rows import BookRow, BorrowedBookStudentRow, BorrowedBookTeacherRow
 from ...core.exceptions import DatabaseException
 
 
 class BookRepository(BaseRepository):
     """Repository for book operations."""
 
+    row_type = BookRow
+
+    # Sortable catalog columns; NULLs sort as empty text so keyset cursors stay comparable
+    CATALOG_SORT_EXPRESSIONS = {
+        'book_number': "book_number",
+        'title': "title",
+        'author': "author",
+        'isbn': "COALESCE(isbn, '')",
+        'subject': "COALESCE(subject, category, '')",
+        'class': "COALESCE(class, '')",
+        'revision': "COALESCE(revision, 0)",
+        'book_condition': "COALESCE(book_condition, '')",
+        'qr_code': "COALESCE(qr_code, '')",
+    }
+
+    # Fixed text, so sqlite3's per-connection statement cache keeps it prepared between scans
+    LEND_SCANNED_BOOK_SQL = """
+        UPDATE books SET available = 0
+        WHERE id = ? AND qr_code = ? AND available = 1
+          AND NOT EXISTS (SELECT 1 FROM borrowed_books_student s
+                          WHERE s.book_id = books.id AND s.returned_on IS NULL)
+          AND NOT EXISTS (SELECT 1 FROM borrowed_books_teacher t
+                          WHERE t.book_id = books.id AND t.returned_on IS NULL)
+    """
+
     def __init__(self):
         super().__init__(Book)
     
@@ -22,7 +49,7 @@ class BookRepository(BaseRepository):
             cursor.execute(f"SELECT * FROM {self.model.__tablename__} WHERE id = ?", (id,))
             result = cursor.fetchone()
             if result:
-                return self.model(**dict(zip([column[0] for column in cursor.description], result)))
+                return self._row_builder(cursor.description)(result)
             return None
         except Exception as e:
             raise DatabaseException(f"Error retrieving book by ID: {e}")
@@ -41,36 +68,328 @@ class BookRepository(BaseRepository):
         try:
             cursor = self.db.cursor()
             cursor.execute("SELECT * FROM books WHERE available = 1")
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving available books: {e}")
 
-    def get_books_by_category(self, category: str) -> List[Book]:
-        """Get books filtered by category"""
+    def get_borrowed_book_ids(self) -> Set[int]:
+        """Get the ids of all books currently on loan to a student or teacher, in one query."""
         try:
             cursor = self.db.cursor()
-            cursor.execute("SELECT * FROM books WHERE category = ?", (category,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            cursor.execute("""
+                SELECT book_id FROM borrowed_books_student WHERE returned_on IS NULL
+                UNION
+                SELECT book_id FROM borrowed_books_teacher WHERE returned_on IS NULL
+            """)
+            return {row[0] for row in cursor.fetchall()}
         except Exception as e:
-            raise DatabaseException(f"Error retrieving books by category: {e}")
+            raise DatabaseException(f"Error retrieving borrowed book ids: {e}")
+
+    def get_borrow_status(self, book_ids: List[int]) -> Dict[int, Tuple[bool, bool]]:
+        """
+        Check many books for borrowing in one query.
+
+        Args:
+            book_ids: Book ids to check; ids missing from the result do not exist.
+
+        Returns:
+            {book_id: (available flag set, has an open student or teacher loan)}
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("""
+                SELECT b.id, b.available,
+                       EXISTS (SELECT 1 FROM borrowed_books_student s
+                               WHERE s.book_id = b.id AND s.returned_on IS NULL)
+                       OR EXISTS (SELECT 1 FROM borrowed_books_teacher t
+                                  WHERE t.book_id = b.id AND t.returned_on IS NULL)
+                FROM books b
+                WHERE b.id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(book_ids)),))
+            return {book_id: (bool(available), bool(on_loan)) for book_id, available, on_loan in cursor.fetchall()}
+        except Exception as e:
+            raise DatabaseException(f"Error checking book availability: {e}")
+
+    def find_open_loans(self, returns: List[Tuple[str, str, int]]) -> List[Tuple[bool, bool]]:
+        """
+        Check a batch of returns against the books and open loans in one query.
+
+        Args:
+            returns: (borrower_type, borrower_id, book_id) triples, where
+                borrower_type is 'student' or 'teacher'.
+
+        Returns:
+            (book exists, borrower has the book on open loan) for each triple, in order.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("""
+                WITH requested AS (
+                    SELECT CAST(key AS INTEGER) AS position,
+                           json_extract(value, '$[0]') AS borrower_type,
+                           json_extract(value, '$[1]') AS borrower_id,
+                           json_extract(value, '$[2]') AS book_id
+                    FROM json_each(?)
+                )
+                SELECT r.position,
+                       b.id IS NOT NULL,
+                       CASE r.borrower_type
+                           WHEN 'student' THEN EXISTS (
+                               SELECT 1 FROM borrowed_books_student s
+                               WHERE s.student_id = r.borrower_id AND s.book_id = r.book_id
+                                 AND s.returned_on IS NULL)
+                           WHEN 'teacher' THEN EXISTS (
+                               SELECT 1 FROM borrowed_books_teacher t
+                               WHERE t.teacher_id = r.borrower_id AND t.book_id = r.book_id
+                                 AND t.returned_on IS NULL)
+                           ELSE 0
+                       END
+                FROM requested r
+                LEFT JOIN books b ON b.id = r.book_id
+                ORDER BY r.position
+            """, (json.dumps([[borrower_type, str(borrower_id), book_id]
+                              for borrower_type, borrower_id, book_id in returns]),))
+            return [(bool(exists), bool(on_loan)) for _, exists, on_loan in cursor.fetchall()]
+        except Exception as e:
+            raise DatabaseException(f"Error checking open loans: {e}")
+
+    def set_availability(self, book_ids: List[int], available: bool) -> int:
+        """
+        Set the available flag on many books with one statement.
+
+        Does not commit, so it can join a caller's ``transaction()``.
+
+        Returns:
+            The number of books updated.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute(
+                "UPDATE books SET available = ? WHERE id IN (SELECT value FROM json_each(?))",
+                (1 if available else 0, json.dumps(list(book_ids)))
+            )
+            return cursor.rowcount
+        except Exception as e:
+            raise DatabaseException(f"Error updating book availability: {e}")
+
+    def get_ids_by_book_numbers(self, book_numbers: List[str]) -> Dict[str, int]:
+        """Resolve book numbers to book ids in one query; unknown numbers are left out."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute(
+                "SELECT book_number, id FROM books WHERE book_number IN (SELECT value FROM json_each(?))",
+                (json.dumps(list(book_numbers)),)
+            )
+            return dict(cursor.fetchall())
+        except Exception as e:
+            raise DatabaseException(f"Error resolving book numbers: {e}")
+
+    def get_open_loans(self) -> List[Dict]:
+        """Get every open student and teacher loan in one query."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("""
+                SELECT student_id AS user_id, book_id, 'student' AS user_type, borrowed_on AS borrowed_date
+                FROM borrowed_books_student WHERE returned_on IS NULL
+                UNION ALL
+                SELECT teacher_id, book_id, 'teacher', borrowed_on
+                FROM borrowed_books_teacher WHERE returned_on IS NULL
+            """)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving open loans: {e}")
+
+    def get_books_without_qr(self) -> List[Tuple[int, str, str]]:
+        """Get (id, book_number, title) for every book that has no QR code yet, in id order."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("""
+                SELECT id, book_number, title FROM books
+                WHERE qr_code IS NULL OR qr_code = ''
+                ORDER BY id
+            """)
+            return cursor.fetchall()
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving books without QR codes: {e}")
+
+    def set_qr_codes(self, codes: List[Tuple[int, str]], generated_at: str) -> int:
+        """
+        Store generated QR codes in one transaction.
+
+        Books that were given a code in the meantime keep it.
+
+        Args:
+            codes: (book id, qr_code) pairs.
+            generated_at: Timestamp stored as qr_generated_at.
+
+        Returns:
+            The number of books updated.
+        """
+        try:
+            with self.transaction():
+                cursor = self.db.cursor()
+                cursor.executemany(
+                    "UPDATE books SET qr_code = ?, qr_generated_at = ? "
+                    "WHERE id = ? AND (qr_code IS NULL OR qr_code = '')",
+                    [(qr_code, generated_at, book_id) for book_id, qr_code in codes]
+                )
+                return cursor.rowcount
+        except Exception as e:
+            raise DatabaseException(f"Error storing book QR codes: {e}")
+
+    def iter_qr_index(self) -> Iterator[Tuple[str, int, str]]:
+        """Stream (qr_code, id, title) for every book that has a QR code."""
+        return self._iter_tuples("SELECT qr_code, id, title FROM books WHERE qr_code IS NOT NULL AND qr_code != ''")
+
+    def find_qr_index_entry(self, qr_code: str) -> Optional[Tuple[int, str]]:
+        """Get (id, title) of the book with a QR code, or None."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("SELECT id, title FROM books WHERE qr_code = ?", (qr_code,))
+            return cursor.fetchone()
+        except Exception as e:
+            raise DatabaseException(f"Error looking up book QR code: {e}")
 
-    def search_books(self, query: str) -> List[Book]:
-        """Search books by title, author, or ISBN"""
+    def get_qr_index_entries(self, book_ids: List[int]) -> List[Tuple[str, int, str]]:
+        """Get (qr_code, id, title) for the given books that have a QR code."""
         try:
             cursor = self.db.cursor()
-            search_query = f"%{query}%"
             cursor.execute("""
-                SELECT * FROM books
-                WHERE title LIKE ?
-                OR author LIKE ?
-                OR isbn LIKE ?
-            """, (search_query, search_query, search_query))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+                SELECT qr_code, id, title FROM books
+                WHERE id IN (SELECT value FROM json_each(?))
+                  AND qr_code IS NOT NULL AND qr_code != ''
+            """, (json.dumps(list(book_ids)),))
+            return cursor.fetchall()
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving book QR codes: {e}")
+
+    def lend_scanned_book(self, book_id: int, qr_code: str) -> bool:
+        """
+        Mark a scanned book unavailable if it can be lent.
+
+        The QR code is matched along with the id so a stale scan index entry
+        cannot lend a different book. Does not commit; call inside
+        ``transaction()`` together with the loan insert.
+
+        Returns:
+            False if the book is on loan, or no longer carries the QR code.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute(self.LEND_SCANNED_BOOK_SQL, (book_id, qr_code))
+            return cursor.rowcount == 1
+        except Exception as e:
+            raise DatabaseException(f"Error lending scanned book: {e}")
+
+    def iter_export_rows(self, batch_size: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Stream every book as a tuple for file export, in id order.
+
+        Each row is (book_number, title, author, subject, class, category, isbn,
+        publication_date, book_condition, available, book_type, qr_code,
+        qr_generated_at), with revision already turned into 'course'/'revision'.
+        """
+        return self._iter_tuples(
+            """
+            SELECT book_number, title, author, subject, class, category, isbn, publication_date,
+                   book_condition, available,
+                   CASE WHEN revision IN (1, '1') THEN 'revision' ELSE 'course' END,
+                   qr_code, qr_generated_at
+            FROM books
+            ORDER BY id
+            """,
+            batch_size=batch_size
+        )
+
+    def iter_loan_export_rows(self, include_returned: bool = False,
+                              batch_size: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Stream student and teacher loans as tuples for file export.
+
+        Each row is (book_id, book_number, borrower_id, borrowed_on, returned_on,
+        status), with status 'Active' or 'Returned'.
+
+        Args:
+            include_returned: Include returned loans as well as open ones (the full history).
+            batch_size: Rows fetched per round trip.
+        """
+        open_only = "" if include_returned else "WHERE loans.returned_on IS NULL"
+        return self._iter_tuples(
+            f"""
+            SELECT loans.book_id, books.book_number, loans.borrower_id, loans.borrowed_on,
+                   loans.returned_on,
+                   CASE WHEN loans.returned_on IS NULL THEN 'Active' ELSE 'Returned' END
+            FROM (
+                SELECT book_id, student_id AS borrower_id, borrowed_on, returned_on FROM borrowed_books_student
+                UNION ALL
+                SELECT book_id, teacher_id, borrowed_on, returned_on FROM borrowed_books_teacher
+            ) loans
+            LEFT JOIN books ON books.id = loans.book_id
+            {open_only}
+            """,
+            batch_size=batch_size
+        )
+
+    def fetch_catalog_page(self, after: Optional[tuple] = None, limit: int = 200,
+                           sort_by: Optional[str] = None, descending: bool = False,
+                           search: Optional[str] = None, subject: Optional[str] = None,
+                           class_name: Optional[str] = None,
+                           has_qr: Optional[bool] = None) -> Tuple[List[Book], Optional[tuple]]:
+        """
+        Fetch one page of the book catalog with filtering and sorting done in SQL.
+
+        Args:
+            after: Cursor returned with the previous page, None for the first page.
+            limit: Maximum number of books in the page.
+            sort_by: Key of CATALOG_SORT_EXPRESSIONS, None to order by id.
+            descending: Sort direction.
+            search: Words prefix-matched against book number, title, author and ISBN.
+            subject: Matches either the subject or the legacy category column.
+            class_name: Exact class filter.
+            has_qr: True/False to keep only books with/without a QR code.
+
+        Returns:
+            The books in the page and the cursor for the next one.
+        """
+        try:
+            if sort_by is not None and sort_by not in self.CATALOG_SORT_EXPRESSIONS:
+                raise ValueError(f"Unsupported sort column: {sort_by}")
+
+            where, params = [], []
+            condition = self._search_condition(search)
+            if condition:
+                where.append(condition[0])
+                params.extend(condition[1])
+            if subject:
+                where.append("(subject = ? OR category = ?)")
+                params.extend([subject, subject])
+            if class_name:
+                where.append("class = ?")
+                params.append(class_name)
+            if has_qr is not None:
+                where.append("qr_code IS NOT NULL" if has_qr else "qr_code IS NULL")
+
+            return self._fetch_keyset_page(
+                where, params, 'id',
+                sort_expression=self.CATALOG_SORT_EXPRESSIONS.get(sort_by),
+                descending=descending, after=after, limit=limit
+            )
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving catalog page: {e}")
+
+    def get_books_by_category(self, category: str) -> List[Book]:
+        """Get books filtered by category"""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("SELECT * FROM books WHERE category = ?", (category,))
+            return self._build_models(cursor)
         except Exception as e:
-            raise DatabaseException(f"Error searching books: {e}")
+            raise DatabaseException(f"Error retrieving books by category: {e}")
+
+    def search_books(self, query: str, limit: int = 50) -> List[Book]:
+        """Search books by number, title, author or ISBN prefix, best matches first."""
+        return self.full_text_search(query, limit)
 
     def get_popular_books(self, limit: int = 10) -> List[Book]:
         """Get most frequently borrowed books"""
@@ -86,8 +405,7 @@ class BookRepository(BaseRepository):
                 ORDER BY borrow_count DESC
                 LIMIT ?
             """, (limit,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving popular books: {e}")
 
@@ -102,6 +420,21 @@ class BookTagRepository(BaseRepository):
 class BorrowedBookStudentRepository(BaseRepository):
     """Repository for borrowed book student operations."""
 
+    row_type = BorrowedBookStudentRow
+
+    # Scan station statements; fixed text keeps them in sqlite3's statement cache
+    INSERT_SCANNED_LOAN_SQL = """
+        INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on, reminder_days)
+        SELECT student_id, ?, ?, ? FROM students WHERE student_id = ? AND qr_code = ?
+    """
+    CLOSE_SCANNED_LOAN_SQL = """
+        UPDATE borrowed_books_student
+        SET returned_on = ?, return_condition = ?, returned_by = ?
+        WHERE student_id = ? AND book_id = ? AND returned_on IS NULL
+          AND EXISTS (SELECT 1 FROM books WHERE id = ? AND qr_code = ?)
+          AND EXISTS (SELECT 1 FROM students WHERE student_id = ? AND qr_code = ?)
+    """
+
     def __init__(self):
         super().__init__(BorrowedBookStudent)
     
@@ -113,8 +446,7 @@ class BorrowedBookStudentRepository(BaseRepository):
                 SELECT * FROM borrowed_books_student
                 WHERE student_id = ? AND returned_on IS NULL
             """, (student_id,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving borrowed books for student: {e}")
 
@@ -126,11 +458,49 @@ class BorrowedBookStudentRepository(BaseRepository):
                 SELECT * FROM borrowed_books_student
                 WHERE book_id = ? AND returned_on IS NULL
             """, (book_id,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving borrowings for book: {e}")
     
+    def iter_open_loans_with_details(self, batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Stream currently borrowed books joined with their book and student rows.
+
+        One query replaces the per-student/per-loan lookups; rows are fetched
+        from the cursor in batches so callers can stop early or page.
+
+        Args:
+            batch_size: Rows fetched from SQLite per round trip.
+
+        Yields:
+            Dictionaries with loan, book and student columns plus days_borrowed.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("""
+                SELECT bbs.student_id, bbs.book_id, bbs.borrowed_on, bbs.reminder_days,
+                       b.book_number, b.title, b.author, b.category, b.isbn,
+                       b.publication_date, b.available, b.revision, b.book_condition,
+                       b.subject, b.class, b.qr_code, b.qr_generated_at,
+                       s.name AS student_name,
+                       COALESCE(CAST(julianday(DATE('now', 'localtime'))
+                                     - julianday(DATE(bbs.borrowed_on)) AS INTEGER), 0) AS days_borrowed
+                FROM borrowed_books_student bbs
+                JOIN books b ON b.id = bbs.book_id
+                LEFT JOIN students s ON s.student_id = bbs.student_id
+                WHERE bbs.returned_on IS NULL
+                ORDER BY bbs.borrowed_on DESC, bbs.book_id
+            """)
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving open loans: {e}")
+
     def get_returned_books_by_student(self, student_id: str) -> List[BorrowedBookStudent]:
         """Get all books returned by a student."""
         try:
@@ -139,8 +509,7 @@ class BorrowedBookStudentRepository(BaseRepository):
                 SELECT * FROM borrowed_books_student
                 WHERE student_id = ? AND returned_on IS NOT NULL
             """, (student_id,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving returned books for student: {e}")
     
@@ -153,8 +522,7 @@ class BorrowedBookStudentRepository(BaseRepository):
                 WHERE returned_on IS NULL
                 AND borrowed_on < DATE('now', ?)
             """, (f'-{days_overdue} days',))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving overdue books: {e}")
     
@@ -171,6 +539,107 @@ class BorrowedBookStudentRepository(BaseRepository):
         except Exception as e:
             raise DatabaseException(f"Error checking borrowed book: {e}")
 
+    def create_loans(self, loans: List[Tuple[str, int]], borrowed_on: str, reminder_days: int = 7) -> int:
+        """
+        Insert many student loans and mark their books unavailable.
+
+        Does not commit: call inside ``transaction()`` together with the
+        availability check so the batch is applied atomically.
+
+        Args:
+            loans: (student_id, book_id) pairs; each book must appear once.
+            borrowed_on: Loan date for every row.
+            reminder_days: Reminder period for every row.
+
+        Returns:
+            The number of loans inserted.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.executemany(
+                "INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on, reminder_days) "
+                "VALUES (?, ?, ?, ?)",
+                [(student_id, book_id, borrowed_on, reminder_days) for student_id, book_id in loans]
+            )
+            cursor.execute(
+                "UPDATE books SET available = 0 WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps([book_id for _, book_id in loans]),)
+            )
+            return len(loans)
+        except Exception as e:
+            raise DatabaseException(f"Error creating loans: {e}")
+
+    def close_loans(self, returns: List[Tuple[str, int, str, float]], returned_on: str,
+                    returned_by: Optional[str] = None) -> int:
+        """
+        Mark many open student loans as returned with one executemany.
+
+        Does not commit or touch ``books.available``; call inside
+        ``transaction()`` alongside ``BookRepository.set_availability``.
+
+        Args:
+            returns: (student_id, book_id, return_condition, fine_amount) tuples.
+            returned_on: Return date for every loan.
+            returned_by: Librarian processing the returns.
+
+        Returns:
+            The number of loans closed.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.executemany("""
+                UPDATE borrowed_books_student
+                SET returned_on = ?, return_condition = ?, fine_amount = ?, returned_by = ?
+                WHERE student_id = ? AND book_id = ? AND returned_on IS NULL
+            """, [(returned_on, condition, fine_amount, returned_by, student_id, book_id)
+                  for student_id, book_id, condition, fine_amount in returns])
+            return cursor.rowcount
+        except Exception as e:
+            raise DatabaseException(f"Error closing student loans: {e}")
+
+    def insert_scanned_loan(self, student_id: str, qr_code: str, book_id: int,
+                            borrowed_on: str, reminder_days: int = 7) -> bool:
+        """
+        Insert a loan for a scanned student card.
+
+        The row is only written if the student still carries the QR code.
+        Does not commit; call inside ``transaction()`` after
+        ``BookRepository.lend_scanned_book``.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute(self.INSERT_SCANNED_LOAN_SQL,
+                           (book_id, borrowed_on, reminder_days, student_id, qr_code))
+            return cursor.rowcount == 1
+        except Exception as e:
+            raise DatabaseException(f"Error inserting scanned loan: {e}")
+
+    def close_scanned_loan(self, student_id: str, student_qr_code: str, book_id: int, book_qr_code: str,
+                           returned_on: str, return_condition: str = "Good",
+                           returned_by: Optional[str] = None) -> bool:
+        """
+        Close a student's open loan of a scanned book and mark the book available.
+
+        Both QR codes are matched along with the ids, as in
+        ``BookRepository.lend_scanned_book``, so a stale scan index entry
+        cannot close another loan. Does not commit; call inside ``transaction()``.
+
+        Returns:
+            False if the student has no open loan of the book, or either no
+            longer carries the scanned QR code.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute(self.CLOSE_SCANNED_LOAN_SQL,
+                           (returned_on, return_condition, returned_by, student_id, book_id,
+                            book_id, book_qr_code, student_id, student_qr_code))
+            if cursor.rowcount == 0:
+                return False
+            cursor.execute("UPDATE books SET available = 1 WHERE id = ?", (book_id,))
+            return True
+        except Exception as e:
+            raise DatabaseException(f"Error closing scanned loan: {e}")
+
     def return_book(self, student_id: str, book_id: int, return_condition: str = "Good",
                    fine_amount: float = 0, returned_by: str = None) -> bool:
         """Mark a book as returned by a student."""
@@ -201,6 +670,8 @@ class BorrowedBookStudentRepository(BaseRepository):
 class BorrowedBookTeacherRepository(BaseRepository):
     """Repository for borrowed book teacher operations."""
 
+    row_type = BorrowedBookTeacherRow
+
     def __init__(self):
         super().__init__(BorrowedBookTeacher)
     
@@ -212,8 +683,7 @@ class BorrowedBookTeacherRepository(BaseRepository):
                 SELECT * FROM borrowed_books_teacher
                 WHERE teacher_id = ? AND returned_on IS NULL
             """, (teacher_id,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving borrowed books for teacher: {e}")
 
@@ -225,8 +695,7 @@ class BorrowedBookTeacherRepository(BaseRepository):
                 SELECT * FROM borrowed_books_teacher
                 WHERE book_id = ? AND returned_on IS NULL
             """, (book_id,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving teacher borrowings for book: {e}")
     
@@ -238,11 +707,34 @@ class BorrowedBookTeacherRepository(BaseRepository):
                 SELECT * FROM borrowed_books_teacher
                 WHERE teacher_id = ? AND returned_on IS NOT NULL
             """, (teacher_id,))
-            results = cursor.fetchall()
-            return [self.model(**dict(zip([column[0] for column in cursor.description], row))) for row in results]
+            return self._build_models(cursor)
         except Exception as e:
             raise DatabaseException(f"Error retrieving returned books for teacher: {e}")
     
+    def close_loans(self, returns: List[Tuple[str, int]], returned_on: str) -> int:
+        """
+        Mark many open teacher loans as returned with one executemany.
+
+        Does not commit or touch ``books.available`` (see the student version).
+
+        Args:
+            returns: (teacher_id, book_id) pairs.
+            returned_on: Return date for every loan.
+
+        Returns:
+            The number of loans closed.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.executemany("""
+                UPDATE borrowed_books_teacher
+                SET returned_on = ?
+                WHERE teacher_id = ? AND book_id = ? AND returned_on IS NULL
+            """, [(returned_on, teacher_id, book_id) for teacher_id, book_id in returns])
+            return cursor.rowcount
+        except Exception as e:
+            raise DatabaseException(f"Error closing teacher loans: {e}")
+
     def return_book(self, teacher_id: str, book_id: int) -> bool:
         """Mark a book as returned by a teacher."""
         try:
@@ -349,6 +841,116 @@ class DistributionStudentRepository(BaseRepository):
             )
         self.db.commit()
     
+    def apply_staged_import(self, session_id: int, rows: Iterator[Tuple[str, str]]) -> Dict[str, int]:
+        """
+        Stage distribution rows in a temp table, classify them in SQL and apply them.
+
+        Rows are bulk-loaded with executemany, then classified with a few
+        set-based statements:
+
+        - missing_student: no student id
+        - duplicate: a book number given to more than one student
+        - unavailable: the book exists but is not available
+        - valid: the book exists and is available
+        - pending: the book is not in the catalog yet
+        - blank: no book number
+
+        Finally ``distribution_students`` is updated with one UPDATE ... FROM;
+        when a student appears more than once, their last row wins. Does not
+        commit, so the whole import can run inside ``transaction()``.
+
+        Args:
+            session_id: Distribution session to update.
+            rows: (student_id, book_number) pairs, already stripped.
+
+        Returns:
+            Row count per category, plus ``duplicate_extra``: the number of
+            duplicate rows beyond the first use of each book number.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("DROP TABLE IF EXISTS temp.distribution_import_staging")
+            cursor.execute("""
+                CREATE TEMP TABLE distribution_import_staging (
+                    line INTEGER PRIMARY KEY,
+                    student_id TEXT NOT NULL,
+                    book_number TEXT NOT NULL,
+                    book_id INTEGER,
+                    category TEXT
+                )
+            """)
+            cursor.executemany(
+                "INSERT INTO distribution_import_staging (student_id, book_number) VALUES (?, ?)", rows
+            )
+
+            cursor.execute("""
+                UPDATE distribution_import_staging SET category = 'missing_student' WHERE student_id = ''
+            """)
+            cursor.execute("""
+                SELECT COALESCE(SUM(uses - 1), 0) FROM (
+                    SELECT COUNT(*) AS uses FROM distribution_import_staging
+                    WHERE category IS NULL AND book_number != ''
+                    GROUP BY book_number HAVING COUNT(*) > 1
+                )
+            """)
+            duplicate_extra = cursor.fetchone()[0]
+            cursor.execute("""
+                UPDATE distribution_import_staging SET category = 'duplicate'
+                WHERE category IS NULL AND book_number IN (
+                    SELECT book_number FROM distribution_import_staging
+                    WHERE category IS NULL AND book_number != ''
+                    GROUP BY book_number HAVING COUNT(*) > 1
+                )
+            """)
+            cursor.execute("""
+                UPDATE distribution_import_staging
+                SET book_id = books.id,
+                    category = CASE WHEN books.available THEN 'valid' ELSE 'unavailable' END
+                FROM books
+                WHERE distribution_import_staging.category IS NULL
+                  AND books.book_number = distribution_import_staging.book_number
+            """)
+            cursor.execute("""
+                UPDATE distribution_import_staging
+                SET category = CASE WHEN book_number = '' THEN 'blank' ELSE 'pending' END
+                WHERE category IS NULL
+            """)
+
+            cursor.execute("""
+                UPDATE distribution_students
+                SET book_number = NULLIF(staged.book_number, ''),
+                    book_id = staged.book_id,
+                    notes = CASE staged.category WHEN 'pending' THEN 'Not in system' END
+                FROM (
+                    SELECT student_id, book_number, book_id, category, MAX(line)
+                    FROM distribution_import_staging
+                    WHERE category IN ('valid', 'pending', 'blank')
+                    GROUP BY student_id
+                ) AS staged
+                WHERE distribution_students.session_id = ?
+                  AND distribution_students.student_id = staged.student_id
+            """, (session_id,))
+
+            cursor.execute("SELECT category, COUNT(*) FROM distribution_import_staging GROUP BY category")
+            counts = dict(cursor.fetchall())
+            counts['duplicate_extra'] = duplicate_extra
+            cursor.execute("DROP TABLE temp.distribution_import_staging")
+            return counts
+        except Exception as e:
+            raise DatabaseException(f"Error applying distribution import: {e}")
+
+    def get_assigned_books(self, session_id: int) -> List[Tuple[str, int]]:
+        """Get the (student_id, book_id) pairs assigned in a session."""
+        cursor = self.db.cursor()
+        cursor.execute(
+            """
+            SELECT student_id, book_id FROM distribution_students
+            WHERE session_id = ? AND book_id IS NOT NULL
+            """,
+            (session_id,)
+        )
+        return cursor.fetchall()
+
     def get_unassigned(self, session_id: int) -> list:
         """
         Get students who haven't been assigned books yet
@@ -0,0 +1,37 @@
+"""
+Repository for the trigger-maintained summary counters.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from .base import BaseRepository
+from ..stats_counters import compute_stats_counters, rebuild_stats_counters
+from ...models.stats import StatsCounter
+
+
+class StatsCounterRepository(BaseRepository):
+    """Repository for stats_counters reads, verification and rebuilds."""
+
+    def __init__(self):
+        super().__init__(StatsCounter)
+
+    def get_values(self, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Stored counter values by name, for the given names or all counters."""
+        cursor = self.db.cursor()
+        if names is None:
+            cursor.execute("SELECT name, value FROM stats_counters")
+        else:
+            names = list(names)
+            placeholders = ', '.join('?' for _ in names)
+            cursor.execute(f"SELECT name, value FROM stats_counters WHERE name IN ({placeholders})", names)
+        return dict(cursor.fetchall())
+
+    def compare(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """(stored, counted from the source tables), read in one transaction."""
+        with self.transaction():
+            return self.get_values(), compute_stats_counters(self.db.cursor())
+
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute and store every counter; returns the new values."""
+        with self.transaction():
+            return rebuild_stats_counters(self.db.cursor())
@@ -2,16 +2,183 @@
 Repository for student operations.
 """
 
+import json
+from typing import Iterator, List, Optional, Tuple
 from .base import BaseRepository
 from ...models.student import Student, ReamEntry, TotalReams
+from ...models.rows import StudentRow
+from ...core.exceptions import DatabaseException
 
 
 class StudentRepository(BaseRepository):
     """Repository for student operations."""
 
+    row_type = StudentRow
+
+    # Sortable list columns; NULLs sort as empty text so keyset cursors stay comparable
+    LIST_SORT_EXPRESSIONS = {
+        'student_id': "student_id",
+        'name': "name",
+        'admission_number': "COALESCE(admission_number, student_id)",
+        'class': "COALESCE(class, '')",
+        'stream_name': "COALESCE(stream_name, '')",
+        'stream': "stream",
+        'qr_code': "COALESCE(qr_code, '')",
+    }
+
+    # Ids per IN (...) query, below SQLite's default 999 bound-parameter limit
+    ID_CHUNK_SIZE = 900
+
     def __init__(self):
         super().__init__(Student)
 
+    def fetch_student_page(self, after: Optional[tuple] = None, limit: int = 200,
+                           sort_by: Optional[str] = None, descending: bool = False,
+                           search: Optional[str] = None, class_name: Optional[str] = None,
+                           stream_name: Optional[str] = None,
+                           has_qr: Optional[bool] = None) -> Tuple[List[Student], Optional[tuple]]:
+        """
+        Fetch one page of students with filtering and sorting done in SQL.
+
+        Args:
+            after: Cursor returned with the previous page, None for the first page.
+            limit: Maximum number of students in the page.
+            sort_by: Key of LIST_SORT_EXPRESSIONS, None to order by student_id.
+            descending: Sort direction.
+            search: Words prefix-matched against student id, admission number, name, class and stream.
+            class_name: Exact class filter.
+            stream_name: Exact stream name filter.
+            has_qr: True/False to keep only students with/without a QR code.
+
+        Returns:
+            The students in the page and the cursor for the next one.
+        """
+        try:
+            if sort_by is not None and sort_by not in self.LIST_SORT_EXPRESSIONS:
+                raise ValueError(f"Unsupported sort column: {sort_by}")
+
+            where, params = [], []
+            condition = self._search_condition(search)
+            if condition:
+                where.append(condition[0])
+                params.extend(condition[1])
+            if class_name:
+                where.append("class = ?")
+                params.append(class_name)
+            if stream_name:
+                where.append("stream_name = ?")
+                params.append(stream_name)
+            if has_qr is not None:
+                where.append("qr_code IS NOT NULL" if has_qr else "qr_code IS NULL")
+
+            return self._fetch_keyset_page(
+                where, params, 'student_id',
+                sort_expression=self.LIST_SORT_EXPRESSIONS.get(sort_by),
+                descending=descending, after=after, limit=limit
+            )
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving student page: {e}")
+
+    def get_class_assignments(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Get the class placement of every student without loading full rows.
+
+        Returns:
+            (student_id, class, stream_name) tuples in student_id order.
+        """
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("SELECT student_id, class, stream_name FROM students ORDER BY student_id")
+            return cursor.fetchall()
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving class assignments: {e}")
+
+    def get_by_student_ids(self, student_ids: List[str]) -> List[Student]:
+        """
+        Get students by id, in the order the ids were given.
+
+        Ids are looked up in chunks so the query stays under SQLite's bound
+        parameter limit; unknown ids are skipped.
+        """
+        try:
+            found = {}
+            cursor = self.db.cursor()
+            for start in range(0, len(student_ids), self.ID_CHUNK_SIZE):
+                chunk = student_ids[start:start + self.ID_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"SELECT * FROM students WHERE student_id IN ({placeholders})", chunk)
+                for student in self._build_models(cursor):
+                    found[student.student_id] = student
+            return [found[student_id] for student_id in student_ids if student_id in found]
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving students by id: {e}")
+
+    def get_students_without_qr(self) -> List[Tuple[str, Optional[str], str]]:
+        """Get (student_id, admission_number, name) for every student that has no QR code yet."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("""
+                SELECT student_id, admission_number, name FROM students
+                WHERE qr_code IS NULL OR qr_code = ''
+                ORDER BY student_id
+            """)
+            return cursor.fetchall()
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving students without QR codes: {e}")
+
+    def set_qr_codes(self, codes: List[Tuple[str, str]], generated_at: str) -> int:
+        """
+        Store generated QR codes in one transaction.
+
+        Students that were given a code in the meantime keep it.
+
+        Args:
+            codes: (student_id, qr_code) pairs.
+            generated_at: Timestamp stored as qr_generated_at.
+
+        Returns:
+            The number of students updated.
+        """
+        try:
+            with self.transaction():
+                cursor = self.db.cursor()
+                cursor.executemany(
+                    "UPDATE students SET qr_code = ?, qr_generated_at = ? "
+                    "WHERE student_id = ? AND (qr_code IS NULL OR qr_code = '')",
+                    [(qr_code, generated_at, student_id) for student_id, qr_code in codes]
+                )
+                return cursor.rowcount
+        except Exception as e:
+            raise DatabaseException(f"Error storing student QR codes: {e}")
+
+    def iter_qr_index(self) -> Iterator[Tuple[str, str, str]]:
+        """Stream (qr_code, student_id, name) for every student that has a QR code."""
+        return self._iter_tuples(
+            "SELECT qr_code, student_id, name FROM students WHERE qr_code IS NOT NULL AND qr_code != ''"
+        )
+
+    def find_qr_index_entry(self, qr_code: str) -> Optional[Tuple[str, str]]:
+        """Get (student_id, name) of the student with a QR code, or None."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("SELECT student_id, name FROM students WHERE qr_code = ?", (qr_code,))
+            return cursor.fetchone()
+        except Exception as e:
+            raise DatabaseException(f"Error looking up student QR code: {e}")
+
+    def get_qr_index_entries(self, student_ids: List[str]) -> List[Tuple[str, str, str]]:
+        """Get (qr_code, student_id, name) for the given students that have a QR code."""
+        try:
+            cursor = self.db.cursor()
+            cursor.execute("""
+                SELECT qr_code, student_id, name FROM students
+                WHERE student_id IN (SELECT value FROM json_each(?))
+                  AND qr_code IS NOT NULL AND qr_code != ''
+            """, (json.dumps(list(student_ids)),))
+            return cursor.fetchall()
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving student QR codes: {e}")
+
     def validate_student_data(self, student_id: str, name: str, stream: str) -> bool:
         """Validate student data before operations."""
         try:
@@ -0,0 +1,104 @@
+"""
+Full-text search indexes for the SQLite database.
+
+Books, students and teachers are indexed by external-content FTS5 tables:
+the text lives only in the source table and triggers keep the index in
+step with every insert, update and delete. Searches are token prefix
+matches ranked by bm25, so typing "alg mat" finds "Algebra Mathematics".
+
+students and teachers have text primary keys, so their index follows the
+implicit rowid. VACUUM may renumber those rowids; run
+``rebuild_search_indexes`` after vacuuming the database by hand.
+"""
+
+import re
+from typing import Optional, Tuple
+
+# content table -> (FTS table, content rowid column, indexed columns)
+FTS_TABLES = {
+    'books': ('books_fts', 'id', ('book_number', 'title', 'author', 'isbn')),
+    'students': ('students_fts', 'rowid', ('student_id', 'admission_number', 'name', 'class', 'stream_name')),
+    'teachers': ('teachers_fts', 'rowid', ('teacher_id', 'teacher_name', 'department')),
+}
+
+# FTS table -> bm25 weight of each indexed column; identifiers and titles outrank the rest
+RANK_WEIGHTS = {
+    'books_fts': (3.0, 4.0, 2.0, 1.0),
+    'students_fts': (4.0, 4.0, 3.0, 1.0, 1.0),
+    'teachers_fts': (4.0, 3.0, 1.0),
+}
+
+# Matches the unicode61 tokenizer: letters and digits, with '_' as a separator
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def create_search_indexes(cursor):
+    """
+    Create the FTS tables and their sync triggers if missing.
+
+    A newly created index is filled from its content table, so an existing
+    database is indexed on the first start after upgrading.
+    """
+    for table, (fts_table, rowid, columns) in FTS_TABLES.items():
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,))
+        exists = cursor.fetchone() is not None
+
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f"new.{column}" for column in columns)
+        old_values = ', '.join(f"old.{column}" for column in columns)
+        # prefix='2 3' keeps short prefixes, the common case while typing, off the slow path
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                {column_list}, content='{table}', content_rowid='{rowid}',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.{rowid}, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.{rowid}, {old_values});
+            END
+        """)
+        # Only the indexed columns fire it, so availability and QR updates skip the index
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.{rowid}, {old_values});
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (new.{rowid}, {new_values});
+            END
+        """)
+        # Stored in the index's config, so ORDER BY rank applies the weights
+        weights = ', '.join(str(weight) for weight in RANK_WEIGHTS[fts_table])
+        cursor.execute(f"INSERT INTO {fts_table} ({fts_table}, rank) VALUES ('rank', 'bm25({weights})')")
+        if not exists:
+            cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+
+
+def rebuild_search_indexes(conn):
+    """Rebuild every FTS index from its content table."""
+    for fts_table, _, _ in FTS_TABLES.values():
+        conn.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+    conn.commit()
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn search box text into an FTS5 query matching every token as a prefix.
+
+    Returns None if the text has no searchable tokens.
+    """
+    tokens = _TOKEN_PATTERN.findall(text or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def fts_table_for(table: str) -> Tuple[str, str]:
+    """Get (FTS table, content rowid column) indexing a content table."""
+    fts_table, rowid, _ = FTS_TABLES[table]
+    return fts_table, rowid
@@ -0,0 +1,117 @@
+"""
+Trigger-maintained summary counters for the dashboard.
+
+``stats_counters`` holds one row per counter (total books, open loans,
+available lockers, ...). Triggers on the source tables adjust a counter by
+one whenever a row that it counts is inserted, deleted, or updated into or
+out of its condition, so reading a count never touches the source table.
+
+``rebuild_stats_counters`` recomputes every counter from scratch. It runs
+when the table is first created and is the repair path if the counters are
+ever found to drift (see ``StatsService.verify_counters``).
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class CounterDefinition(NamedTuple):
+    """A counted row set: rows of table for which condition holds (all rows if None)."""
+    table: str
+    # SQL predicate over one row; {row} is replaced by NEW, OLD or the table name
+    condition: Optional[str] = None
+    # Columns the condition reads; only updates of these can move the counter
+    columns: Tuple[str, ...] = ()
+
+
+STATS_COUNTERS: Dict[str, CounterDefinition] = {
+    'books_total': CounterDefinition('books'),
+    # Same reading as the dashboard: a missing flag means the book is on the shelf
+    'books_available': CounterDefinition('books', "COALESCE({row}.available, 1) = 1", ('available',)),
+    'student_loans_open': CounterDefinition('borrowed_books_student', "{row}.returned_on IS NULL", ('returned_on',)),
+    'teacher_loans_open': CounterDefinition('borrowed_books_teacher', "{row}.returned_on IS NULL", ('returned_on',)),
+    'students_total': CounterDefinition('students'),
+    'teachers_total': CounterDefinition('teachers'),
+    'chairs_total': CounterDefinition('chairs'),
+    'chairs_available': CounterDefinition('chairs', "{row}.assigned = 0", ('assigned',)),
+    'lockers_total': CounterDefinition('lockers'),
+    'lockers_available': CounterDefinition('lockers', "{row}.assigned = 0", ('assigned',)),
+}
+
+
+def _counted(counter: CounterDefinition, row: str) -> str:
+    """SQL that is 1 if the row is counted and 0 otherwise (a NULL condition counts as false)."""
+    if counter.condition is None:
+        return "1"
+    return f"(CASE WHEN {counter.condition.format(row=row)} THEN 1 ELSE 0 END)"
+
+
+def counter_tables() -> Tuple[str, ...]:
+    """Source tables of the counters, in definition order."""
+    return tuple(dict.fromkeys(counter.table for counter in STATS_COUNTERS.values()))
+
+
+def count_query(name: str) -> str:
+    """SELECT that computes a counter from its source table."""
+    counter = STATS_COUNTERS[name]
+    if counter.condition is None:
+        return f"SELECT COUNT(*) FROM {counter.table}"
+    return f"SELECT COUNT(*) FROM {counter.table} WHERE {counter.condition.format(row=counter.table)}"
+
+
+def create_stats_counters(cursor):
+    """Create ``stats_counters`` and its triggers, then fill it from the current data."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+
+    for table in counter_tables():
+        counters = {name: counter for name, counter in STATS_COUNTERS.items() if counter.table == table}
+        on_insert = ''.join(
+            f"UPDATE stats_counters SET value = value + {_counted(counter, 'NEW')} WHERE name = '{name}';"
+            for name, counter in counters.items()
+        )
+        on_delete = ''.join(
+            f"UPDATE stats_counters SET value = value - {_counted(counter, 'OLD')} WHERE name = '{name}';"
+            for name, counter in counters.items()
+        )
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ai AFTER INSERT ON {table} BEGIN {on_insert} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ad AFTER DELETE ON {table} BEGIN {on_delete} END")
+
+        conditional = {name: counter for name, counter in counters.items() if counter.condition is not None}
+        if conditional:
+            columns = ', '.join(dict.fromkeys(column for counter in conditional.values() for column in counter.columns))
+            on_update = ''.join(
+                f"UPDATE stats_counters SET value = value + {_counted(counter, 'NEW')} - {_counted(counter, 'OLD')} "
+                f"WHERE name = '{name}';"
+                for name, counter in conditional.items()
+            )
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_stats_au AFTER UPDATE OF {columns} ON {table} "
+                           f"BEGIN {on_update} END")
+
+    rebuild_stats_counters(cursor)
+
+
+def compute_stats_counters(cursor) -> Dict[str, int]:
+    """Every counter's value, counted from the source tables."""
+    values = {}
+    for name in STATS_COUNTERS:
+        cursor.execute(count_query(name))
+        values[name] = cursor.fetchone()[0]
+    return values
+
+
+def rebuild_stats_counters(cursor) -> Dict[str, int]:
+    """
+    Recompute every counter from the source tables and store the results.
+
+    Run it inside a transaction so no write lands between counting and storing.
+
+    Returns:
+        The stored values.
+    """
+    values = compute_stats_counters(cursor)
+    cursor.executemany("INSERT OR REPLACE INTO stats_counters (name, value) VALUES (?, ?)", values.items())
+    return values
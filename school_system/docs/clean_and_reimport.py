@@ -40,10 +40,8 @@ def clean_and_reimport():
         # Reimport students from Excel
         print("\nReimporting students from Excel...")
         student_service = StudentService()
-        students = student_service.import_students_from_excel("students_excel.xlsx")
-        print(f"Imported {len(students)} students:")
-        for student in students:
-            print(f"  {student.student_id} - {student.name} (admission: {student.admission_number})")
+        imported = student_service.import_students_from_excel("students_excel.xlsx")
+        print(f"Imported {imported} students")
         
         # Verify the data is consistent
         print("\nVerifying data consistency:")
@@ -54,23 +52,23 @@ def clean_and_reimport():
         
         # Test ream operations with the new clean data
         print("\nTesting ream operations with clean data:")
-        if students:
-            test_student = students[0]
-            print(f"Testing with student: {test_student.student_id} - {test_student.name}")
+        if verified_students:
+            test_student_id, _, test_student_name = verified_students[0]
+            print(f"Testing with student: {test_student_id} - {test_student_name}")
             
             # Test adding reams
-            print(f"Adding 5 reams to student {test_student.student_id}")
-            entry = student_service.add_reams_to_student(test_student.student_id, 5, "Test")
+            print(f"Adding 5 reams to student {test_student_id}")
+            entry = student_service.add_reams_to_student(test_student_id, 5, "Test")
             print(f"SUCCESS: Added reams, entry ID: {entry.id}")
             
             # Test deducting reams
-            print(f"Deducting 2 reams from student {test_student.student_id}")
-            entry = student_service.deduct_reams_from_student(test_student.student_id, 2, "Test")
+            print(f"Deducting 2 reams from student {test_student_id}")
+            entry = student_service.deduct_reams_from_student(test_student_id, 2, "Test")
             print(f"SUCCESS: Deducted reams, entry ID: {entry.id}")
             
             # Test balance
-            balance = student_service.get_student_ream_balance(test_student.student_id)
-            print(f"Final balance for student {test_student.student_id}: {balance}")
+            balance = student_service.get_student_ream_balance(test_student_id)
+            print(f"Final balance for student {test_student_id}: {balance}")
         
         print("\nClean and reimport completed successfully!")
         return True
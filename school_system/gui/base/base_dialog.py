@@ -72,6 +72,8 @@ the same set of pre-configured, themed widgets, reducing code duplication and
 ensuring visual consistency throughout the application.
 """
 
+from typing import Any, Callable, Optional, Sequence
+
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
     QDialogButtonBox, QLabel, QFrame
@@ -880,18 +882,24 @@ class BaseDialog(QDialog):
         self.widget_created.emit(f"{placeholder}_advanced", search_box)
         return search_box
     
-    def create_memoized_search_box(self, placeholder: str = "Search...", cache_size: int = 100) -> MemoizedSearchBox:
+    def create_memoized_search_box(self, placeholder: str = "Search...", cache_size: int = 100,
+                                   search_func: Optional[Callable[[str], Any]] = None,
+                                   tables: Sequence[str] = ()) -> MemoizedSearchBox:
         """
         Create a memoized search box with specified placeholder and cache size.
          
         Args:
             placeholder: Placeholder text for search box
             cache_size: Maximum cache size for memoization
+            search_func: Search whose results are memoized and emitted through
+                search_results_ready; None to only cache explicit search() calls
+            tables: Tables search_func reads; a cached result is reused only
+                while none of them has changed
              
         Returns:
             Configured MemoizedSearchBox instance
         """
-        search_box = MemoizedSearchBox(placeholder, self, cache_size)
+        search_box = MemoizedSearchBox(placeholder, self, cache_size, search_func=search_func, tables=tables)
         search_box.setAccessibleName(f"{placeholder} memoized search box")
         search_box.setAccessibleDescription(f"{placeholder} memoized search box in {self.windowTitle()} dialog")
         
@@ -12,7 +12,9 @@ The BaseWindow serves as the foundation for all application windows,
 ensuring visual and functional consistency throughout the application.
 """
 
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStatusBar
+from typing import Any, Callable, Optional, Sequence
+
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStatusBar, QTableView, QAbstractItemView
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QAction
 
@@ -22,7 +24,7 @@ from school_system.gui.base.widgets import (
     ModernButton, ModernInput, ModernCard,
     ModernLayout, FlexLayout,
     SearchBox, AdvancedSearchBox, MemoizedSearchBox,
-    CustomTableWidget, SortFilterProxyModel, VirtualScrollModel,
+    CustomTableWidget, SortFilterProxyModel, VirtualScrollModel, KeysetPagedModel,
     ProgressIndicator
 )
 from school_system.config.logging import logger
@@ -685,18 +687,24 @@ class BaseWindow(QMainWindow):
         """
         return AdvancedSearchBox(placeholder, self)
     
-    def create_memoized_search_box(self, placeholder: str = "Search...", cache_size: int = 100) -> MemoizedSearchBox:
+    def create_memoized_search_box(self, placeholder: str = "Search...", cache_size: int = 100,
+                                   search_func: Optional[Callable[[str], Any]] = None,
+                                   tables: Sequence[str] = ()) -> MemoizedSearchBox:
         """
         Create a memoized search box with specified placeholder and cache size.
         
         Args:
             placeholder: Placeholder text for search box
             cache_size: Maximum cache size for memoization
+            search_func: Search whose results are memoized and emitted through
+                search_results_ready; None to only cache explicit search() calls
+            tables: Tables search_func reads; a cached result is reused only
+                while none of them has changed
             
         Returns:
             Configured MemoizedSearchBox instance
         """
-        return MemoizedSearchBox(placeholder, self, cache_size)
+        return MemoizedSearchBox(placeholder, self, cache_size, search_func=search_func, tables=tables)
     
     def create_table(self, rows: int = 0, columns: int = 0) -> CustomTableWidget:
         """
@@ -715,6 +723,29 @@ class BaseWindow(QMainWindow):
             table.setColumnCount(columns)
         return table
     
+    def create_paged_table(self, model: KeysetPagedModel) -> QTableView:
+        """
+        Create a table view over a lazily paged model.
+        
+        Args:
+            model: Model that loads pages on demand as the view scrolls
+            
+        Returns:
+            Configured QTableView instance
+        """
+        table = QTableView(self)
+        table.setModel(model)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        table.setAlternatingRowColors(True)
+        table.setSortingEnabled(False)
+        table.verticalHeader().setVisible(False)
+        # Fixed row heights let the view skip measuring rows it never shows
+        table.verticalHeader().setDefaultSectionSize(30)
+        table.horizontalHeader().setStretchLastSection(True)
+        model.bind_sort_header(table.horizontalHeader())
+        return table
+    
     def create_scrollable_container(self, horizontal_scroll: bool = True, vertical_scroll: bool = True) -> ScrollableContainer:
         """
         Create a scrollable container with specified scroll options.
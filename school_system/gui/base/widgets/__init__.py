@@ -23,7 +23,7 @@ from .theme import ThemeManager
 from .state import StateManager
 from .accessibility import AccessibleWidget, AccessibleButton, AccessibleInput
 from .scrollable_container import ScrollableContainer, ScrollableCardContainer
-from .custom_table import CustomTableWidget, SortFilterProxyModel, VirtualScrollModel
+from .custom_table import CustomTableWidget, SortFilterProxyModel, VirtualScrollModel, KeysetPagedModel
 from .search_box import SearchBox, AdvancedSearchBox, MemoizedSearchBox
 from .status_bar import ModernStatusBar, ProgressIndicator
 
@@ -43,6 +43,7 @@ __all__ = [
     "CustomTableWidget",
     "SortFilterProxyModel",
     "VirtualScrollModel",
+    "KeysetPagedModel",
     "SearchBox",
     "AdvancedSearchBox",
     "MemoizedSearchBox",
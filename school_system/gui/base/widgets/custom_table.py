@@ -7,7 +7,7 @@ An interactive data table with sorting, filtering, and advanced UI features.
 from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView, QMenu, QVBoxLayout, QWidget, QLineEdit, QComboBox, QAbstractItemView
 from PyQt6.QtCore import Qt, QSortFilterProxyModel, QModelIndex, pyqtSignal, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QAction
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 
 class VirtualScrollModel(QAbstractTableModel):
@@ -70,6 +70,152 @@ class VirtualScrollModel(QAbstractTableModel):
         pass
 
 
+class KeysetPagedModel(VirtualScrollModel):
+    """
+    A lazily paged model backed by keyset-paginated queries.
+    
+    Features:
+        - Fetches one page at a time as the view scrolls (canFetchMore/fetchMore)
+        - Formats only the rows the view actually asks for
+        - Delegates sorting and filtering to the page fetcher (i.e. to SQL)
+    
+    The page fetcher is called as ``page_fetcher(after, limit, sort_key, descending,
+    **filters)`` and must return ``(records, next_after)``, where ``next_after``
+    is None once the last page has been returned. ``filters`` comes from the
+    optional ``filter_provider``, read once per result set (on the first page
+    after a reset) so every page of it uses the same filters.
+    """
+    
+    fetch_failed = pyqtSignal(str)
+    
+    def __init__(self, page_fetcher: Callable[..., Tuple[List[Any], Any]],
+                 row_formatter: Callable[[Any], List[Any]], headers: List[str], page_size: int = 200,
+                 sort_keys: Optional[Dict[int, str]] = None,
+                 role_provider: Optional[Callable[[Any, int, int], Any]] = None,
+                 filter_provider: Optional[Callable[[], Dict[str, Any]]] = None,
+                 parent: Optional[QWidget] = None):
+        super().__init__(self._format_row, 0, len(headers), headers, parent)
+        self._page_fetcher = page_fetcher
+        self._row_formatter = row_formatter
+        self._role_provider = role_provider
+        self._filter_provider = filter_provider
+        self._page_size = page_size
+        self._sort_keys = sort_keys or {}
+        self._sort_key = None
+        self._descending = False
+        self._filters = None
+        self._records = []
+        self._after = None
+        self._exhausted = False
+    
+    def _format_row(self, row: int, col: int) -> List[Any]:
+        """Data provider for the base model: format a record on first display."""
+        return self._row_formatter(self._records[row])
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """Return data for the given index."""
+        if not index.isValid() or index.row() >= len(self._records):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return super().data(index, role)
+        if self._role_provider is not None:
+            return self._role_provider(self._records[index.row()], index.column(), role)
+        return None
+    
+    def record(self, row: int) -> Any:
+        """Return the underlying record for a row, or None if it is out of range."""
+        if 0 <= row < len(self._records):
+            return self._records[row]
+        return None
+    
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Return whether another page is available."""
+        return not parent.isValid() and not self._exhausted
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        """Fetch the next page and append it to the model."""
+        if not self.canFetchMore(parent):
+            return
+        try:
+            if self._filters is None:
+                self._filters = self._filter_provider() if self._filter_provider else {}
+            records, next_after = self._page_fetcher(
+                self._after, self._page_size, self._sort_key, self._descending, **self._filters
+            )
+        except Exception as e:
+            # Exceptions must not escape a Qt virtual; stop paging and report instead
+            self._exhausted = True
+            self.fetch_failed.emit(str(e))
+            return
+        
+        self._after = next_after
+        self._exhausted = next_after is None
+        if records:
+            first = len(self._records)
+            self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+            self._records.extend(records)
+            self._row_count = len(self._records)
+            self.endInsertRows()
+    
+    def refresh(self):
+        """Drop all loaded pages and load the first page again (e.g. after a filter change)."""
+        self.beginResetModel()
+        self._records = []
+        self._visible_rows = {}
+        self._row_count = 0
+        self._after = None
+        self._exhausted = False
+        # Read the filters again for the new result set
+        self._filters = None
+        self.endResetModel()
+        self.fetchMore()
+    
+    @property
+    def sort_key(self) -> Optional[str]:
+        """The active SQL sort key, or None for the fetcher's default order."""
+        return self._sort_key
+    
+    @property
+    def descending(self) -> bool:
+        """Whether the active sort is descending."""
+        return self._descending
+    
+    def set_sort(self, sort_key: Optional[str], descending: bool = False):
+        """Set the SQL sort key (None for the fetcher's default order) and reload."""
+        self._sort_key = sort_key
+        self._descending = descending
+        self.refresh()
+    
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Sort by a header column, if the column has a SQL sort key."""
+        if column in self._sort_keys:
+            self.set_sort(self._sort_keys[column], order == Qt.SortOrder.DescendingOrder)
+    
+    def bind_sort_header(self, header: QHeaderView):
+        """
+        Sort in SQL when a header section is clicked.
+        
+        Clicking a column without a sort key puts the indicator back on the
+        active sort column, so the header never shows a sort that is not applied.
+        """
+        header.setSortIndicatorShown(True)
+        header.setSectionsClickable(True)
+        header.sortIndicatorChanged.connect(
+            lambda column, order: self._on_header_sort(header, column, order)
+        )
+    
+    def _on_header_sort(self, header: QHeaderView, column: int, order: Qt.SortOrder):
+        """Apply a header click, or restore the indicator if the column cannot be sorted."""
+        if column in self._sort_keys:
+            self.sort(column, order)
+            return
+        active = next((col for col, key in self._sort_keys.items() if key == self._sort_key), -1)
+        header.blockSignals(True)
+        header.setSortIndicator(active, Qt.SortOrder.DescendingOrder if self._descending
+                                else Qt.SortOrder.AscendingOrder)
+        header.blockSignals(False)
+
+
 class CustomTableWidget(QTableWidget):
     """
     An interactive data table with sorting, filtering, and advanced UI features.
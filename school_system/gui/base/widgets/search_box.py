@@ -7,11 +7,12 @@ A real-time search widget with debouncing for performance optimization.
 from PyQt6.QtWidgets import QLineEdit, QHBoxLayout, QWidget, QPushButton
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Sequence, Tuple
 from functools import lru_cache
 import os
 
 # Import settings for centralized path resolution
+from ....config.logging import logger
 from ....config.settings import get_settings
 
 
@@ -28,6 +29,11 @@ class SearchBox(QWidget):
     
     # Signal emitted when search text changes (after debounce)
     search_text_changed = pyqtSignal(str)
+
+    # Debounce delays in milliseconds. Searches served by an FTS index are
+    # cheap enough to run after a shorter pause.
+    DEFAULT_DEBOUNCE_MS = 300
+    INDEXED_DEBOUNCE_MS = 100
     
     def __init__(self, placeholder_text: str = "Search...", parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -102,7 +108,7 @@ class SearchBox(QWidget):
         # Debounce timer
         self._debounce_timer = QTimer()
         self._debounce_timer.setSingleShot(True)
-        self._debounce_timer.setInterval(300)  # 300ms debounce delay
+        self._debounce_timer.setInterval(self.DEFAULT_DEBOUNCE_MS)
         self._debounce_timer.timeout.connect(self._emit_search_text)
         
         # Connect signals
@@ -174,36 +180,93 @@ class MemoizedSearchBox(SearchBox):
         - Memoization of search results
         - Configurable cache size
         - Automatic cache invalidation
+    
+    With a search function, results are emitted through search_results_ready
+    and cached per query. If the tables the search reads are given, each
+    entry records their versions and is only reused while none of them has
+    changed; without change tracking such results are not cached at all.
     """
     
-    def __init__(self, placeholder_text: str = "Search...", parent: Optional[QWidget] = None, cache_size: int = 100):
+    # Signal emitted with (query, results) when a search function is set
+    search_results_ready = pyqtSignal(str, object)
+    # Signal emitted with (query, error message) when the search function raises
+    search_failed = pyqtSignal(str, str)
+    
+    def __init__(self, placeholder_text: str = "Search...", parent: Optional[QWidget] = None, cache_size: int = 100,
+                 search_func: Optional[Callable[[str], Any]] = None, tables: Sequence[str] = (),
+                 change_tracker=None):
         super().__init__(placeholder_text, parent)
         self._cache_size = cache_size
-        self._search_cache: Dict[str, Any] = {}
-        
-        # Override the search text changed signal to use memoization
-        original_signal = self.search_text_changed
-        self.search_text_changed = pyqtSignal(str)
-        
-        def memoized_search(text: str):
-            # Check cache first
-            if text in self._search_cache:
-                print(f"Cache hit for search: {text}")
-                original_signal.emit(self._search_cache[text])
-            else:
-                print(f"Cache miss for search: {text}")
-                # Store result in cache
-                self._search_cache[text] = text
-                original_signal.emit(text)
-                
-                # Limit cache size
-                if len(self._search_cache) > self._cache_size:
-                    # Remove oldest entry (simple FIFO cache)
-                    oldest_key = next(iter(self._search_cache))
-                    del self._search_cache[oldest_key]
-        
-        # Connect the memoized search function
-        self._debounce_timer.timeout.connect(lambda: memoized_search(self.search_input.text()))
+        self._change_tracker = change_tracker
+        # query -> (results, versions of the tables they were read from)
+        self._search_cache: Dict[str, Tuple[Any, Optional[Dict[str, int]]]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.set_search_function(search_func, tables)
+    
+    def set_search_function(self, search_func: Optional[Callable[[str], Any]], tables: Sequence[str] = ()):
+        """
+        Set the search function whose results are memoized.
+        
+        Args:
+            search_func: Called with the query text; returns the results
+            tables: Tables the search reads, for version-based invalidation
+        """
+        self._search_func = search_func
+        self._tables = tuple(tables)
+        if self._tables and self._change_tracker is None:
+            # Imported here so plain search boxes do not pull in the database layer
+            from ....database.connection import db_connection
+            self._change_tracker = db_connection.change_tracker
+        self.clear_cache()
+    
+    def _emit_search_text(self):
+        """Emit the search text and, with a search function, the memoized results."""
+        super()._emit_search_text()
+        if self._search_func is not None:
+            text = self.search_input.text()
+            try:
+                results = self.search(text)
+            except Exception as e:
+                logger.error(f"Search failed for '{text}': {e}")
+                self.search_failed.emit(text, str(e))
+                return
+            self.search_results_ready.emit(text, results)
+    
+    def search(self, text: str) -> Any:
+        """
+        Run the search function for text, reusing a current cached result.
+        
+        Args:
+            text: Query text
+            
+        Returns:
+            The search results
+        """
+        cached = self._search_cache.get(text)
+        if cached is not None and self._is_current(cached[1]):
+            self.cache_hits += 1
+            return cached[0]
+        
+        self.cache_misses += 1
+        versions = self._change_tracker.versions(self._tables) if self._tables else None
+        results = self._search_func(text)
+        self._search_cache.pop(text, None)
+        if versions is not None or not self._tables:
+            self._search_cache[text] = (results, versions)
+            
+            # Limit cache size
+            if len(self._search_cache) > self._cache_size:
+                # Remove oldest entry (simple FIFO cache)
+                oldest_key = next(iter(self._search_cache))
+                del self._search_cache[oldest_key]
+        return results
+    
+    def _is_current(self, versions: Optional[Dict[str, int]]) -> bool:
+        """Whether a cached result's tables are unchanged; always true without tables."""
+        if not self._tables:
+            return True
+        return self._change_tracker.is_current(versions)
     
     def set_cache_size(self, size: int):
         """
@@ -3,7 +3,7 @@ Dashboard Data Manager
 
 A comprehensive data management system for the main window dashboard that provides:
 - Real-time data fetching with background processing
-- Intelligent caching with TTL
+- Intelligent caching, invalidated by table version or TTL
 - Robust error handling and recovery
 - Performance monitoring
 - Modular architecture for easy extension
@@ -11,17 +11,19 @@ A comprehensive data management system for the main window dashboard that provid
 
 import time
 import threading
-from typing import Dict, Any, Optional, Callable, List
+from typing import Dict, Any, Optional, Callable, List, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
 
-from PyQt6.QtCore import QThread, pyqtSignal, QObject, QTimer
+from PyQt6.QtCore import QRunnable, QThreadPool, pyqtSignal, QObject, QTimer
 from PyQt6.QtWidgets import QApplication
 
 from school_system.config.logging import logger
 from school_system.core.exceptions import DatabaseException
+from school_system.database.connection import db_connection
+from school_system.database.stats_counters import counter_tables
 
 
 class DataState(Enum):
@@ -35,82 +37,108 @@ class DataState(Enum):
 
 @dataclass
 class CacheEntry:
-    """Cache entry with TTL and metadata."""
+    """
+    Cache entry with TTL and metadata.
+
+    An entry that recorded the versions of the tables it was built from is
+    dropped by the manager when one of them changes, so its TTL no longer
+    applies; max_age_seconds still bounds data that goes out of date with
+    the clock (e.g. "borrowed today").
+    """
     data: Any
     timestamp: datetime
     ttl_seconds: int
     state: DataState = DataState.READY
     error_message: Optional[str] = None
     last_access: datetime = field(default_factory=datetime.now)
+    table_versions: Optional[Dict[str, int]] = None
+    max_age_seconds: Optional[int] = None
+
+    def _lifetime(self) -> Optional[int]:
+        """Seconds the entry may be served, or None while table versions keep it current."""
+        return self.max_age_seconds if self.table_versions is not None else self.ttl_seconds
 
     def is_expired(self) -> bool:
         """Check if cache entry has expired."""
-        return datetime.now() - self.timestamp > timedelta(seconds=self.ttl_seconds)
+        lifetime = self._lifetime()
+        return lifetime is not None and datetime.now() - self.timestamp > timedelta(seconds=lifetime)
 
     def is_stale(self) -> bool:
-        """Check if cache entry is stale (older than half TTL)."""
-        return datetime.now() - self.timestamp > timedelta(seconds=self.ttl_seconds // 2)
+        """Check if cache entry is stale (older than half its lifetime)."""
+        lifetime = self._lifetime()
+        return lifetime is not None and datetime.now() - self.timestamp > timedelta(seconds=lifetime // 2)
 
     def update_access(self):
         """Update last access time."""
         self.last_access = datetime.now()
 
 
-class DataFetchWorker(QThread):
-    """Background worker for fetching dashboard data."""
+class FetchSignals(QObject):
+    """Signals for DataFetchWorker, which as a QRunnable cannot emit them itself."""
 
-    # Signals
-    data_ready = pyqtSignal(str, object, DataState)  # data_key, data, state
-    error_occurred = pyqtSignal(str, str)  # data_key, error_message
-    progress_update = pyqtSignal(str, int)  # data_key, progress_percentage
+    data_ready = pyqtSignal(str, object, float)  # fetch_id, data, elapsed_ms
+    error_occurred = pyqtSignal(str, str, float)  # fetch_id, error_message, elapsed_ms
 
-    def __init__(self, data_key: str, fetch_function: Callable, parent=None):
-        super().__init__(parent)
-        self.data_key = data_key
+
+class DataFetchWorker(QRunnable):
+    """Background fetch run on the data manager's thread pool."""
+
+    def __init__(self, fetch_id: str, fetch_function: Callable):
+        super().__init__()
+        self.fetch_id = fetch_id
         self.fetch_function = fetch_function
         self.cancelled = False
+        self.signals = FetchSignals()
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        # Versions of the tables the fetch reads, taken when it was queued
+        self.table_versions: Optional[Dict[str, int]] = None
+        # The manager holds the reference until the result has been delivered
+        self.setAutoDelete(False)
 
     def cancel(self):
         """Cancel the data fetching operation."""
         self.cancelled = True
 
     def run(self):
-        """Execute the data fetching in background thread."""
+        """Execute the data fetching in a pool thread."""
+        self.started_at = time.perf_counter()
+        if self.cancelled:
+            return
         try:
-            if self.cancelled:
-                return
-
-            # Emit progress update
-            self.progress_update.emit(self.data_key, 10)
-
-            # Execute the fetch function
-            start_time = time.time()
-            result = self.fetch_function()
-
-            if self.cancelled:
-                return
-
-            self.progress_update.emit(self.data_key, 90)
-
-            execution_time = time.time() - start_time
-
-            # Log performance
-            logger.debug(f"Data fetch for '{self.data_key}' completed in {execution_time:.2f}s")
-
-            # Emit success signal
-            self.data_ready.emit(self.data_key, result, DataState.READY)
-
+            # Execute the fetch function on a query-only pooled connection
+            with db_connection.reader_session():
+                result = self.fetch_function()
+            elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+            logger.debug(f"Data fetch for '{self.fetch_id}' completed in {elapsed_ms:.0f} ms")
+            if not self.cancelled:
+                self.signals.data_ready.emit(self.fetch_id, result, elapsed_ms)
         except Exception as e:
-            logger.error(f"Error fetching data for '{self.data_key}': {str(e)}")
-            self.data_error.emit(self.data_key, str(e))
+            logger.error(f"Error fetching data for '{self.fetch_id}': {str(e)}")
+            if not self.cancelled:
+                self.signals.error_occurred.emit(self.fetch_id, str(e),
+                                                 (time.perf_counter() - self.started_at) * 1000)
+        finally:
+            db_connection.release_thread_connection()
 
 
 class DashboardDataManager(QObject):
     """
     Comprehensive data manager for dashboard operations.
 
+    Fetches run on a bounded QThreadPool. Requests for a fetch that is
+    already in flight join it instead of starting another, and keys derived
+    from the same data (e.g. several counts from one analytics report) are
+    registered as projections of one shared source, fetched once per refresh.
+
+    Keys and sources declare the tables they read. Their cache entries record
+    those tables' versions and are dropped, and refetched if on screen, as
+    soon as the change tracker reports one of the tables changed, whether by
+    this application or another desk sharing the database. TTLs only apply
+    when the database has no change tracking.
+
     Features:
-    - Background data fetching with threading
+    - Background data fetching on a bounded thread pool
     - Intelligent caching with configurable TTL
     - Automatic refresh and invalidation
     - Error recovery and retry logic
@@ -134,12 +162,18 @@ class DashboardDataManager(QObject):
         # Cache storage
         self._cache: Dict[str, CacheEntry] = {}
 
-        # Active workers
+        # Shared sources - maps source names to fetch functions; data keys project from them
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._source_cache: Dict[str, CacheEntry] = {}
+
+        # In-flight fetches by fetch id (a source name, or the data key itself)
+        # and the data keys waiting on each of them
         self._active_workers: Dict[str, DataFetchWorker] = {}
+        self._waiting: Dict[str, Set[str]] = {}
 
         # Configuration
         self._default_ttl = 300  # 5 minutes default
-        self._max_concurrent_workers = 8
+        self._max_concurrent_workers = 4  # below the reader pool size, so fetches never wait on a connection
         self._retry_attempts = 3
         self._retry_delay = 1.0  # seconds
 
@@ -148,11 +182,26 @@ class DashboardDataManager(QObject):
         self._auto_refresh_timer.timeout.connect(self._auto_refresh_tick)
         self._auto_refresh_intervals: Dict[str, int] = {}  # data_key -> interval_seconds
 
+        # Fetches beyond the cap queue in the pool
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(self._max_concurrent_workers)
+
+        # Table change polling; PRAGMA data_version makes an idle poll a single cheap read
+        self._change_tracker = db_connection.change_tracker
+        self._change_tracker.add_listener(self._on_tables_changed)
+        self._change_poll_interval_ms = 2000
+        self._change_poll_timer = QTimer(self)
+        self._change_poll_timer.timeout.connect(self._change_tracker.poll)
+        self._change_poll_timer.start(self._change_poll_interval_ms)
+
         # Performance monitoring
+        self._fetch_timings: Dict[str, Dict[str, float]] = {}  # fetch_id -> timing counters
         self._performance_stats = {
             'fetch_count': 0,
+            'coalesced_requests': 0,
             'cache_hits': 0,
             'cache_misses': 0,
+            'change_invalidations': 0,
             'error_count': 0,
             'avg_fetch_time': 0.0
         }
@@ -175,91 +224,55 @@ class DashboardDataManager(QObject):
             service_name: Name of the service (e.g., 'student_service')
             service_instance: The service instance
         """
-        if service_name == 'student_service':
-            self._register_student_service(service_instance)
-        elif service_name == 'teacher_service':
-            self._register_teacher_service(service_instance)
-        elif service_name == 'book_service':
-            self._register_book_service(service_instance)
-        elif service_name == 'report_service':
+        if service_name == 'report_service':
             self._register_report_service(service_instance)
-        elif service_name == 'furniture_service':
-            self._register_furniture_service(service_instance)
+        elif service_name == 'stats_service':
+            self._register_stats_service(service_instance)
 
         logger.info(f"Registered service: {service_name}")
 
-    def _register_student_service(self, service):
-        """Register student service data fetchers."""
-        self._data_registry.update({
-            'active_users_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: self._get_active_users_count(service), "active users count"
-                ),
-                'ttl': 300,  # 5 minutes
-                'description': 'Total active users (students + teachers)'
-            },
-            'total_students_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: len(service.get_all_students()), "total students"
-                ),
-                'ttl': 600,  # 10 minutes
-                'description': 'Total number of students'
-            }
-        })
-
-    def _register_teacher_service(self, service):
-        """Register teacher service data fetchers."""
-        self._data_registry.update({
-            'total_teachers_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: len(service.get_all_teachers()), "total teachers"
-                ),
-                'ttl': 600,  # 10 minutes
-                'description': 'Total number of teachers'
-            }
-        })
+    def _register_source(self, source: str, fetch_func: Callable, ttl: int, description: str,
+                         tables: Tuple[str, ...] = (), max_age: Optional[int] = None):
+        """
+        Register a shared source that several data keys project from.
 
-    def _register_book_service(self, service):
-        """Register book service data fetchers."""
-        self._data_registry.update({
-            'total_books_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: len(service.get_all_books()), "total books"
-                ),
-                'ttl': 300,  # 5 minutes
-                'description': 'Total number of books'
-            },
-            'available_books_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: self._get_available_books_count(service), "available books"
-                ),
-                'ttl': 180,  # 3 minutes
-                'description': 'Number of available books'
-            }
-        })
+        Args:
+            source: Source name, used as the fetch id.
+            fetch_func: Fetches the source data in a pool thread.
+            ttl: Seconds a fetched source may serve projections without refetching;
+                at most the shortest TTL of the keys using it.
+            description: What the source holds.
+            tables: Tables the source reads; a change to any of them invalidates it.
+            max_age: Seconds a version-tracked source may be served, for data that
+                also depends on the date; None for no limit.
+        """
+        self._sources[source] = {
+            'fetch_func': fetch_func, 'ttl': ttl, 'description': description,
+            'tables': tables, 'max_age': max_age
+        }
 
     def _register_report_service(self, service):
         """Register report service data fetchers."""
+        self._register_source(
+            'borrowing_analytics',
+            lambda: self._safe_fetch(service.get_borrowing_analytics_report, "borrowing analytics"),
+            ttl=60, description='Borrowing analytics report',
+            tables=('books', 'students', 'borrowed_books_student'), max_age=600
+        )
         self._data_registry.update({
             'books_borrowed_today': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: self._get_books_borrowed_today(service), "books borrowed today"
-                ),
+                'source': 'borrowing_analytics',
+                'project': self._get_books_borrowed_today,
                 'ttl': 60,  # 1 minute
                 'description': 'Books borrowed today'
             },
-            'total_borrowed_books_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: self._get_total_borrowed_books(service), "total borrowed books"
-                ),
-                'ttl': 180,  # 3 minutes
-                'description': 'Total currently borrowed books'
-            },
             'due_soon_count': {
                 'fetch_func': lambda: self._safe_fetch(
                     lambda: self._get_due_soon_count(service), "due soon books"
                 ),
                 'ttl': 300,  # 5 minutes
+                'tables': ('books', 'students', 'borrowed_books_student'),
+                'max_age': 3600,  # due dates move with the clock
                 'description': 'Books due soon'
             },
             'recent_activities': {
@@ -267,27 +280,34 @@ class DashboardDataManager(QObject):
                     lambda: self._get_recent_activities(service), "recent activities"
                 ),
                 'ttl': 120,  # 2 minutes
+                'tables': ('books', 'students', 'borrowed_books_student'),
                 'description': 'Recent system activities'
             }
         })
 
-    def _register_furniture_service(self, service):
-        """Register furniture service data fetchers."""
+    def _register_stats_service(self, service):
+        """Register counts read from the trigger-maintained stats counters."""
+        self._register_source(
+            'stats_counters',
+            lambda: self._safe_fetch(service.get_counters, "stats counters"),
+            ttl=60, description='Summary counters by name', tables=counter_tables()
+        )
+        projections = {
+            'active_users_count': (service.count_active_users, 300, 'Total active users (students + teachers)'),
+            'total_students_count': (lambda counters: counters['students_total'], 600, 'Total number of students'),
+            'total_teachers_count': (lambda counters: counters['teachers_total'], 600, 'Total number of teachers'),
+            'total_books_count': (lambda counters: counters['books_total'], 300, 'Total number of books'),
+            'available_books_count': (lambda counters: counters['books_available'], 180,
+                                      'Number of available books'),
+            'total_borrowed_books_count': (service.count_borrowed, 180, 'Total currently borrowed books'),
+            'available_chairs_count': (lambda counters: counters['chairs_available'], 600,
+                                       'Available chairs count'),
+            'available_lockers_count': (lambda counters: counters['lockers_available'], 600,
+                                        'Available lockers count'),
+        }
         self._data_registry.update({
-            'available_chairs_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: self._get_available_furniture_count(service, 'chairs'), "available chairs"
-                ),
-                'ttl': 600,  # 10 minutes
-                'description': 'Available chairs count'
-            },
-            'available_lockers_count': {
-                'fetch_func': lambda: self._safe_fetch(
-                    lambda: self._get_available_furniture_count(service, 'lockers'), "available lockers"
-                ),
-                'ttl': 600,  # 10 minutes
-                'description': 'Available lockers count'
-            }
+            data_key: {'source': 'stats_counters', 'project': project, 'ttl': ttl, 'description': description}
+            for data_key, (project, ttl, description) in projections.items()
         })
 
     def _safe_fetch(self, fetch_func: Callable, data_name: str):
@@ -300,59 +320,9 @@ class DashboardDataManager(QObject):
             logger.error(f"Error fetching {data_name}: {str(e)}")
             raise
 
-    def _get_active_users_count(self, student_service, teacher_service=None) -> int:
-        """Get total active users count."""
-        total = 0
-        if student_service:
-            total += len(student_service.get_all_students())
-        if teacher_service:
-            total += len(teacher_service.get_all_teachers())
-        return total
-
-    def _get_available_books_count(self, book_service) -> int:
-        """Get count of available books."""
-        if not book_service:
-            return 0
-        try:
-            books = book_service.get_all_books()
-            available_count = 0
-
-            for book in books:
-                # Check various ways the available status might be stored
-                available = getattr(book, 'available', None)
-
-                # Debug: log the first few books to understand the data structure
-                if available_count < 3:  # Log first 3 books
-                    logger.debug(f"Book debug: available={available} (type: {type(available)}), id={getattr(book, 'id', 'N/A')}")
-
-                if available is None:
-                    # If available field is missing, assume available
-                    available = 1
-
-                # Convert to int if it's a string
-                if isinstance(available, str):
-                    available = int(available) if available.isdigit() else 1
-
-                # Also check if it's a boolean
-                if isinstance(available, bool):
-                    available = 1 if available else 0
-
-                if available == 1:
-                    available_count += 1
-
-            logger.debug(f"Counted {available_count} available books out of {len(books)} total books")
-            return available_count
-
-        except Exception as e:
-            logger.error(f"Error counting available books: {str(e)}")
-            return 0
-
-    def _get_books_borrowed_today(self, report_service) -> int:
-        """Get books borrowed today."""
-        if not report_service:
-            return 0
+    def _get_books_borrowed_today(self, analytics: Dict) -> int:
+        """Project books borrowed today from the borrowing analytics report."""
         try:
-            analytics = report_service.get_borrowing_analytics_report()
             borrowing_summary = analytics.get('borrowing_summary_by_subject_stream_form', [])
             # Count total borrowings from the summary
             total_borrowings = sum(item.get('total_borrowings', 0) for item in borrowing_summary)
@@ -360,16 +330,6 @@ class DashboardDataManager(QObject):
         except:
             return 0
 
-    def _get_total_borrowed_books(self, report_service) -> int:
-        """Get total borrowed books count."""
-        if not report_service:
-            return 0
-        try:
-            analytics = report_service.get_borrowing_analytics_report()
-            return analytics.get('inventory_summary', {}).get('borrowed_books', 0)
-        except:
-            return 0
-
     def _get_due_soon_count(self, report_service) -> int:
         """Get books due soon count."""
         if not report_service:
@@ -386,8 +346,8 @@ class DashboardDataManager(QObject):
         activities = []
         try:
             # Get recent borrowing activities
-            borrowed_books = report_service.get_borrowed_books_report()
-            recent_borrowings = borrowed_books[:5]  # Last 5 borrowings
+            # Report streams newest loans first, so only five rows are materialized
+            recent_borrowings = report_service.get_borrowed_books_report(limit=5)
 
             for borrowing in recent_borrowings:
                 book_title = borrowing.get('title', 'Unknown Book')
@@ -419,22 +379,6 @@ class DashboardDataManager(QObject):
 
         return activities[:5]
 
-    def _get_available_furniture_count(self, furniture_service, furniture_type: str) -> int:
-        """Get available furniture count."""
-        if not furniture_service:
-            return 0
-        try:
-            if furniture_type == 'chairs':
-                items = furniture_service.get_all_chairs()
-            elif furniture_type == 'lockers':
-                items = furniture_service.get_all_lockers()
-            else:
-                return 0
-
-            return sum(1 for item in items if getattr(item, 'assigned', 0) == 0)
-        except:
-            return 0
-
     def get_data(self, data_key: str, force_refresh: bool = False) -> Optional[Any]:
         """
         Get data for the specified key, using cache if available.
@@ -451,6 +395,9 @@ class DashboardDataManager(QObject):
             logger.warning(f"Data key '{data_key}' not registered")
             return None
 
+        # Drops entries whose tables changed since the last poll before they can be served
+        self._change_tracker.poll()
+
         # Check cache first (unless force refresh)
         if not force_refresh and data_key in self._cache:
             cache_entry = self._cache[data_key]
@@ -465,11 +412,16 @@ class DashboardDataManager(QObject):
 
         # Cache miss or expired - fetch fresh data
         self._performance_stats['cache_misses'] += 1
-        self._fetch_data_async(data_key)
+        self._fetch_data_async(data_key, force_refresh)
 
-        # Return stale data if available while fetching
         if data_key in self._cache:
             cache_entry = self._cache[data_key]
+            # Projected straight from a fresh shared source, without a fetch
+            if not self.is_loading(data_key) and cache_entry.state == DataState.READY \
+                    and not cache_entry.is_expired():
+                return cache_entry.data
+
+            # Return stale data if available while fetching
             if cache_entry.state == DataState.READY and cache_entry.is_stale():
                 cache_entry.state = DataState.STALE
                 logger.debug(f"Returning stale data for '{data_key}' while fetching fresh")
@@ -477,59 +429,185 @@ class DashboardDataManager(QObject):
 
         return None
 
-    def _fetch_data_async(self, data_key: str):
-        """Fetch data asynchronously in background thread."""
-        if data_key in self._active_workers:
-            logger.debug(f"Worker already active for '{data_key}', skipping")
-            return
-
-        # Check concurrent worker limit
-        if len(self._active_workers) >= self._max_concurrent_workers:
-            logger.warning("Maximum concurrent workers reached, queuing request")
-            # Could implement queuing here
-            return
+    def _fetch_data_async(self, data_key: str, force_refresh: bool = False):
+        """
+        Fetch data for a key on the thread pool.
 
+        A key joins the in-flight fetch of its source (or of itself) instead
+        of starting another one. A key whose source was fetched within the
+        source TTL is projected from it at once, unless force_refresh is set.
+        """
         registry_entry = self._data_registry[data_key]
-        fetch_func = registry_entry['fetch_func']
+        source = registry_entry.get('source')
+        fetch_id = source or data_key
+
+        if source and not force_refresh and fetch_id not in self._active_workers:
+            source_entry = self._source_cache.get(source)
+            if source_entry and not source_entry.is_expired():
+                self._project(data_key, source_entry.data, finished=False,
+                              table_versions=source_entry.table_versions)
+                return
+
+        waiting = self._waiting.setdefault(fetch_id, set())
+        if data_key not in waiting:
+            waiting.add(data_key)
+            self.loading_started.emit(data_key)
+
+        if fetch_id in self._active_workers:
+            self._performance_stats['coalesced_requests'] += 1
+            self._timing_entry(fetch_id)['coalesced'] += 1
+            logger.debug(f"Joined in-flight fetch '{fetch_id}' for '{data_key}'")
+            return
 
-        # Create and start worker
-        worker = DataFetchWorker(data_key, fetch_func)
-        worker.data_ready.connect(self._on_data_ready)
-        worker.error_occurred.connect(self._on_data_error)
-        worker.progress_update.connect(self._on_progress_update)
-        worker.finished.connect(lambda: self._cleanup_worker(data_key))
+        fetch_func = self._sources[source]['fetch_func'] if source else registry_entry['fetch_func']
+        worker = DataFetchWorker(fetch_id, fetch_func)
+        tables = self._fetch_tables(fetch_id)
+        if tables:
+            worker.table_versions = self._change_tracker.versions(tables)
+        worker.signals.data_ready.connect(self._on_fetch_finished)
+        worker.signals.error_occurred.connect(self._on_fetch_failed)
+        self._active_workers[fetch_id] = worker
+
+        logger.debug(f"Queueing background fetch '{fetch_id}' for '{data_key}'")
+        self._thread_pool.start(worker)
+
+    def is_loading(self, data_key: str) -> bool:
+        """Whether a fetch that will update data_key is in flight."""
+        return any(data_key in keys for keys in self._waiting.values())
+
+    def _fetch_tables(self, fetch_id: str) -> Tuple[str, ...]:
+        """Tables read by a source or by a key with its own fetch function."""
+        entry = self._sources.get(fetch_id) or self._data_registry.get(fetch_id, {})
+        return entry.get('tables', ())
+
+    def _key_tables(self, data_key: str) -> Tuple[str, ...]:
+        """Tables a data key's value is built from."""
+        return self._fetch_tables(self._data_registry.get(data_key, {}).get('source') or data_key)
+
+    def _on_tables_changed(self, tables: Set[str]):
+        """Drop cached data read from the changed tables and refetch it."""
+        for source in [source for source in self._source_cache
+                       if tables.intersection(self._fetch_tables(source))]:
+            del self._source_cache[source]
+
+        outdated = [data_key for data_key in self._cache if tables.intersection(self._key_tables(data_key))]
+        for data_key in outdated:
+            del self._cache[data_key]
+            self._performance_stats['change_invalidations'] += 1
+            self.cache_invalidated.emit(data_key)
+        if outdated:
+            logger.debug(f"Tables {', '.join(sorted(tables))} changed; refreshing {', '.join(outdated)}")
+
+        # Only keys the dashboard has asked for are cached, so each one is on screen
+        for data_key in outdated:
+            self._fetch_data_async(data_key, force_refresh=True)
+
+    def _on_fetch_finished(self, fetch_id: str, data: Any, elapsed_ms: float):
+        """Deliver a finished fetch to every key waiting on it, or projecting from it."""
+        worker = self._active_workers.pop(fetch_id, None)
+        waiting = self._waiting.pop(fetch_id, set())
+        self._record_fetch(fetch_id, worker, elapsed_ms, failed=False)
+
+        table_versions = worker.table_versions if worker else None
+        if fetch_id not in self._sources:
+            self._on_data_ready(fetch_id, data, DataState.READY, table_versions=table_versions)
+        else:
+            self._source_cache[fetch_id] = CacheEntry(
+                data=data,
+                timestamp=datetime.now(),
+                ttl_seconds=self._sources[fetch_id]['ttl'],
+                table_versions=table_versions,
+                max_age_seconds=self._sources[fetch_id]['max_age']
+            )
+            # Keys sharing the source that were not asked for get the fresh values too
+            for data_key, entry in list(self._data_registry.items()):
+                if entry.get('source') == fetch_id:
+                    self._project(data_key, data, finished=data_key in waiting, table_versions=table_versions)
+
+        # A change committed while the fetch ran may not be in its result; requests made
+        # for that change joined this fetch, so start another one for them
+        if table_versions is not None and not self._change_tracker.is_current(table_versions):
+            current = self._change_tracker.versions(table_versions) or {}
+            self._on_tables_changed({table for table, version in table_versions.items()
+                                     if current.get(table) != version})
+
+    def _on_fetch_failed(self, fetch_id: str, error_message: str, elapsed_ms: float):
+        """Report a failed fetch to every key waiting on it."""
+        worker = self._active_workers.pop(fetch_id, None)
+        waiting = self._waiting.pop(fetch_id, set())
+        self._record_fetch(fetch_id, worker, elapsed_ms, failed=True)
+        for data_key in sorted(waiting):
+            self._on_data_error(data_key, error_message)
+
+    def _project(self, data_key: str, source_data: Any, finished: bool,
+                 table_versions: Optional[Dict[str, int]] = None):
+        """Derive a key's value from its source data and publish it."""
+        try:
+            value = self._data_registry[data_key]['project'](source_data)
+        except Exception as e:
+            logger.error(f"Error projecting '{data_key}': {e}")
+            if finished:
+                self._on_data_error(data_key, str(e))
+            return
+        self._on_data_ready(data_key, value, DataState.READY, finished=finished, table_versions=table_versions)
 
-        self._active_workers[data_key] = worker
-        self.loading_started.emit(data_key)
+    def _timing_entry(self, fetch_id: str) -> Dict[str, float]:
+        """Timing counters of a fetch id, created on first use."""
+        return self._fetch_timings.setdefault(fetch_id, {
+            'fetches': 0, 'errors': 0, 'coalesced': 0,
+            'last_ms': 0.0, 'avg_ms': 0.0, 'max_ms': 0.0, 'last_queue_ms': 0.0
+        })
 
-        logger.debug(f"Starting background fetch for '{data_key}'")
-        worker.start()
+    def _record_fetch(self, fetch_id: str, worker: Optional[DataFetchWorker], elapsed_ms: float, failed: bool):
+        """Update the per-fetch and overall timing statistics."""
+        timing = self._timing_entry(fetch_id)
+        timing['fetches'] += 1
+        timing['errors'] += int(failed)
+        timing['last_ms'] = round(elapsed_ms, 1)
+        timing['max_ms'] = round(max(timing['max_ms'], elapsed_ms), 1)
+        timing['avg_ms'] = round(timing['avg_ms'] + (elapsed_ms - timing['avg_ms']) / timing['fetches'], 1)
+        if worker and worker.started_at is not None:
+            timing['last_queue_ms'] = round((worker.started_at - worker.submitted_at) * 1000, 1)
+
+        stats = self._performance_stats
+        stats['fetch_count'] += 1
+        stats['avg_fetch_time'] += (elapsed_ms / 1000 - stats['avg_fetch_time']) / stats['fetch_count']
+
+    def _on_data_ready(self, data_key: str, data: Any, state: DataState, finished: bool = True,
+                       table_versions: Optional[Dict[str, int]] = None):
+        """
+        Validate, cache and publish new data for a key.
 
-    def _on_data_ready(self, data_key: str, data: Any, state: DataState):
-        """Handle successful data fetch."""
+        finished is False for keys refreshed as a side effect of a shared
+        source fetch they were not waiting on. table_versions are the
+        versions of the tables the data was read from, if tracked.
+        """
         # Validate data before caching
         if not self._validate_data(data_key, data):
             logger.warning(f"Data validation failed for '{data_key}', treating as error")
             self.data_error.emit(data_key, "Data validation failed")
-            self.loading_finished.emit(data_key)
+            if finished:
+                self.loading_finished.emit(data_key)
             return
 
-        ttl = self._data_registry[data_key]['ttl']
+        registry_entry = self._data_registry[data_key]
+        max_age = self._sources[registry_entry['source']]['max_age'] if 'source' in registry_entry \
+            else registry_entry.get('max_age')
 
         # Update cache
         self._cache[data_key] = CacheEntry(
             data=data,
             timestamp=datetime.now(),
-            ttl_seconds=ttl,
-            state=state
+            ttl_seconds=registry_entry['ttl'],
+            state=state,
+            table_versions=table_versions,
+            max_age_seconds=max_age
         )
 
-        # Update performance stats
-        self._performance_stats['fetch_count'] += 1
-
         # Emit signals
         self.data_updated.emit(data_key, data)
-        self.loading_finished.emit(data_key)
+        if finished:
+            self.loading_finished.emit(data_key)
 
         logger.debug(f"Data ready for '{data_key}': {type(data)} (validated)")
 
@@ -548,17 +626,6 @@ class DashboardDataManager(QObject):
 
         logger.error(f"Data fetch error for '{data_key}': {error_message}")
 
-    def _on_progress_update(self, data_key: str, progress: int):
-        """Handle progress updates from workers."""
-        # Could emit progress signal for UI feedback
-        logger.debug(f"Progress for '{data_key}': {progress}%")
-
-    def _cleanup_worker(self, data_key: str):
-        """Clean up finished worker."""
-        if data_key in self._active_workers:
-            del self._active_workers[data_key]
-            logger.debug(f"Cleaned up worker for '{data_key}'")
-
     def invalidate_cache(self, data_key: Optional[str] = None):
         """
         Invalidate cache for specific key or all keys.
@@ -567,6 +634,9 @@ class DashboardDataManager(QObject):
             data_key: Specific key to invalidate, or None for all
         """
         if data_key:
+            # Otherwise the next request would be served from the source fetched before the change
+            source = self._data_registry.get(data_key, {}).get('source')
+            self._source_cache.pop(source, None)
             if data_key in self._cache:
                 del self._cache[data_key]
                 self.cache_invalidated.emit(data_key)
@@ -574,6 +644,7 @@ class DashboardDataManager(QObject):
         else:
             cache_keys = list(self._cache.keys())
             self._cache.clear()
+            self._source_cache.clear()
             for key in cache_keys:
                 self.cache_invalidated.emit(key)
             logger.debug("Invalidated all cache entries")
@@ -629,18 +700,28 @@ class DashboardDataManager(QObject):
             max(1, self._performance_stats['cache_hits'] + self._performance_stats['cache_misses'])
         )
 
+        # In-flight fetches that no pool thread has picked up yet
+        queue_depth = sum(1 for worker in self._active_workers.values() if worker.started_at is None)
+
         return {
             'cache_stats': {
                 'total_entries': total_cache_size,
                 'expired_entries': expired_entries,
                 'stale_entries': stale_entries,
-                'active_workers': len(self._active_workers)
+                'source_entries': len(self._source_cache),
+                'active_workers': len(self._active_workers),
+                'queue_depth': queue_depth,
+                'max_concurrent_workers': self._max_concurrent_workers
             },
             'performance_stats': {
                 **self._performance_stats,
                 'cache_hit_rate': cache_hit_rate
             },
-            'registered_data_keys': list(self._data_registry.keys())
+            'fetch_timings': {fetch_id: dict(timing) for fetch_id, timing in self._fetch_timings.items()},
+            'registered_data_keys': list(self._data_registry.keys()),
+            'registered_sources': list(self._sources.keys()),
+            'change_tracker': dict(self._change_tracker.stats),
+            'connection_pool': db_connection.get_pool_stats()
         }
 
     def cleanup_expired_cache(self):
@@ -658,18 +739,24 @@ class DashboardDataManager(QObject):
         """Shutdown the data manager and clean up resources."""
         logger.info("Shutting down DashboardDataManager")
 
-        # Stop auto-refresh timer
+        # Stop auto-refresh and change polling
         self._auto_refresh_timer.stop()
+        self._change_poll_timer.stop()
+        self._change_tracker.remove_listener(self._on_tables_changed)
 
-        # Cancel all active workers
+        # Cancel all active workers; queued ones return as soon as they start
         for worker in self._active_workers.values():
             worker.cancel()
-            worker.wait(5000)  # Wait up to 5 seconds
+        self._thread_pool.clear()
+        self._thread_pool.waitForDone(5000)  # Wait up to 5 seconds
 
         # Clear resources
         self._active_workers.clear()
+        self._waiting.clear()
         self._cache.clear()
+        self._source_cache.clear()
         self._data_registry.clear()
+        self._sources.clear()
 
         logger.info("DashboardDataManager shutdown complete")
 
@@ -1,10 +1,26 @@
 # Initialization file for the windows module
+#
+# Windows are resolved on first access so importing the package, e.g. for the
+# login window, does not load the main window and every screen behind it.
 
-from school_system.gui.windows.login_window import LoginWindow
-from school_system.gui.windows.main_window import MainWindow
-from school_system.gui.windows.user_window.user_window import UserWindow
-from school_system.gui.windows.book_window import BookWindow
+import importlib
 
+_LAZY_WINDOWS = {
+    'LoginWindow': 'school_system.gui.windows.login_window',
+    'MainWindow': 'school_system.gui.windows.main_window',
+    'UserWindow': 'school_system.gui.windows.user_window.user_window',
+    'BookWindow': 'school_system.gui.windows.book_window',
+}
+
+
+def __getattr__(name):
+    """Import the requested window's module on first access."""
+    module_name = _LAZY_WINDOWS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    window_class = getattr(importlib.import_module(module_name), name)
+    globals()[name] = window_class
+    return window_class
 
 
 __all__ = ['LoginWindow', 'MainWindow', 'UserWindow', 'BookWindow']
@@ -10,22 +10,53 @@ Comprehensive window for QR code-based book and student management including:
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
-    QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
+    QComboBox, QTableView, QHeaderView, QMessageBox,
     QDialog, QGroupBox, QCheckBox, QAbstractItemView, QTabWidget, QTextEdit,
     QProgressBar, QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QPixmap, QPainter
-from typing import Optional, List, Dict, Tuple
-import qrcode
-import io
+from PyQt6.QtCore import Qt, pyqtSignal, QThread, QTimer, QModelIndex
+from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor
+from typing import Optional, Dict, Tuple
 from datetime import datetime
 
 from school_system.gui.windows.base_function_window import BaseFunctionWindow
+from school_system.gui.base.widgets import KeysetPagedModel, SearchBox
 from school_system.gui.dialogs.message_dialog import show_error_message, show_success_message
 from school_system.config.logging import logger
+from school_system.database.connection import db_connection
 from school_system.services.book_service import BookService
+from school_system.services.qr_batch_service import QRBatchService
+from school_system.services.scan_station_service import ScanStationService
 from school_system.services.student_service import StudentService
+from school_system.utils.qr_cache import get_qr_image_cache
+
+
+class QRBatchWorker(QThread):
+    """Worker thread that generates every missing book or student QR code."""
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(dict)  # QRBatchService result
+    error = pyqtSignal(str)
+
+    def __init__(self, target: str):
+        super().__init__()
+        self.target = target
+
+    def run(self):
+        """Run the batch; requestInterruption() cancels it between chunks."""
+        try:
+            service = QRBatchService()
+            if self.target == "books":
+                generate = service.generate_missing_book_codes
+            else:
+                generate = service.generate_missing_student_codes
+            result = generate(progress_callback=self.progress.emit,
+                              is_cancelled=self.isInterruptionRequested)
+            self.finished.emit(result)
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            # Hand this thread's pooled connection back for the next worker
+            db_connection.release_thread_connection()
 
 
 class QRManagementWindow(QDialog):
@@ -33,6 +64,15 @@ class QRManagementWindow(QDialog):
 
     operation_completed = pyqtSignal()
 
+    BOOK_HEADERS = ["Book Number", "Title", "Author", "Subject", "Class", "Available", "QR Code", "Generated", "Actions"]
+    BOOK_SORT_KEYS = {0: 'book_number', 1: 'title', 2: 'author', 3: 'subject', 4: 'class', 6: 'qr_code'}
+    BOOK_ACTIONS_COLUMN = 8
+
+    STUDENT_HEADERS = ["Admission Number", "Name", "Stream", "QR Code", "Generated", "Actions", "Card Preview"]
+    STUDENT_SORT_KEYS = {0: 'admission_number', 1: 'name', 2: 'stream', 3: 'qr_code'}
+    STUDENT_ACTIONS_COLUMN = 5
+    STUDENT_CARD_COLUMN = 6
+
     def __init__(
         self,
         parent=None,
@@ -49,9 +89,11 @@ class QRManagementWindow(QDialog):
 
         self.book_service = BookService()
         self.student_service = StudentService()
+        self.scan_station_service = ScanStationService()
 
         self.current_user = current_user
         self.current_role = current_role
+        self.qr_batch_workers: Dict[str, QRBatchWorker] = {}
 
         self.setup_ui()
         self.load_initial_data()
@@ -146,7 +188,11 @@ class QRManagementWindow(QDialog):
         self.books_search_input = QLineEdit()
         self.books_search_input.setPlaceholderText("Search by title, author, or book number...")
         self.books_search_input.setFixedHeight(32)
-        self.books_search_input.textChanged.connect(self._filter_books_table)
+        self._books_search_timer = QTimer(self)
+        self._books_search_timer.setSingleShot(True)
+        self._books_search_timer.setInterval(SearchBox.INDEXED_DEBOUNCE_MS)
+        self._books_search_timer.timeout.connect(self._filter_books_table)
+        self.books_search_input.textChanged.connect(self._books_search_timer.start)
         search_layout.addWidget(self.books_search_input)
         controls_layout.addLayout(search_layout)
 
@@ -187,30 +233,23 @@ class QRManagementWindow(QDialog):
 
         layout.addLayout(controls_layout)
 
-        # Books table
-        self.books_table = QTableWidget()
-        self.books_table.setColumnCount(9)
-        self.books_table.setHorizontalHeaderLabels([
-            "Book Number", "Title", "Author", "Subject", "Class", "Available", "QR Code", "Generated", "Actions"
-        ])
+        # Books table: pages are loaded from the database as the user scrolls
+        self.books_model = KeysetPagedModel(
+            self._fetch_books_page, self._format_book_row, self.BOOK_HEADERS,
+            sort_keys=self.BOOK_SORT_KEYS, role_provider=self._book_cell_role,
+            filter_provider=self._current_book_filters, parent=self
+        )
+        self.books_model.fetch_failed.connect(self._on_fetch_failed)
+        self.books_table = self._create_paged_view(self.books_model)
+        self.books_table.clicked.connect(self._on_books_table_clicked)
 
+        # Interactive columns: resizing to contents would re-measure on every page load
         header = self.books_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(7, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(8, QHeaderView.ResizeMode.ResizeToContents)
-
-        self.books_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.books_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.books_table.verticalHeader().setVisible(False)
 
         self.books_table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {theme['background']};
                 border: 1px solid {theme['border']};
                 border-radius: 6px;
@@ -227,10 +266,16 @@ class QRManagementWindow(QDialog):
 
         layout.addWidget(self.books_table)
 
-        # Progress bar (hidden by default)
+        # Batch progress bar and cancel button (hidden by default)
+        progress_layout = QHBoxLayout()
         self.books_progress_bar = QProgressBar()
         self.books_progress_bar.setVisible(False)
-        layout.addWidget(self.books_progress_bar)
+        progress_layout.addWidget(self.books_progress_bar)
+        self.books_cancel_btn = QPushButton("Cancel")
+        self.books_cancel_btn.setVisible(False)
+        self.books_cancel_btn.clicked.connect(lambda: self._cancel_qr_batch("books"))
+        progress_layout.addWidget(self.books_cancel_btn)
+        layout.addLayout(progress_layout)
 
         return tab
 
@@ -252,7 +297,11 @@ class QRManagementWindow(QDialog):
         self.students_search_input = QLineEdit()
         self.students_search_input.setPlaceholderText("Search by name or admission number...")
         self.students_search_input.setFixedHeight(32)
-        self.students_search_input.textChanged.connect(self._filter_students_table)
+        self._students_search_timer = QTimer(self)
+        self._students_search_timer.setSingleShot(True)
+        self._students_search_timer.setInterval(SearchBox.INDEXED_DEBOUNCE_MS)
+        self._students_search_timer.timeout.connect(self._filter_students_table)
+        self.students_search_input.textChanged.connect(self._students_search_timer.start)
         search_layout.addWidget(self.students_search_input)
         controls_layout.addLayout(search_layout)
 
@@ -293,29 +342,24 @@ class QRManagementWindow(QDialog):
 
         layout.addLayout(controls_layout)
 
-        # Students table
-        self.students_table = QTableWidget()
-        self.students_table.setColumnCount(7)
-        self.students_table.setHorizontalHeaderLabels([
-            "Admission Number", "Name", "Stream", "QR Code", "Generated", "Actions", "Card Preview"
-        ])
+        # Students table: pages are loaded from the database as the user scrolls
+        self.students_model = KeysetPagedModel(
+            self._fetch_students_page, self._format_student_row, self.STUDENT_HEADERS,
+            sort_keys=self.STUDENT_SORT_KEYS, role_provider=self._student_cell_role,
+            filter_provider=self._current_student_filters, parent=self
+        )
+        self.students_model.fetch_failed.connect(self._on_fetch_failed)
+        self.students_table = self._create_paged_view(self.students_model)
+        self.students_table.clicked.connect(self._on_students_table_clicked)
 
         header = self.students_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Fixed)
-        header.resizeSection(6, 120)
-
-        self.students_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.students_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.students_table.verticalHeader().setVisible(False)
+        header.setSectionResizeMode(self.STUDENT_CARD_COLUMN, QHeaderView.ResizeMode.Fixed)
+        header.resizeSection(self.STUDENT_CARD_COLUMN, 120)
 
         self.students_table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {theme['background']};
                 border: 1px solid {theme['border']};
                 border-radius: 6px;
@@ -332,10 +376,16 @@ class QRManagementWindow(QDialog):
 
         layout.addWidget(self.students_table)
 
-        # Progress bar (hidden by default)
+        # Batch progress bar and cancel button (hidden by default)
+        progress_layout = QHBoxLayout()
         self.students_progress_bar = QProgressBar()
         self.students_progress_bar.setVisible(False)
-        layout.addWidget(self.students_progress_bar)
+        progress_layout.addWidget(self.students_progress_bar)
+        self.students_cancel_btn = QPushButton("Cancel")
+        self.students_cancel_btn.setVisible(False)
+        self.students_cancel_btn.clicked.connect(lambda: self._cancel_qr_batch("students"))
+        progress_layout.addWidget(self.students_cancel_btn)
+        layout.addLayout(progress_layout)
 
         return tab
 
@@ -434,6 +484,9 @@ class QRManagementWindow(QDialog):
             }}
         """)
         borrow_btn.clicked.connect(self._borrow_by_qr)
+        # Scanners end each code with Enter: book scan moves to the card, card scan borrows
+        self.book_qr_input.returnPressed.connect(self.student_qr_input.setFocus)
+        self.student_qr_input.returnPressed.connect(self._borrow_by_qr)
         layout.addWidget(borrow_btn)
 
         # Status display
@@ -563,6 +616,8 @@ class QRManagementWindow(QDialog):
             }}
         """)
         return_btn.clicked.connect(self._return_by_qr)
+        self.return_book_qr_input.returnPressed.connect(self.return_student_qr_input.setFocus)
+        self.return_student_qr_input.returnPressed.connect(self._return_by_qr)
         layout.addWidget(return_btn)
 
         # Status display
@@ -588,11 +643,21 @@ class QRManagementWindow(QDialog):
         self._load_books_data()
         self._load_students_data()
 
+    def _create_paged_view(self, model: KeysetPagedModel) -> QTableView:
+        """Create a read-only table view over a paged model."""
+        table = QTableView()
+        table.setModel(model)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.verticalHeader().setDefaultSectionSize(34)
+        model.bind_sort_header(table.horizontalHeader())
+        return table
+
     def _load_books_data(self):
         """Load books data for the books tab."""
         try:
-            books = self.book_service.get_all_books()
-            self._populate_books_table(books)
+            self.books_model.refresh()
         except Exception as e:
             logger.error(f"Error loading books data: {e}")
             show_error_message("Error", f"Failed to load books data: {str(e)}", self)
@@ -600,164 +665,120 @@ class QRManagementWindow(QDialog):
     def _load_students_data(self):
         """Load students data for the students tab."""
         try:
-            students = self.student_service.get_all_students()
-            self._populate_students_table(students)
+            self.students_model.refresh()
         except Exception as e:
             logger.error(f"Error loading students data: {e}")
             show_error_message("Error", f"Failed to load students data: {str(e)}", self)
 
-    def _populate_books_table(self, books: List):
-        """Populate the books table."""
-        self.books_table.setRowCount(0)
-
-        for book in books:
-            row = self.books_table.rowCount()
-            self.books_table.insertRow(row)
-
-            # Book Number
-            book_number_item = QTableWidgetItem(book.book_number)
-            book_number_item.setData(Qt.ItemDataRole.UserRole, book.id)
-            self.books_table.setItem(row, 0, book_number_item)
-
-            # Title
-            title_item = QTableWidgetItem(book.title)
-            self.books_table.setItem(row, 1, title_item)
-
-            # Author
-            author_item = QTableWidgetItem(book.author)
-            self.books_table.setItem(row, 2, author_item)
-
-            # Subject
-            subject_item = QTableWidgetItem(getattr(book, 'subject', ''))
-            self.books_table.setItem(row, 3, subject_item)
-
-            # Class
-            class_item = QTableWidgetItem(getattr(book, 'class_name', ''))
-            self.books_table.setItem(row, 4, class_item)
-
-            # Available
-            available_item = QTableWidgetItem("Yes" if book.available else "No")
-            available_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.books_table.setItem(row, 5, available_item)
-
-            # QR Code
-            qr_code = getattr(book, 'qr_code', None)
-            qr_item = QTableWidgetItem(qr_code or "Not Generated")
-            if qr_code:
-                qr_item.setForeground(Qt.GlobalColor.darkGreen)
-            else:
-                qr_item.setForeground(Qt.GlobalColor.red)
-            self.books_table.setItem(row, 6, qr_item)
-
-            # Generated Date
-            generated_at = getattr(book, 'qr_generated_at', None)
-            generated_item = QTableWidgetItem(generated_at or "N/A")
-            self.books_table.setItem(row, 7, generated_item)
-
-            # Actions
-            actions_widget = self._create_book_actions_widget(book)
-            self.books_table.setCellWidget(row, 8, actions_widget)
-
-    def _create_book_actions_widget(self, book) -> QWidget:
-        """Create action buttons for a book row."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(2, 2, 2, 2)
-        layout.setSpacing(4)
-
-        # Generate QR button
-        if not getattr(book, 'qr_code', None):
-            generate_btn = QPushButton("Generate QR")
-            generate_btn.setFixedSize(100, 28)
-            generate_btn.clicked.connect(lambda: self._generate_qr_for_book(book))
-            layout.addWidget(generate_btn)
+    def _on_fetch_failed(self, message: str):
+        """Handle a failed page load from either table."""
+        logger.error(f"Error loading QR management page: {message}")
+        show_error_message("Error", f"Failed to load data: {message}", self)
+
+    @staticmethod
+    def _qr_filter_value(filter_text: str) -> Optional[bool]:
+        """Map a QR status combo selection to the repository has_qr filter."""
+        if filter_text == "With QR Code":
+            return True
+        if filter_text == "Without QR Code":
+            return False
+        return None
+
+    def _current_book_filters(self) -> dict:
+        """Get the book search and QR filter; read by the model once per result set."""
+        return {
+            'search': self.books_search_input.text().strip() or None,
+            'has_qr': self._qr_filter_value(self.books_qr_filter.currentText()),
+        }
+
+    def _current_student_filters(self) -> dict:
+        """Get the student search and QR filter; read by the model once per result set."""
+        return {
+            'search': self.students_search_input.text().strip() or None,
+            'has_qr': self._qr_filter_value(self.students_qr_filter.currentText()),
+        }
+
+    def _fetch_books_page(self, after, limit, sort_key, descending, **filters):
+        """Page fetcher for the books model; search and QR filter run in SQL."""
+        return self.book_service.get_catalog_page(after, limit, sort_key, descending, **filters)
+
+    def _fetch_students_page(self, after, limit, sort_key, descending, **filters):
+        """Page fetcher for the students model; search and QR filter run in SQL."""
+        return self.student_service.get_students_page(after, limit, sort_key, descending, **filters)
+
+    def _format_book_row(self, book) -> list:
+        """Format a book as table cells."""
+        qr_code = getattr(book, 'qr_code', None)
+        return [
+            book.book_number,
+            book.title,
+            book.author,
+            getattr(book, 'subject', '') or '',
+            getattr(book, 'class_name', '') or '',
+            "Yes" if book.available else "No",
+            qr_code or "Not Generated",
+            getattr(book, 'qr_generated_at', None) or "N/A",
+            "View QR" if qr_code else "Generate QR",
+        ]
+
+    def _format_student_row(self, student) -> list:
+        """Format a student as table cells."""
+        qr_code = getattr(student, 'qr_code', None)
+        return [
+            student.admission_number or str(student.student_id),
+            student.name,
+            student.stream,
+            qr_code or "Not Generated",
+            getattr(student, 'qr_generated_at', None) or "N/A",
+            "View QR" if qr_code else "Generate QR",
+            "Preview Card",
+        ]
+
+    def _book_cell_role(self, book, column: int, role: int):
+        """Colours and alignment for book cells."""
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if column == 6:
+                return QColor(Qt.GlobalColor.darkGreen) if getattr(book, 'qr_code', None) else QColor(Qt.GlobalColor.red)
+            if column == self.BOOK_ACTIONS_COLUMN:
+                return QColor(Qt.GlobalColor.blue)
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column == 5:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def _student_cell_role(self, student, column: int, role: int):
+        """Colours for student cells."""
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if column == 3:
+                return QColor(Qt.GlobalColor.darkGreen) if getattr(student, 'qr_code', None) else QColor(Qt.GlobalColor.red)
+            if column in (self.STUDENT_ACTIONS_COLUMN, self.STUDENT_CARD_COLUMN):
+                return QColor(Qt.GlobalColor.blue)
+        return None
+
+    def _on_books_table_clicked(self, index: QModelIndex):
+        """Run the row action when its Actions cell is clicked."""
+        if index.column() != self.BOOK_ACTIONS_COLUMN:
+            return
+        book = self.books_model.record(index.row())
+        if book is None:
+            return
+        if getattr(book, 'qr_code', None):
+            self._view_book_qr_code(book)
         else:
-            view_qr_btn = QPushButton("View QR")
-            view_qr_btn.setFixedSize(80, 28)
-            view_qr_btn.clicked.connect(lambda: self._view_book_qr_code(book))
-            layout.addWidget(view_qr_btn)
-
-        layout.addStretch()
-        return widget
-
-    def _populate_students_table(self, students: List):
-        """Populate the students table."""
-        self.students_table.setRowCount(0)
+            self._generate_qr_for_book(book)
 
-        for student in students:
-            row = self.students_table.rowCount()
-            self.students_table.insertRow(row)
-
-            # Admission Number
-            admission_item = QTableWidgetItem(student.admission_number or str(student.student_id))
-            admission_item.setData(Qt.ItemDataRole.UserRole, student.student_id)
-            self.students_table.setItem(row, 0, admission_item)
-
-            # Name
-            name_item = QTableWidgetItem(student.name)
-            self.students_table.setItem(row, 1, name_item)
-
-            # Stream
-            stream_item = QTableWidgetItem(student.stream)
-            self.students_table.setItem(row, 2, stream_item)
-
-            # QR Code
-            qr_code = getattr(student, 'qr_code', None)
-            qr_item = QTableWidgetItem(qr_code or "Not Generated")
-            if qr_code:
-                qr_item.setForeground(Qt.GlobalColor.darkGreen)
-            else:
-                qr_item.setForeground(Qt.GlobalColor.red)
-            self.students_table.setItem(row, 3, qr_item)
-
-            # Generated Date
-            generated_at = getattr(student, 'qr_generated_at', None)
-            generated_item = QTableWidgetItem(generated_at or "N/A")
-            self.students_table.setItem(row, 4, generated_item)
-
-            # Actions
-            actions_widget = self._create_student_actions_widget(student)
-            self.students_table.setCellWidget(row, 5, actions_widget)
-
-            # Card Preview
-            card_widget = self._create_student_card_preview_widget(student)
-            self.students_table.setCellWidget(row, 6, card_widget)
-
-    def _create_student_actions_widget(self, student) -> QWidget:
-        """Create action buttons for a student row."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(2, 2, 2, 2)
-        layout.setSpacing(4)
-
-        # Generate QR button
-        if not getattr(student, 'qr_code', None):
-            generate_btn = QPushButton("Generate QR")
-            generate_btn.setFixedSize(100, 28)
-            generate_btn.clicked.connect(lambda: self._generate_qr_for_student(student))
-            layout.addWidget(generate_btn)
+    def _on_students_table_clicked(self, index: QModelIndex):
+        """Run the row action when its Actions or Card Preview cell is clicked."""
+        if index.column() not in (self.STUDENT_ACTIONS_COLUMN, self.STUDENT_CARD_COLUMN):
+            return
+        student = self.students_model.record(index.row())
+        if student is None:
+            return
+        if index.column() == self.STUDENT_CARD_COLUMN:
+            self._show_student_card_preview(student)
+        elif getattr(student, 'qr_code', None):
+            self._view_student_qr_code(student)
         else:
-            view_qr_btn = QPushButton("View QR")
-            view_qr_btn.setFixedSize(80, 28)
-            view_qr_btn.clicked.connect(lambda: self._view_student_qr_code(student))
-            layout.addWidget(view_qr_btn)
-
-        layout.addStretch()
-        return widget
-
-    def _create_student_card_preview_widget(self, student) -> QWidget:
-        """Create a preview widget for student borrowing card."""
-        widget = QWidget()
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(2, 2, 2, 2)
-        layout.setSpacing(2)
-
-        preview_btn = QPushButton("Preview Card")
-        preview_btn.setFixedSize(110, 32)
-        preview_btn.clicked.connect(lambda: self._show_student_card_preview(student))
-        layout.addWidget(preview_btn)
-
-        return widget
+            self._generate_qr_for_student(student)
 
     def _generate_qr_for_book(self, book):
         """Generate QR code for a specific book."""
@@ -836,21 +857,10 @@ class QRManagementWindow(QDialog):
         dialog.exec()
 
     def _generate_qr_pixmap(self, data: str, size: int = 200) -> Optional[QPixmap]:
-        """Generate QR code pixmap."""
+        """Get a QR code pixmap, rendered once and then read from the QR image cache."""
         try:
-            qr = qrcode.QRCode(version=1, box_size=10, border=5)
-            qr.add_data(data)
-            qr.make(fit=True)
-
-            img = qr.make_image(fill_color="black", back_color="white")
-
-            # Convert PIL image to QPixmap
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
-            buffer.seek(0)
-
             pixmap = QPixmap()
-            pixmap.loadFromData(buffer.getvalue(), 'PNG')
+            pixmap.loadFromData(get_qr_image_cache().get_png(data), 'PNG')
             pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio)
             return pixmap
 
@@ -956,30 +966,22 @@ class QRManagementWindow(QDialog):
             self._update_borrow_status("Error: Please enter both book and student QR codes")
             return
 
-        try:
-            success = self.book_service.borrow_book_by_qr(book_qr, student_qr)
-            if success:
-                # Get book and student details for display
-                book = self.book_service.get_book_by_qr_code(book_qr)
-                student = self.student_service.get_student_by_qr_code(student_qr)
-
-                book_name = book.title if book else "Unknown Book"
-                student_name = student.name if student else "Unknown Student"
+        result = self.scan_station_service.borrow(book_qr, student_qr)
+        if result['success']:
+            self._update_borrow_status(
+                f"✅ SUCCESS: '{result['book_title']}' borrowed by {result['student_name']} "
+                f"({result['latency_ms']} ms)"
+            )
 
-                self._update_borrow_status(f"✅ SUCCESS: '{book_name}' borrowed by {student_name}")
+            # Clear inputs and wait for the next book scan
+            self.book_qr_input.clear()
+            self.student_qr_input.clear()
+            self.book_qr_input.setFocus()
 
-                # Clear inputs
-                self.book_qr_input.clear()
-                self.student_qr_input.clear()
-
-                # Refresh data
-                self.operation_completed.emit()
-            else:
-                self._update_borrow_status("❌ FAILED: Could not process borrowing request")
-
-        except Exception as e:
-            logger.error(f"Error in QR borrow: {e}")
-            self._update_borrow_status(f"❌ ERROR: {str(e)}")
+            # Refresh data
+            self.operation_completed.emit()
+        else:
+            self._update_borrow_status(f"❌ FAILED: {result['message']} ({result['latency_ms']} ms)")
 
     def _return_by_qr(self):
         """Return a book using QR codes."""
@@ -991,31 +993,24 @@ class QRManagementWindow(QDialog):
             self._update_return_status("Error: Please enter both book and student QR codes")
             return
 
-        try:
-            success = self.book_service.return_book_by_qr(book_qr, student_qr, condition)
-            if success:
-                # Get book and student details for display
-                book = self.book_service.get_book_by_qr_code(book_qr)
-                student = self.student_service.get_student_by_qr_code(student_qr)
-
-                book_name = book.title if book else "Unknown Book"
-                student_name = student.name if student else "Unknown Student"
-
-                self._update_return_status(f"✅ SUCCESS: '{book_name}' returned by {student_name}\nCondition: {condition}")
-
-                # Clear inputs
-                self.return_book_qr_input.clear()
-                self.return_student_qr_input.clear()
-                self.return_condition_combo.setCurrentText("Good")
-
-                # Refresh data
-                self.operation_completed.emit()
-            else:
-                self._update_return_status("❌ FAILED: Could not process return request")
-
-        except Exception as e:
-            logger.error(f"Error in QR return: {e}")
-            self._update_return_status(f"❌ ERROR: {str(e)}")
+        result = self.scan_station_service.return_book(book_qr, student_qr, condition,
+                                                       returned_by=self.current_user or None)
+        if result['success']:
+            self._update_return_status(
+                f"✅ SUCCESS: '{result['book_title']}' returned by {result['student_name']} "
+                f"({result['latency_ms']} ms)\nCondition: {condition}"
+            )
+
+            # Clear inputs and wait for the next book scan
+            self.return_book_qr_input.clear()
+            self.return_student_qr_input.clear()
+            self.return_condition_combo.setCurrentText("Good")
+            self.return_book_qr_input.setFocus()
+
+            # Refresh data
+            self.operation_completed.emit()
+        else:
+            self._update_return_status(f"❌ FAILED: {result['message']} ({result['latency_ms']} ms)")
 
     def _update_borrow_status(self, message: str):
         """Update borrow status display."""
@@ -1037,60 +1032,11 @@ class QRManagementWindow(QDialog):
 
     def _filter_books_table(self):
         """Filter books table based on search and QR status."""
-        search_text = self.books_search_input.text().lower()
-        qr_filter = self.books_qr_filter.currentText()
-
-        for row in range(self.books_table.rowCount()):
-            show_row = True
-
-            # Search filter
-            if search_text:
-                title = self.books_table.item(row, 1).text().lower()
-                author = self.books_table.item(row, 2).text().lower()
-                book_number = self.books_table.item(row, 0).text().lower()
-
-                if search_text not in title and search_text not in author and search_text not in book_number:
-                    show_row = False
-
-            # QR filter
-            if show_row and qr_filter != "All Books":
-                qr_code = self.books_table.item(row, 6).text()
-                has_qr = qr_code != "Not Generated"
-
-                if qr_filter == "With QR Code" and not has_qr:
-                    show_row = False
-                elif qr_filter == "Without QR Code" and has_qr:
-                    show_row = False
-
-            self.books_table.setRowHidden(row, not show_row)
+        self._load_books_data()
 
     def _filter_students_table(self):
         """Filter students table based on search and QR status."""
-        search_text = self.students_search_input.text().lower()
-        qr_filter = self.students_qr_filter.currentText()
-
-        for row in range(self.students_table.rowCount()):
-            show_row = True
-
-            # Search filter
-            if search_text:
-                name = self.students_table.item(row, 1).text().lower()
-                admission = self.students_table.item(row, 0).text().lower()
-
-                if search_text not in name and search_text not in admission:
-                    show_row = False
-
-            # QR filter
-            if show_row and qr_filter != "All Students":
-                qr_code = self.students_table.item(row, 3).text()
-                has_qr = qr_code != "Not Generated"
-
-                if qr_filter == "With QR Code" and not has_qr:
-                    show_row = False
-                elif qr_filter == "Without QR Code" and has_qr:
-                    show_row = False
-
-            self.students_table.setRowHidden(row, not show_row)
+        self._load_students_data()
 
     def _generate_qr_for_all_books(self):
         """Generate QR codes for all books without QR codes."""
@@ -1104,34 +1050,7 @@ class QRManagementWindow(QDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # Show progress bar
-        self.books_progress_bar.setVisible(True)
-        self.books_progress_bar.setRange(0, 0)  # Indeterminate progress
-
-        # Process in background
-        QTimer.singleShot(100, lambda: self._do_generate_qr_for_all_books())
-
-    def _do_generate_qr_for_all_books(self):
-        """Background task to generate QR codes for all books."""
-        try:
-            books = self.book_service.get_all_books()
-            generated = 0
-
-            for book in books:
-                if not getattr(book, 'qr_code', None):
-                    qr_code = self.book_service.generate_qr_code_for_book(book.id)
-                    if qr_code:
-                        generated += 1
-
-            show_success_message("Success", f"Generated QR codes for {generated} books", self)
-            self._load_books_data()  # Refresh table
-
-        except Exception as e:
-            logger.error(f"Error generating QR codes for all books: {e}")
-            show_error_message("Error", f"Failed to generate QR codes: {str(e)}", self)
-
-        finally:
-            self.books_progress_bar.setVisible(False)
+        self._start_qr_batch("books")
 
     def _generate_qr_for_all_students(self):
         """Generate QR codes for all students without QR codes."""
@@ -1145,35 +1064,70 @@ class QRManagementWindow(QDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # Show progress bar
-        self.students_progress_bar.setVisible(True)
-        self.students_progress_bar.setRange(0, 0)  # Indeterminate progress
-
-        # Process in background
-        QTimer.singleShot(100, lambda: self._do_generate_qr_for_all_students())
-
-    def _do_generate_qr_for_all_students(self):
-        """Background task to generate QR codes for all students."""
-        try:
-            students = self.student_service.get_all_students()
-            generated = 0
-
-            for student in students:
-                if not getattr(student, 'qr_code', None):
-                    admission_number = student.admission_number or str(student.student_id)
-                    qr_code = self.student_service.generate_qr_code_for_student(admission_number)
-                    if qr_code:
-                        generated += 1
-
-            show_success_message("Success", f"Generated QR codes for {generated} students", self)
-            self._load_students_data()  # Refresh table
+        self._start_qr_batch("students")
 
-        except Exception as e:
-            logger.error(f"Error generating QR codes for all students: {e}")
-            show_error_message("Error", f"Failed to generate QR codes: {str(e)}", self)
+    def _start_qr_batch(self, target: str):
+        """Start generating missing QR codes for 'books' or 'students' on a worker thread."""
+        if target in self.qr_batch_workers:
+            return
 
-        finally:
-            self.students_progress_bar.setVisible(False)
+        progress_bar = getattr(self, f"{target}_progress_bar")
+        progress_bar.setVisible(True)
+        progress_bar.setRange(0, 0)  # Indeterminate until the first chunk is stored
+        cancel_btn = getattr(self, f"{target}_cancel_btn")
+        cancel_btn.setEnabled(True)
+        cancel_btn.setVisible(True)
+
+        worker = QRBatchWorker(target)
+        worker.progress.connect(lambda done, total: self._on_qr_batch_progress(target, done, total))
+        worker.finished.connect(lambda result: self._on_qr_batch_finished(target, result))
+        worker.error.connect(lambda message: self._on_qr_batch_error(target, message))
+        self.qr_batch_workers[target] = worker
+        worker.start()
+
+    def _cancel_qr_batch(self, target: str):
+        """Ask a running batch to stop after its current chunk."""
+        worker = self.qr_batch_workers.get(target)
+        if worker:
+            worker.requestInterruption()
+            getattr(self, f"{target}_cancel_btn").setEnabled(False)
+
+    def _on_qr_batch_progress(self, target: str, done: int, total: int):
+        """Show batch progress."""
+        progress_bar = getattr(self, f"{target}_progress_bar")
+        progress_bar.setRange(0, total)
+        progress_bar.setValue(done)
+
+    def _on_qr_batch_finished(self, target: str, result: dict):
+        """Report a completed or cancelled batch and refresh the table."""
+        self._end_qr_batch(target)
+        status = "Cancelled after generating" if result['cancelled'] else "Generated"
+        show_success_message("Success", f"{status} QR codes for {result['generated']} {target}", self)
+        if target == "books":
+            self._load_books_data()
+        else:
+            self._load_students_data()
+
+    def _on_qr_batch_error(self, target: str, message: str):
+        """Report a failed batch."""
+        self._end_qr_batch(target)
+        logger.error(f"Error generating QR codes for all {target}: {message}")
+        show_error_message("Error", f"Failed to generate QR codes: {message}", self)
+
+    def _end_qr_batch(self, target: str):
+        """Hide the batch controls and forget the finished worker."""
+        worker = self.qr_batch_workers.pop(target, None)
+        if worker:
+            worker.wait()
+        getattr(self, f"{target}_progress_bar").setVisible(False)
+        getattr(self, f"{target}_cancel_btn").setVisible(False)
+
+    def done(self, result: int):
+        """Stop running QR batches before the dialog closes."""
+        for worker in list(self.qr_batch_workers.values()):
+            worker.requestInterruption()
+            worker.wait()
+        super().done(result)
 
     def _export_book_qr_codes(self):
         """Export book QR codes."""
@@ -4,11 +4,12 @@ View Books Window
 Dedicated window for viewing and managing books list.
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QComboBox, QFileDialog
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QFileDialog
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from school_system.gui.windows.base_function_window import BaseFunctionWindow
+from school_system.gui.base.widgets import KeysetPagedModel, SearchBox
 from school_system.gui.dialogs.message_dialog import show_error_message, show_success_message
 from school_system.config.logging import logger
 from school_system.services.book_service import BookService
@@ -23,6 +24,11 @@ class ViewBooksWindow(BaseFunctionWindow):
     
     book_updated = pyqtSignal()
     
+    BOOK_HEADERS = ["Book Number", "Title", "Author", "ISBN", "Subject", "Class", "Type", "Condition", "Status"]
+    # Table column -> BookRepository catalog sort key (Status is computed, so not sortable)
+    BOOK_SORT_KEYS = {0: 'book_number', 1: 'title', 2: 'author', 3: 'isbn', 4: 'subject',
+                      5: 'class', 6: 'revision', 7: 'book_condition'}
+    
     def __init__(self, parent=None, current_user: str = "", current_role: str = ""):
         """Initialize the view books window."""
         super().__init__("View Books", parent, current_user, current_role)
@@ -30,7 +36,8 @@ class ViewBooksWindow(BaseFunctionWindow):
         self.book_service = BookService()
         self.import_export_service = ImportExportService()
         self.books_table = None
-        self.current_books_data = []  # Store current filtered books data
+        self.books_model = None
+        self.borrowed_ids = set()  # Open loans, refreshed with the table
         
         # Setup content
         self.setup_content()
@@ -94,6 +101,7 @@ class ViewBooksWindow(BaseFunctionWindow):
         
         # Search box
         self.search_box = self.create_search_box("Search books by title, author, ISBN, or ID...")
+        self.search_box.set_debounce_delay(SearchBox.INDEXED_DEBOUNCE_MS)
         self.search_box.setMinimumWidth(300)
         self.search_box.search_text_changed.connect(self._on_search)
         action_layout.addWidget(self.search_box)
@@ -189,93 +197,74 @@ class ViewBooksWindow(BaseFunctionWindow):
         title_label.setStyleSheet(f"color: {theme['text']}; margin-bottom: 8px;")
         table_layout.addWidget(title_label)
         
-        # Books table
-        self.books_table = self.create_table(0, 9)
-        self.books_table.setColumnCount(9)
-        self.books_table.setHorizontalHeaderLabels([
-            "Book Number", "Title", "Author", "ISBN", "Subject", "Class", "Type", "Condition", "Status"
-        ])
-        self.books_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.books_table.setAlternatingRowColors(True)
+        # Books table: pages are loaded from the database as the user scrolls
+        self.books_model = KeysetPagedModel(
+            self._fetch_books_page, self._format_book_row, self.BOOK_HEADERS,
+            sort_keys=self.BOOK_SORT_KEYS, filter_provider=self._current_filters, parent=self
+        )
+        self.books_model.fetch_failed.connect(self._on_books_fetch_failed)
+        self.books_table = self.create_paged_table(self.books_model)
         table_layout.addWidget(self.books_table)
         
         return table_card
     
+    def _current_filters(self) -> dict:
+        """Get the catalog filters selected in the action bar; read by the model once per result set."""
+        subject_filter = self.subject_filter.currentText()
+        class_filter = self.class_filter.currentText()
+        return {
+            'search': self.search_box.get_search_text().strip() or None,
+            'subject': None if subject_filter == "All Subjects" else subject_filter,
+            'class_name': None if class_filter == "All Classes" else class_filter,
+        }
+    
+    def _fetch_books_page(self, after, limit, sort_key, descending, **filters):
+        """Page fetcher for the books model; filtering and sorting run in SQL."""
+        return self.book_service.get_catalog_page(after, limit, sort_key, descending, **filters)
+    
+    def _format_book_row(self, book) -> list:
+        """Format a book as table cells."""
+        status = "Borrowed" if book.id in self.borrowed_ids else "Available"
+        # Display subject if available, otherwise fall back to category
+        subject_display = getattr(book, 'subject', None) or getattr(book, 'category', None) or ""
+        return [
+            book.book_number,
+            book.title,
+            book.author or "",
+            book.isbn or "",
+            subject_display,
+            book.class_name or "",
+            book.book_type.title(),
+            book.book_condition or "Good",
+            status,
+        ]
+    
+    def _selected_book(self):
+        """Get the book on the selected row, or None."""
+        selected_rows = self.books_table.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        return self.books_model.record(selected_rows[0].row())
+    
     def _refresh_books_table(self):
         """Refresh the books table with current data."""
         try:
-            # Get filters
-            subject_filter = self.subject_filter.currentText()
-            class_filter = self.class_filter.currentText()
-            
-            subject = None if subject_filter == "All Subjects" else subject_filter
-            class_name = None if class_filter == "All Classes" else class_filter
-            
-            # Get books
-            books = self.book_service.get_all_books()
-
-            # Apply filters
-            if subject:
-                # Check both subject and category fields for compatibility
-                books = [b for b in books if (getattr(b, 'subject', None) == subject or getattr(b, 'category', None) == subject)]
-            if class_name:
-                books = [b for b in books if b.class_name == class_name]
-
-            # Store current filtered data
-            self.current_books_data = books
-
-            # Apply sorting
-            sort_order = self.sort_combo.currentText()
-            if sort_order == "Ascending":
-                books = sorted(books, key=lambda x: x.book_number or "")
-            elif sort_order == "Descending":
-                books = sorted(books, key=lambda x: x.book_number or "", reverse=True)
-            
-            # Clear table
-            self.books_table.setRowCount(0)
-            
-            # Populate table
-            for book in books:
-                row = self.books_table.rowCount()
-                self.books_table.insertRow(row)
-                
-                # Get status
-                status = "Available"
-                try:
-                    borrowed = self.book_service.get_borrowed_books()
-                    if any(b.book_number == book.book_number for b in borrowed):
-                        status = "Borrowed"
-                except:
-                    pass
-                
-                self.books_table.setItem(row, 0, QTableWidgetItem(book.book_number))
-                self.books_table.setItem(row, 1, QTableWidgetItem(book.title))
-                self.books_table.setItem(row, 2, QTableWidgetItem(book.author or ""))
-                self.books_table.setItem(row, 3, QTableWidgetItem(book.isbn or ""))
-                # Display subject if available, otherwise fall back to category
-                subject_display = getattr(book, 'subject', None) or getattr(book, 'category', None) or ""
-                self.books_table.setItem(row, 4, QTableWidgetItem(subject_display))
-                self.books_table.setItem(row, 5, QTableWidgetItem(book.class_name or ""))
-                self.books_table.setItem(row, 6, QTableWidgetItem(book.book_type.title()))
-                self.books_table.setItem(row, 7, QTableWidgetItem(book.book_condition or "Good"))
-                self.books_table.setItem(row, 8, QTableWidgetItem(status))
-            
-            logger.info(f"Refreshed books table with {len(books)} books")
+            # Availability for the whole catalog in one query
+            self.borrowed_ids = self.book_service.get_borrowed_book_ids()
+            self.books_model.refresh()
+            logger.info(f"Refreshed books table, first page has {self.books_model.rowCount()} books")
         except Exception as e:
             logger.error(f"Error refreshing books table: {e}")
             show_error_message("Error", f"Failed to refresh books: {str(e)}", self)
     
+    def _on_books_fetch_failed(self, message: str):
+        """Handle a failed page load."""
+        logger.error(f"Error loading books page: {message}")
+        show_error_message("Error", f"Failed to load books: {message}", self)
+    
     def _on_search(self, text: str):
         """Handle search text change."""
-        # Filter table based on search text
-        for row in range(self.books_table.rowCount()):
-            match = False
-            for col in range(9):  # Check all columns
-                item = self.books_table.item(row, col)
-                if item and text.lower() in item.text().lower():
-                    match = True
-                    break
-            self.books_table.setRowHidden(row, not match)
+        self._refresh_books_table()
     
     def _on_filter_changed(self, text: str):
         """Handle filter change."""
@@ -283,7 +272,10 @@ class ViewBooksWindow(BaseFunctionWindow):
 
     def _on_sort_changed(self, sort_order: str):
         """Handle sort order change."""
-        self._refresh_books_table()
+        if sort_order == "None":
+            self.books_model.set_sort(None)
+        else:
+            self.books_model.set_sort('book_number', sort_order == "Descending")
     
     def _on_add_book(self):
         """Open add book window."""
@@ -299,12 +291,12 @@ class ViewBooksWindow(BaseFunctionWindow):
     
     def _on_edit_book(self):
         """Open edit book window."""
-        selected_rows = self.books_table.selectionModel().selectedRows()
-        if not selected_rows:
+        book = self._selected_book()
+        if book is None:
             show_error_message("No Selection", "Please select a book to edit.", self)
             return
         
-        book_number = self.books_table.item(selected_rows[0].row(), 0).text()
+        book_number = book.book_number
         from school_system.gui.windows.book_window.edit_book_window import EditBookWindow
         edit_window = EditBookWindow(book_number, self, self.current_user, self.current_role)
         edit_window.book_updated.connect(self._on_book_updated)
@@ -328,12 +320,12 @@ class ViewBooksWindow(BaseFunctionWindow):
     
     def _on_delete_book(self):
         """Handle delete book."""
-        selected_rows = self.books_table.selectionModel().selectedRows()
-        if not selected_rows:
+        book = self._selected_book()
+        if book is None:
             show_error_message("No Selection", "Please select a book to delete.", self)
             return
         
-        book_number = self.books_table.item(selected_rows[0].row(), 0).text()
+        book_number = book.book_number
         from school_system.gui.dialogs.confirm_dialog import ConfirmationDialog
         dialog = ConfirmationDialog(
             title="Delete Book",
@@ -354,7 +346,7 @@ class ViewBooksWindow(BaseFunctionWindow):
     def _on_export_excel(self):
         """Handle Excel export button click."""
         try:
-            if not self.current_books_data:
+            if self.books_model.rowCount() == 0:
                 show_error_message("No Data", "No books data to export. Please refresh the table first.", self)
                 return
 
@@ -387,7 +379,7 @@ class ViewBooksWindow(BaseFunctionWindow):
     def _on_export_pdf(self):
         """Handle PDF export button click."""
         try:
-            if not self.current_books_data:
+            if self.books_model.rowCount() == 0:
                 show_error_message("No Data", "No books data to export. Please refresh the table first.", self)
                 return
 
@@ -422,15 +414,11 @@ class ViewBooksWindow(BaseFunctionWindow):
         export_data = []
 
         try:
-            for book in self.current_books_data:
-                # Get status
-                status = "Available"
-                try:
-                    borrowed = self.book_service.get_borrowed_books()
-                    if any(b.book_number == book.book_number for b in borrowed):
-                        status = "Borrowed"
-                except:
-                    pass
+            borrowed_ids = self.book_service.get_borrowed_book_ids()
+            for book in self.book_service.iter_catalog(sort_by=self.books_model.sort_key,
+                                                       descending=self.books_model.descending,
+                                                       **self._current_filters()):
+                status = "Borrowed" if book.id in borrowed_ids else "Available"
 
                 book_info = {
                     "Book_Number": book.book_number,
@@ -22,44 +22,10 @@ from school_system.services.student_service import StudentService
 from school_system.services.teacher_service import TeacherService
 from school_system.services.furniture_service import FurnitureService
 from school_system.services.report_service import ReportService
+from school_system.services.stats_service import StatsService
 from school_system.gui.dashboard_data_manager import DashboardDataManager, DataState
 from school_system.services.class_management_service import ClassManagementService
-from school_system.gui.windows.user_window.user_window import UserWindow
-from school_system.gui.windows.user_window.view_users_window import ViewUsersWindow
-from school_system.gui.windows.user_window.add_user_window import AddUserWindow
-from school_system.gui.windows.user_window.edit_user_window import EditUserWindow
-from school_system.gui.windows.user_window.delete_user_window import DeleteUserWindow
-from school_system.gui.windows.user_window.user_settings_window import UserSettingsWindow
-from school_system.gui.windows.user_window.short_form_mappings_window import ShortFormMappingsWindow
-from school_system.gui.windows.user_window.user_sessions_window import UserSessionsWindow
-from school_system.gui.windows.user_window.user_activity_window import UserActivityWindow
-from school_system.gui.windows.user_window.user_validation import UserValidator
-from school_system.gui.windows.book_window import (
-    BookWindow,
-    BookAddWorkflow,
-    BookEditWorkflow,
-    BookBorrowWorkflow,
-    BookReturnWorkflow
-)
-from school_system.gui.windows.book_window.book_import_export_window import BookImportExportWindow
-from school_system.gui.windows.book_window.distribution_window import DistributionWindow
-from school_system.gui.windows.book_window.book_intake_window import BookIntakeWindow
-from school_system.gui.windows.furniture_window.manage_furniture_window import ManageFurnitureWindow
-from school_system.gui.windows.furniture_window.furniture_assignments_window import FurnitureAssignmentsWindow
-from school_system.gui.windows.furniture_window.furniture_maintenance_window import FurnitureMaintenanceWindow
-from school_system.gui.windows.report_window.book_reports_window import BookReportsWindow
-from school_system.gui.windows.report_window.student_reports_window import StudentReportsWindow
-from school_system.gui.windows.report_window.custom_reports_window import CustomReportsWindow
-from school_system.gui.windows.student_window.add_student_window import AddStudentWindow
-from school_system.gui.windows.student_window.edit_student_window import EditStudentWindow
-from school_system.gui.windows.student_window.view_students_window import ViewStudentsWindow
-from school_system.gui.windows.student_window.ream_management_window import ReamManagementWindow
-from school_system.gui.windows.student_window.student_promotion_window import StudentPromotionWindow
-from school_system.gui.windows.teacher_window.add_teacher_window import AddTeacherWindow
-from school_system.gui.windows.teacher_window.edit_teacher_window import EditTeacherWindow
-from school_system.gui.windows.teacher_window.view_teachers_window import ViewTeachersWindow
-from school_system.gui.windows.teacher_window.teacher_import_export_window import TeacherImportExportWindow
-
+from school_system.gui.windows.view_registry import load_view_class
 
 class MainWindow(BaseApplicationWindow):
     """Main application window for the school system with dropdown menus and dynamic content."""
@@ -112,22 +78,18 @@ class MainWindow(BaseApplicationWindow):
             self.teacher_service = TeacherService()
             self.furniture_service = FurnitureService()
             self.report_service = ReportService()
+            self.stats_service = StatsService()
             self.class_management_service = ClassManagementService()
 
             # Initialize the new DashboardDataManager
             self.dashboard_data_manager = DashboardDataManager(self)
 
-            # Register services with the data manager
-            if self.student_service:
-                self.dashboard_data_manager.register_service('student_service', self.student_service)
-            if self.teacher_service:
-                self.dashboard_data_manager.register_service('teacher_service', self.teacher_service)
-            if self.book_service:
-                self.dashboard_data_manager.register_service('book_service', self.book_service)
+            # Register services with the data manager. Counts come from the stats counters,
+            # registered last so they take over the count keys the report service also defines
             if self.report_service:
                 self.dashboard_data_manager.register_service('report_service', self.report_service)
-            if self.furniture_service:
-                self.dashboard_data_manager.register_service('furniture_service', self.furniture_service)
+            if self.stats_service:
+                self.dashboard_data_manager.register_service('stats_service', self.stats_service)
 
             # Connect data manager signals with debouncing
             self.dashboard_data_manager.data_updated.connect(self._on_dashboard_data_updated)
@@ -153,6 +115,7 @@ class MainWindow(BaseApplicationWindow):
             self.teacher_service = None
             self.furniture_service = None
             self.report_service = None
+            self.stats_service = None
             self.class_management_service = None
             self.dashboard_data_manager = None
 
@@ -945,87 +908,6 @@ class MainWindow(BaseApplicationWindow):
             "student_import_export": lambda: self._create_student_import_export_view(),
         }
         
-        # Add error handling for missing or corrupted files
-        try:
-            # Verify that all furniture windows can be imported
-            from school_system.gui.windows.furniture_window.manage_furniture_window import ManageFurnitureWindow
-            from school_system.gui.windows.furniture_window.furniture_assignments_window import FurnitureAssignmentsWindow
-            from school_system.gui.windows.furniture_window.furniture_maintenance_window import FurnitureMaintenanceWindow
-            logger.info("All furniture windows imported successfully")
-        except ImportError as e:
-            logger.error(f"Failed to import furniture windows: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load furniture module: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error loading furniture module: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Unexpected error loading furniture module: {str(e)}")
-
-        # Add error handling for user windows
-        try:
-            # Verify that all user windows can be imported
-            from school_system.gui.windows.user_window.user_window import UserWindow
-            from school_system.gui.windows.user_window.view_users_window import ViewUsersWindow
-            from school_system.gui.windows.user_window.add_user_window import AddUserWindow
-            from school_system.gui.windows.user_window.edit_user_window import EditUserWindow
-            from school_system.gui.windows.user_window.delete_user_window import DeleteUserWindow
-            from school_system.gui.windows.user_window.user_settings_window import UserSettingsWindow
-            from school_system.gui.windows.user_window.short_form_mappings_window import ShortFormMappingsWindow
-            from school_system.gui.windows.user_window.user_sessions_window import UserSessionsWindow
-            from school_system.gui.windows.user_window.user_activity_window import UserActivityWindow
-            logger.info("All user windows imported successfully")
-        except ImportError as e:
-            logger.error(f"Failed to import user windows: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load user module: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error loading user module: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Unexpected error loading user module: {str(e)}")
-
-        # Add error handling for student windows
-        try:
-            # Verify that all student windows can be imported
-            from school_system.gui.windows.student_window.add_student_window import AddStudentWindow
-            from school_system.gui.windows.student_window.edit_student_window import EditStudentWindow
-            from school_system.gui.windows.student_window.view_students_window import ViewStudentsWindow
-            from school_system.gui.windows.student_window.ream_management_window import ReamManagementWindow
-            from school_system.gui.windows.student_window.student_import_export_window import StudentImportExportWindow
-            from school_system.gui.windows.student_window.class_management_window import ClassManagementWindow
-            from school_system.gui.windows.student_window.library_activity_window import LibraryActivityWindow
-            logger.info("All student windows imported successfully")
-        except ImportError as e:
-            logger.error(f"Failed to import student windows: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load student module: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error loading student module: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Unexpected error loading student module: {str(e)}")
-
-        # Add error handling for report windows
-        try:
-            # Verify that all report windows can be imported
-            from school_system.gui.windows.report_window.book_reports_window import BookReportsWindow
-            from school_system.gui.windows.report_window.student_reports_window import StudentReportsWindow
-            from school_system.gui.windows.report_window.custom_reports_window import CustomReportsWindow
-            logger.info("All report windows imported successfully")
-        except ImportError as e:
-            logger.error(f"Failed to import report windows: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load report module: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error loading report module: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Unexpected error loading report module: {str(e)}")
-
-        # Add error handling for teacher windows
-        try:
-            # Verify that all teacher windows can be imported
-            from school_system.gui.windows.teacher_window.add_teacher_window import AddTeacherWindow
-            from school_system.gui.windows.teacher_window.edit_teacher_window import EditTeacherWindow
-            from school_system.gui.windows.teacher_window.view_teachers_window import ViewTeachersWindow
-            from school_system.gui.windows.teacher_window.teacher_import_export_window import TeacherImportExportWindow
-            logger.info("All teacher windows imported successfully")
-        except ImportError as e:
-            logger.error(f"Failed to import teacher windows: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load teacher module: {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error loading teacher module: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Unexpected error loading teacher module: {str(e)}")
-
         try:
             creator = content_creators.get(content_id)
             if creator:
@@ -2578,9 +2460,6 @@ class MainWindow(BaseApplicationWindow):
     def _create_manage_users_view(self) -> QWidget:
         """Create the manage users content view."""
         try:
-            # Import the user window logic but create content widget instead of window
-            from school_system.gui.windows.user_window.user_window import UserWindow
-
             # Create a container widget for the user management interface
             container = QWidget()
             layout = QVBoxLayout(container)
@@ -4114,8 +3993,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_view_users_window(self):
         """Open the view users window."""
         try:
-            from school_system.gui.windows.user_window.view_users_window import ViewUsersWindow
-            window = ViewUsersWindow(self, self.username, self.role)
+            window = load_view_class('view_users')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening view users window: {str(e)}")
@@ -4124,8 +4002,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_add_user_window(self):
         """Open the add user window."""
         try:
-            from school_system.gui.windows.user_window.add_user_window import AddUserWindow
-            window = AddUserWindow(self, self.username, self.role)
+            window = load_view_class('add_user')(self, self.username, self.role)
             window.user_added.connect(self._on_user_data_changed)
             window.show()
         except Exception as e:
@@ -4135,8 +4012,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_edit_user_window(self):
         """Open the user selection window for editing."""
         try:
-            from school_system.gui.windows.user_window.view_users_window import ViewUsersWindow
-            window = ViewUsersWindow(self, self.username, self.role)
+            window = load_view_class('view_users')(self, self.username, self.role)
             # The view users window has its own edit functionality
             window.show()
         except Exception as e:
@@ -4146,8 +4022,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_delete_user_window(self):
         """Open the delete user window."""
         try:
-            from school_system.gui.windows.user_window.delete_user_window import DeleteUserWindow
-            window = DeleteUserWindow(self, self.username, self.role)
+            window = load_view_class('delete_user')(self, self.username, self.role)
             window.user_deleted.connect(self._on_user_data_changed)
             window.show()
         except Exception as e:
@@ -4157,8 +4032,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_user_settings_window(self):
         """Open the user settings window."""
         try:
-            from school_system.gui.windows.user_window.user_settings_window import UserSettingsWindow
-            window = UserSettingsWindow(self, self.username, self.role)
+            window = load_view_class('user_settings')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening user settings window: {str(e)}")
@@ -4167,8 +4041,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_short_form_mappings_window(self):
         """Open the short form mappings window."""
         try:
-            from school_system.gui.windows.user_window.short_form_mappings_window import ShortFormMappingsWindow
-            window = ShortFormMappingsWindow(self, self.username, self.role)
+            window = load_view_class('short_form_mappings')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening short form mappings window: {str(e)}")
@@ -4177,8 +4050,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_user_sessions_window(self):
         """Open the user sessions window."""
         try:
-            from school_system.gui.windows.user_window.user_sessions_window import UserSessionsWindow
-            window = UserSessionsWindow(self, self.username, self.role)
+            window = load_view_class('user_sessions')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening user sessions window: {str(e)}")
@@ -4187,8 +4059,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_user_activity_window(self):
         """Open the user activity window."""
         try:
-            from school_system.gui.windows.user_window.user_activity_window import UserActivityWindow
-            window = UserActivityWindow(self, self.username, self.role)
+            window = load_view_class('user_activity')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening user activity window: {str(e)}")
@@ -4197,8 +4068,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_manage_users_window(self):
         """Open the main user management window."""
         try:
-            from school_system.gui.windows.user_window.user_window import UserWindow
-            window = UserWindow(self, self.username, self.role)
+            window = load_view_class('user_window')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening user management window: {str(e)}")
@@ -4207,8 +4077,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_view_students_window(self):
         """Open the view students window."""
         try:
-            from school_system.gui.windows.student_window.view_students_window import ViewStudentsWindow
-            window = ViewStudentsWindow(self, self.username, self.role)
+            window = load_view_class('view_students')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening view students window: {str(e)}")
@@ -4217,8 +4086,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_add_student_window(self):
         """Open the add student window."""
         try:
-            from school_system.gui.windows.student_window.add_student_window import AddStudentWindow
-            window = AddStudentWindow(self, self.username, self.role)
+            window = load_view_class('add_student')(self, self.username, self.role)
             window.student_added.connect(self._on_student_data_changed)
             window.show()
         except Exception as e:
@@ -4228,8 +4096,7 @@ class MainWindow(BaseApplicationWindow):
     def _show_edit_student_selection(self):
         """Show student selection for editing."""
         try:
-            from school_system.gui.windows.student_window.view_students_window import ViewStudentsWindow
-            window = ViewStudentsWindow(self, self.username, self.role)
+            window = load_view_class('view_students')(self, self.username, self.role)
             # The view students window has its own edit functionality
             window.show()
         except Exception as e:
@@ -4239,8 +4106,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_edit_student_window(self, student_id: str):
         """Open the edit student window for a specific student."""
         try:
-            from school_system.gui.windows.student_window.edit_student_window import EditStudentWindow
-            window = EditStudentWindow(student_id, self, self.username, self.role)
+            window = load_view_class('edit_student')(student_id, self, self.username, self.role)
             window.student_updated.connect(self._on_student_data_changed)
             window.show()
         except Exception as e:
@@ -4250,7 +4116,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_student_promotion_window(self):
         """Open the student promotion window."""
         try:
-            window = StudentPromotionWindow(self, self.username, self.role)
+            window = load_view_class('student_promotion')(self, self.username, self.role)
             window.show()
             logger.info("Student promotion window opened")
         except Exception as e:
@@ -4260,8 +4126,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_student_import_export_window(self):
         """Open the student import/export window."""
         try:
-            from school_system.gui.windows.student_window.student_import_export_window import StudentImportExportWindow
-            window = StudentImportExportWindow(self, self.username, self.role)
+            window = load_view_class('student_import_export')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening student import/export window: {str(e)}")
@@ -4270,8 +4135,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_class_management_window(self):
         """Open the class management window."""
         try:
-            from school_system.gui.windows.student_window.class_management_window import ClassManagementWindow
-            window = ClassManagementWindow(self, self.username, self.role)
+            window = load_view_class('class_management')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening class management window: {str(e)}")
@@ -4280,8 +4144,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_enhanced_class_management_window(self):
         """Open the enhanced class management window."""
         try:
-            from school_system.gui.windows.student_window.enhanced_class_management_window import EnhancedClassManagementWindow
-            window = EnhancedClassManagementWindow(self, self.username, self.role)
+            window = load_view_class('enhanced_class_management')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening enhanced class management window: {str(e)}")
@@ -4290,8 +4153,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_library_activity_window(self):
         """Open the library activity window."""
         try:
-            from school_system.gui.windows.student_window.library_activity_window import LibraryActivityWindow
-            window = LibraryActivityWindow(self, self.username, self.role)
+            window = load_view_class('library_activity')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening library activity window: {str(e)}")
@@ -4300,8 +4162,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_ream_management_window(self):
         """Open the ream management window."""
         try:
-            from school_system.gui.windows.student_window.ream_management_window import ReamManagementWindow
-            window = ReamManagementWindow(self, self.username, self.role)
+            window = load_view_class('ream_management')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening ream management window: {str(e)}")
@@ -4310,8 +4171,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_view_teachers_window(self):
         """Open the view teachers window."""
         try:
-            from school_system.gui.windows.teacher_window.view_teachers_window import ViewTeachersWindow
-            window = ViewTeachersWindow(self, self.username, self.role)
+            window = load_view_class('view_teachers')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening view teachers window: {str(e)}")
@@ -4320,8 +4180,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_add_teacher_window(self):
         """Open the add teacher window."""
         try:
-            from school_system.gui.windows.teacher_window.add_teacher_window import AddTeacherWindow
-            window = AddTeacherWindow(self, self.username, self.role)
+            window = load_view_class('add_teacher')(self, self.username, self.role)
             window.teacher_added.connect(self._on_teacher_data_changed)
             window.show()
         except Exception as e:
@@ -4331,8 +4190,7 @@ class MainWindow(BaseApplicationWindow):
     def _show_edit_teacher_selection(self):
         """Show teacher selection for editing."""
         try:
-            from school_system.gui.windows.teacher_window.view_teachers_window import ViewTeachersWindow
-            window = ViewTeachersWindow(self, self.username, self.role)
+            window = load_view_class('view_teachers')(self, self.username, self.role)
             # The view teachers window has its own edit functionality
             window.show()
         except Exception as e:
@@ -4342,8 +4200,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_edit_teacher_window(self, teacher_id: str):
         """Open the edit teacher window for a specific teacher."""
         try:
-            from school_system.gui.windows.teacher_window.edit_teacher_window import EditTeacherWindow
-            window = EditTeacherWindow(teacher_id, self, self.username, self.role)
+            window = load_view_class('edit_teacher')(teacher_id, self, self.username, self.role)
             window.teacher_updated.connect(self._on_teacher_data_changed)
             window.show()
         except Exception as e:
@@ -4353,8 +4210,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_teacher_import_export_window(self):
         """Open the teacher import/export window."""
         try:
-            from school_system.gui.windows.teacher_window.teacher_import_export_window import TeacherImportExportWindow
-            window = TeacherImportExportWindow(self, self.username, self.role)
+            window = load_view_class('teacher_import_export')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening teacher import/export window: {str(e)}")
@@ -4363,8 +4219,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_view_books_window(self):
         """Open the view books window."""
         try:
-            from school_system.gui.windows.book_window.view_books_window import ViewBooksWindow
-            window = ViewBooksWindow(self, self.username, self.role)
+            window = load_view_class('view_books')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening view books window: {str(e)}")
@@ -4373,8 +4228,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_add_book_window(self):
         """Open the add book window."""
         try:
-            from school_system.gui.windows.book_window.add_book_window import AddBookWindow
-            window = AddBookWindow(self, self.username, self.role)
+            window = load_view_class('add_book')(self, self.username, self.role)
             window.book_added.connect(self._on_book_data_changed)
             window.show()
         except Exception as e:
@@ -4384,8 +4238,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_borrow_book_window(self):
         """Open the borrow book window."""
         try:
-            from school_system.gui.windows.book_window.borrow_book_window import BorrowBookWindow
-            window = BorrowBookWindow(self, self.username, self.role)
+            window = load_view_class('borrow_book_basic')(self, self.username, self.role)
             window.book_borrowed.connect(self._on_book_data_changed)
             window.show()
         except Exception as e:
@@ -4395,8 +4248,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_return_book_window(self):
         """Open the return book window."""
         try:
-            from school_system.gui.windows.book_window.return_book_window import ReturnBookWindow
-            window = ReturnBookWindow(self, self.username, self.role)
+            window = load_view_class('return_book_basic')(self, self.username, self.role)
             window.book_returned.connect(self._on_book_data_changed)
             window.show()
         except Exception as e:
@@ -4407,7 +4259,6 @@ class MainWindow(BaseApplicationWindow):
         """Open the enhanced borrow per stream per subject window."""
         try:
             # First, show a dialog to select class/stream/subject (optional)
-            from school_system.gui.windows.book_window.enhanced_borrow_window import EnhancedBorrowWindow
             from school_system.gui.windows.dialogs.class_stream_selection_dialog import ClassStreamSelectionDialog
             
             # Open selection dialog
@@ -4416,7 +4267,7 @@ class MainWindow(BaseApplicationWindow):
                 class_name = selection_dialog.get_class_level()
                 stream_name = selection_dialog.get_stream()
 
-                window = EnhancedBorrowWindow(
+                window = load_view_class('borrow_book')(
                     self,
                     self.username,
                     self.role,
@@ -4428,8 +4279,7 @@ class MainWindow(BaseApplicationWindow):
         except ImportError:
             # If selection dialog doesn't exist, open directly without filters
             try:
-                from school_system.gui.windows.book_window.enhanced_borrow_window import EnhancedBorrowWindow
-                window = EnhancedBorrowWindow(
+                window = load_view_class('borrow_book')(
                     self,
                     self.username,
                     self.role,
@@ -4449,7 +4299,6 @@ class MainWindow(BaseApplicationWindow):
         """Open the enhanced return per stream per subject window."""
         try:
             # First, show a dialog to select class/stream/subject (optional)
-            from school_system.gui.windows.book_window.enhanced_return_window import EnhancedReturnWindow
             from school_system.gui.windows.dialogs.class_stream_selection_dialog import ClassStreamSelectionDialog
 
             # Open selection dialog
@@ -4458,7 +4307,7 @@ class MainWindow(BaseApplicationWindow):
                 class_name = selection_dialog.get_class_level()
                 stream_name = selection_dialog.get_stream()
 
-                window = EnhancedReturnWindow(
+                window = load_view_class('return_book')(
                     self,
                     self.username,
                     self.role,
@@ -4470,8 +4319,7 @@ class MainWindow(BaseApplicationWindow):
         except ImportError:
             # If selection dialog doesn't exist, open directly without filters
             try:
-                from school_system.gui.windows.book_window.enhanced_return_window import EnhancedReturnWindow
-                window = EnhancedReturnWindow(
+                window = load_view_class('return_book')(
                     self,
                     self.username,
                     self.role,
@@ -4490,8 +4338,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_qr_management_window(self):
         """Open the QR code management window."""
         try:
-            from school_system.gui.windows.book_window.qr_management_window import QRManagementWindow
-            window = QRManagementWindow(
+            window = load_view_class('qr_management')(
                 self,
                 self.username,
                 self.role,
@@ -4506,8 +4353,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_distribution_window(self):
         """Open the distribution window."""
         try:
-            from school_system.gui.windows.book_window.distribution_window import DistributionWindow
-            window = DistributionWindow(self, self.username, self.role)
+            window = load_view_class('distribution')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening distribution window: {str(e)}")
@@ -4516,8 +4362,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_book_import_export_window(self):
         """Open the book import/export window."""
         try:
-            from school_system.gui.windows.book_window.book_import_export_window import BookImportExportWindow
-            window = BookImportExportWindow(self, self.username, self.role)
+            window = load_view_class('book_import_export')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening book import/export window: {str(e)}")
@@ -4526,7 +4371,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_book_intake_window(self):
         """Open the book intake window."""
         try:
-            window = BookIntakeWindow(self, self.username, self.role)
+            window = load_view_class('book_intake')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening book intake window: {str(e)}")
@@ -4535,8 +4380,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_manage_furniture_window(self):
         """Open the manage furniture window."""
         try:
-            from school_system.gui.windows.furniture_window.manage_furniture_window import ManageFurnitureWindow
-            window = ManageFurnitureWindow(self, self.username, self.role)
+            window = load_view_class('manage_furniture')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening manage furniture window: {str(e)}")
@@ -4545,8 +4389,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_furniture_assignments_window(self):
         """Open the furniture assignments window."""
         try:
-            from school_system.gui.windows.furniture_window.furniture_assignments_window import FurnitureAssignmentsWindow
-            window = FurnitureAssignmentsWindow(self, self.username, self.role)
+            window = load_view_class('furniture_assignments')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening furniture assignments window: {str(e)}")
@@ -4555,8 +4398,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_furniture_maintenance_window(self):
         """Open the furniture maintenance window."""
         try:
-            from school_system.gui.windows.furniture_window.furniture_maintenance_window import FurnitureMaintenanceWindow
-            window = FurnitureMaintenanceWindow(self, self.username, self.role)
+            window = load_view_class('furniture_maintenance')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening furniture maintenance window: {str(e)}")
@@ -4566,7 +4408,6 @@ class MainWindow(BaseApplicationWindow):
         """Open the enhanced furniture management window."""
         try:
             # First, show a dialog to select class/stream (optional)
-            from school_system.gui.windows.furniture_window.enhanced_furniture_management_window import EnhancedFurnitureManagementWindow
             from school_system.gui.windows.dialogs.class_stream_selection_dialog import ClassStreamSelectionDialog
             
             # Open selection dialog
@@ -4575,7 +4416,7 @@ class MainWindow(BaseApplicationWindow):
                 class_level = selection_dialog.get_class_level()
                 stream = selection_dialog.get_stream()
                 
-                window = EnhancedFurnitureManagementWindow(
+                window = load_view_class('enhanced_furniture_management')(
                     self,
                     self.username,
                     self.role,
@@ -4587,8 +4428,7 @@ class MainWindow(BaseApplicationWindow):
         except ImportError:
             # If selection dialog doesn't exist, open directly without filters
             try:
-                from school_system.gui.windows.furniture_window.enhanced_furniture_management_window import EnhancedFurnitureManagementWindow
-                window = EnhancedFurnitureManagementWindow(
+                window = load_view_class('enhanced_furniture_management')(
                     self,
                     self.username,
                     self.role,
@@ -4607,8 +4447,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_book_reports_window(self):
         """Open the book reports window."""
         try:
-            from school_system.gui.windows.report_window.book_reports_window import BookReportsWindow
-            window = BookReportsWindow(self, self.username, self.role)
+            window = load_view_class('book_reports')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening book reports window: {str(e)}")
@@ -4617,8 +4456,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_student_reports_window(self):
         """Open the student reports window."""
         try:
-            from school_system.gui.windows.report_window.student_reports_window import StudentReportsWindow
-            window = StudentReportsWindow(self, self.username, self.role)
+            window = load_view_class('student_reports')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening student reports window: {str(e)}")
@@ -4627,8 +4465,7 @@ class MainWindow(BaseApplicationWindow):
     def _open_custom_reports_window(self):
         """Open the custom reports window."""
         try:
-            from school_system.gui.windows.report_window.custom_reports_window import CustomReportsWindow
-            window = CustomReportsWindow(self, self.username, self.role)
+            window = load_view_class('custom_reports')(self, self.username, self.role)
             window.show()
         except Exception as e:
             logger.error(f"Error opening custom reports window: {str(e)}")
@@ -6328,8 +6165,7 @@ For additional support, contact your system administrator.
 
         if self.dashboard_data_manager:
             # Check if data is currently being fetched
-            if hasattr(self.dashboard_data_manager, '_active_workers') and \
-               data_key in self.dashboard_data_manager._active_workers:
+            if self.dashboard_data_manager.is_loading(data_key):
                 is_loading = True
             else:
                 # Try to get cached data
@@ -7695,7 +7531,9 @@ Developed for efficient school administration."""
             cache_hit_rate = perf_stats.get('cache_hit_rate', 0)
 
             if active_workers > 0:
-                status_text = f"🔄 Loading ({active_workers} active)"
+                queue_depth = cache_stats.get('queue_depth', 0)
+                status_text = f"🔄 Loading ({active_workers} active"
+                status_text += f", {queue_depth} queued)" if queue_depth else ")"
                 color = "#fbbf24"  # Yellow
             elif cache_hit_rate > 0.8:
                 status_text = f"⚡ Fast ({cache_hit_rate:.1%} hit rate)"
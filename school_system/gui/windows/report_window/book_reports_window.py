@@ -4,7 +4,9 @@ Book Reports Window
 Dedicated window for generating book reports.
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QTableWidget, QTableWidgetItem, QFileDialog, QTextEdit
+from itertools import islice
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QTableWidget, QTableWidgetItem, QFileDialog, QTextEdit
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QColor
 
@@ -22,6 +24,9 @@ class BookReportsWindow(BaseFunctionWindow):
         super().__init__("Book Reports", parent, current_user, current_role)
         
         self.report_service = ReportService()
+        # Set while a streamed report is being added to the table; see _populate_borrowed_books_table
+        self._streaming = False
+        self._stop_streaming = False
         
         # Setup content
         self.setup_content()
@@ -94,16 +99,16 @@ class BookReportsWindow(BaseFunctionWindow):
         type_layout.addStretch()
         
         # Generate button
-        generate_btn = self.create_button("Generate Report", "primary")
-        generate_btn.setFixedHeight(44)
-        generate_btn.clicked.connect(self._on_generate_report)
-        type_layout.addWidget(generate_btn)
+        self.generate_btn = self.create_button("Generate Report", "primary")
+        self.generate_btn.setFixedHeight(44)
+        self.generate_btn.clicked.connect(self._on_generate_report)
+        type_layout.addWidget(self.generate_btn)
         
         # Export button
-        export_btn = self.create_button("Export Report", "secondary")
-        export_btn.setFixedHeight(44)
-        export_btn.clicked.connect(self._on_export_report)
-        type_layout.addWidget(export_btn)
+        self.export_btn = self.create_button("Export Report", "secondary")
+        self.export_btn.setFixedHeight(44)
+        self.export_btn.clicked.connect(self._on_export_report)
+        type_layout.addWidget(self.export_btn)
         
         layout.addLayout(type_layout)
         
@@ -177,8 +182,62 @@ class BookReportsWindow(BaseFunctionWindow):
             logger.error(f"Error populating books table: {e}")
             show_error_message("Error", f"Failed to display report data: {str(e)}", self)
     
+    def _populate_borrowed_books_table(self, rows, page_size: int = 200):
+        """
+        Fill the results table from a streamed borrowed books report, one page at a time.
+
+        Events are processed between pages while the report's cursor is still
+        open, so the report controls are disabled until it finishes and
+        closing the window stops the stream.
+        """
+        self._set_report_controls_enabled(False)
+        self._streaming = True
+        self._stop_streaming = False
+        try:
+            self.results_table.setRowCount(0)
+            page = list(islice(rows, page_size))
+            while page:
+                start_row = self.results_table.rowCount()
+                self.results_table.setRowCount(start_row + len(page))
+                for offset, row in enumerate(page):
+                    row_idx = start_row + offset
+                    details = f"{row['student_name']} - {row['days_borrowed']} days"
+                    self.results_table.setItem(row_idx, 0, QTableWidgetItem(str(row['book_number'])))
+                    self.results_table.setItem(row_idx, 1, QTableWidgetItem(row['title'] or ''))
+                    self.results_table.setItem(row_idx, 2, QTableWidgetItem(row['status']))
+                    self.results_table.setItem(row_idx, 3, QTableWidgetItem(details))
+                # Keep the window responsive while large reports stream in
+                QApplication.processEvents()
+                if self._stop_streaming:
+                    break
+                page = list(islice(rows, page_size))
+
+        except Exception as e:
+            logger.error(f"Error populating borrowed books table: {e}")
+            show_error_message("Error", f"Failed to display report data: {str(e)}", self)
+        finally:
+            # Closing the generator closes its cursor even if the stream was stopped early
+            if hasattr(rows, 'close'):
+                rows.close()
+            self._streaming = False
+            self._set_report_controls_enabled(True)
+
+    def _set_report_controls_enabled(self, enabled: bool):
+        """Enable or disable the controls that start a report or act on its results."""
+        for control in (self.report_type_combo, self.generate_btn, self.export_btn):
+            control.setEnabled(enabled)
+
+    def closeEvent(self, event):
+        """Stop a report that is still streaming before the window closes."""
+        if self._streaming:
+            self._stop_streaming = True
+        super().closeEvent(event)
+
     def _on_generate_report(self):
         """Handle generate report."""
+        if self._streaming:
+            # A click queued before the controls were disabled
+            return
         report_type = self.report_type_combo.currentText()
 
         try:
@@ -190,9 +249,10 @@ class BookReportsWindow(BaseFunctionWindow):
                 report_data = self.report_service.get_all_books_report()
                 self._populate_books_table(report_data)
             elif report_type == "Borrowed Books":
-                # This would need to be implemented in ReportService
-                report_data = self.report_service.get_borrowed_books_report()
-                self._populate_books_table(report_data)
+                self._populate_borrowed_books_table(self.report_service.iter_borrowed_books_report())
+                if self._stop_streaming:
+                    # The window was closed while the report streamed
+                    return
             elif report_type == "Available Books":
                 # This would need to be implemented in ReportService
                 report_data = self.report_service.get_available_books_report()
@@ -10,12 +10,13 @@ from PyQt6.QtGui import QFont
 import pandas as pd
 import csv
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from school_system.gui.windows.base_function_window import BaseFunctionWindow
 from school_system.gui.dialogs.message_dialog import show_error_message, show_success_message, show_info_message
 from school_system.config.logging import logger
+from school_system.database.connection import db_connection
 from school_system.services.student_service import StudentService
 from school_system.gui.windows.student_window.student_validation import StudentValidator
 from school_system.gui.windows.book_window.utils.constants import (
@@ -33,6 +34,7 @@ class ImportWorker(QThread):
     """Worker thread for importing student data."""
     progress = pyqtSignal(int)
     finished = pyqtSignal(list)  # List of import results
+    imported = pyqtSignal(int)  # Number of students imported from an Excel sheet
     error = pyqtSignal(str)
 
     def __init__(self, file_path: str, file_format: str, student_service: StudentService, validator: StudentValidator):
@@ -45,6 +47,10 @@ class ImportWorker(QThread):
     def run(self):
         """Run the import process."""
         try:
+            if self.file_format == 'excel':
+                self._import_excel()
+                return
+
             # Read data from file
             data = self._read_file_data()
             if not data:
@@ -99,14 +105,31 @@ class ImportWorker(QThread):
 
         except Exception as e:
             self.error.emit(f"Import failed: {str(e)}")
+        finally:
+            # Hand this thread's pooled connection back for the next worker
+            db_connection.release_thread_connection()
+
+    def _import_excel(self):
+        """Stream an Excel sheet through the service's batched import, reporting progress as it goes."""
+        count = self.student_service.import_students_from_excel(
+            self.file_path, progress_callback=self._report_progress
+        )
+        if not count:
+            self.error.emit("No students were imported. The file may be empty, or a row was rejected "
+                            "and the whole import rolled back; see the log for details.")
+            return
+        self.imported.emit(count)
+
+    def _report_progress(self, processed: int, total: Optional[int]):
+        """Forward import progress as a percentage."""
+        if total:
+            self.progress.emit(min(int(processed / total * 100), 100))
 
     def _read_file_data(self) -> List[Dict[str, Any]]:
         """Read data from the file based on format."""
         try:
             if self.file_format == 'csv':
                 return self._read_csv()
-            elif self.file_format == 'excel':
-                return self._read_excel()
             elif self.file_format == 'json':
                 return self._read_json()
             else:
@@ -135,23 +158,6 @@ class ImportWorker(QThread):
                 data.append(student_data)
         return data
 
-    def _read_excel(self) -> List[Dict[str, Any]]:
-        """Read data from Excel file."""
-        df = pd.read_excel(self.file_path)
-        data = []
-        for _, row in df.iterrows():
-            student_data = {}
-            for col in EXCEL_STUDENT_IMPORT_COLUMNS:
-                value = str(row.get(col, '')).strip()
-                student_data[col.lower().replace('_', '_')] = value
-
-            # Normalize class name
-            if 'class_name' in student_data and student_data['class_name']:
-                student_data['class_name'] = normalize_class_name(student_data['class_name'])
-
-            data.append(student_data)
-        return data
-
     def _read_json(self) -> List[Dict[str, Any]]:
         """Read data from JSON file."""
         with open(self.file_path, 'r', encoding='utf-8') as file:
@@ -456,6 +462,7 @@ class StudentImportExportWindow(BaseFunctionWindow):
 
         self.import_worker.progress.connect(self._update_import_progress)
         self.import_worker.finished.connect(self._on_import_finished)
+        self.import_worker.imported.connect(self._on_excel_import_finished)
         self.import_worker.error.connect(self._on_import_error)
         self.import_worker.start()
 
@@ -489,6 +496,13 @@ class StudentImportExportWindow(BaseFunctionWindow):
         if failed > 0:
             show_info_message("Import Completed with Errors", f"{failed} students failed to import. Check results for details.", self)
 
+    def _on_excel_import_finished(self, count: int):
+        """Handle completion of an Excel import, which is all-or-nothing and reports only a count."""
+        self.import_progress.setVisible(False)
+        self.import_btn.setEnabled(True)
+        self.results_text.setPlainText(f"Import completed: {count} students imported")
+        show_success_message("Import Successful", f"Successfully imported {count} students.", self)
+
     def _on_import_error(self, error_msg: str):
         """Handle import error."""
         self.import_progress.setVisible(False)
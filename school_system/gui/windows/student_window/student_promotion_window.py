@@ -11,6 +11,7 @@ from PyQt6.QtGui import QFont
 from school_system.gui.windows.base_function_window import BaseFunctionWindow
 from school_system.gui.dialogs.message_dialog import show_error_message, show_success_message, show_info_message
 from school_system.config.logging import logger
+from school_system.database.connection import db_connection
 from school_system.services.student_service import StudentService
 from school_system.gui.windows.book_window.utils.constants import STANDARD_CLASSES
 
@@ -57,6 +58,9 @@ class PromotionWorker(QThread):
 
         except Exception as e:
             self.error.emit(f"Promotion failed: {str(e)}")
+        finally:
+            # Hand this thread's pooled connection back for the next worker
+            db_connection.release_thread_connection()
 
 
 class StudentPromotionWindow(BaseFunctionWindow):
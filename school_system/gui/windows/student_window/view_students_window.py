@@ -4,12 +4,13 @@ View Students Window
 Dedicated window for viewing and managing students list.
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QComboBox, QListWidget, QSizePolicy
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QListWidget, QSizePolicy
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from typing import Optional
 
 from school_system.gui.windows.base_function_window import BaseFunctionWindow
+from school_system.gui.base.widgets import KeysetPagedModel, SearchBox
 from school_system.gui.dialogs.message_dialog import show_error_message, show_success_message
 from school_system.config.logging import logger
 from school_system.services.student_service import StudentService
@@ -21,12 +22,17 @@ from school_system.gui.windows.student_window.student_workflow_components import
 class ViewStudentsWindow(BaseFunctionWindow):
     """Dedicated window for viewing and managing students."""
     
+    STUDENT_HEADERS = ["Student ID", "Name", "Class", "Stream", "Legacy Stream", "Actions"]
+    # Table column -> StudentRepository sort key
+    STUDENT_SORT_KEYS = {0: 'student_id', 1: 'name', 2: 'class', 3: 'stream_name', 4: 'stream'}
+    
     def __init__(self, parent=None, current_user: str = "", current_role: str = ""):
         """Initialize the view students window."""
         super().__init__("View Students", parent, current_user, current_role)
 
         self.student_service = StudentService()
         self.students_table = None
+        self.students_model = None
         self.action_bar_layout = None  # Reference to action bar layout
 
         # Setup content
@@ -91,6 +97,7 @@ class ViewStudentsWindow(BaseFunctionWindow):
         
         # Search box
         self.search_box = self.create_search_box("Search students by name, ID, or stream...")
+        self.search_box.set_debounce_delay(SearchBox.INDEXED_DEBOUNCE_MS)
         self.search_box.setMinimumWidth(250)
         self.search_box.search_text_changed.connect(self._on_search)
         action_layout.addWidget(self.search_box)
@@ -163,12 +170,13 @@ class ViewStudentsWindow(BaseFunctionWindow):
         title_label.setStyleSheet(f"color: {theme['text']}; margin-bottom: 8px;")
         table_layout.addWidget(title_label)
         
-        # Students table
-        self.students_table = self.create_table(0, 6)
-        self.students_table.setColumnCount(6)  # Ensure columns are set
-        self.students_table.setHorizontalHeaderLabels(["Student ID", "Name", "Class", "Stream", "Legacy Stream", "Actions"])
-        self.students_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.students_table.setAlternatingRowColors(True)
+        # Students table: pages are loaded from the database as the user scrolls
+        self.students_model = KeysetPagedModel(
+            self._fetch_students_page, self._format_student_row, self.STUDENT_HEADERS,
+            sort_keys=self.STUDENT_SORT_KEYS, filter_provider=self._current_filters, parent=self
+        )
+        self.students_model.fetch_failed.connect(self._on_students_fetch_failed)
+        self.students_table = self.create_paged_table(self.students_model)
         self.students_table.setMinimumHeight(150)
         self.students_table.setMinimumWidth(400)
         table_layout.addWidget(self.students_table)
@@ -221,6 +229,39 @@ class ViewStudentsWindow(BaseFunctionWindow):
         self._populate_stream_filter()
         self._refresh_students_table()
     
+    def _current_filters(self) -> dict:
+        """Get the student filters selected in the action bar; read by the model once per result set."""
+        class_filter = self.class_filter.currentText()
+        stream_filter = self.stream_filter.currentText()
+        return {
+            'search': self.search_box.get_search_text().strip() or None,
+            'class_name': None if class_filter == "All Classes" else class_filter,
+            'stream_name': None if stream_filter == "All Streams" else stream_filter,
+        }
+
+    def _fetch_students_page(self, after, limit, sort_key, descending, **filters):
+        """Page fetcher for the students model; filtering and sorting run in SQL."""
+        return self.student_service.get_students_page(after, limit, sort_key, descending, **filters)
+
+    def _format_student_row(self, student) -> list:
+        """Format a student as table cells."""
+        return [
+            student.student_id,
+            student.name,
+            student.class_name or "",
+            student.stream_name or "",
+            student.stream,
+            "",  # Actions column (can add buttons here if needed)
+        ]
+
+    def _selected_student_id(self) -> Optional[str]:
+        """Get the id of the student on the selected row, or None."""
+        selected_rows = self.students_table.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        student = self.students_model.record(selected_rows[0].row())
+        return student.student_id if student is not None else None
+
     def _refresh_students_table(self):
         """Refresh the students table with current data."""
         # Ensure table is initialized
@@ -228,75 +269,20 @@ class ViewStudentsWindow(BaseFunctionWindow):
             return
 
         try:
-            # Get filters
-            class_filter = self.class_filter.currentText()
-            stream_filter = self.stream_filter.currentText()
-
-            class_name = None if class_filter == "All Classes" else class_filter
-            stream_name = None if stream_filter == "All Streams" else stream_filter
-
-            # Get students based on filters
-            if class_name and stream_name:
-                students = self.student_service.get_students_by_class_and_stream(class_name, stream_name)
-            elif class_name:
-                students = self.student_service.get_students_by_class(class_name)
-            elif stream_name:
-                students = self.student_service.get_students_by_stream_name(stream_name)
-            else:
-                students = self.student_service.get_all_students()
-            
-            # Clear table
-            self.students_table.setRowCount(0)
-            
-            # Populate table
-            for student in students:
-                row = self.students_table.rowCount()
-                self.students_table.insertRow(row)
-                
-                self.students_table.setItem(row, 0, QTableWidgetItem(student.student_id))
-                self.students_table.setItem(row, 1, QTableWidgetItem(student.name))
-                self.students_table.setItem(row, 2, QTableWidgetItem(student.class_name or ""))
-                self.students_table.setItem(row, 3, QTableWidgetItem(student.stream_name or ""))
-                self.students_table.setItem(row, 4, QTableWidgetItem(student.stream))
-
-                # Actions column (can add buttons here if needed)
-                self.students_table.setItem(row, 5, QTableWidgetItem(""))
-
-            # Resize columns to fit content
-            self.students_table.resizeColumnsToContents()
-            self.students_table.resizeRowsToContents()
-
-            # Ensure minimum height for visibility
-            if self.students_table.rowCount() > 0:
-                self.students_table.setMinimumHeight(200)
-
-            # Force layout update
-            self.students_table.update()
-            self.students_table.repaint()
-            table_card = self.students_table.parent()
-            if table_card:
-                table_card.update()
-                table_card.repaint()
-
-            logger.info(f"Refreshed students table with {len(students)} students")
-            logger.debug(f"Table row count: {self.students_table.rowCount()}, column count: {self.students_table.columnCount()}")
-            logger.debug(f"Table is visible: {self.students_table.isVisible()}")
-            logger.debug(f"Table size: {self.students_table.size()}")
+            self.students_model.refresh()
+            logger.info(f"Refreshed students table, first page has {self.students_model.rowCount()} students")
         except Exception as e:
             logger.error(f"Error refreshing students table: {e}")
             show_error_message("Error", f"Failed to refresh students: {str(e)}", self)
+
+    def _on_students_fetch_failed(self, message: str):
+        """Handle a failed page load."""
+        logger.error(f"Error loading students page: {message}")
+        show_error_message("Error", f"Failed to load students: {message}", self)
     
     def _on_search(self, text: str):
         """Handle search text change."""
-        # Filter table based on search text
-        for row in range(self.students_table.rowCount()):
-            match = False
-            for col in range(3):  # Check first 3 columns
-                item = self.students_table.item(row, col)
-                if item and text.lower() in item.text().lower():
-                    match = True
-                    break
-            self.students_table.setRowHidden(row, not match)
+        self._refresh_students_table()
     
     def _on_filter_changed(self, text: str):
         """Handle filter change."""
@@ -311,12 +297,11 @@ class ViewStudentsWindow(BaseFunctionWindow):
     
     def _on_edit_student(self):
         """Open edit student window."""
-        selected_rows = self.students_table.selectionModel().selectedRows()
-        if not selected_rows:
+        student_id = self._selected_student_id()
+        if student_id is None:
             show_error_message("No Selection", "Please select a student to edit.", self)
             return
         
-        student_id = self.students_table.item(selected_rows[0].row(), 0).text()
         from school_system.gui.windows.student_window.edit_student_window import EditStudentWindow
         edit_window = EditStudentWindow(student_id, self, self.current_user, self.current_role)
         edit_window.student_updated.connect(self._refresh_students_table)
@@ -324,12 +309,11 @@ class ViewStudentsWindow(BaseFunctionWindow):
     
     def _on_delete_student(self):
         """Handle delete student."""
-        selected_rows = self.students_table.selectionModel().selectedRows()
-        if not selected_rows:
+        student_id = self._selected_student_id()
+        if student_id is None:
             show_error_message("No Selection", "Please select a student to delete.", self)
             return
         
-        student_id = self.students_table.item(selected_rows[0].row(), 0).text()
         from school_system.gui.dialogs.confirm_dialog import ConfirmationDialog
         dialog = ConfirmationDialog(
             title="Delete Student",
@@ -9,6 +9,7 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from school_system.gui.windows.base_function_window import BaseFunctionWindow
+from school_system.gui.base.widgets import SearchBox
 from school_system.gui.dialogs.message_dialog import show_error_message, show_success_message
 from school_system.config.logging import logger
 from school_system.services.teacher_service import TeacherService
@@ -70,9 +71,18 @@ class ViewTeachersWindow(BaseFunctionWindow):
         action_layout.setSpacing(12)
         
         # Search box
-        self.search_box = self.create_search_box("Search teachers by name, ID, or department...")
+        # FTS results are memoized until the teachers table changes
+        self.search_box = self.create_memoized_search_box(
+            "Search teachers by name, ID, or department...",
+            search_func=self.teacher_service.search_teachers, tables=('teachers',)
+        )
+        self.search_box.set_debounce_delay(SearchBox.INDEXED_DEBOUNCE_MS)
         self.search_box.setMinimumWidth(300)
         self.search_box.search_text_changed.connect(self._on_search)
+        self.search_box.search_results_ready.connect(self._on_search_results)
+        self.search_box.search_failed.connect(
+            lambda text, error: show_error_message("Error", f"Failed to search teachers: {error}", self)
+        )
         action_layout.addWidget(self.search_box)
         
         action_layout.addStretch()
@@ -136,36 +146,41 @@ class ViewTeachersWindow(BaseFunctionWindow):
     def _refresh_teachers_table(self):
         """Refresh the teachers table with current data."""
         try:
-            teachers = self.teacher_service.get_all_teachers()
-            
-            # Clear table
-            self.teachers_table.setRowCount(0)
-            
-            # Populate table
-            for teacher in teachers:
-                row = self.teachers_table.rowCount()
-                self.teachers_table.insertRow(row)
-                
-                self.teachers_table.setItem(row, 0, QTableWidgetItem(teacher.teacher_id))
-                self.teachers_table.setItem(row, 1, QTableWidgetItem(teacher.teacher_name))
-                self.teachers_table.setItem(row, 2, QTableWidgetItem(teacher.department or ""))
-            
-            logger.info(f"Refreshed teachers table with {len(teachers)} teachers")
+            search = self.search_box.get_search_text()
+            if search.strip():
+                teachers = self.search_box.search(search)
+            else:
+                teachers = self.teacher_service.get_all_teachers()
+            self._populate_teachers_table(teachers)
         except Exception as e:
             logger.error(f"Error refreshing teachers table: {e}")
             show_error_message("Error", f"Failed to refresh teachers: {str(e)}", self)
     
+    def _populate_teachers_table(self, teachers):
+        """Fill the teachers table with the given teachers."""
+        # Clear table
+        self.teachers_table.setRowCount(0)
+        
+        # Populate table
+        for teacher in teachers:
+            row = self.teachers_table.rowCount()
+            self.teachers_table.insertRow(row)
+            
+            self.teachers_table.setItem(row, 0, QTableWidgetItem(teacher.teacher_id))
+            self.teachers_table.setItem(row, 1, QTableWidgetItem(teacher.teacher_name))
+            self.teachers_table.setItem(row, 2, QTableWidgetItem(teacher.department or ""))
+        
+        logger.info(f"Refreshed teachers table with {len(teachers)} teachers")
+    
     def _on_search(self, text: str):
-        """Handle search text change."""
-        # Filter table based on search text
-        for row in range(self.teachers_table.rowCount()):
-            match = False
-            for col in range(5):  # Check all columns
-                item = self.teachers_table.item(row, col)
-                if item and text.lower() in item.text().lower():
-                    match = True
-                    break
-            self.teachers_table.setRowHidden(row, not match)
+        """Show every teacher when the search is cleared; searches arrive through _on_search_results."""
+        if not text.strip():
+            self._refresh_teachers_table()
+    
+    def _on_search_results(self, text: str, teachers):
+        """Show the memoized search results for a non-blank query."""
+        if text.strip():
+            self._populate_teachers_table(teachers)
     
     def _on_add_teacher(self):
         """Open add teacher window."""
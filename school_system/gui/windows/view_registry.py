@@ -0,0 +1,122 @@
+"""
+Lazy registry of the windows opened from the main window.
+
+Window modules pull in their own services, widgets and report libraries, so
+importing them all with the main window made every launch pay for screens
+that were never opened. The registry maps a view id to its module and class;
+the class is imported the first time the view is used, or ahead of time by
+``prewarm_views`` on a background thread after login.
+"""
+
+import importlib
+import threading
+import time
+from typing import Dict, Iterable, Tuple, Type
+
+from school_system.config.logging import logger
+
+_WINDOWS = 'school_system.gui.windows'
+
+# view id -> (module, class name)
+VIEW_REGISTRY: Dict[str, Tuple[str, str]] = {
+    'user_window': (f'{_WINDOWS}.user_window.user_window', 'UserWindow'),
+    'view_users': (f'{_WINDOWS}.user_window.view_users_window', 'ViewUsersWindow'),
+    'add_user': (f'{_WINDOWS}.user_window.add_user_window', 'AddUserWindow'),
+    'delete_user': (f'{_WINDOWS}.user_window.delete_user_window', 'DeleteUserWindow'),
+    'user_settings': (f'{_WINDOWS}.user_window.user_settings_window', 'UserSettingsWindow'),
+    'short_form_mappings': (f'{_WINDOWS}.user_window.short_form_mappings_window', 'ShortFormMappingsWindow'),
+    'user_sessions': (f'{_WINDOWS}.user_window.user_sessions_window', 'UserSessionsWindow'),
+    'user_activity': (f'{_WINDOWS}.user_window.user_activity_window', 'UserActivityWindow'),
+    'view_students': (f'{_WINDOWS}.student_window.view_students_window', 'ViewStudentsWindow'),
+    'add_student': (f'{_WINDOWS}.student_window.add_student_window', 'AddStudentWindow'),
+    'edit_student': (f'{_WINDOWS}.student_window.edit_student_window', 'EditStudentWindow'),
+    'student_import_export': (f'{_WINDOWS}.student_window.student_import_export_window', 'StudentImportExportWindow'),
+    'student_promotion': (f'{_WINDOWS}.student_window.student_promotion_window', 'StudentPromotionWindow'),
+    'class_management': (f'{_WINDOWS}.student_window.class_management_window', 'ClassManagementWindow'),
+    'enhanced_class_management': (f'{_WINDOWS}.student_window.enhanced_class_management_window',
+                                  'EnhancedClassManagementWindow'),
+    'library_activity': (f'{_WINDOWS}.student_window.library_activity_window', 'LibraryActivityWindow'),
+    'ream_management': (f'{_WINDOWS}.student_window.ream_management_window', 'ReamManagementWindow'),
+    'view_teachers': (f'{_WINDOWS}.teacher_window.view_teachers_window', 'ViewTeachersWindow'),
+    'add_teacher': (f'{_WINDOWS}.teacher_window.add_teacher_window', 'AddTeacherWindow'),
+    'edit_teacher': (f'{_WINDOWS}.teacher_window.edit_teacher_window', 'EditTeacherWindow'),
+    'teacher_import_export': (f'{_WINDOWS}.teacher_window.teacher_import_export_window', 'TeacherImportExportWindow'),
+    'view_books': (f'{_WINDOWS}.book_window.view_books_window', 'ViewBooksWindow'),
+    'add_book': (f'{_WINDOWS}.book_window.add_book_window', 'AddBookWindow'),
+    'borrow_book_basic': (f'{_WINDOWS}.book_window.borrow_book_window', 'BorrowBookWindow'),
+    'return_book_basic': (f'{_WINDOWS}.book_window.return_book_window', 'ReturnBookWindow'),
+    'borrow_book': (f'{_WINDOWS}.book_window.enhanced_borrow_window', 'EnhancedBorrowWindow'),
+    'return_book': (f'{_WINDOWS}.book_window.enhanced_return_window', 'EnhancedReturnWindow'),
+    'qr_management': (f'{_WINDOWS}.book_window.qr_management_window', 'QRManagementWindow'),
+    'book_import_export': (f'{_WINDOWS}.book_window.book_import_export_window', 'BookImportExportWindow'),
+    'book_intake': (f'{_WINDOWS}.book_window.book_intake_window', 'BookIntakeWindow'),
+    'distribution': (f'{_WINDOWS}.book_window.distribution_window', 'DistributionWindow'),
+    'manage_furniture': (f'{_WINDOWS}.furniture_window.manage_furniture_window', 'ManageFurnitureWindow'),
+    'furniture_assignments': (f'{_WINDOWS}.furniture_window.furniture_assignments_window', 'FurnitureAssignmentsWindow'),
+    'furniture_maintenance': (f'{_WINDOWS}.furniture_window.furniture_maintenance_window', 'FurnitureMaintenanceWindow'),
+    'enhanced_furniture_management': (f'{_WINDOWS}.furniture_window.enhanced_furniture_management_window',
+                                      'EnhancedFurnitureManagementWindow'),
+    'book_reports': (f'{_WINDOWS}.report_window.book_reports_window', 'BookReportsWindow'),
+    'student_reports': (f'{_WINDOWS}.report_window.student_reports_window', 'StudentReportsWindow'),
+    'custom_reports': (f'{_WINDOWS}.report_window.custom_reports_window', 'CustomReportsWindow'),
+}
+
+# role -> views most often opened first after logging in, in pre-warm order
+LIKELY_VIEWS: Dict[str, Tuple[str, ...]] = {
+    'admin': ('view_students', 'view_books', 'view_users', 'view_teachers'),
+    'librarian': ('borrow_book', 'return_book', 'qr_management', 'view_books', 'view_students'),
+    'teacher': ('view_students', 'view_books', 'borrow_book'),
+}
+
+_loaded: Dict[str, type] = {}
+_lock = threading.Lock()
+
+
+def load_view_class(view_id: str) -> Type:
+    """
+    Get the window class of a view, importing its module on first use.
+
+    Raises:
+        KeyError: If the view id is not registered.
+    """
+    view_class = _loaded.get(view_id)
+    if view_class is None:
+        module_name, class_name = VIEW_REGISTRY[view_id]
+        view_class = getattr(importlib.import_module(module_name), class_name)
+        with _lock:
+            _loaded[view_id] = view_class
+    return view_class
+
+
+def is_view_loaded(view_id: str) -> bool:
+    """Whether the view's class has already been imported."""
+    return view_id in _loaded
+
+
+def prewarm_views(view_ids: Iterable[str]) -> threading.Thread:
+    """
+    Import the given views on a daemon thread so opening them later is instant.
+
+    Only modules are imported; widgets are still created on the GUI thread
+    when the view is opened. Failures are logged and left for the view to
+    report when it is actually opened.
+    """
+    pending = [view_id for view_id in view_ids if view_id in VIEW_REGISTRY and view_id not in _loaded]
+
+    def run():
+        started = time.perf_counter()
+        for view_id in pending:
+            try:
+                load_view_class(view_id)
+            except Exception as e:
+                logger.warning(f"Could not pre-warm view {view_id}: {e}")
+        logger.info(f"Pre-warmed {len(pending)} views in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    thread = threading.Thread(target=run, name="view-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def prewarm_views_for_role(role: str) -> threading.Thread:
+    """Pre-warm the views the given role is most likely to open next."""
+    return prewarm_views(LIKELY_VIEWS.get(role, LIKELY_VIEWS['teacher']))
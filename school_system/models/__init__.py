@@ -6,4 +6,6 @@ from .teacher import Teacher
 from .book import Book, BookTag, BorrowedBookStudent, BorrowedBookTeacher, QRBook, QRBorrowLog, DistributionSession, DistributionStudent, DistributionImportLog
 from .furniture import Chair, Locker, FurnitureCategory, LockerAssignment, ChairAssignment
 from .user import User, UserSetting, ShortFormMapping
+from .stats import StatsCounter
+from .rows import BookRow, StudentRow, BorrowedBookStudentRow, BorrowedBookTeacherRow
 from .base import get_db_session
@@ -1,5 +1,14 @@
 # Book models
 from .base import BaseModel, get_db_session
+from datetime import datetime
+import hashlib
+
+
+def make_book_qr_code(book_number, title):
+    """Build a unique 16-character book QR code ("BK" + 14 hex digits) from the book number, title and current time."""
+    unique_string = f"{book_number}_{title}_{datetime.now().isoformat()}"
+    return "BK" + hashlib.sha256(unique_string.encode()).hexdigest()[:14].upper()
+
 
 class Book(BaseModel):
     __tablename__ = 'books'
@@ -59,6 +68,7 @@ class Book(BaseModel):
              self.publication_date, self.available, self.revision, self.book_condition,
              self.subject, self.class_name, self.qr_code, self.qr_generated_at)
         )
+        self.id = cursor.lastrowid
         db.commit()
     
     def update(self):
@@ -79,25 +89,9 @@ class Book(BaseModel):
 
     def generate_qr_code(self):
         """Generate a unique QR code for this book."""
-        try:
-            from school_system.services.qr_service import QRService
-            qr_service = QRService()
-
-            # Generate QR code containing book information
-            qr_data = f"BOOK:{self.book_number}|{self.title}|{self.author}"
-            self.qr_code = qr_service.generate_qr_code(qr_data)
-
-            import datetime
-            self.qr_generated_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            return self.qr_code
-        except Exception as e:
-            # Fallback to simple hash if QR generation fails
-            import hashlib
-            import datetime
-            unique_string = f"{self.book_number}_{self.title}_{datetime.datetime.now().isoformat()}"
-            self.qr_code = hashlib.sha256(unique_string.encode()).hexdigest()[:16].upper()
-            self.qr_generated_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            return self.qr_code
+        self.qr_code = make_book_qr_code(self.book_number, self.title)
+        self.qr_generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return self.qr_code
 
     def __repr__(self):
         return f"<Book(book_number={self.book_number}, title={self.title}, qr_code={self.qr_code}, available={self.available})>"
@@ -0,0 +1,89 @@
+# Read-only row types for bulk reads
+"""
+Compact, immutable row objects for read-only bulk queries.
+
+The mutable models in this package carry a ``__dict__`` and two
+``datetime.utcnow()`` calls per instance, which adds up when reports load
+tens of thousands of rows only to read them. The row types here are named
+tuples (no per-instance ``__dict__``), are built straight from cursor rows,
+and expose the same attribute names as the models they mirror. Use the
+models for anything that is saved back to the database.
+"""
+
+from collections import namedtuple
+from operator import itemgetter
+from typing import Callable, Sequence
+
+from .student import derive_stream
+
+# Database column -> attribute name where the models rename a column
+COLUMN_ALIASES = {'class': 'class_name'}
+
+
+class BookRow(namedtuple('BookRow', (
+        'id', 'book_number', 'title', 'author', 'category', 'isbn', 'publication_date',
+        'available', 'revision', 'book_condition', 'subject', 'class_name', 'qr_code',
+        'qr_generated_at'))):
+    """Read-only view of a ``books`` row."""
+    __slots__ = ()
+
+    @property
+    def book_type(self):
+        """Get book type as string ('course' or 'revision')."""
+        return "revision" if self.revision == 1 or self.revision == "1" else "course"
+
+
+class StudentRow(namedtuple('StudentRow', (
+        'student_id', 'admission_number', 'name', 'stream', 'class_name', 'stream_name',
+        'created_at', 'qr_code', 'qr_generated_at'))):
+    """Read-only view of a ``students`` row."""
+    __slots__ = ()
+
+    @staticmethod
+    def _adapt(values: tuple) -> tuple:
+        """Derive the legacy stream value the same way the Student model does."""
+        student_id, admission_number, name, stream, class_name, stream_name = values[:6]
+        return (student_id, admission_number, name, derive_stream(class_name, stream_name, stream),
+                class_name, stream_name) + tuple(values[6:])
+
+
+class BorrowedBookStudentRow(namedtuple('BorrowedBookStudentRow', (
+        'student_id', 'book_id', 'borrowed_on', 'reminder_days', 'returned_on',
+        'return_condition', 'fine_amount', 'returned_by'))):
+    """Read-only view of a ``borrowed_books_student`` row."""
+    __slots__ = ()
+
+
+class BorrowedBookTeacherRow(namedtuple('BorrowedBookTeacherRow', (
+        'teacher_id', 'book_id', 'borrowed_on', 'returned_on'))):
+    """Read-only view of a ``borrowed_books_teacher`` row."""
+    __slots__ = ()
+
+
+def make_row_builder(row_type: type, columns: Sequence[str]) -> Callable[[tuple], tuple]:
+    """
+    Build a function that turns a cursor row into ``row_type``.
+
+    Column positions are resolved once for the result layout; fields the
+    query did not select are None.
+
+    Args:
+        row_type: One of the row types in this module.
+        columns: Column names from ``cursor.description``, in order.
+    """
+    positions = {}
+    for index, column in enumerate(columns):
+        positions.setdefault(COLUMN_ALIASES.get(column, column), index)
+    indexes = [positions.get(field) for field in row_type._fields]
+
+    if None in indexes:
+        def values(row):
+            return tuple(row[i] if i is not None else None for i in indexes)
+    else:
+        values = itemgetter(*indexes)
+
+    new = tuple.__new__
+    adapt = getattr(row_type, '_adapt', None)
+    if adapt is not None:
+        return lambda row: new(row_type, adapt(values(row)))
+    return lambda row: new(row_type, values(row))
@@ -0,0 +1,20 @@
+"""
+Summary counter model for dashboard statistics.
+"""
+
+from .base import BaseModel
+
+
+class StatsCounter(BaseModel):
+    """One trigger-maintained counter from the stats_counters table."""
+
+    __tablename__ = 'stats_counters'
+    __pk__ = "name"
+
+    def __init__(self, name: str, value: int = 0, **kwargs):
+        super().__init__()
+        self.name = name
+        self.value = value
+
+    def __repr__(self):
+        return f"<StatsCounter(name={self.name}, value={self.value})>"
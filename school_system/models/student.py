@@ -1,6 +1,44 @@
 # Student models
 from .base import BaseModel, get_db_session
 from datetime import datetime
+import hashlib
+
+
+def extract_class_level(class_name):
+    """Extract numeric class level from class name (e.g., 'Form 4' -> 4)."""
+    if not class_name:
+        return None
+
+    class_name = class_name.lower()
+    if 'form' in class_name:
+        parts = class_name.split()
+        for part in parts:
+            if part.isdigit():
+                return int(part)
+    elif 'grade' in class_name:
+        parts = class_name.split()
+        for part in parts:
+            if part.isdigit():
+                return int(part)
+    elif class_name.isdigit():
+        return int(class_name)
+
+    return None
+
+
+def derive_stream(class_name, stream_name, stream=None):
+    """Build the legacy stream value (e.g. "4 Red") from the separate class and stream fields."""
+    if class_name and stream_name:
+        class_level = extract_class_level(class_name)
+        return f"{class_level} {stream_name}" if class_level else f"{class_name} {stream_name}"
+    return stream or ""
+
+
+def make_student_qr_code(admission_number, name):
+    """Build a unique 16-character student QR code from the admission number, name and current time."""
+    unique_string = f"{admission_number}_{name}_{datetime.now().isoformat()}"
+    return hashlib.sha256(unique_string.encode()).hexdigest()[:16].upper()
+
 
 class Student(BaseModel):
     __tablename__ = 'students'
@@ -24,13 +62,7 @@ class Student(BaseModel):
 
         # For backward compatibility, keep the old stream field
         # If new fields are provided, construct the old stream format
-        if self.class_name and stream_name:
-            # Extract class level from class_name (e.g., "Form 4" -> 4)
-            class_level = self._extract_class_level(self.class_name)
-            self.stream = f"{class_level} {stream_name}" if class_level else f"{self.class_name} {stream_name}"
-        else:
-            # Use provided stream or default
-            self.stream = stream or ""
+        self.stream = derive_stream(self.class_name, stream_name, stream)
 
         self.created_at = created_at if created_at is not None else datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.qr_code = qr_code
@@ -38,24 +70,7 @@ class Student(BaseModel):
 
     def _extract_class_level(self, class_name):
         """Extract numeric class level from class name (e.g., 'Form 4' -> 4)."""
-        if not class_name:
-            return None
-
-        class_name = class_name.lower()
-        if 'form' in class_name:
-            parts = class_name.split()
-            for part in parts:
-                if part.isdigit():
-                    return int(part)
-        elif 'grade' in class_name:
-            parts = class_name.split()
-            for part in parts:
-                if part.isdigit():
-                    return int(part)
-        elif class_name.isdigit():
-            return int(class_name)
-
-        return None
+        return extract_class_level(class_name)
     
     def save(self):
         """Save the student to the database."""
@@ -83,11 +98,8 @@ class Student(BaseModel):
 
     def generate_qr_code(self):
         """Generate a unique QR code for this student."""
-        import hashlib
-        import datetime
-        unique_string = f"{self.admission_number}_{self.name}_{datetime.datetime.now().isoformat()}"
-        self.qr_code = hashlib.sha256(unique_string.encode()).hexdigest()[:16].upper()
-        self.qr_generated_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.qr_code = make_student_qr_code(self.admission_number, self.name)
+        self.qr_generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return self.qr_code
 
     def __repr__(self):
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Verify or rebuild the trigger-maintained dashboard counters.
+
+    python -m school_system.scripts.stats_counters            # recount and store
+    python -m school_system.scripts.stats_counters --verify   # report drift only
+
+--verify exits with status 1 if any counter differs from a full recount.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from school_system.config.logging import logger
+from school_system.core.exceptions import DatabaseException
+from school_system.database.connection import db_connection
+from school_system.database.migrations import MigrationManager
+from school_system.services.stats_service import StatsService
+
+
+def run(verify_only: bool = False) -> bool:
+    """Verify the counters and, unless verify_only, rebuild them; returns True on success."""
+    service = StatsService()
+    try:
+        # Creates the counters on a database the application has not opened since upgrading
+        MigrationManager(db_connection.get_connection()).migrate()
+        mismatches = service.verify_counters()
+        if verify_only:
+            if mismatches:
+                logger.error(f"{len(mismatches)} stats counters differ from a full recount")
+                return False
+            logger.info("All stats counters match a full recount")
+            return True
+
+        values = service.rebuild_counters()
+        logger.info("Stats counters: " + ", ".join(f"{name}={value}" for name, value in values.items()))
+        return True
+    except DatabaseException as e:
+        logger.error(f"Stats counter {'verification' if verify_only else 'rebuild'} failed: {e}")
+        return False
+    finally:
+        db_connection.close_connection()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify or rebuild the dashboard summary counters.")
+    parser.add_argument('--verify', action='store_true',
+                        help="only compare the counters with a full recount")
+    args = parser.parse_args(argv)
+    return 0 if run(verify_only=args.verify) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,12 @@ from .teacher_service import TeacherService
 from .book_service import BookService
 from .furniture_service import FurnitureService
 from .qr_service import QRService
+from .qr_batch_service import QRBatchService
+from .scan_station_service import ScanStationService
 from .report_service import ReportService
 from .import_export_service import ImportExportService
 from .notification_service import NotificationService
+from .stats_service import StatsService
 
 __all__ = [
     'AuthService',
@@ -18,7 +21,10 @@ __all__ = [
     'BookService',
     'FurnitureService',
     'QRService',
+    'QRBatchService',
+    'ScanStationService',
     'ReportService',
     'ImportExportService',
-    'NotificationService'
+    'NotificationService',
+    'StatsService'
 ]
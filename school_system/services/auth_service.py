@@ -10,6 +10,7 @@ from school_system.config.logging import logger
 from school_system.config.settings import Settings
 from school_system.core.exceptions import AuthenticationError, ValidationError
 from school_system.core.utils import ValidationUtils, HashUtils
+from school_system.database.audit_writer import get_audit_writer
 from school_system.models.user import User, UserSetting, ShortFormMapping
 from school_system.database.repositories.user_repo import UserRepository
 from school_system.database.repositories.user_repo import UserSettingRepository
@@ -36,6 +37,7 @@ class AuthService:
         self.user_session_repository = UserSessionRepository()
         self.audit_log_repository = AuditLogRepository()
         self.user_activity_repository = UserActivityRepository()
+        self.audit_writer = get_audit_writer()
         self.settings_service = SettingsService()
     
     def authenticate_user(self, username: str, password: str) -> User:
@@ -133,7 +135,8 @@ class AuthService:
         user.save()
         
         # Log the user creation
-        self.audit_log_repository.create(
+        self.audit_writer.enqueue(
+            self.audit_log_repository,
             AuditLog(
                 user_id=username,
                 action="user_create",
@@ -371,7 +374,8 @@ class AuthService:
         logger.info(f"Password reset token generated for user: {username}")
         
         # Log the password reset request in the audit log
-        self.audit_log_repository.create(
+        self.audit_writer.enqueue(
+            self.audit_log_repository,
             AuditLog(
                 user_id=user.username,
                 action="password_reset_request",
@@ -417,7 +421,8 @@ class AuthService:
         
         if success:
             # Log the user deletion in the audit log
-            self.audit_log_repository.create(
+            self.audit_writer.enqueue(
+                self.audit_log_repository,
                 AuditLog(
                     user_id=username,
                     action="user_delete",
@@ -455,7 +460,8 @@ class AuthService:
         self.user_repository.update(user)
         
         # Log the role update in the audit log
-        self.audit_log_repository.create(
+        self.audit_writer.enqueue(
+            self.audit_log_repository,
             AuditLog(
                 user_id=user.username,
                 action="role_update",
@@ -485,7 +491,8 @@ class AuthService:
         created_session = self.user_session_repository.create(session)
         
         # Log the session creation in the audit log
-        self.audit_log_repository.create(
+        self.audit_writer.enqueue(
+            self.audit_log_repository,
             AuditLog(
                 user_id=username,
                 action="session_create",
@@ -517,7 +524,8 @@ class AuthService:
         self.user_session_repository.update(session)
         
         # Log the session expiration in the audit log
-        self.audit_log_repository.create(
+        self.audit_writer.enqueue(
+            self.audit_log_repository,
             AuditLog(
                 user_id=session.username,
                 action="session_expire",
@@ -538,17 +546,21 @@ class AuthService:
             details: Additional details about the action.
             
         Returns:
-            The created AuditLog object.
+            The queued AuditLog object; it is written by the audit writer shortly after.
+            
+        Raises:
+            ValidationError: If the user does not exist.
         """
         logger.info(f"Logging action for user: {username}")
         ValidationUtils.validate_input(username, "Username cannot be empty")
         ValidationUtils.validate_input(action, "Action cannot be empty")
+        self._require_existing_user(username)
         
         audit_log = AuditLog(user_id=username, action=action, details=details)
-        created_log = self.audit_log_repository.create(audit_log)
+        self.audit_writer.enqueue(self.audit_log_repository, audit_log)
 
         logger.info(f"Action logged successfully for user: {username}")
-        return created_log
+        return audit_log
 
     def get_all_users(self) -> list:
         """
@@ -587,14 +599,28 @@ class AuthService:
             details: Additional details about the activity.
             
         Returns:
-            The created UserActivity object.
+            The queued UserActivity object; it is written by the audit writer shortly after.
+            
+        Raises:
+            ValidationError: If the user does not exist.
         """
         logger.info(f"Tracking activity for user: {username}")
         ValidationUtils.validate_input(username, "Username cannot be empty")
         ValidationUtils.validate_input(activity_type, "Activity type cannot be empty")
+        self._require_existing_user(username)
         
         user_activity = UserActivity(username=username, activity_type=activity_type, details=details)
-        created_activity = self.user_activity_repository.create(user_activity)
+        self.audit_writer.enqueue(self.user_activity_repository, user_activity)
         
         logger.info(f"Activity tracked successfully for user: {username}")
-        return created_activity
+        return user_activity
+    
+    def _require_existing_user(self, username: str):
+        """
+        Reject an explicit log entry for an unknown user before it is queued.
+        
+        The audit writer flushes in the background, where a foreign key failure
+        can only be logged and dropped, so the caller has to hear about it here.
+        """
+        if not self.user_repository.get_user_by_username(username):
+            raise ValidationError(f"User does not exist: {username}")
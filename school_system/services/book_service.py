@@ -2,7 +2,9 @@
 Book service for managing book-related operations.
 """
 
-from typing import List, Optional, Union, Tuple, Dict
+import csv
+import weakref
+from typing import Callable, List, Optional, Union, Tuple, Dict, Set, Iterator
 from datetime import datetime, timedelta
 from school_system.config.logging import logger
 from school_system.config.settings import Settings
@@ -11,6 +13,7 @@ from school_system.core.utils import ValidationUtils
 from school_system.services.import_export_service import ImportExportService
 from school_system.services.student_service import StudentService
 from school_system.services.class_management_service import ClassManagementService
+from school_system.services.scan_station_service import ScanStationService
 
 from school_system.models.book import (Book, BookTag, BorrowedBookStudent, BorrowedBookTeacher,
  DistributionSession, DistributionStudent, DistributionImportLog, get_db_session)
@@ -18,17 +21,75 @@ from school_system.models.book import (Book, BookTag, BorrowedBookStudent, Borro
 from school_system.database.repositories.book_repo import (BookRepository,
         BookTagRepository, BorrowedBookStudentRepository, BorrowedBookTeacherRepository,
         DistributionSessionRepository,DistributionStudentRepository, DistributionImportLogRepository)
+from school_system.database.audit_writer import get_audit_writer
+from school_system.database.repositories.audit_log_repo import AuditLogRepository
+from school_system.models.audit_log import AuditLog
 
+# books columns written by the Excel import, in the order Book.save() uses
+BOOK_IMPORT_COLUMNS = ('book_number', 'title', 'author', 'category', 'isbn', 'publication_date',
+                       'available', 'revision', 'book_condition', 'subject', 'class', 'qr_code',
+                       'qr_generated_at')
+
+# Export headers, in the column order of BookRepository.iter_export_rows()
+BOOK_EXCEL_EXPORT_HEADERS = ('Book_Number', 'Title', 'Author', 'Subject', 'Class', 'Category', 'ISBN',
+                             'Publication_Date', 'Book_Condition', 'Available', 'Book_Type', 'QR_Code',
+                             'QR_Generated_At')
+BOOK_CSV_EXPORT_HEADERS = ('book_number', 'title', 'author', 'subject', 'class', 'category', 'isbn',
+                           'publication_date', 'book_condition', 'available', 'book_type', 'qr_code',
+                           'qr_generated_at')
 
 
 class BookService:
     """Service for managing book-related operations."""
 
+    # Callbacks told about book create/update/delete/QR changes, shared by every instance.
+    # Bound methods are held weakly so subscribing does not keep a service alive.
+    _change_listeners: List[Callable[[], Optional[Callable]]] = []
+
     def __init__(self):
         self.book_repository = BookRepository()
+        self.borrowed_book_student_repository = BorrowedBookStudentRepository()
+        self.borrowed_book_teacher_repository = BorrowedBookTeacherRepository()
+        self.distribution_student_repository = DistributionStudentRepository()
+        self.distribution_import_log_repository = DistributionImportLogRepository()
+        self.audit_log_repository = AuditLogRepository()
+        self.audit_writer = get_audit_writer()
         self.import_export_service = ImportExportService()
         self.student_service = StudentService()
         self.class_management_service = ClassManagementService()
+        self.scan_station_service = ScanStationService()
+
+    @classmethod
+    def add_change_listener(cls, callback: Callable[[str, List[int]], None]) -> None:
+        """
+        Register a callback for changes to book records.
+
+        The callback receives the change type ('create', 'update', 'delete',
+        'qr' or 'import') and the affected book ids.
+        """
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        cls._change_listeners.append(ref)
+
+    @classmethod
+    def remove_change_listener(cls, callback: Callable[[str, List[int]], None]) -> None:
+        """Unregister a callback added with add_change_listener."""
+        cls._change_listeners[:] = [ref for ref in cls._change_listeners if ref() not in (None, callback)]
+
+    @classmethod
+    def notify_books_changed(cls, change: str, book_ids: List[int]) -> None:
+        """Tell every registered listener that book records changed."""
+        for ref in list(cls._change_listeners):
+            callback = ref()
+            if callback is None:
+                cls._change_listeners.remove(ref)
+                continue
+            try:
+                callback(change, book_ids)
+            except Exception as e:
+                logger.error(f"Book change listener failed: {e}")
 
     def get_all_books(self) -> List[Book]:
         """
@@ -39,46 +100,67 @@ class BookService:
         """
         return self.book_repository.get_all()
 
-    def get_borrowed_books(self) -> List[Dict]:
+    def get_catalog_page(self, after: Optional[tuple] = None, limit: int = 200,
+                         sort_by: Optional[str] = None, descending: bool = False,
+                         **filters) -> Tuple[List[Book], Optional[tuple]]:
         """
-        Get all currently borrowed books from both students and teachers.
+        Get one keyset-paginated page of the book catalog.
+
+        Args:
+            after: Cursor returned with the previous page, None for the first page.
+            limit: Page size.
+            sort_by: Catalog sort key (see BookRepository.CATALOG_SORT_EXPRESSIONS).
+            descending: Sort direction.
+            **filters: search, subject, class_name and has_qr filters.
 
         Returns:
-            List of dictionaries with user_id, book_id, user_type, and borrowed_date
+            The books in the page and the cursor for the next page (None at the end).
         """
-        try:
-            # Get all borrowed books from both students and teachers
-            student_borrowings = self.get_all_borrowed_books_student()
-            teacher_borrowings = self.get_all_borrowed_books_teacher()
-
-            borrowed_books = []
+        return self.book_repository.fetch_catalog_page(
+            after=after, limit=limit, sort_by=sort_by, descending=descending, **filters
+        )
 
-            # Process student borrowings (only those not returned)
-            for borrowing in student_borrowings:
-                if not borrowing.returned_on:  # Only currently borrowed
-                    borrowed_books.append({
-                        'user_id': borrowing.student_id,
-                        'book_id': borrowing.book_id,
-                        'user_type': 'student',
-                        'borrowed_date': borrowing.borrowed_on
-                    })
+    def iter_catalog(self, page_size: int = 500, sort_by: Optional[str] = None,
+                     descending: bool = False, **filters) -> Iterator[Book]:
+        """
+        Iterate over every catalog book matching the filters, one page at a time.
 
-            # Process teacher borrowings (only those not returned)
-            for borrowing in teacher_borrowings:
-                if not borrowing.returned_on:  # Only currently borrowed
-                    borrowed_books.append({
-                        'user_id': borrowing.teacher_id,
-                        'book_id': borrowing.book_id,
-                        'user_type': 'teacher',
-                        'borrowed_date': borrowing.borrowed_on
-                    })
+        Yields:
+            Book objects in catalog order.
+        """
+        after = None
+        while True:
+            books, after = self.get_catalog_page(after, page_size, sort_by, descending, **filters)
+            yield from books
+            if after is None:
+                return
 
-            return borrowed_books
+    def get_borrowed_books(self) -> List[Dict]:
+        """
+        Get all currently borrowed books from both students and teachers.
 
+        Returns:
+            List of dictionaries with user_id, book_id, user_type, and borrowed_date
+        """
+        try:
+            return self.book_repository.get_open_loans()
         except Exception as e:
             logger.error(f"Error getting borrowed books: {e}")
             return []
 
+    def get_borrowed_book_ids(self) -> Set[int]:
+        """
+        Get the ids of all books currently on loan, for bulk availability checks.
+
+        Returns:
+            Set of book ids borrowed by a student or teacher and not yet returned.
+        """
+        try:
+            return self.book_repository.get_borrowed_book_ids()
+        except Exception as e:
+            logger.error(f"Error getting borrowed book ids: {e}")
+            return set()
+
     def get_book_by_id(self, book_id: int) -> Optional[Book]:
         """
         Retrieve a book by its ID.
@@ -110,6 +192,7 @@ class BookService:
         book = Book(**book_data)
         # Use the book's save method instead of repository create to ensure proper column mapping
         book.save()
+        self.notify_books_changed('create', [book.id] if book.id is not None else [])
         logger.info(f"Book created successfully with book_number: {book.book_number}")
         return book
 
@@ -134,6 +217,7 @@ class BookService:
         # Use the book's own update method instead of repository update
         # to handle special field mappings like class_name -> class
         book.update()
+        self.notify_books_changed('update', [book_id])
         return book
 
     def delete_book(self, book_id: int) -> bool:
@@ -151,6 +235,7 @@ class BookService:
             return False
 
         self.book_repository.delete(book)
+        self.notify_books_changed('delete', [book_id])
         return True
 
     def get_all_book_tags(self) -> List[BookTag]:
@@ -644,23 +729,25 @@ class BookService:
         distribution_import_log_repository.delete(distribution_import_log)
         return True
 
-    def import_books_from_excel(self, filename: str) -> List[Book]:
+    def import_books_from_excel(self, filename: str,
+                                progress_callback: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
         """
         Import books from an Excel file.
 
+        The sheet is streamed row by row and inserted in chunks inside one
+        transaction, so either every book is imported or none are.
+
         Args:
             filename: The name of the Excel file.
+            progress_callback: Called with (rows imported, total rows or None) after each chunk.
 
         Returns:
-            A list of imported Book objects.
+            The number of books imported, 0 if the import failed.
         """
         logger.info(f"Importing books from Excel file: {filename}")
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
 
         try:
-            data = self.import_export_service.import_from_excel(filename)
-            books = []
-
             # Column name mapping from Excel (Title Case) to Book constructor (lowercase)
             column_mapping = {
                 'Book_Number': 'book_number',
@@ -678,25 +765,33 @@ class BookService:
                 'QR_Generated_At': 'qr_generated_at'
             }
 
-            for book_data in data:
-                # Map Excel column names to Book constructor parameter names
-                mapped_data = {}
-                for excel_col, book_param in column_mapping.items():
-                    if excel_col in book_data:
-                        mapped_data[book_param] = book_data[excel_col]
-
-                # Create book with mapped data
-                book = Book(**mapped_data)
-                # Use the book's save method instead of repository create
-                # to handle special field mappings like class_name -> class
-                book.save()
-                books.append(book)
-
-            logger.info(f"Successfully imported {len(books)} books from {filename}")
-            return books
+            def book_rows():
+                for book_data in self.import_export_service.iter_excel_rows(filename):
+                    # Map Excel column names to Book constructor parameter names
+                    mapped_data = {}
+                    for excel_col, book_param in column_mapping.items():
+                        if excel_col in book_data:
+                            mapped_data[book_param] = book_data[excel_col]
+
+                    # The Book model handles special fields like book_type -> revision
+                    book = Book(**mapped_data)
+                    yield (book.book_number, book.title, book.author, book.category, book.isbn,
+                           book.publication_date, book.available, book.revision, book.book_condition,
+                           book.subject, book.class_name, book.qr_code, book.qr_generated_at)
+
+            imported = self.book_repository.insert_many(
+                BOOK_IMPORT_COLUMNS, book_rows(),
+                progress_callback=self.import_export_service.excel_progress_reporter(filename, progress_callback)
+            )
+
+            if imported:
+                # An import only adds rows, so listeners get no ids rather than one per row
+                self.notify_books_changed('import', [])
+            logger.info(f"Successfully imported {imported} books from {filename}")
+            return imported
         except Exception as e:
             logger.error(f"Error importing books from Excel: {e}")
-            return []
+            return 0
 
     def import_books_from_excel_with_validation(self, filename: str, required_columns: List[str]) -> Tuple[bool, List[Dict], str]:
         """
@@ -842,6 +937,10 @@ class BookService:
         
         This implements the updated DISTRIBUTION IMPORT FLOW that allows importing
         book numbers even if they are not yet in the books table.
+
+        The CSV is read once and bulk-loaded into a staging table; duplicate,
+        unknown and unavailable books are classified in SQL and the session's
+        rows are updated in one statement, all in one transaction.
         
         Args:
             session_id: ID of the distribution session
@@ -851,125 +950,30 @@ class BookService:
         Returns:
             Dictionary containing import statistics and categorization
         """
-        cursor = self.db.cursor()
-        
-        # Categorization counters
-        valid_books = 0
-        pending_books = 0
-        conflicts = 0
-        duplicate_book_numbers = 0
-        
-        # Track book numbers to detect duplicates
-        book_number_counts = {}
-        
-        # First pass: validate students and check for duplicate book numbers
-        with open(file_path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            
-            for row in reader:
-                student_id = row.get("student_id", "").strip()
-                book_number = row.get("book_number", "").strip()
-                
-                # Validate student exists (REQUIRED)
-                if not student_id:
-                    conflicts += 1
-                    continue
-                    
-                # Check for duplicate book numbers (NOT allowed)
-                if book_number:
-                    if book_number in book_number_counts:
-                        book_number_counts[book_number] += 1
-                        duplicate_book_numbers += 1
-                        conflicts += 1
-                    else:
-                        book_number_counts[book_number] = 1
-        
-        # Second pass: process the import
-        with open(file_path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            
-            for row in reader:
-                student_id = row.get("student_id", "").strip()
-                book_number = row.get("book_number", "").strip()
-                
-                # Skip if we already identified this as a conflict
-                if book_number and book_number_counts.get(book_number, 0) > 1:
-                    continue
-                
-                if not student_id:
-                    continue
-                
-                # Check if book exists in catalog
-                book_exists = False
-                book_id = None
-                
-                if book_number:
-                    cursor.execute(
-                        "SELECT book_id, available FROM books WHERE book_number = ?",
-                        (book_number,)
-                    )
-                    book = cursor.fetchone()
-                    
-                    if book:
-                        book_exists = True
-                        book_id = book[0]
-                        
-                        # Check availability if book exists
-                        if not book[1]:  # book[1] is the 'available' field
-                            conflicts += 1
-                            continue
-                    else:
-                        # Book doesn't exist in catalog - mark as PENDING_BOOK
-                        pending_books += 1
-                
-                # Update distribution_students record
-                if book_number:
-                    if book_exists:
-                        valid_books += 1
-                        cursor.execute("""
-                            UPDATE distribution_students
-                            SET book_number = ?, book_id = ?, notes = NULL
-                            WHERE session_id = ? AND student_id = ?
-                        """, (
-                            book_number,
-                            book_id,
-                            session_id,
-                            student_id
-                        ))
-                    else:
-                        # Book doesn't exist - save book_number but NULL book_id
-                        cursor.execute("""
-                            UPDATE distribution_students
-                            SET book_number = ?, book_id = NULL, notes = 'Not in system'
-                            WHERE session_id = ? AND student_id = ?
-                        """, (
-                            book_number,
-                            session_id,
-                            student_id
-                        ))
-                else:
-                    # No book number provided - just ensure student exists
-                    cursor.execute("""
-                        UPDATE distribution_students
-                        SET book_number = NULL, book_id = NULL, notes = NULL
-                        WHERE session_id = ? AND student_id = ?
-                    """, (
-                        session_id,
-                        student_id
-                    ))
-        
-        # Update session status to IMPORTED
-        cursor.execute("""
-            UPDATE distribution_sessions
-            SET status = 'IMPORTED'
-            WHERE id = ?
-        """, (session_id,))
+        def staged_rows():
+            with open(file_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    yield (row.get("student_id") or "").strip(), (row.get("book_number") or "").strip()
+
+        repository = self.distribution_student_repository
+        with repository.transaction():
+            counts = repository.apply_staged_import(session_id, staged_rows())
+            # Imported but not yet posted
+            repository.db.execute(
+                "UPDATE distribution_sessions SET status = 'IN_PROGRESS' WHERE session_id = ?",
+                (session_id,)
+            )
+
+        valid_books = counts.get('valid', 0)
+        pending_books = counts.get('pending', 0)
+        duplicate_book_numbers = counts['duplicate_extra']
+        conflicts = counts.get('missing_student', 0) + duplicate_book_numbers + counts.get('unavailable', 0)
         
         # Create import log
         status = "SUCCESS" if conflicts == 0 else "PARTIAL"
         message = f"Valid: {valid_books}, Pending: {pending_books}, Conflicts: {conflicts}"
         
-        self.log_repo.create(
+        self.distribution_import_log_repository.create(
             session_id=session_id,
             file_name=file_path,
             imported_by=imported_by,
@@ -977,8 +981,6 @@ class BookService:
             message=message
         )
         
-        self.db.commit()
-        
         return {
             "valid_books": valid_books,
             "pending_books": pending_books,
@@ -1071,41 +1073,6 @@ class BookService:
                 logger.error(f"Error undoing distribution session: {e}")
                 return False
     
-        def return_via_distribution(self, session_id: int, returned_by: str) -> bool:
-            """
-            Return all books assigned in a distribution session.
-            
-            Args:
-                session_id: ID of the distribution session
-                returned_by: Username of the user processing the returns
-                
-            Returns:
-                True if the return was successful, False otherwise
-            """
-            logger.info(f"Returning books via distribution session {session_id}")
-            
-            try:
-                cursor = self.db.cursor()
-                
-                # Get all book assignments for the session
-                cursor.execute("""
-                    SELECT student_id, book_id FROM distribution_students
-                    WHERE session_id = ? AND book_id IS NOT NULL
-                """, (session_id,))
-                
-                assignments = cursor.fetchall()
-                
-                # Return each book
-                for student_id, book_id in assignments:
-                    self.return_book_student(student_id, book_id, "Good", 0, returned_by)
-                
-                logger.info(f"Successfully returned {len(assignments)} books via distribution session {session_id}")
-                return True
-                
-            except Exception as e:
-                logger.error(f"Error returning books via distribution: {e}")
-                return False
-    
         def detect_duplicate_books(self) -> List[dict]:
             """
             Detect duplicate books in the system.
@@ -1218,80 +1185,6 @@ class BookService:
                 logger.error(f"Error getting borrowed books with details: {e}")
                 return []
     
-        def bulk_return_books(self, book_return_data: List[Dict], current_user: str) -> Tuple[bool, str, dict]:
-            """
-            Bulk return multiple books with comprehensive validation and error handling.
-    
-            Args:
-                book_return_data: List of dictionaries containing return information
-                current_user: Username of the user processing the returns
-    
-            Returns:
-                Tuple of (success, message, statistics)
-            """
-            try:
-                success_count = 0
-                error_count = 0
-                errors = []
-    
-                for return_item in book_return_data:
-                    try:
-                        book_id = return_item['book_id']
-                        borrower_id = return_item['borrower_id']
-                        borrower_type = return_item['borrower_type']
-                        condition = return_item.get('condition', 'Good')
-                        fine_amount = float(return_item.get('fine_amount', 0))
-    
-                        # Validate book exists and is borrowed
-                        book = self.get_book_by_id(book_id)
-                        if not book:
-                            errors.append(f"Book {book_id} not found")
-                            error_count += 1
-                            continue
-    
-                        # Process return based on borrower type
-                        if borrower_type == 'student':
-                            success = self.return_book_student(
-                                borrower_id, book_id, condition, fine_amount, current_user
-                            )
-                        else:
-                            success = self.return_book_teacher(borrower_id, book_id)
-    
-                        if success:
-                            success_count += 1
-                        else:
-                            errors.append(f"Failed to return book {book_id} for {borrower_type} {borrower_id}")
-                            error_count += 1
-    
-                    except Exception as e:
-                        errors.append(f"Error processing return: {str(e)}")
-                        error_count += 1
-    
-                # Log the bulk operation
-                self.log_user_action(
-                    current_user,
-                    "bulk_return",
-                    f"Bulk return operation: {success_count} successful, {error_count} failed"
-                )
-    
-                statistics = {
-                    'total_attempted': len(book_return_data),
-                    'success_count': success_count,
-                    'error_count': error_count,
-                    'errors': errors
-                }
-    
-                if error_count > 0:
-                    message = f"Bulk return completed with {error_count} errors. {success_count} books returned successfully."
-                else:
-                    message = f"Bulk return completed successfully. {success_count} books returned."
-    
-                return True, message, statistics
-    
-            except Exception as e:
-                logger.error(f"Error in bulk return: {e}")
-                return False, f"Bulk return failed: {str(e)}", {}
-    
         def _calculate_due_date(self, borrowed_on: str) -> str:
             """
             Calculate due date based on borrowed date.
@@ -1432,6 +1325,9 @@ class BookService:
         """
         Export books to an Excel file.
 
+        Books are streamed from the database into the file, so memory use does
+        not depend on the size of the catalog.
+
         Args:
             filename: The name of the Excel file.
 
@@ -1442,30 +1338,10 @@ class BookService:
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
 
         try:
-            books = self.book_repository.get_all()
-
-            # Convert books to exportable data using Title Case column names
-            # that match what the UI shows for import
-            data = []
-            for book in books:
-                book_dict = {
-                    'Book_Number': book.book_number,
-                    'Title': book.title,
-                    'Author': book.author,
-                    'Subject': getattr(book, 'subject', ''),
-                    'Class': getattr(book, 'class_name', ''),
-                    'Category': getattr(book, 'category', ''),
-                    'ISBN': getattr(book, 'isbn', ''),
-                    'Publication_Date': getattr(book, 'publication_date', ''),
-                    'Book_Condition': book.book_condition,
-                    'Available': book.available,
-                    'Book_Type': book.book_type,
-                    'QR_Code': getattr(book, 'qr_code', ''),
-                    'QR_Generated_At': getattr(book, 'qr_generated_at', '')
-                }
-                data.append(book_dict)
-
-            return self.import_export_service.export_to_excel(data, filename)
+            # Title Case column names that match what the UI shows for import
+            return self.import_export_service.export_rows_to_excel(
+                BOOK_EXCEL_EXPORT_HEADERS, self.book_repository.iter_export_rows(), filename
+            )
         except Exception as e:
             logger.error(f"Error exporting books to Excel: {e}")
             return False
@@ -1484,39 +1360,20 @@ class BookService:
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
 
         try:
-            books = self.book_repository.get_all()
-
-            # Convert books to exportable data
-            data = []
-            for book in books:
-                book_dict = {
-                    'book_number': book.book_number,
-                    'title': book.title,
-                    'author': book.author,
-                    'category': getattr(book, 'category', ''),
-                    'isbn': getattr(book, 'isbn', ''),
-                    'publication_date': getattr(book, 'publication_date', ''),
-                    'available': book.available,
-                    'book_type': book.book_type,
-                    'book_condition': book.book_condition,
-                    'subject': getattr(book, 'subject', ''),
-                    'class': getattr(book, 'class_name', ''),
-                    'qr_code': getattr(book, 'qr_code', ''),
-                    'qr_generated_at': getattr(book, 'qr_generated_at', '')
-                }
-                data.append(book_dict)
-
-            return self.import_export_service.export_to_csv(data, filename)
+            return self.import_export_service.export_rows_to_csv(
+                BOOK_CSV_EXPORT_HEADERS, self.book_repository.iter_export_rows(), filename
+            )
         except Exception as e:
             logger.error(f"Error exporting books to CSV: {e}")
             return False
 
-    def export_borrowed_books_to_excel(self, filename: str) -> bool:
+    def export_borrowed_books_to_excel(self, filename: str, include_returned: bool = False) -> bool:
         """
         Export borrowed books data to an Excel file.
 
         Args:
             filename: The name of the Excel file.
+            include_returned: Export the full loan history instead of open loans only.
 
         Returns:
             True if the export was successful, otherwise False.
@@ -1525,22 +1382,13 @@ class BookService:
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
 
         try:
-            # Get basic borrowed books data
-            borrowed_books = self.get_borrowed_books()
-
-            # Convert to export format
-            export_data = []
-            for book_info in borrowed_books:
-                export_dict = {
-                    'Book_ID': book_info.get('book_id', ''),
-                    'Book_Number': book_info.get('book_number', ''),
-                    'Student_ID': book_info.get('user_id', ''),
-                    'Borrowed_Date': book_info.get('borrowed_on', ''),
-                    'Status': 'Active'
-                }
-                export_data.append(export_dict)
-
-            return self.import_export_service.export_to_excel(export_data, filename)
+            loans = self.book_repository.iter_loan_export_rows(include_returned)
+            if include_returned:
+                headers = ['Book_ID', 'Book_Number', 'Student_ID', 'Borrowed_Date', 'Returned_Date', 'Status']
+            else:
+                headers = ['Book_ID', 'Book_Number', 'Student_ID', 'Borrowed_Date', 'Status']
+                loans = (loan[:4] + loan[5:] for loan in loans)
+            return self.import_export_service.export_rows_to_excel(headers, loans, filename)
         except Exception as e:
             logger.error(f"Error exporting borrowed books to Excel: {e}")
             return False
@@ -1702,7 +1550,7 @@ class BookService:
             List of unique subject names
         """
         try:
-            all_books = self.book_repository.get_all()
+            all_books = self.book_repository.iter_rows()
             subjects = set()
 
             for book in all_books:
@@ -1750,6 +1598,7 @@ class BookService:
 
             qr_code = book.generate_qr_code()
             self.book_repository.update(book)
+            self.notify_books_changed('qr', [book_id])
             logger.info(f"Generated QR code {qr_code} for book {book.book_number}")
             return qr_code
         except Exception as e:
@@ -1777,6 +1626,9 @@ class BookService:
         """
         Borrow a book using QR codes.
 
+        Scans are resolved through the in-memory scan index; see
+        ScanStationService.borrow for the result with latency.
+
         Args:
             book_qr_code: QR code of the book
             student_qr_code: QR code of the student
@@ -1784,25 +1636,7 @@ class BookService:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            # Get book by QR code
-            book = self.get_book_by_qr_code(book_qr_code)
-            if not book:
-                logger.error(f"Book with QR code {book_qr_code} not found")
-                return False
-
-            # Get student by QR code
-            student = self.student_service.get_student_by_qr_code(student_qr_code)
-            if not student:
-                logger.error(f"Student with QR code {student_qr_code} not found")
-                return False
-
-            # Borrow the book
-            return self.borrow_book(book.id, student.admission_number, 'student')
-
-        except Exception as e:
-            logger.error(f"Error borrowing book by QR codes: {e}")
-            return False
+        return self.scan_station_service.borrow(book_qr_code, student_qr_code)['success']
 
     def return_book_by_qr(self, book_qr_code: str, student_qr_code: str, return_condition: str = "Good") -> bool:
         """
@@ -1816,29 +1650,14 @@ class BookService:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            # Get book by QR code
-            book = self.get_book_by_qr_code(book_qr_code)
-            if not book:
-                logger.error(f"Book with QR code {book_qr_code} not found")
-                return False
-
-            # Get student by QR code
-            student = self.student_service.get_student_by_qr_code(student_qr_code)
-            if not student:
-                logger.error(f"Student with QR code {student_qr_code} not found")
-                return False
-
-            # Return the book
-            return self.return_book_student(student.admission_number, book.id, return_condition)
-
-        except Exception as e:
-            logger.error(f"Error returning book by QR codes: {e}")
-            return False
+        return self.scan_station_service.return_book(book_qr_code, student_qr_code, return_condition)['success']
     
     def log_user_action(self, username: str, action_type: str, details: str) -> bool:
         """
-        Log user action to audit trail.
+        Queue a user action for the audit trail.
+
+        The record is written in a batch by the audit writer, so the calling
+        operation does not wait for the insert.
         
         Args:
             username: Username of the user
@@ -1846,10 +1665,11 @@ class BookService:
             details: Details about the action
             
         Returns:
-            True if logging was successful, False otherwise
+            True if the action was queued, False otherwise
         """
         try:
-            # This would be implemented in a real system
+            self.audit_writer.enqueue(self.audit_log_repository,
+                                      AuditLog(user_id=username, action=action_type, details=details))
             logger.info(f"User action logged: {username} - {action_type} - {details}")
             return True
         except Exception as e:
@@ -1902,21 +1722,156 @@ class BookService:
             logger.error(f"Error borrowing book: {e}")
             return False
 
+    def bulk_borrow_books(
+        self,
+        assignments: List[Tuple[str, Union[int, str]]],
+        all_or_nothing: bool = False
+    ) -> Dict[str, any]:
+        """
+        Borrow books for many students in one transaction.
+
+        Every book is checked in a single query, then all loans are inserted
+        with one executemany and the books are marked unavailable with one
+        UPDATE. The checks and the writes share one IMMEDIATE transaction, so
+        no other writer can lend the same copies in between.
+
+        Args:
+            assignments: (student_id, book) pairs, where book is a book id or
+                a book number. Each copy can only be lent once per batch.
+            all_or_nothing: If True, nothing is borrowed unless every
+                assignment is valid. Otherwise the valid ones are borrowed and
+                the rest are reported as failed.
+
+        Returns:
+            A dictionary with operation results (same format as bulk_borrow_books_by_class_stream)
+        """
+        logger.info(f"Bulk borrowing {len(assignments)} books "
+                    f"({'all-or-nothing' if all_or_nothing else 'best-effort'})")
+
+        result = {
+            'success': False,
+            'total_students': len(assignments),
+            'successful_borrows': 0,
+            'failed_borrows': 0,
+            'errors': [],
+            'details': []
+        }
+        if not assignments:
+            result['errors'].append("No students to borrow for")
+            return result
+
+        try:
+            book_ids = {}
+            book_numbers = set()
+            for _, book in assignments:
+                book_id = self._parse_book_id(book)
+                if book_id is not None:
+                    book_ids[book] = book_id
+                elif book is not None:
+                    book_numbers.add(str(book))
+
+            with self.borrowed_book_student_repository.transaction():
+                if book_numbers:
+                    book_ids.update(self.book_repository.get_ids_by_book_numbers(list(book_numbers)))
+                status = self.book_repository.get_borrow_status(list(set(book_ids.values())))
+                students = {
+                    student.student_id: student
+                    for student in self.student_service.student_repository.get_by_student_ids(
+                        list({str(student_id) for student_id, _ in assignments})
+                    )
+                }
+
+                loans = []
+                lent = set()
+                for student_id, book in assignments:
+                    student_id = str(student_id)
+                    student = students.get(student_id)
+                    book_id = book_ids.get(book if book in book_ids else str(book))
+                    detail = {
+                        'student_id': student_id,
+                        'student_name': student.name if student else None,
+                        'book_id': book_id,
+                        'status': 'success'
+                    }
+                    if student is None:
+                        detail['error'] = 'Student not found'
+                    elif book is None:
+                        detail['error'] = 'No copy left for this student'
+                    elif book_id is None or book_id not in status:
+                        detail['error'] = f"Book {book} not found"
+                    elif book_id in lent:
+                        detail['error'] = f"Book {book} is already assigned in this batch"
+                    elif not status[book_id][0] or status[book_id][1]:
+                        detail['error'] = f"Book {book} is not available for borrowing"
+                    else:
+                        lent.add(book_id)
+                        loans.append((student_id, book_id))
+                    result['details'].append(detail)
+
+                rejected = len(loans) < len(assignments)
+                if loans and not (all_or_nothing and rejected):
+                    self.borrowed_book_student_repository.create_loans(
+                        loans, datetime.now().strftime('%Y-%m-%d')
+                    )
+
+            for detail in result['details']:
+                if 'error' not in detail and all_or_nothing and rejected:
+                    detail['error'] = 'Not borrowed: another assignment in the batch failed'
+                if 'error' in detail:
+                    detail['status'] = 'failed'
+                    label = f"{detail['student_name']} ({detail['student_id']})" if detail['student_name'] \
+                        else detail['student_id']
+                    result['errors'].append(f"Failed to borrow book for student {label}: {detail['error']}")
+                    result['failed_borrows'] += 1
+                else:
+                    result['successful_borrows'] += 1
+
+            result['success'] = result['successful_borrows'] > 0
+            logger.info(
+                f"Bulk borrow completed: {result['successful_borrows']}/{result['total_students']} successful"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in bulk borrow operation: {e}")
+            # The transaction was rolled back, so nothing was borrowed
+            result['successful_borrows'] = 0
+            result['failed_borrows'] = len(assignments)
+            result['details'] = [
+                {'student_id': str(student_id), 'status': 'failed', 'error': str(e)}
+                for student_id, _ in assignments
+            ]
+            result['errors'] = [f"Bulk borrow operation failed: {str(e)}"]
+
+        return result
+
+    @staticmethod
+    def _parse_book_id(book) -> Optional[int]:
+        """Return the book id for an int or numeric string, None for a book number."""
+        if isinstance(book, int):
+            return book
+        try:
+            return int(book)
+        except (TypeError, ValueError):
+            return None
+
     def bulk_borrow_books_by_class_stream(
         self,
-        book_id: int,
+        book_id: Union[int, List[int]],
         class_level: Optional[int] = None,
         stream: Optional[str] = None,
-        subject: Optional[str] = None
+        subject: Optional[str] = None,
+        all_or_nothing: bool = False
     ) -> Dict[str, any]:
         """
         Borrow a book for all students in a specific class/stream combination.
         
         Args:
-            book_id: ID of the book to borrow
+            book_id: ID of the book to borrow, or a list of copies to hand out
+                one per student in class order
             class_level: Optional class level filter (e.g., 4 for Form 4)
             stream: Optional stream filter (e.g., "Red")
             subject: Optional subject name for logging/context
+            all_or_nothing: Borrow for nobody unless every student can be served
             
         Returns:
             A dictionary with operation results:
@@ -1934,167 +1889,48 @@ class BookService:
             f"stream={stream}, subject={subject}"
         )
         
-        result = {
-            'success': False,
-            'total_students': 0,
-            'successful_borrows': 0,
-            'failed_borrows': 0,
-            'errors': [],
-            'details': []
-        }
-        
-        try:
-            # Get students matching the criteria
-            students = self.class_management_service.get_students_for_bulk_operation(
-                class_level=class_level,
-                stream=stream
-            )
-            
-            result['total_students'] = len(students)
-            
-            if not students:
-                result['errors'].append("No students found matching the specified criteria")
-                return result
-            
-            # Check if book is available (for first student - in real scenario, 
-            # you might want to check availability for each or have multiple copies)
-            if not self.check_book_availability(book_id):
-                result['errors'].append(f"Book {book_id} is not available for borrowing")
-                return result
-            
-            # Attempt to borrow for each student
-            for student in students:
-                try:
-                    # Convert student_id to appropriate format
-                    student_id = student.student_id
-                    if isinstance(student_id, str):
-                        try:
-                            student_id_int = int(student_id)
-                        except ValueError:
-                            # If student_id is not numeric, use admission_number
-                            student_id_int = int(student.admission_number) if student.admission_number else None
-                    else:
-                        student_id_int = student_id
-                    
-                    if student_id_int is None:
-                        result['failed_borrows'] += 1
-                        result['errors'].append(f"Invalid student ID for student {student.name}")
-                        result['details'].append({
-                            'student_id': str(student.student_id),
-                            'student_name': student.name,
-                            'status': 'failed',
-                            'error': 'Invalid student ID'
-                        })
-                        continue
-                    
-                    # Borrow the book
-                    success = self.borrow_book(book_id, str(student_id_int), 'student')
-                    
-                    if success:
-                        result['successful_borrows'] += 1
-                        result['details'].append({
-                            'student_id': str(student.student_id),
-                            'student_name': student.name,
-                            'status': 'success'
-                        })
-                    else:
-                        result['failed_borrows'] += 1
-                        result['errors'].append(f"Failed to borrow book for student {student.name} ({student.student_id})")
-                        result['details'].append({
-                            'student_id': str(student.student_id),
-                            'student_name': student.name,
-                            'status': 'failed',
-                            'error': 'Borrow operation failed'
-                        })
-                        
-                except Exception as e:
-                    result['failed_borrows'] += 1
-                    error_msg = f"Error borrowing for student {student.name}: {str(e)}"
-                    result['errors'].append(error_msg)
-                    result['details'].append({
-                        'student_id': str(student.student_id),
-                        'student_name': student.name,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
-                    logger.error(error_msg)
-            
-            result['success'] = result['successful_borrows'] > 0
-            
-            logger.info(
-                f"Bulk borrow completed: {result['successful_borrows']}/{result['total_students']} successful"
-            )
-            
-        except Exception as e:
-            logger.error(f"Error in bulk borrow operation: {e}")
-            result['errors'].append(f"Bulk borrow operation failed: {str(e)}")
+        students = self.class_management_service.get_students_for_bulk_operation(
+            class_level=class_level,
+            stream=stream
+        )
+        if not students:
+            return {
+                'success': False,
+                'total_students': 0,
+                'successful_borrows': 0,
+                'failed_borrows': 0,
+                'errors': ["No students found matching the specified criteria"],
+                'details': []
+            }
         
-        return result
+        student_ids = [student.student_id for student in students]
+        return self.bulk_borrow_books_for_students(book_id, student_ids, all_or_nothing=all_or_nothing)
     
     def bulk_borrow_books_for_students(
         self,
-        book_id: int,
-        student_ids: List[str]
+        book_id: Union[int, List[int]],
+        student_ids: List[str],
+        all_or_nothing: bool = False
     ) -> Dict[str, any]:
         """
         Borrow a book for a list of specific students.
         
         Args:
-            book_id: ID of the book to borrow
+            book_id: ID of the book to borrow, or a list of copies to hand out
+                one per student in order
             student_ids: List of student IDs to borrow for
+            all_or_nothing: Borrow for nobody unless every student can be served
             
         Returns:
             A dictionary with operation results (same format as bulk_borrow_books_by_class_stream)
         """
-        logger.info(f"Bulk borrowing book {book_id} for {len(student_ids)} students")
-        
-        result = {
-            'success': False,
-            'total_students': len(student_ids),
-            'successful_borrows': 0,
-            'failed_borrows': 0,
-            'errors': [],
-            'details': []
-        }
-        
-        try:
-            for student_id in student_ids:
-                try:
-                    success = self.borrow_book(book_id, student_id, 'student')
-                    
-                    if success:
-                        result['successful_borrows'] += 1
-                        result['details'].append({
-                            'student_id': student_id,
-                            'status': 'success'
-                        })
-                    else:
-                        result['failed_borrows'] += 1
-                        result['errors'].append(f"Failed to borrow book for student {student_id}")
-                        result['details'].append({
-                            'student_id': student_id,
-                            'status': 'failed',
-                            'error': 'Borrow operation failed'
-                        })
-                        
-                except Exception as e:
-                    result['failed_borrows'] += 1
-                    error_msg = f"Error borrowing for student {student_id}: {str(e)}"
-                    result['errors'].append(error_msg)
-                    result['details'].append({
-                        'student_id': student_id,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
-                    logger.error(error_msg)
-            
-            result['success'] = result['successful_borrows'] > 0
-            
-        except Exception as e:
-            logger.error(f"Error in bulk borrow operation: {e}")
-            result['errors'].append(f"Bulk borrow operation failed: {str(e)}")
-        
-        return result
+        if isinstance(book_id, (list, tuple)):
+            if len(book_id) < len(student_ids):
+                logger.warning(f"{len(book_id)} copies for {len(student_ids)} students")
+            book_ids = list(book_id) + [None] * (len(student_ids) - len(book_id))
+        else:
+            book_ids = [book_id] * len(student_ids)
+        return self.bulk_borrow_books(list(zip(student_ids, book_ids)), all_or_nothing=all_or_nothing)
 
     def check_book_availability(self, book_id) -> bool:
         """
@@ -2476,6 +2312,141 @@ class BookService:
             logger.error(f"Error returning book: {e}")
             return False
 
+    def bulk_return_books(self, book_return_data: List[Dict], current_user: str) -> Tuple[bool, str, dict]:
+        """
+        Bulk return multiple books with comprehensive validation and error handling.
+
+        The whole batch is checked with one query, then every valid return is
+        applied in one transaction: loans are closed with executemany and the
+        books are made available with one UPDATE. Invalid items are reported
+        in the statistics and do not stop the rest. One audit entry is
+        written for the batch.
+
+        Args:
+            book_return_data: List of dictionaries containing return information
+                (book_id, borrower_id, borrower_type, optional condition and fine_amount)
+            current_user: Username of the user processing the returns
+
+        Returns:
+            Tuple of (success, message, statistics)
+        """
+        try:
+            returned, errors = self._apply_returns(book_return_data, current_user)
+            success_count = len(returned)
+            error_count = len(book_return_data) - success_count
+
+            self.log_user_action(
+                current_user,
+                "bulk_return",
+                f"Bulk return operation: {success_count} successful, {error_count} failed"
+            )
+
+            statistics = {
+                'total_attempted': len(book_return_data),
+                'success_count': success_count,
+                'error_count': error_count,
+                'errors': errors
+            }
+
+            if error_count > 0:
+                message = f"Bulk return completed with {error_count} errors. {success_count} books returned successfully."
+            else:
+                message = f"Bulk return completed successfully. {success_count} books returned."
+
+            return True, message, statistics
+
+        except Exception as e:
+            logger.error(f"Error in bulk return: {e}")
+            return False, f"Bulk return failed: {str(e)}", {}
+
+    def return_via_distribution(self, session_id: int, returned_by: str) -> bool:
+        """
+        Return all books assigned in a distribution session.
+
+        Args:
+            session_id: ID of the distribution session
+            returned_by: Username of the user processing the returns
+
+        Returns:
+            True if the return was successful, False otherwise
+        """
+        logger.info(f"Returning books via distribution session {session_id}")
+
+        try:
+            assignments = self.distribution_student_repository.get_assigned_books(session_id)
+            returned, errors = self._apply_returns(
+                [{'book_id': book_id, 'borrower_id': student_id, 'borrower_type': 'student'}
+                 for student_id, book_id in assignments],
+                returned_by
+            )
+            for error in errors:
+                logger.warning(f"Distribution session {session_id}: {error}")
+
+            self.log_user_action(
+                returned_by,
+                "distribution_return",
+                f"Returned {len(returned)} of {len(assignments)} books from distribution session {session_id}"
+            )
+            logger.info(f"Successfully returned {len(returned)} books via distribution session {session_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error returning books via distribution: {e}")
+            return False
+
+    def _apply_returns(self, return_items: List[Dict], returned_by: Optional[str]) -> Tuple[List[Dict], List[str]]:
+        """
+        Validate and apply a batch of returns in one transaction.
+
+        Returns:
+            The items that were returned, and an error message for each item that was not.
+        """
+        errors = []
+        requests = []
+        for index, item in enumerate(return_items):
+            try:
+                borrower_type = item['borrower_type']
+                if borrower_type not in ('student', 'teacher'):
+                    raise ValueError(f"invalid borrower type '{borrower_type}'")
+                requests.append((index, borrower_type, str(item['borrower_id']), int(item['book_id']),
+                                 item.get('condition', 'Good'), float(item.get('fine_amount', 0))))
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append(f"Error processing return: {str(e)}")
+
+        returned = []
+        with self.book_repository.transaction():
+            checks = self.book_repository.find_open_loans(
+                [(borrower_type, borrower_id, book_id) for _, borrower_type, borrower_id, book_id, _, _ in requests]
+            )
+            seen = set()
+            student_returns, teacher_returns = [], []
+            for request, (book_exists, on_loan) in zip(requests, checks):
+                index, borrower_type, borrower_id, book_id, condition, fine_amount = request
+                if not book_exists:
+                    errors.append(f"Book {book_id} not found")
+                elif not on_loan or (borrower_type, borrower_id, book_id) in seen:
+                    errors.append(f"Failed to return book {book_id} for {borrower_type} {borrower_id}")
+                else:
+                    seen.add((borrower_type, borrower_id, book_id))
+                    if borrower_type == 'student':
+                        student_returns.append((borrower_id, book_id, condition, fine_amount))
+                    else:
+                        teacher_returns.append((borrower_id, book_id))
+                    returned.append(return_items[index])
+
+            returned_on = datetime.now().strftime('%Y-%m-%d')
+            if student_returns:
+                self.borrowed_book_student_repository.close_loans(student_returns, returned_on, returned_by)
+            if teacher_returns:
+                self.borrowed_book_teacher_repository.close_loans(teacher_returns, returned_on)
+            if returned:
+                self.book_repository.set_availability(
+                    list({int(item['book_id']) for item in returned}), available=True
+                )
+
+        logger.info(f"Applied {len(returned)} returns, {len(errors)} rejected")
+        return returned, errors
+
     def get_borrowing_history(self, user_id: int, user_type: str) -> List[Union[BorrowedBookStudent, BorrowedBookTeacher]]:
         """
         Get complete borrowing history for a user (student or teacher)
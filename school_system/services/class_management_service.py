@@ -23,9 +23,16 @@ class ClassManagementService:
     def __init__(self):
         self.class_parser = ClassParser()
         self.student_service = StudentService()
-        self._class_cache: Optional[Dict] = None
+        # {class_name: {stream_name: [student_id, ...]}}, built from one narrow query
+        self._class_cache: Optional[Dict[str, Dict[str, List[str]]]] = None
+        # {class_level: {stream_name: [student_id, ...]}}; None holds classes without a level
+        self._level_index: Optional[Dict[Optional[int], Dict[str, List[str]]]] = None
         self._cache_valid = False
-    
+        # Bumped on every invalidation so a rebuild that raced with a change is not trusted
+        self._cache_generation = 0
+        self.cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        StudentService.add_change_listener(self._on_students_changed)
+
     def parse_student_stream(self, stream_identifier: str) -> Tuple[int, Optional[str]]:
         """
         Parse a student's stream identifier into class level and stream.
@@ -54,16 +61,15 @@ class ClassManagementService:
             Example: {"Form 4": {"Red": [student1, student2], "Blue": [student3]}}
         """
         try:
-            all_students = self.student_service.get_all_students()
-            categorized = defaultdict(lambda: defaultdict(list))
-
-            for student in all_students:
-                class_name = student.class_name or "Unassigned"
-                stream_name = student.stream_name or "Unassigned"
-
-                categorized[class_name][stream_name].append(student)
-
-            return dict(categorized)
+            class_cache = self._get_class_cache()
+            students = {student.student_id: student for student in self.student_service.get_all_students()}
+            return {
+                class_name: {
+                    stream_name: [students[student_id] for student_id in student_ids if student_id in students]
+                    for stream_name, student_ids in streams.items()
+                }
+                for class_name, streams in class_cache.items()
+            }
         except Exception as e:
             logger.error(f"Error categorizing students: {e}")
             return {}
@@ -130,13 +136,7 @@ class ClassManagementService:
         Returns:
             A sorted list of class levels (e.g., [1, 2, 3, 4, 10, 11, 12])
         """
-        categorized = self.categorize_all_students()
-        class_levels = []
-        for class_name in categorized.keys():
-            class_level = self._extract_class_level_from_name(class_name)
-            if class_level is not None and class_level > 0:
-                class_levels.append(class_level)
-        return sorted(list(set(class_levels)))
+        return sorted(level for level in self._get_level_index() if level is not None and level > 0)
     
     def get_all_streams(self, class_level: Optional[int] = None) -> List[str]:
         """
@@ -148,17 +148,15 @@ class ClassManagementService:
         Returns:
             A sorted list of unique stream names
         """
-        categorized = self.categorize_all_students()
+        level_index = self._get_level_index()
         
         if class_level is not None:
-            if class_level in categorized:
-                return sorted(categorized[class_level].keys())
-            return []
+            return sorted(level_index.get(class_level, {}).keys())
         
         # Get all streams across all class levels
         all_streams = set()
-        for class_data in categorized.values():
-            all_streams.update(class_data.keys())
+        for streams in level_index.values():
+            all_streams.update(streams.keys())
         
         return sorted([s for s in all_streams if s != "Invalid Format"])
     
@@ -172,21 +170,8 @@ class ClassManagementService:
         Returns:
             A list of students in that class level
         """
-        categorized = self.categorize_all_students()
-        students = []
-
-        # Find the class name that corresponds to this level
-        target_class_name = None
-        for class_name in categorized.keys():
-            if self._extract_class_level_from_name(class_name) == class_level:
-                target_class_name = class_name
-                break
-
-        if target_class_name and target_class_name in categorized:
-            for stream_students in categorized[target_class_name].values():
-                students.extend(stream_students)
-
-        return students
+        streams = self._get_level_index().get(class_level, {})
+        return self._load_students([student_id for student_ids in streams.values() for student_id in student_ids])
     
     def get_students_by_stream(self, stream: str, class_level: Optional[int] = None) -> List[Student]:
         """
@@ -199,19 +184,15 @@ class ClassManagementService:
         Returns:
             A list of students in that stream
         """
-        categorized = self.categorize_all_students()
-        students = []
+        level_index = self._get_level_index()
         
         if class_level is not None:
-            if class_level in categorized and stream in categorized[class_level]:
-                students = categorized[class_level][stream]
+            student_ids = level_index.get(class_level, {}).get(stream, [])
         else:
             # Search across all class levels
-            for class_data in categorized.values():
-                if stream in class_data:
-                    students.extend(class_data[stream])
+            student_ids = [student_id for streams in level_index.values() for student_id in streams.get(stream, [])]
         
-        return students
+        return self._load_students(student_ids)
     
     def get_students_by_class_and_stream(self, class_level: int, stream: str) -> List[Student]:
         """
@@ -224,19 +205,7 @@ class ClassManagementService:
         Returns:
             A list of students matching both criteria
         """
-        categorized = self.categorize_all_students()
-
-        # Find the class name that corresponds to this level
-        target_class_name = None
-        for class_name in categorized.keys():
-            if self._extract_class_level_from_name(class_name) == class_level:
-                target_class_name = class_name
-                break
-
-        if target_class_name and target_class_name in categorized and stream in categorized[target_class_name]:
-            return categorized[target_class_name][stream]
-
-        return []
+        return self._load_students(self._get_level_index().get(class_level, {}).get(stream, []))
     
     def get_class_stream_combinations(self) -> List[Tuple[int, str, int]]:
         """
@@ -245,17 +214,14 @@ class ClassManagementService:
         Returns:
             A list of tuples: (class_level, stream, student_count)
         """
-        categorized = self.categorize_all_students()
         combinations = []
 
-        for class_name, streams in categorized.items():
-            # Extract numeric class level from class name
-            class_level = self._extract_class_level_from_name(class_name)
+        for class_level, streams in self._get_level_index().items():
             if class_level is None or class_level < 0:  # Skip invalid formats
                 continue
-            for stream, students in streams.items():
+            for stream, student_ids in streams.items():
                 if stream != "Invalid Format":
-                    combinations.append((class_level, stream, len(students)))
+                    combinations.append((class_level, stream, len(student_ids)))
 
         return sorted(combinations, key=lambda x: (x[0], x[1]))
 
@@ -334,23 +300,21 @@ class ClassManagementService:
         Returns:
             A dictionary with statistics
         """
-        categorized = self.categorize_all_students()
+        level_index = self._get_level_index()
         
         total_students = sum(
-            len(students)
-            for class_data in categorized.values()
-            for students in class_data.values()
-            if "Invalid Format" not in str(class_data)
+            len(student_ids)
+            for class_level, streams in level_index.items()
+            if class_level is not None
+            for student_ids in streams.values()
         )
         
         class_levels = self.get_all_class_levels()
         all_streams = self.get_all_streams()
         combinations = self.get_class_stream_combinations()
         
-        # Count students with invalid formats
-        invalid_count = 0
-        if -1 in categorized:
-            invalid_count = sum(len(students) for students in categorized[-1].values())
+        # Count students whose class has no recognisable level
+        invalid_count = sum(len(student_ids) for student_ids in level_index.get(None, {}).values())
         
         return {
             "total_students": total_students,
@@ -402,5 +366,61 @@ class ClassManagementService:
 
     def invalidate_cache(self):
         """Invalidate the class categorization cache."""
+        self._cache_generation += 1
         self._cache_valid = False
         self._class_cache = None
+        self._level_index = None
+        self.cache_stats['invalidations'] += 1
+
+    def _on_students_changed(self, change: str, student_ids: List[str]):
+        """StudentService change listener: any student write makes the index stale."""
+        logger.debug(f"Class cache invalidated by student {change} ({len(student_ids)} students)")
+        self.invalidate_cache()
+
+    def _get_class_cache(self) -> Dict[str, Dict[str, List[str]]]:
+        """Return the class/stream index, rebuilding it if it is stale."""
+        self._ensure_cache()
+        return self._class_cache
+
+    def _get_level_index(self) -> Dict[Optional[int], Dict[str, List[str]]]:
+        """Return the class level/stream index, rebuilding it if it is stale."""
+        self._ensure_cache()
+        return self._level_index
+
+    def _ensure_cache(self):
+        """Build both indexes from the students table unless the cached copy is current."""
+        if self._cache_valid:
+            self.cache_stats['hits'] += 1
+            return
+        self.cache_stats['misses'] += 1
+
+        generation = self._cache_generation
+        class_cache = defaultdict(lambda: defaultdict(list))
+        level_index = defaultdict(lambda: defaultdict(list))
+        try:
+            assignments = self.student_service.student_repository.get_class_assignments()
+        except Exception as e:
+            logger.error(f"Error building class index: {e}")
+            self._class_cache, self._level_index = {}, {}
+            return
+
+        for student_id, class_name, stream_name in assignments:
+            class_name = class_name or "Unassigned"
+            stream_name = stream_name or "Unassigned"
+            class_cache[class_name][stream_name].append(student_id)
+            level_index[self._extract_class_level_from_name(class_name)][stream_name].append(student_id)
+
+        self._class_cache = {name: dict(streams) for name, streams in class_cache.items()}
+        self._level_index = {level: dict(streams) for level, streams in level_index.items()}
+        # A change notified while we were reading leaves the result usable for this call only
+        self._cache_valid = generation == self._cache_generation
+
+    def _load_students(self, student_ids: List[str]) -> List[Student]:
+        """Load the students for a list of indexed ids."""
+        if not student_ids:
+            return []
+        try:
+            return self.student_service.student_repository.get_by_student_ids(student_ids)
+        except Exception as e:
+            logger.error(f"Error loading students for class index: {e}")
+            return []
@@ -14,6 +14,10 @@ from school_system.database.repositories.furniture_repo import ChairRepository,
 
 class FurnitureService:
     """Service for managing furniture-related operations."""
+
+    # Columns matched by search_furniture
+    CHAIR_SEARCH_COLUMNS = ('chair_id', 'location', 'form')
+    LOCKER_SEARCH_COLUMNS = ('locker_id', 'location', 'form')
   
     def __init__(self):
         self.chair_repository = ChairRepository()
@@ -421,20 +425,10 @@ class FurnitureService:
         
         try:
             if furniture_type in ['all', 'chair']:
-                chairs = self.chair_repository.get_all()
-                for chair in chairs:
-                    if (query.lower() in str(chair.chair_id).lower() or
-                        (chair.location and query.lower() in chair.location.lower()) or
-                        (chair.form and query.lower() in chair.form.lower())):
-                        results.append(chair)
+                results.extend(self.chair_repository.find_containing(self.CHAIR_SEARCH_COLUMNS, query))
             
             if furniture_type in ['all', 'locker']:
-                lockers = self.locker_repository.get_all()
-                for locker in lockers:
-                    if (query.lower() in str(locker.locker_id).lower() or
-                        (locker.location and query.lower() in locker.location.lower()) or
-                        (locker.form and query.lower() in locker.form.lower())):
-                        results.append(locker)
+                results.extend(self.locker_repository.find_containing(self.LOCKER_SEARCH_COLUMNS, query))
             
             logger.info(f"Found {len(results)} furniture items matching query: {query}")
             return results
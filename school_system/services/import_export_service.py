@@ -4,18 +4,22 @@ Import/Export service for handling data import and export operations.
 
 import csv
 import json
-import openpyxl
-from typing import List, Dict, Tuple
+from itertools import islice
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 from school_system.config.logging import logger
 from school_system.config.settings import Settings
 from school_system.core.exceptions import FileOperationException
 from school_system.core.utils import ValidationUtils
-from fpdf import FPDF
+
+# openpyxl and fpdf are imported where used: loading them costs ~150 ms at startup
 
 
 class ImportExportService:
     """Service for handling data import and export operations."""
 
+    # Rows written per chunk by the streaming exports
+    EXPORT_CHUNK_SIZE = 1000
+
     def export_to_csv(self, data: List[Dict], filename: str) -> bool:
         """
         Export data to a CSV file.
@@ -103,6 +107,27 @@ class ImportExportService:
             data: The data to export.
             filename: The name of the Excel file.
 
+        Returns:
+            True if the export was successful, otherwise False.
+        """
+        headers = list(data[0].keys()) if data else []
+        rows = ([row.get(header, '') for header in headers] for row in data)
+        return self.export_rows_to_excel(headers, rows, filename)
+
+    def export_rows_to_excel(self, headers: Sequence[str], rows: Iterable[Sequence],
+                             filename: str) -> bool:
+        """
+        Stream rows into an Excel file.
+
+        The workbook is write-only, so rows go straight to disk and memory use
+        does not grow with the row count. ``rows`` can be a database cursor
+        iterator; it is consumed once.
+
+        Args:
+            headers: Header row; nothing is written when empty.
+            rows: Value sequences, in header order.
+            filename: The name of the Excel file.
+
         Returns:
             True if the export was successful, otherwise False.
         """
@@ -110,15 +135,15 @@ class ImportExportService:
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
         
         try:
-            workbook = openpyxl.Workbook()
-            sheet = workbook.active
+            import openpyxl
+            workbook = openpyxl.Workbook(write_only=True)
+            sheet = workbook.create_sheet()
             
-            if data:
-                headers = list(data[0].keys())
-                sheet.append(headers)
-                
-                for row in data:
-                    sheet.append([row.get(header, '') for header in headers])
+            if headers:
+                sheet.append(list(headers))
+                for chunk in self._chunks(rows):
+                    for row in chunk:
+                        sheet.append(row)
             
             workbook.save(filename)
             logger.info(f"Data exported successfully to {filename}")
@@ -127,6 +152,43 @@ class ImportExportService:
             logger.error(f"Error exporting to Excel: {e}")
             return False
 
+    def export_rows_to_csv(self, headers: Sequence[str], rows: Iterable[Sequence],
+                           filename: str) -> bool:
+        """
+        Stream rows into a CSV file, written in chunks of EXPORT_CHUNK_SIZE.
+
+        Args:
+            headers: Header row.
+            rows: Value sequences, in header order; None is written as an empty field.
+            filename: The name of the CSV file.
+
+        Returns:
+            True if the export was successful, otherwise False.
+        """
+        logger.info(f"Exporting data to CSV file: {filename}")
+        ValidationUtils.validate_input(filename, "Filename cannot be empty")
+        
+        try:
+            with open(filename, mode='w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(headers)
+                for chunk in self._chunks(rows):
+                    writer.writerows(chunk)
+            logger.info(f"Data exported successfully to {filename}")
+            return True
+        except Exception as e:
+            logger.error(f"Error exporting to CSV: {e}")
+            return False
+
+    def _chunks(self, rows: Iterable[Sequence]) -> Iterator[List[Sequence]]:
+        """Split an iterable into lists of at most EXPORT_CHUNK_SIZE rows."""
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.EXPORT_CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
     def import_from_excel(self, filename: str) -> List[Dict]:
         """
         Import data from an Excel file.
@@ -138,20 +200,70 @@ class ImportExportService:
             The imported data as a list of dictionaries.
         """
         try:
-            workbook = openpyxl.load_workbook(filename)
-            sheet = workbook.active
-            
-            headers = [cell.value for cell in sheet[1]]
-            data = []
-            
-            for row in sheet.iter_rows(min_row=2, values_only=True):
-                if row:
-                    data.append(dict(zip(headers, row)))
-            
-            return data
+            return list(self.iter_excel_rows(filename))
         except Exception as e:
             print(f"Error importing from Excel: {e}")
             return []
+
+    def iter_excel_rows(self, filename: str) -> Iterator[Dict]:
+        """
+        Stream the rows of an Excel file's active sheet.
+
+        The workbook is opened read-only, so rows are parsed as they are
+        iterated instead of the whole sheet being loaded into memory.
+        Completely empty rows are skipped.
+
+        Args:
+            filename: The name of the Excel file.
+
+        Yields:
+            One dictionary per data row, keyed by the header row.
+        """
+        import openpyxl
+        workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = next(rows, None)
+            if headers is None:
+                return
+            for row in rows:
+                if any(value is not None for value in row):
+                    yield dict(zip(headers, row))
+        finally:
+            workbook.close()
+
+    def count_excel_rows(self, filename: str) -> Optional[int]:
+        """
+        Get the number of data rows in an Excel file's active sheet, for progress reporting.
+
+        The count comes from the sheet's recorded dimensions, so it may include
+        trailing empty rows. Returns None when the file does not record them.
+        """
+        try:
+            import openpyxl
+            workbook = openpyxl.load_workbook(filename, read_only=True)
+            try:
+                max_row = workbook.active.max_row
+            finally:
+                workbook.close()
+            return max(max_row - 1, 0) if max_row else None
+        except Exception as e:
+            logger.warning(f"Could not read the size of {filename}: {e}")
+            return None
+    
+    def excel_progress_reporter(self, filename: str,
+                                progress_callback: Optional[Callable[[int, Optional[int]], None]]
+                                ) -> Optional[Callable[[int], None]]:
+        """
+        Adapt a (rows done, total rows) progress callback for a streamed Excel import.
+
+        The returned function takes the running row count, as reported by
+        BaseRepository.insert_many. Returns None when there is no callback.
+        """
+        if progress_callback is None:
+            return None
+        total = self.count_excel_rows(filename)
+        return lambda done: progress_callback(done, total)
     
     def import_from_excel_with_validation(self, filename: str, required_columns: List[str]) -> Tuple[bool, List[Dict], str]:
         """
@@ -165,11 +277,13 @@ class ImportExportService:
             tuple: (success, data, error_message)
         """
         try:
-            workbook = openpyxl.load_workbook(filename)
+            import openpyxl
+            workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
             sheet = workbook.active
+            rows = sheet.iter_rows(values_only=True)
             
             # Get headers from first row
-            headers = [cell.value for cell in sheet[1]]
+            headers = list(next(rows, None) or ())
             
             # Validate required columns (with variations)
             missing_columns = []
@@ -202,11 +316,12 @@ class ImportExportService:
                     missing_columns.append(column)
             
             if missing_columns:
+                workbook.close()
                 return False, [], f"Missing required columns: {', '.join(missing_columns)}"
             
             # Import data with proper column mapping
             data = []
-            for row in sheet.iter_rows(min_row=2, values_only=True):
+            for row in rows:
                 if row:
                     row_dict = dict(zip(headers, row))
                     # Map columns to expected names
@@ -214,6 +329,7 @@ class ImportExportService:
                     for expected_col, actual_col in column_mapping.items():
                         mapped_row[expected_col] = row_dict.get(actual_col, '')
                     data.append(mapped_row)
+            workbook.close()
             
             return True, data, ""
             
@@ -234,6 +350,7 @@ class ImportExportService:
             True if template generation was successful, False otherwise.
         """
         try:
+            import openpyxl
             workbook = openpyxl.Workbook()
             sheet = workbook.active
             
@@ -281,6 +398,7 @@ class ImportExportService:
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
         
         try:
+            from fpdf import FPDF
             pdf = FPDF()
             pdf.add_page()
             pdf.set_font("Arial", size=12)
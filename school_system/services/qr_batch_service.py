@@ -0,0 +1,151 @@
+"""
+Batch QR code generation for books and students.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from school_system.config.logging import logger
+from school_system.database.repositories.book_repo import BookRepository
+from school_system.database.repositories.student_repo import StudentRepository
+from school_system.models.book import make_book_qr_code
+from school_system.models.student import make_student_qr_code
+from school_system.utils.qr_cache import QRImageCache, get_qr_image_cache, warm_qr_cache
+
+# progress_callback(done, total) and is_cancelled() as taken by the generate_* methods
+ProgressCallback = Callable[[int, int], None]
+CancelCheck = Callable[[], bool]
+
+
+class QRBatchService:
+    """Service for generating missing QR codes in bulk."""
+
+    # Book images rendered by a worker process per task; larger tasks spend less time on IPC
+    RENDER_CHUNK_SIZE = 50
+    # Codes stored per transaction; work already written survives a cancel
+    WRITE_CHUNK_SIZE = 500
+
+    def __init__(self, max_workers: Optional[int] = None, image_cache: Optional[QRImageCache] = None):
+        """
+        Args:
+            max_workers: Worker processes used to render book QR images; defaults
+                to the CPU count. With one worker images are rendered in-process.
+            image_cache: Cache the book images are rendered into; the shared cache if None.
+        """
+        self.book_repository = BookRepository()
+        self.student_repository = StudentRepository()
+        self.max_workers = max_workers
+        self.image_cache = image_cache or get_qr_image_cache()
+
+    def generate_missing_book_codes(self, progress_callback: Optional[ProgressCallback] = None,
+                                    is_cancelled: Optional[CancelCheck] = None) -> Dict[str, Any]:
+        """
+        Generate QR codes for every book that has none.
+
+        The codes are stored in chunked transactions once their label images
+        have been rendered into the image cache by a process pool, so printing
+        labels right after setup does not render them one by one.
+
+        Args:
+            progress_callback: Called with (books done, total) after each stored chunk.
+            is_cancelled: Polled between chunks; returning True stops the run after
+                storing the codes already rendered.
+
+        Returns:
+            Dict with 'total', 'generated' and 'cancelled'.
+        """
+        books = self.book_repository.get_books_without_qr()
+        codes = [(book_id, make_book_qr_code(book_number, title))
+                 for book_id, book_number, title in books]
+        chunks = [codes[i:i + self.RENDER_CHUNK_SIZE]
+                  for i in range(0, len(codes), self.RENDER_CHUNK_SIZE)]
+        logger.info(f"Generating QR codes for {len(codes)} books")
+        return self._store_codes(self._render_chunks(chunks), len(codes),
+                                 self.book_repository.set_qr_codes, progress_callback, is_cancelled)
+
+    def generate_missing_student_codes(self, progress_callback: Optional[ProgressCallback] = None,
+                                       is_cancelled: Optional[CancelCheck] = None) -> Dict[str, Any]:
+        """
+        Generate QR codes for every student that has none.
+
+        Student codes are short hashes rather than images, so they are built
+        in-process and only the writes are batched.
+
+        Args:
+            progress_callback: Called with (students done, total) after each stored chunk.
+            is_cancelled: Polled between chunks; returning True stops the run.
+
+        Returns:
+            Dict with 'total', 'generated' and 'cancelled'.
+        """
+        students = self.student_repository.get_students_without_qr()
+        logger.info(f"Generating QR codes for {len(students)} students")
+        codes = ([(student_id, make_student_qr_code(admission_number or student_id, name))]
+                 for student_id, admission_number, name in students)
+        return self._store_codes(codes, len(students), self.student_repository.set_qr_codes,
+                                 progress_callback, is_cancelled)
+
+    def _render_chunks(self, chunks: List[Sequence[Tuple[Any, str]]]) -> Iterator[List[Tuple[Any, str]]]:
+        """
+        Render the images for chunks of (key, code) pairs, yielding each chunk as soon as it is done.
+
+        Chunks complete in any order. Closing the generator early cancels the
+        chunks that have not started. The bytes each chunk wrote are added to
+        the image cache's size here, so eviction runs in this process only.
+        """
+        cache_dir = self.image_cache.cache_dir
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                rendered, written = warm_qr_cache(cache_dir, chunk)
+                self.image_cache.record_write(written)
+                yield rendered
+            return
+
+        # spawn: forking a process that runs Qt and database threads is unsafe
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                       mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = [executor.submit(warm_qr_cache, cache_dir, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                rendered, written = future.result()
+                self.image_cache.record_write(written)
+                yield rendered
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _store_codes(self, batches: Iterator[List[Tuple[Any, str]]], total: int,
+                     store: Callable[[List[Tuple[Any, str]], str], int],
+                     progress_callback: Optional[ProgressCallback],
+                     is_cancelled: Optional[CancelCheck]) -> Dict[str, Any]:
+        """Write (key, code) batches back WRITE_CHUNK_SIZE at a time, reporting progress and honouring cancellation."""
+        done = generated = 0
+        cancelled = False
+        pending: List[Tuple[Any, str]] = []
+
+        def flush():
+            nonlocal done, generated, pending
+            if pending:
+                generated += store(pending, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                done += len(pending)
+                pending = []
+                if progress_callback:
+                    progress_callback(done, total)
+
+        try:
+            for batch in batches:
+                pending.extend(batch)
+                if len(pending) >= self.WRITE_CHUNK_SIZE:
+                    flush()
+                if is_cancelled and is_cancelled():
+                    cancelled = True
+                    break
+            flush()
+        finally:
+            if hasattr(batches, 'close'):
+                batches.close()
+
+        logger.info(f"Stored {generated} of {total} QR codes" + (" (cancelled)" if cancelled else ""))
+        return {'total': total, 'generated': generated, 'cancelled': cancelled}
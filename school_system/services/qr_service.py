@@ -10,7 +10,7 @@ from school_system.core.exceptions import DatabaseException
 from school_system.core.utils import ValidationUtils
 from school_system.models.book import QRBook, QRBorrowLog
 from school_system.database.repositories.book_repo import QRBookRepository, QRBorrowLogRepository
-from school_system.utils.qr_generator import QRGenerator
+from school_system.utils.qr_generator import QRGenerator, render_qr_data_uri
 
 
 class QRService:
@@ -22,20 +22,24 @@ class QRService:
 
     def generate_qr_code(self, data: str) -> str:
         """
-        Generate a QR code for the given data.
+        Generate a QR code image for the given data.
+
+        The image is returned inline, for one-off display or export. Book and
+        student records store a short code instead; their images come from the
+        QR image cache (see utils/qr_cache.py).
 
         Args:
             data: The data to encode in the QR code.
 
         Returns:
-            The generated QR code as a string.
+            The generated QR code as a PNG data URI.
         """
         logger.info(f"Generating QR code for data: {data}")
         ValidationUtils.validate_input(data, "Data for QR code cannot be empty")
         
         # Logic to generate QR code
         qr_code = self._generate_qr(data)
-        logger.info(f"QR code generated successfully: {qr_code}")
+        logger.info(f"QR code generated successfully ({len(qr_code)} characters)")
         return qr_code
 
     def _generate_qr(self, data: str) -> str:
@@ -49,14 +53,7 @@ class QRService:
             The generated QR code as a base64 string.
         """
         try:
-            # Generate QR code as BytesIO
-            qr_bytes = self.qr_generator.generate_qr_code(data)
-
-            # Convert to base64 string for storage
-            import base64
-            qr_base64 = base64.b64encode(qr_bytes.getvalue()).decode('utf-8')
-
-            return f"data:image/png;base64,{qr_base64}"
+            return render_qr_data_uri(data, self.qr_generator)
         except Exception as e:
             logger.error(f"Failed to generate QR code for data '{data}': {e}")
             # Fallback to placeholder
@@ -252,7 +249,7 @@ class QRService:
         try:
             # Enhanced QR generation with options
             qr_code = self._generate_qr_with_options(data, size, format)
-            logger.info(f"QR code generated successfully with options: {qr_code}")
+            logger.info(f"QR code generated successfully with options ({len(qr_code)} characters)")
             return {
                 'qr_code': qr_code,
                 'data': data,
@@ -361,15 +358,7 @@ class QRService:
         logger.info(f"Searching QR books with query: {query}")
         
         try:
-            all_qr_books = self.qr_book_repository.get_all()
-            results = []
-            
-            for qr_book in all_qr_books:
-                # Search by book number or details
-                if (query.lower() in str(qr_book.book_number).lower() or
-                    (qr_book.details and query.lower() in qr_book.details.lower())):
-                    results.append(qr_book)
-            
+            results = self.qr_book_repository.find_containing(('book_number', 'details'), query)
             logger.info(f"Found {len(results)} QR books matching query: {query}")
             return results
         except Exception as e:
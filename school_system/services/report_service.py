@@ -2,7 +2,9 @@
 Report service for generating and managing reports.
 """
 
-from typing import Dict, List, Tuple
+import time
+from itertools import islice
+from typing import Dict, List, Tuple, Optional, Iterator
 from school_system.config.logging import logger
 from school_system.config.settings import Settings
 from school_system.core.exceptions import DatabaseException
@@ -14,6 +16,8 @@ from school_system.database.repositories.book_repo import BookRepository, Borrow
 from school_system.database.repositories.student_repo import StudentRepository
 from school_system.database.repositories.teacher_repo import TeacherRepository
 from school_system.database.repositories.furniture_repo import ChairRepository, LockerRepository
+from school_system.models.book import Book
+from school_system.models.student import derive_stream, extract_class_level
 
 
 class ReportService:
@@ -83,70 +87,65 @@ class ReportService:
         Returns:
             A list of all books report data.
         """
-        books = self.book_repository.get_all()
+        books = self.book_repository.get_all_rows()
         return [{"book": book} for book in books]
 
-    def get_borrowed_books_report(self) -> List[Dict]:
+    def get_borrowed_books_report(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
         """
         Retrieve borrowed books report.
 
+        Args:
+            limit: Maximum number of rows to return, or None for all.
+            offset: Number of rows to skip (for paging).
+
         Returns:
-            A list of borrowed books report data.
+            A list of borrowed books report data, most recent loans first.
         """
         try:
-            report_data = []
-            
-            # Get all borrowed books (not returned)
-            all_borrowed = []
-            try:
-                # Get all students and their borrowings
-                all_students = self.student_service.get_all_students()
-                for student in all_students:
-                    borrowings = self.borrowed_book_repo.get_borrowed_books_by_student(str(student.student_id))
-                    all_borrowed.extend(borrowings)
-            except Exception as e:
-                logger.warning(f"Error getting all borrowed books: {e}")
-            
-            # Process each borrowing
-            for borrowing in all_borrowed:
-                if borrowing.returned_on is None:  # Only currently borrowed
-                    book = self.book_repository.get_by_id(borrowing.book_id)
-                    if book:
-                        # Get student info
-                        student = self.student_service.get_student_by_id(str(borrowing.student_id))
-                        student_name = student.name if student else f"Student {borrowing.student_id}"
-                        
-                        # Calculate days borrowed
-                        from datetime import datetime, date
-                        if isinstance(borrowing.borrowed_on, str):
-                            borrowed_date = datetime.strptime(borrowing.borrowed_on, '%Y-%m-%d').date()
-                        elif isinstance(borrowing.borrowed_on, date):
-                            borrowed_date = borrowing.borrowed_on
-                        else:
-                            borrowed_date = date.today()
-                        
-                        days_borrowed = (date.today() - borrowed_date).days
-                        
-                        report_data.append({
-                            'book': book,
-                            'book_number': book.book_number,
-                            'title': book.title,
-                            'author': book.author or 'N/A',
-                            'student_id': borrowing.student_id,
-                            'student_name': student_name,
-                            'borrowed_on': borrowing.borrowed_on,
-                            'days_borrowed': days_borrowed,
-                            'reminder_days': borrowing.reminder_days or 7,
-                            'status': 'Borrowed'
-                        })
-            
+            stop = offset + limit if limit is not None else None
+            report_data = list(islice(self.iter_borrowed_books_report(), offset, stop))
             logger.info(f"Generated borrowed books report with {len(report_data)} entries")
             return report_data
-            
+
         except Exception as e:
             logger.error(f"Error generating borrowed books report: {e}")
             return []
 
+    def iter_borrowed_books_report(self, batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Stream the borrowed books report row by row.
+
+        Uses a single JOIN over borrowed_books_student, books and students with
+        days borrowed computed in SQL, so rows are produced lazily.
+
+        Args:
+            batch_size: Rows fetched from the database per round trip.
+
+        Yields:
+            Borrowed book report rows.
+        """
+        for row in self.borrowed_book_repo.iter_open_loans_with_details(batch_size):
+            book = Book(
+                id=row['book_id'], book_number=row['book_number'], title=row['title'],
+                author=row['author'], category=row['category'], isbn=row['isbn'],
+                publication_date=row['publication_date'], available=row['available'],
+                revision=row['revision'], book_condition=row['book_condition'],
+                subject=row['subject'], class_name=row['class'],
+                qr_code=row['qr_code'], qr_generated_at=row['qr_generated_at']
+            )
+            yield {
+                'book': book,
+                'book_number': row['book_number'],
+                'title': row['title'],
+                'author': row['author'] or 'N/A',
+                'student_id': row['student_id'],
+                'student_name': row['student_name'] or f"Student {row['student_id']}",
+                'borrowed_on': row['borrowed_on'],
+                'days_borrowed': row['days_borrowed'],
+                'reminder_days': row['reminder_days'] or 7,
+                'status': 'Borrowed'
+            }
+
     def get_available_books_report(self) -> List[Dict]:
         """
         Retrieve available books report.
@@ -266,7 +265,7 @@ class ReportService:
             report_data = []
             
             # Get all books
-            all_books = self.book_repository.get_all()
+            all_books = self.book_repository.get_all_rows()
             
             # Get all borrowed books to check status
             borrowed_book_ids = set()
@@ -397,7 +396,7 @@ class ReportService:
         Returns:
             A list of all students report data.
         """
-        students = self.student_repository.get_all()
+        students = self.student_repository.get_all_rows()
         return [{"student": student} for student in students]
 
     def get_students_by_stream_report(self) -> List[Dict]:
@@ -709,181 +708,206 @@ class ReportService:
 
         return furniture_data
 
+    # Subject of a book as the analytics report groups it: the subject, else the category
+    ANALYTICS_SUBJECT_SQL = "COALESCE(NULLIF({alias}subject, ''), NULLIF({alias}category, ''), 'Unknown')"
+
     def get_borrowing_analytics_report(self) -> Dict:
         """
         Get comprehensive borrowing analytics report.
 
+        Each section is computed with a few aggregate queries, and the time
+        spent on each one is reported under ``section_timings`` (seconds).
+        The class/stream totals are queried once and shared by the two
+        sections that use them; the first of those is timed with the query.
+
         Returns:
             Dictionary containing all borrowing analytics data.
         """
         logger.info("Generating comprehensive borrowing analytics report")
 
         try:
-            analytics = {
-                'borrowing_summary_by_subject_stream_form': self._get_borrowing_summary_by_subject_stream_form(),
-                'borrowing_percentage_by_class': self._get_borrowing_percentage_by_class(),
-                'inventory_summary': self._get_inventory_summary(),
-                'books_categorized_by_subject_form': self._get_books_categorized_by_subject_form(),
-                'students_not_borrowed_by_stream_subject': self._get_students_not_borrowed_by_stream_subject(),
-                'students_not_borrowed_any_books': self._get_students_not_borrowed_any_books()
-            }
-
-            logger.info("Borrowing analytics report generated successfully")
+            class_stream_totals = None
+
+            def shared_totals():
+                nonlocal class_stream_totals
+                if class_stream_totals is None:
+                    class_stream_totals = self._get_class_stream_totals()
+                return class_stream_totals
+
+            sections = [
+                ('borrowing_summary_by_subject_stream_form',
+                 lambda: self._get_borrowing_summary_by_subject_stream_form(shared_totals())),
+                ('borrowing_percentage_by_class',
+                 lambda: self._get_borrowing_percentage_by_class(shared_totals())),
+                ('inventory_summary', self._get_inventory_summary),
+                ('books_categorized_by_subject_form', self._get_books_categorized_by_subject_form),
+                ('students_not_borrowed_by_stream_subject', self._get_students_not_borrowed_by_stream_subject),
+                ('students_not_borrowed_any_books', self._get_students_not_borrowed_any_books)
+            ]
+            analytics = {}
+            timings = {}
+            for name, section in sections:
+                started = time.perf_counter()
+                analytics[name] = section()
+                timings[name] = round(time.perf_counter() - started, 4)
+            analytics['section_timings'] = timings
+
+            logger.info("Borrowing analytics report generated successfully in "
+                        f"{sum(timings.values()):.3f}s: " +
+                        ", ".join(f"{name}={seconds:.3f}s" for name, seconds in timings.items()))
             return analytics
 
         except Exception as e:
             logger.error(f"Error generating borrowing analytics report: {e}")
             return {}
 
-    def _get_borrowing_summary_by_subject_stream_form(self) -> List[Dict]:
+    def _get_class_stream_totals(self) -> Dict[Tuple[int, str], Dict]:
         """
-        Get borrowing summary for each subject in each stream per form.
+        Count students and their current loans per (class level, stream).
+
+        Students are grouped by class and stream in SQL; the handful of class
+        names is then folded into class levels the same way the class
+        management service does it. Classes without a level are left out.
 
         Returns:
-            List of dictionaries with borrowing summaries.
+            {(class_level, stream): {'total_students', 'students_borrowed', 'total_borrowings'}}
         """
-        try:
-            summary = []
+        cursor = self.borrowed_book_repo.db.cursor()
+        cursor.execute("""
+            SELECT s.class,
+                   COALESCE(NULLIF(s.stream_name, ''), 'Unassigned') AS stream_group,
+                   COUNT(*) AS total_students,
+                   COUNT(loans.student_id) AS students_borrowed,
+                   COALESCE(SUM(loans.borrow_count), 0) AS total_borrowings
+            FROM students s
+            LEFT JOIN (
+                SELECT student_id, COUNT(*) AS borrow_count
+                FROM borrowed_books_student
+                WHERE returned_on IS NULL
+                GROUP BY student_id
+            ) loans ON loans.student_id = s.student_id
+            GROUP BY s.class, stream_group
+        """)
+
+        totals = {}
+        for class_name, stream, total_students, students_borrowed, total_borrowings in cursor.fetchall():
+            class_level = extract_class_level(class_name)
+            if class_level is None or class_level < 0:
+                continue
+            entry = totals.setdefault((class_level, stream), {
+                'total_students': 0, 'students_borrowed': 0, 'total_borrowings': 0
+            })
+            entry['total_students'] += total_students
+            entry['students_borrowed'] += students_borrowed
+            entry['total_borrowings'] += total_borrowings
+        return totals
 
-            # Get all class-stream combinations
-            combinations = self.class_management_service.get_class_stream_combinations()
+    def _get_borrowing_summary_by_subject_stream_form(self, totals: Optional[Dict[Tuple[int, str], Dict]] = None
+                                                      ) -> List[Dict]:
+        """
+        Get borrowing summary for each subject in each stream per form.
 
-            for class_level, stream, student_count in combinations:
-                # Get students in this class-stream
-                students = self.class_management_service.get_students_by_class_and_stream(class_level, stream)
+        Args:
+            totals: Result of _get_class_stream_totals(), queried here if None.
 
-                if not students:
+        Returns:
+            List of dictionaries with borrowing summaries.
+        """
+        try:
+            if totals is None:
+                totals = self._get_class_stream_totals()
+
+            # One pass over the current loans, joined to their student and book. The unary
+            # + keeps loan order without letting the planner walk the whole loan history for it.
+            cursor = self.borrowed_book_repo.db.cursor()
+            cursor.execute(f"""
+                SELECT s.class,
+                       COALESCE(NULLIF(s.stream_name, ''), 'Unassigned'),
+                       {self.ANALYTICS_SUBJECT_SQL.format(alias='b.')},
+                       COALESCE(b.book_number, CAST(b.id AS TEXT)),
+                       b.title,
+                       bbs.student_id,
+                       bbs.borrowed_on
+                FROM borrowed_books_student bbs
+                JOIN students s ON s.student_id = bbs.student_id
+                JOIN books b ON b.id = bbs.book_id
+                WHERE bbs.returned_on IS NULL
+                ORDER BY +bbs.rowid
+            """)
+
+            class_levels = {}
+            subject_summary = {}
+            for class_name, stream, subject, book_number, title, student_id, borrowed_on in cursor:
+                if class_name not in class_levels:
+                    class_levels[class_name] = extract_class_level(class_name)
+                class_level = class_levels[class_name]
+                if (class_level, stream) not in totals:
                     continue
+                key = (class_level, stream, subject)
+                if key not in subject_summary:
+                    subject_summary[key] = {'unique_students': set(), 'books': []}
+                subject_summary[key]['unique_students'].add(student_id)
+                subject_summary[key]['books'].append({
+                    'book_number': book_number,
+                    'title': title,
+                    'student_id': student_id,
+                    'borrowed_on': borrowed_on
+                })
 
-                student_ids = [str(student.student_id) for student in students]
-
-                # Get all borrowed books for these students
-                borrowed_books = []
-                for student_id in student_ids:
-                    student_borrowings = self.borrowed_book_repo.get_borrowed_books_by_student(student_id)
-                    borrowed_books.extend(student_borrowings)
-
-                # Group by subject
-                subject_summary = {}
-                for borrowing in borrowed_books:
-                    book = self.book_repository.get_by_id(borrowing.book_id)
-                    if book:
-                        subject = getattr(book, 'subject', None) or getattr(book, 'category', 'Unknown')
-                        if subject not in subject_summary:
-                            subject_summary[subject] = {
-                                'subject': subject,
-                                'total_borrowed': 0,
-                                'unique_students': set(),
-                                'books': []
-                            }
-                        subject_summary[subject]['total_borrowed'] += 1
-                        subject_summary[subject]['unique_students'].add(borrowing.student_id)
-                        subject_summary[subject]['books'].append({
-                            'book_number': getattr(book, 'book_number', str(book.id)),
-                            'title': book.title,
-                            'student_id': borrowing.student_id,
-                            'borrowed_on': borrowing.borrowed_on
-                        })
-
-                # Convert to list format
-                for subject_data in subject_summary.values():
-                    summary.append({
-                        'form': f"Form {class_level}",
-                        'stream': stream,
-                        'subject': subject_data['subject'],
-                        'total_students': student_count,
-                        'students_borrowed': len(subject_data['unique_students']),
-                        'total_borrowings': subject_data['total_borrowed'],
-                        'books_borrowed': subject_data['books']
-                    })
-
-            return summary
+            return [
+                {
+                    'form': f"Form {class_level}",
+                    'stream': stream,
+                    'subject': subject,
+                    'total_students': totals[(class_level, stream)]['total_students'],
+                    'students_borrowed': len(data['unique_students']),
+                    'total_borrowings': len(data['books']),
+                    'books_borrowed': data['books']
+                }
+                for (class_level, stream, subject), data in sorted(subject_summary.items(), key=lambda item: item[0])
+            ]
 
         except Exception as e:
             logger.error(f"Error getting borrowing summary by subject stream form: {e}")
             return []
 
-    def _get_borrowing_percentage_by_class(self) -> List[Dict]:
+    def _get_borrowing_percentage_by_class(self, totals: Optional[Dict[Tuple[int, str], Dict]] = None
+                                           ) -> List[Dict]:
         """
         Get percentage of borrowing per class compared to total required.
 
+        Args:
+            totals: Result of _get_class_stream_totals(), queried here if None.
+
         Returns:
             List of dictionaries with borrowing percentages by class.
         """
         try:
-            percentages = []
-
-            # Get all class levels
-            class_levels = self.class_management_service.get_all_class_levels()
-
-            for class_level in class_levels:
-                # Get students in this class
-                students = self.class_management_service.get_students_by_class_level(class_level)
-                total_students = len(students)
-
-                if total_students == 0:
+            if totals is None:
+                totals = self._get_class_stream_totals()
+            by_level = {}
+            for (class_level, _), entry in totals.items():
+                if class_level <= 0:
                     continue
+                level_totals = by_level.setdefault(class_level, {
+                    'total_students': 0, 'students_borrowed': 0, 'total_borrowings': 0
+                })
+                for field, value in entry.items():
+                    level_totals[field] += value
 
-                # Get borrowed books for this class using a simpler approach
-                borrowed_count = 0
-                students_borrowed = set()
-
-                try:
-                    # Use a more direct database approach to avoid repository issues
-                    from school_system.database.repositories.base import BaseRepository
-                    from school_system.models.book import BorrowedBookStudent
-
-                    repo = BaseRepository(BorrowedBookStudent)
-                    student_ids = [str(student.student_id) for student in students]
-
-                    # Query directly for borrowed books
-                    cursor = repo.db.cursor()
-                    placeholders = ','.join('?' * len(student_ids))
-                    cursor.execute(f"""
-                        SELECT student_id, COUNT(*) as borrow_count
-                        FROM borrowed_books_student
-                        WHERE student_id IN ({placeholders}) AND returned_on IS NULL
-                        GROUP BY student_id
-                    """, student_ids)
-
-                    results = cursor.fetchall()
-                    for row in results:
-                        student_id, count = row[0], row[1]
-                        students_borrowed.add(student_id)
-                        borrowed_count += count
-
-                except Exception as e:
-                    logger.warning(f"Error getting borrowing data for class {class_level}: {e}")
-                    # Fallback: try to get basic counts
-                    try:
-                        for student in students[:10]:  # Limit to first 10 students to avoid performance issues
-                            try:
-                                # Simple count query
-                                cursor = self.borrowed_book_repo.db.cursor()
-                                cursor.execute("""
-                                    SELECT COUNT(*) FROM borrowed_books_student
-                                    WHERE student_id = ? AND returned_on IS NULL
-                                """, (str(student.student_id),))
-                                count = cursor.fetchone()[0]
-                                if count > 0:
-                                    students_borrowed.add(student.student_id)
-                                    borrowed_count += count
-                            except:
-                                continue
-                    except:
-                        pass
-
-                # Calculate percentages
-                students_borrowed_count = len(students_borrowed)
-                student_borrowing_percentage = (students_borrowed_count / total_students) * 100 if total_students > 0 else 0
+            percentages = []
+            for class_level in sorted(by_level):
+                total_students = by_level[class_level]['total_students']
+                students_borrowed_count = by_level[class_level]['students_borrowed']
+                borrowed_count = by_level[class_level]['total_borrowings']
 
                 percentages.append({
                     'form': f"Form {class_level}",
                     'total_students': total_students,
                     'students_borrowed': students_borrowed_count,
-                    'student_borrowing_percentage': round(student_borrowing_percentage, 2),
+                    'student_borrowing_percentage': round((students_borrowed_count / total_students) * 100, 2),
                     'total_borrowings': borrowed_count,
-                    'average_borrowings_per_student': round(borrowed_count / total_students, 2) if total_students > 0 else 0
+                    'average_borrowings_per_student': round(borrowed_count / total_students, 2)
                 })
 
             return percentages
@@ -900,14 +924,16 @@ class ReportService:
             Dictionary with inventory summary.
         """
         try:
-            all_books = self.book_repository.get_all()
-            total_books = len(all_books)
-            available_books = len([book for book in all_books if book.available])
+            cursor = self.book_repository.db.cursor()
+            cursor.execute("""
+                SELECT COUNT(*),
+                       COALESCE(SUM(CASE WHEN available THEN 1 ELSE 0 END), 0),
+                       COALESCE(SUM(CASE WHEN available = 1 THEN 1 ELSE 0 END), 0)
+                FROM books
+            """)
+            total_books, available_books, available_count = cursor.fetchone()
             borrowed_books = total_books - available_books
 
-            # Get available books count
-            available_count = len(self.book_repository.get_available_books())
-
             return {
                 'total_books': total_books,
                 'available_books': available_count,
@@ -927,47 +953,27 @@ class ReportService:
             List of dictionaries with book categorization data.
         """
         try:
-            categorization = []
-
-            # Get all books
-            all_books = self.book_repository.get_all()
-
-            # Group by form and subject
-            form_subject_groups = {}
-
-            for book in all_books:
-                form = getattr(book, 'class_name', None) or 'Unknown'
-                subject = getattr(book, 'subject', None) or getattr(book, 'category', None) or 'Unknown'
-                
-                # Ensure form and subject are strings (not None) for consistent sorting
-                form = str(form) if form is not None else 'Unknown'
-                subject = str(subject) if subject is not None else 'Unknown'
-
-                key = (form, subject)
-                if key not in form_subject_groups:
-                    form_subject_groups[key] = {
-                        'form': form,
-                        'subject': subject,
-                        'total_books': 0,
-                        'available_books': 0,
-                        'borrowed_books': 0
-                    }
-
-                form_subject_groups[key]['total_books'] += 1
-                if book.available:
-                    form_subject_groups[key]['available_books'] += 1
-                else:
-                    form_subject_groups[key]['borrowed_books'] += 1
-
-            # Convert to list
-            for data in form_subject_groups.values():
-                categorization.append(data)
-
-            # Sort with safe handling of None values
-            return sorted(categorization, key=lambda x: (
-                str(x['form']) if x['form'] is not None else 'Unknown',
-                str(x['subject']) if x['subject'] is not None else 'Unknown'
-            ))
+            cursor = self.book_repository.db.cursor()
+            cursor.execute(f"""
+                SELECT COALESCE(NULLIF(class, ''), 'Unknown') AS form,
+                       {self.ANALYTICS_SUBJECT_SQL.format(alias='')} AS subject_name,
+                       COUNT(*),
+                       COALESCE(SUM(CASE WHEN available THEN 1 ELSE 0 END), 0)
+                FROM books
+                GROUP BY form, subject_name
+                ORDER BY form, subject_name
+            """)
+
+            return [
+                {
+                    'form': str(form),
+                    'subject': str(subject),
+                    'total_books': total_books,
+                    'available_books': available_books,
+                    'borrowed_books': total_books - available_books
+                }
+                for form, subject, total_books, available_books in cursor.fetchall()
+            ]
 
         except Exception as e:
             logger.error(f"Error getting books categorized by subject form: {e}")
@@ -977,69 +983,67 @@ class ReportService:
         """
         Get names of students who have not borrowed books in each stream, per subject.
 
+        Every subject in the catalog is checked for every class and stream;
+        a student counts as having borrowed a subject if any loan, current or
+        returned, was for a book of that subject.
+
         Returns:
             List of dictionaries with students who haven't borrowed by stream/subject.
         """
         try:
-            not_borrowed = []
-
-            # Get all class-stream combinations (simplified approach)
-            try:
-                combinations = self.class_management_service.get_class_stream_combinations()
-            except:
-                # Fallback: get basic class levels and assume common streams
-                combinations = []
-                try:
-                    class_levels = self.class_management_service.get_all_class_levels()
-                    for class_level in class_levels[:3]:  # Limit to avoid performance issues
-                        combinations.append((class_level, "General", 10))  # Assume 10 students per class
-                except:
-                    return []  # Return empty if we can't get basic data
-
-            for class_level, stream, _ in combinations[:5]:  # Limit combinations to avoid performance issues
-                try:
-                    # Get students in this class-stream
-                    students = self.class_management_service.get_students_by_class_and_stream(class_level, stream)
-                except:
-                    continue
-
-                # Get popular subjects (limit to avoid performance issues)
-                popular_subjects = ["Mathematics", "English", "Science", "History", "Geography"]
-
-                for subject in popular_subjects[:3]:  # Limit subjects
-                    # Find students who haven't borrowed from this subject
-                    students_not_borrowed = []
-
-                    for student in students[:20]:  # Limit students per class
-                        try:
-                            # Check borrowing history using simpler query
-                            cursor = self.borrowed_book_repo.db.cursor()
-                            cursor.execute("""
-                                SELECT COUNT(*) FROM borrowed_books_student bbs
-                                JOIN books bk ON bbs.book_id = bk.id
-                                WHERE bbs.student_id = ? AND (bk.subject = ? OR bk.category = ?)
-                            """, (str(student.student_id), subject, subject))
-
-                            borrow_count = cursor.fetchone()[0]
-                            if borrow_count == 0:
-                                students_not_borrowed.append({
-                                    'student_id': student.student_id,
-                                    'student_name': student.name,
-                                    'admission_number': getattr(student, 'admission_number', str(student.student_id))
-                                })
-                        except:
-                            continue
-
-                    if students_not_borrowed:
-                        not_borrowed.append({
-                            'form': f"Form {class_level}",
-                            'stream': stream,
-                            'subject': subject,
-                            'students_not_borrowed': students_not_borrowed[:10],  # Limit results
-                            'count': len(students_not_borrowed)
-                        })
+            subject_sql = self.ANALYTICS_SUBJECT_SQL.format(alias='b.')
+            cursor = self.borrowed_book_repo.db.cursor()
+            cursor.execute(f"""
+                WITH subjects AS (
+                    SELECT DISTINCT {subject_sql} AS subject FROM books b
+                ),
+                borrowed_subjects AS (
+                    SELECT DISTINCT bbs.student_id, {subject_sql} AS subject
+                    FROM borrowed_books_student bbs
+                    JOIN books b ON b.id = bbs.book_id
+                )
+                SELECT s.class,
+                       COALESCE(NULLIF(s.stream_name, ''), 'Unassigned') AS stream_group,
+                       subjects.subject,
+                       s.student_id,
+                       s.name,
+                       COALESCE(s.admission_number, s.student_id)
+                FROM students s
+                CROSS JOIN subjects
+                LEFT JOIN borrowed_subjects bs
+                    ON bs.student_id = s.student_id AND bs.subject = subjects.subject
+                WHERE bs.student_id IS NULL
+                ORDER BY s.class, stream_group, subjects.subject, s.student_id
+            """)
+
+            # Rows arrive grouped, so only look up the level when the class changes
+            groups = {}
+            current_key, students = None, None
+            for class_name, stream, subject, student_id, name, admission_number in cursor:
+                if current_key is None or current_key[:3] != (class_name, stream, subject):
+                    class_level = extract_class_level(class_name)
+                    current_key = (class_name, stream, subject, class_level)
+                    if class_level is None or class_level < 0:
+                        students = None
+                        continue
+                    students = groups.setdefault((class_level, stream, subject), [])
+                if students is not None:
+                    students.append({
+                        'student_id': student_id,
+                        'student_name': name,
+                        'admission_number': admission_number
+                    })
 
-            return not_borrowed
+            return [
+                {
+                    'form': f"Form {class_level}",
+                    'stream': stream,
+                    'subject': subject,
+                    'students_not_borrowed': students,
+                    'count': len(students)
+                }
+                for (class_level, stream, subject), students in sorted(groups.items(), key=lambda item: item[0])
+            ]
 
         except Exception as e:
             logger.error(f"Error getting students not borrowed by stream subject: {e}")
@@ -1053,41 +1057,33 @@ class ReportService:
             Dictionary with students who haven't borrowed any books.
         """
         try:
-            all_students = self.student_service.get_all_students()
-            students_not_borrowed = []
+            cursor = self.borrowed_book_repo.db.cursor()
+            cursor.execute("""
+                SELECT s.student_id, s.name, COALESCE(s.admission_number, s.student_id),
+                       s.class, s.stream_name, s.stream
+                FROM students s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM borrowed_books_student bbs WHERE bbs.student_id = s.student_id
+                )
+                ORDER BY s.student_id
+            """)
 
-            for student in all_students[:100]:  # Limit to avoid performance issues
-                try:
-                    # Check borrowing history using direct query
-                    cursor = self.borrowed_book_repo.db.cursor()
-                    cursor.execute("""
-                        SELECT COUNT(*) FROM borrowed_books_student
-                        WHERE student_id = ?
-                    """, (str(student.student_id),))
-
-                    borrow_count = cursor.fetchone()[0]
-                    if borrow_count == 0:
-                        students_not_borrowed.append({
-                            'student_id': student.student_id,
-                            'student_name': student.name,
-                            'admission_number': getattr(student, 'admission_number', str(student.student_id)),
-                            'stream': getattr(student, 'stream', 'Unknown')
-                        })
-                except:
-                    continue
-
-            # Group by stream for better organization
+            students_not_borrowed = []
             stream_groups = {}
-            for student in students_not_borrowed:
-                stream = student['stream']
-                if stream not in stream_groups:
-                    stream_groups[stream] = []
-                stream_groups[stream].append(student)
+            for student_id, name, admission_number, class_name, stream_name, stream in cursor:
+                student = {
+                    'student_id': student_id,
+                    'student_name': name,
+                    'admission_number': admission_number,
+                    'stream': derive_stream(class_name, stream_name, stream)
+                }
+                students_not_borrowed.append(student)
+                stream_groups.setdefault(student['stream'], []).append(student)
 
             return {
                 'total_students_not_borrowed': len(students_not_borrowed),
                 'students_by_stream': stream_groups,
-                'all_students_not_borrowed': students_not_borrowed[:50]  # Limit results
+                'all_students_not_borrowed': students_not_borrowed
             }
 
         except Exception as e:
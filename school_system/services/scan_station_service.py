@@ -0,0 +1,300 @@
+"""
+Scan station service for QR based borrowing and returning.
+
+At the library desk a book and a student card are scanned every second or
+two. Tokens are resolved from an in-memory index instead of full-row
+lookups, and each borrow or return is a fixed pair of statements in one
+IMMEDIATE transaction.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from school_system.config.logging import logger
+from school_system.database.repositories.book_repo import BookRepository, BorrowedBookStudentRepository
+from school_system.database.repositories.student_repo import StudentRepository
+from school_system.services.student_service import StudentService
+
+
+class QRScanIndex:
+    """In-memory map from QR tokens to book and student ids."""
+
+    def __init__(self):
+        self.book_repository = BookRepository()
+        self.student_repository = StudentRepository()
+        # {qr_code: (book id, title)} and {qr_code: (student_id, name)}
+        self._books: Dict[str, Tuple[int, str]] = {}
+        self._students: Dict[str, Tuple[str, str]] = {}
+        # {book id: qr_code} and {student_id: qr_code}, so a changed record's old token can be dropped
+        self._book_tokens: Dict[int, str] = {}
+        self._student_tokens: Dict[str, str] = {}
+        self._warm = False
+        self._lock = threading.Lock()
+        StudentService.add_change_listener(self._on_students_changed)
+        # Imported here: book_service imports this module
+        from school_system.services.book_service import BookService
+        BookService.add_change_listener(self._on_books_changed)
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether the index has been loaded."""
+        return self._warm
+
+    def warm(self):
+        """Load every book and student token with one query each."""
+        started = time.perf_counter()
+        books = {qr_code: (book_id, title) for qr_code, book_id, title in self.book_repository.iter_qr_index()}
+        students = {qr_code: (student_id, name)
+                    for qr_code, student_id, name in self.student_repository.iter_qr_index()}
+        with self._lock:
+            self._books = books
+            self._students = students
+            self._book_tokens = {book_id: qr_code for qr_code, (book_id, _) in books.items()}
+            self._student_tokens = {student_id: qr_code for qr_code, (student_id, _) in students.items()}
+            self._warm = True
+        logger.info(f"QR scan index warmed with {len(books)} books and {len(students)} students "
+                    f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def lookup_book(self, qr_code: str, refresh: bool = False) -> Optional[Tuple[int, str]]:
+        """
+        Resolve a book token to (id, title).
+
+        Tokens missing from the index, such as codes generated since it was
+        warmed, are read from the database and added. refresh forces that read.
+        """
+        if not self._warm:
+            self.warm()
+        entry = None if refresh else self._books.get(qr_code)
+        if entry is None:
+            entry = self.book_repository.find_qr_index_entry(qr_code)
+            entry = tuple(entry) if entry else None
+            with self._lock:
+                if entry:
+                    self._set_book(qr_code, entry[0], entry[1])
+                else:
+                    self._books.pop(qr_code, None)
+        return entry
+
+    def lookup_student(self, qr_code: str, refresh: bool = False) -> Optional[Tuple[str, str]]:
+        """Resolve a student token to (student_id, name); see lookup_book."""
+        if not self._warm:
+            self.warm()
+        entry = None if refresh else self._students.get(qr_code)
+        if entry is None:
+            entry = self.student_repository.find_qr_index_entry(qr_code)
+            entry = tuple(entry) if entry else None
+            with self._lock:
+                if entry:
+                    self._set_student(qr_code, entry[0], entry[1])
+                else:
+                    self._students.pop(qr_code, None)
+        return entry
+
+    def refresh_books(self, book_ids: List[int]):
+        """Re-read the tokens of the given books, dropping those they no longer carry."""
+        entries = self.book_repository.get_qr_index_entries(book_ids)
+        with self._lock:
+            for book_id in book_ids:
+                self._books.pop(self._book_tokens.pop(book_id, None), None)
+            for qr_code, book_id, title in entries:
+                self._set_book(qr_code, book_id, title)
+
+    def refresh_students(self, student_ids: List[str]):
+        """Re-read the tokens of the given students, dropping those they no longer carry."""
+        entries = self.student_repository.get_qr_index_entries(student_ids)
+        with self._lock:
+            for student_id in student_ids:
+                self._students.pop(self._student_tokens.pop(student_id, None), None)
+            for qr_code, student_id, name in entries:
+                self._set_student(qr_code, student_id, name)
+
+    def _set_book(self, qr_code: str, book_id: int, title: str):
+        """Index a book token; the caller holds the lock."""
+        self._books.pop(self._book_tokens.get(book_id), None)
+        self._books[qr_code] = (book_id, title)
+        self._book_tokens[book_id] = qr_code
+
+    def _set_student(self, qr_code: str, student_id: str, name: str):
+        """Index a student token; the caller holds the lock."""
+        self._students.pop(self._student_tokens.get(student_id), None)
+        self._students[qr_code] = (student_id, name)
+        self._student_tokens[student_id] = qr_code
+
+    def _on_books_changed(self, change: str, book_ids: List[int]):
+        """BookService change listener: keep the changed books' tokens current."""
+        if not self._warm or not book_ids:
+            return
+        try:
+            self.refresh_books(book_ids)
+        except Exception as e:
+            # The scan statements re-check the token, so a stale entry is caught at scan time
+            logger.error(f"Error refreshing QR scan index after book {change}: {e}")
+
+    def _on_students_changed(self, change: str, student_ids: List[str]):
+        """StudentService change listener: keep the changed students' tokens current."""
+        if not self._warm or not student_ids:
+            return
+        try:
+            self.refresh_students(student_ids)
+        except Exception as e:
+            # The borrow statement re-checks the token, so a stale entry is caught at scan time
+            logger.error(f"Error refreshing QR scan index after student {change}: {e}")
+
+
+class _ScanRejected(Exception):
+    """Rolls back a scan transaction whose student token no longer matches."""
+
+
+# Global index instance
+_qr_scan_index: Optional[QRScanIndex] = None
+_qr_scan_index_lock = threading.Lock()
+
+
+def get_qr_scan_index() -> QRScanIndex:
+    """Get the global QRScanIndex instance (singleton)."""
+    global _qr_scan_index
+    if _qr_scan_index is None:
+        with _qr_scan_index_lock:
+            if _qr_scan_index is None:
+                _qr_scan_index = QRScanIndex()
+    return _qr_scan_index
+
+
+class ScanStationService:
+    """Service for borrowing and returning books by scanning QR codes."""
+
+    def __init__(self, index: Optional[QRScanIndex] = None):
+        """
+        Args:
+            index: Token index used to resolve scans; the shared index if None.
+        """
+        self.index = index or get_qr_scan_index()
+        self.book_repository = BookRepository()
+        self.loan_repository = BorrowedBookStudentRepository()
+
+    def borrow(self, book_qr_code: str, student_qr_code: str, reminder_days: int = 7) -> Dict[str, Any]:
+        """
+        Lend the scanned book to the scanned student.
+
+        The availability check and the loan insert are one conditional
+        UPDATE and one INSERT in an IMMEDIATE transaction. Both re-check the
+        scanned token, so a stale index entry is re-read and the scan
+        retried once.
+
+        Returns:
+            Dict with 'success', 'message', 'book_title', 'student_name' and 'latency_ms'.
+        """
+        started = time.perf_counter()
+        borrowed_on = datetime.now().strftime('%Y-%m-%d')
+        message = None
+        book = student = None
+        try:
+            book = self.index.lookup_book(book_qr_code)
+            student = self.index.lookup_student(student_qr_code)
+            rejected = None
+            if book and student:
+                rejected = self._lend(book, book_qr_code, student, student_qr_code, borrowed_on, reminder_days)
+            if rejected == 'book':
+                fresh = self.index.lookup_book(book_qr_code, refresh=True)
+                if fresh != book:
+                    book = fresh
+                    rejected = book and self._lend(book, book_qr_code, student, student_qr_code,
+                                                   borrowed_on, reminder_days)
+            elif rejected == 'student':
+                student = self.index.lookup_student(student_qr_code, refresh=True)
+                rejected = student and self._lend(book, book_qr_code, student, student_qr_code,
+                                                  borrowed_on, reminder_days)
+
+            if not book:
+                message = f"No book with QR code {book_qr_code}"
+            elif not student:
+                message = f"No student with QR code {student_qr_code}"
+            elif rejected:
+                message = "Book is already on loan" if rejected == 'book' else "Student card was not accepted"
+        except Exception as e:
+            logger.error(f"Error in scan borrow: {e}")
+            message = str(e)
+        return self._result(started, 'borrow', message, book, student)
+
+    def _lend(self, book: Tuple[int, str], book_qr_code: str, student: Tuple[str, str],
+              student_qr_code: str, borrowed_on: str, reminder_days: int) -> Optional[str]:
+        """Run the borrow transaction; return None on success, else 'book' or 'student' for the rejected scan."""
+        try:
+            with self.loan_repository.transaction():
+                if not self.book_repository.lend_scanned_book(book[0], book_qr_code):
+                    return 'book'
+                if not self.loan_repository.insert_scanned_loan(student[0], student_qr_code, book[0],
+                                                                borrowed_on, reminder_days):
+                    raise _ScanRejected()
+        except _ScanRejected:
+            # Raised inside the block so the availability change is rolled back
+            return 'student'
+        return None
+
+    def return_book(self, book_qr_code: str, student_qr_code: str, return_condition: str = "Good",
+                    returned_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Close the scanned student's loan of the scanned book.
+
+        Returns:
+            Dict with 'success', 'message', 'book_title', 'student_name' and 'latency_ms'.
+        """
+        started = time.perf_counter()
+        returned_on = datetime.now().strftime('%Y-%m-%d')
+        message = None
+        book = student = None
+        try:
+            book = self.index.lookup_book(book_qr_code)
+            student = self.index.lookup_student(student_qr_code)
+            closed = False
+            if book and student:
+                closed = self._close(book, book_qr_code, student, student_qr_code,
+                                     returned_on, return_condition, returned_by)
+                if not closed:
+                    # The update re-checks both tokens, so retry once if either index entry was stale
+                    fresh = (self.index.lookup_book(book_qr_code, refresh=True),
+                             self.index.lookup_student(student_qr_code, refresh=True))
+                    if fresh != (book, student):
+                        book, student = fresh
+                        closed = bool(book and student) and self._close(
+                            book, book_qr_code, student, student_qr_code, returned_on, return_condition, returned_by
+                        )
+
+            if not book:
+                message = f"No book with QR code {book_qr_code}"
+            elif not student:
+                message = f"No student with QR code {student_qr_code}"
+            elif not closed:
+                message = "Student has no open loan of this book"
+        except Exception as e:
+            logger.error(f"Error in scan return: {e}")
+            message = str(e)
+        return self._result(started, 'return', message, book, student)
+
+    def _close(self, book: Tuple[int, str], book_qr_code: str, student: Tuple[str, str],
+               student_qr_code: str, returned_on: str, return_condition: str,
+               returned_by: Optional[str]) -> bool:
+        """Run the return transaction; return False if no open loan matches both scanned tokens."""
+        with self.loan_repository.transaction():
+            return self.loan_repository.close_scanned_loan(student[0], student_qr_code, book[0], book_qr_code,
+                                                           returned_on, return_condition, returned_by)
+
+    def _result(self, started: float, action: str, message: Optional[str],
+                book: Optional[tuple], student: Optional[tuple]) -> Dict[str, Any]:
+        """Build a scan result and log its latency."""
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        success = message is None
+        book_title = book[1] if book else None
+        student_name = student[1] if student else None
+        if success:
+            logger.info(f"Scan {action}: '{book_title}' / {student_name} in {latency_ms} ms")
+        else:
+            logger.warning(f"Scan {action} failed in {latency_ms} ms: {message}")
+        return {
+            'success': success,
+            'message': message or f"'{book_title}' {'borrowed' if action == 'borrow' else 'returned'} by {student_name}",
+            'book_title': book_title,
+            'student_name': student_name,
+            'latency_ms': latency_ms,
+        }
@@ -0,0 +1,132 @@
+"""
+Statistics service backed by the trigger-maintained summary counters.
+"""
+
+from typing import Dict, Tuple
+
+from school_system.config.logging import logger
+from school_system.core.exceptions import DatabaseException
+from school_system.database.repositories.stats_repo import StatsCounterRepository
+from school_system.database.stats_counters import STATS_COUNTERS
+
+
+class StatsService:
+    """
+    Service for dashboard counts.
+
+    Every count is read from ``stats_counters``, which triggers keep in step
+    with the source tables, so the cost does not grow with the number of
+    books, students or loans.
+    """
+
+    def __init__(self):
+        self.stats_repository = StatsCounterRepository()
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Get every counter in one read.
+
+        Returns:
+            Counter values by name (see ``STATS_COUNTERS``).
+
+        Raises:
+            DatabaseException: If the counters cannot be read.
+        """
+        try:
+            counters = self.stats_repository.get_values()
+        except Exception as e:
+            logger.error(f"Error reading stats counters: {e}")
+            raise DatabaseException(f"Failed to read stats counters: {e}")
+        return {name: counters.get(name, 0) for name in STATS_COUNTERS}
+
+    def get_counter(self, name: str) -> int:
+        """
+        Get a single counter.
+
+        Raises:
+            KeyError: If name is not a defined counter.
+            DatabaseException: If the counter cannot be read.
+        """
+        if name not in STATS_COUNTERS:
+            raise KeyError(f"Unknown stats counter: {name}")
+        try:
+            return self.stats_repository.get_values([name]).get(name, 0)
+        except Exception as e:
+            logger.error(f"Error reading stats counter '{name}': {e}")
+            raise DatabaseException(f"Failed to read stats counter '{name}': {e}")
+
+    def get_total_books_count(self) -> int:
+        """Number of books."""
+        return self.get_counter('books_total')
+
+    def get_available_books_count(self) -> int:
+        """Number of books marked available."""
+        return self.get_counter('books_available')
+
+    def get_total_borrowed_count(self) -> int:
+        """Number of open student and teacher loans."""
+        return self.count_borrowed(self.get_counters())
+
+    def get_total_students_count(self) -> int:
+        """Number of students."""
+        return self.get_counter('students_total')
+
+    def get_total_teachers_count(self) -> int:
+        """Number of teachers."""
+        return self.get_counter('teachers_total')
+
+    def get_active_users_count(self) -> int:
+        """Number of students and teachers."""
+        return self.count_active_users(self.get_counters())
+
+    def get_available_chairs_count(self) -> int:
+        """Number of unassigned chairs."""
+        return self.get_counter('chairs_available')
+
+    def get_available_lockers_count(self) -> int:
+        """Number of unassigned lockers."""
+        return self.get_counter('lockers_available')
+
+    @staticmethod
+    def count_borrowed(counters: Dict[str, int]) -> int:
+        """Open loans in a ``get_counters`` result."""
+        return counters['student_loans_open'] + counters['teacher_loans_open']
+
+    @staticmethod
+    def count_active_users(counters: Dict[str, int]) -> int:
+        """Students and teachers in a ``get_counters`` result."""
+        return counters['students_total'] + counters['teachers_total']
+
+    def verify_counters(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Recount every counter from its source table and compare.
+
+        Returns:
+            (stored, actual) for each counter that has drifted; empty if all match.
+        """
+        try:
+            stored, actual = self.stats_repository.compare()
+        except Exception as e:
+            logger.error(f"Error verifying stats counters: {e}")
+            raise DatabaseException(f"Failed to verify stats counters: {e}")
+        mismatches = {name: (stored.get(name, 0), value) for name, value in actual.items()
+                      if stored.get(name) != value}
+        for name, (stored_value, value) in mismatches.items():
+            logger.warning(f"Stats counter '{name}' is {stored_value}, but the source table counts {value}")
+        return mismatches
+
+    def rebuild_counters(self) -> Dict[str, int]:
+        """
+        Recompute every counter from scratch.
+
+        Returns:
+            The rebuilt values by name.
+        """
+        try:
+            values = self.stats_repository.rebuild()
+        except Exception as e:
+            logger.error(f"Error rebuilding stats counters: {e}")
+            raise DatabaseException(f"Failed to rebuild stats counters: {e}")
+        logger.info(f"Rebuilt {len(values)} stats counters")
+        return values
+
@@ -2,7 +2,8 @@
 Student service for managing student-related operations.
 """
 
-from typing import List, Optional, Tuple
+import weakref
+from typing import Callable, List, Optional, Tuple
 from datetime import datetime
 from school_system.config.logging import logger
 from school_system.config.settings import Settings
@@ -18,15 +19,55 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from school_system.services.class_management_service import ClassManagementService
 
+# students columns written by the Excel import, in the order Student.save() uses
+STUDENT_IMPORT_COLUMNS = ('student_id', 'admission_number', 'name', 'stream', 'class', 'stream_name',
+                          'created_at', 'qr_code', 'qr_generated_at')
+
 
 class StudentService:
     """Service for managing student-related operations."""
 
+    # Callbacks told about student create/update/delete/promote, shared by every instance.
+    # Bound methods are held weakly so subscribing does not keep a service alive.
+    _change_listeners: List[Callable[[], Optional[Callable]]] = []
+
     def __init__(self):
         self.student_repository = StudentRepository()
         self.import_export_service = ImportExportService()
         self.class_management_service: Optional[ClassManagementService] = None
 
+    @classmethod
+    def add_change_listener(cls, callback: Callable[[str, List[str]], None]) -> None:
+        """
+        Register a callback for changes to student records.
+
+        The callback receives the change type ('create', 'update', 'delete',
+        'promote' or 'import') and the affected student ids.
+        """
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        cls._change_listeners.append(ref)
+
+    @classmethod
+    def remove_change_listener(cls, callback: Callable[[str, List[str]], None]) -> None:
+        """Unregister a callback added with add_change_listener."""
+        cls._change_listeners[:] = [ref for ref in cls._change_listeners if ref() not in (None, callback)]
+
+    @classmethod
+    def notify_students_changed(cls, change: str, student_ids: List[str]) -> None:
+        """Tell every registered listener that student records changed."""
+        for ref in list(cls._change_listeners):
+            callback = ref()
+            if callback is None:
+                cls._change_listeners.remove(ref)
+                continue
+            try:
+                callback(change, student_ids)
+            except Exception as e:
+                logger.error(f"Student change listener failed: {e}")
+
     def get_all_students(self, stream: Optional[str] = None) -> List[Student]:
         """
         Retrieve all students, optionally filtered by stream.
@@ -42,6 +83,26 @@ class StudentService:
             students = [s for s in students if s.stream == stream]
         return students
 
+    def get_students_page(self, after: Optional[tuple] = None, limit: int = 200,
+                          sort_by: Optional[str] = None, descending: bool = False,
+                          **filters) -> Tuple[List[Student], Optional[tuple]]:
+        """
+        Get one keyset-paginated page of students.
+
+        Args:
+            after: Cursor returned with the previous page, None for the first page.
+            limit: Page size.
+            sort_by: Sort key (see StudentRepository.LIST_SORT_EXPRESSIONS).
+            descending: Sort direction.
+            **filters: search, class_name, stream_name and has_qr filters.
+
+        Returns:
+            The students in the page and the cursor for the next page (None at the end).
+        """
+        return self.student_repository.fetch_student_page(
+            after=after, limit=limit, sort_by=sort_by, descending=descending, **filters
+        )
+
     def get_all_streams(self) -> List[str]:
         """
         Get all unique streams from existing students (legacy method for backward compatibility).
@@ -49,7 +110,7 @@ class StudentService:
         Returns:
             A list of unique stream names (old format like "4 Red").
         """
-        students = self.student_repository.get_all()
+        students = self.student_repository.iter_rows()
         streams = list(set(s.stream for s in students if s.stream))
         return sorted(streams)
 
@@ -60,7 +121,7 @@ class StudentService:
         Returns:
             A list of unique class names (e.g., "Form 3", "Form 4", "Grade 10").
         """
-        students = self.student_repository.get_all()
+        students = self.student_repository.iter_rows()
         classes = list(set(s.class_name for s in students if s.class_name))
         return sorted(classes)
 
@@ -71,7 +132,7 @@ class StudentService:
         Returns:
             A list of unique stream names (e.g., "Red", "Blue", "Orange").
         """
-        students = self.student_repository.get_all()
+        students = self.student_repository.iter_rows()
         stream_names = list(set(s.stream_name for s in students if s.stream_name))
         return sorted(stream_names)
 
@@ -122,6 +183,7 @@ class StudentService:
 
             qr_code = student.generate_qr_code()
             student.update()
+            self.notify_students_changed('update', [student.student_id])
             logger.info(f"Generated QR code {qr_code} for student {admission_number}")
             return qr_code
         except Exception as e:
@@ -201,15 +263,18 @@ class StudentService:
         student = Student(**student_data_copy)
         student.save()
         logger.info(f"Student created successfully with ID: {student.student_id}")
+        self.notify_students_changed('create', [student.student_id])
         return student
 
-    def update_student(self, admission_number: str, student_data: dict) -> Optional[Student]:
+    def update_student(self, admission_number: str, student_data: dict,
+                       change: str = 'update') -> Optional[Student]:
         """
         Update an existing student.
 
         Args:
             admission_number: The admission number of the student to update.
             student_data: A dictionary containing updated student data.
+            change: Change type reported to change listeners.
 
         Returns:
             The updated Student object if successful, otherwise None.
@@ -225,6 +290,7 @@ class StudentService:
             setattr(student, key, value)
 
         student.update()
+        self.notify_students_changed(change, [student.student_id])
         return student
 
     def delete_student(self, admission_number: str) -> bool:
@@ -245,6 +311,7 @@ class StudentService:
         student = students[0]
 
         self.student_repository.delete(student.student_id)
+        self.notify_students_changed('delete', [student.student_id])
         return True
 
 
@@ -330,52 +397,56 @@ class StudentService:
         distribution_student_repository.delete(distribution_student)
         return True
 
-    def import_students_from_excel(self, filename: str) -> List[Student]:
+    def import_students_from_excel(self, filename: str,
+                                   progress_callback: Optional[Callable[[int, Optional[int]], None]] = None
+                                   ) -> int:
         """
         Import students from an Excel file.
 
+        The sheet is streamed row by row and inserted in chunks inside one
+        transaction, so either every student is imported or none are.
+
         Args:
             filename: The name of the Excel file.
+            progress_callback: Called with (rows imported, total rows or None) after each chunk.
 
         Returns:
-            A list of imported Student objects.
+            The number of students imported, 0 if the import failed.
         """
         logger.info(f"Importing students from Excel file: {filename}")
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
          
         try:
-            data = self.import_export_service.import_from_excel(filename)
-            students = []
-             
-            for student_data in data:
-                # Remove 'created_at' from student_data if it exists to avoid passing it to the Student constructor
-                # Keep student_id if provided, otherwise it will be set to admission_number in Student model
-                student_data_copy = student_data.copy()
-                student_data_copy.pop('created_at', None)
-                # Don't remove student_id - let the Student model handle it
-                
-                # Map Excel column names to Student model attributes
-                # Excel uses 'Student_ID' but Student model expects 'admission_number'
-                if 'Student_ID' in student_data_copy:
-                    student_data_copy['admission_number'] = student_data_copy.pop('Student_ID')
-                 
-                # Excel uses 'Name' (capital N) but Student model expects 'name' (lowercase n)
-                if 'Name' in student_data_copy:
-                    student_data_copy['name'] = student_data_copy.pop('Name')
-                 
-                # Excel uses 'Stream' (capital S) but Student model expects 'stream' (lowercase s)
-                if 'Stream' in student_data_copy:
-                    student_data_copy['stream'] = student_data_copy.pop('Stream')
-                 
-                student = Student(**student_data_copy)
-                student.save()
-                students.append(student)
-             
-            logger.info(f"Successfully imported {len(students)} students from {filename}")
-            return students
+            def student_rows():
+                for student_data in self.import_export_service.iter_excel_rows(filename):
+                    # Excel headers are Title Case (Student_ID, Name, Class_Name, ...) while the
+                    # Student model expects lowercase names
+                    student_data = {str(column).lower(): value for column, value in student_data.items()
+                                    if column is not None}
+                    # Remove 'created_at' to avoid passing it to the Student constructor
+                    student_data.pop('created_at', None)
+                    # Sheets without an Admission_Number column use Student_ID as the admission number
+                    if not student_data.get('admission_number'):
+                        student_data['admission_number'] = student_data.pop('student_id', None)
+
+                    student = Student(**student_data)
+                    yield (student.student_id, student.admission_number, student.name, student.stream,
+                           student.class_name, student.stream_name, student.created_at,
+                           student.qr_code, student.qr_generated_at)
+
+            imported = self.student_repository.insert_many(
+                STUDENT_IMPORT_COLUMNS, student_rows(),
+                progress_callback=self.import_export_service.excel_progress_reporter(filename, progress_callback)
+            )
+
+            if imported:
+                # An import only adds rows, so listeners get no ids rather than one per row
+                self.notify_students_changed('import', [])
+            logger.info(f"Successfully imported {imported} students from {filename}")
+            return imported
         except Exception as e:
             logger.error(f"Error importing students from Excel: {e}")
-            return []
+            return 0
 
     def export_students_to_excel(self, filename: str) -> bool:
         """
@@ -1234,7 +1305,7 @@ class StudentService:
                 'stream': f"{self._extract_class_level(target_class)} {student.stream_name}" if student.stream_name else ""
             }
 
-            success = self.update_student(admission_number, student_data)
+            success = self.update_student(admission_number, student_data, change='promote')
             if success:
                 logger.info(f"Successfully promoted student {admission_number} from {student.class_name} to {target_class}")
                 return True
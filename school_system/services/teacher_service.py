@@ -2,7 +2,7 @@
 Teacher service for managing teacher-related operations.
 """
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 import datetime
 from school_system.config.logging import logger
 from school_system.config.settings import Settings
@@ -30,6 +30,19 @@ class TeacherService:
         """
         return self.teacher_repository.get_all()
 
+    def search_teachers(self, query: str, limit: int = 200) -> List[Teacher]:
+        """
+        Search teachers by id, name or department prefix, best matches first.
+
+        Args:
+            query: Search box text; every word must prefix-match.
+            limit: Maximum number of teachers returned.
+
+        Returns:
+            The matching Teacher objects.
+        """
+        return self.teacher_repository.full_text_search(query, limit)
+
     def get_teacher_by_id(self, teacher_id: int) -> Optional[Teacher]:
         """
         Retrieve a teacher by their ID.
@@ -196,37 +209,44 @@ class TeacherService:
             'performance_records': 0,
             'qualifications': 0
         }
-    def import_teachers_from_excel(self, filename: str) -> List[Teacher]:
+    def import_teachers_from_excel(self, filename: str,
+                                   progress_callback: Optional[Callable[[int, Optional[int]], None]] = None
+                                   ) -> int:
         """
         Import teachers from an Excel file.
 
+        The sheet is streamed row by row and inserted in chunks inside one
+        transaction, so either every teacher is imported or none are.
+
         Args:
             filename: The name of the Excel file.
+            progress_callback: Called with (rows imported, total rows or None) after each chunk.
 
         Returns:
-            A list of imported Teacher objects.
+            The number of teachers imported, 0 if the import failed.
         """
         logger.info(f"Importing teachers from Excel file: {filename}")
         ValidationUtils.validate_input(filename, "Filename cannot be empty")
         
         try:
-            data = self.import_export_service.import_from_excel(filename)
-            teachers = []
-            
-            for teacher_data in data:
-                # Remove created_at if it exists (Teacher model doesn't accept it)
-                teacher_data_copy = teacher_data.copy()
-                teacher_data_copy.pop('created_at', None)
-
-                teacher = Teacher(**teacher_data_copy)
-                teacher.save()
-                teachers.append(teacher)
+            def teacher_rows():
+                for teacher_data in self.import_export_service.iter_excel_rows(filename):
+                    # Remove created_at if it exists (Teacher model doesn't accept it)
+                    teacher_data.pop('created_at', None)
+
+                    teacher = Teacher(**teacher_data)
+                    yield (teacher.teacher_id, teacher.teacher_name, teacher.department)
+
+            imported = self.teacher_repository.insert_many(
+                ('teacher_id', 'teacher_name', 'department'), teacher_rows(),
+                progress_callback=self.import_export_service.excel_progress_reporter(filename, progress_callback)
+            )
             
-            logger.info(f"Successfully imported {len(teachers)} teachers from {filename}")
-            return teachers
+            logger.info(f"Successfully imported {imported} teachers from {filename}")
+            return imported
         except Exception as e:
             logger.error(f"Error importing teachers from Excel: {e}")
-            return []
+            return 0
 
     def export_teachers_to_excel(self, filename: str) -> bool:
         """
@@ -6,12 +6,13 @@ and coordinates between different components of the application.
 """
 
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from typing import Optional
 
 from school_system.config.logging import logger
 from school_system.config.settings import Settings
-from school_system.database import get_db_session
+from school_system.config.startup import startup_timeline
+from school_system.database import db_connection
 from school_system.database.repositories import (
     StudentRepository, TeacherRepository, BookRepository, UserRepository,
     ChairRepository, LockerRepository, FurnitureCategoryRepository
@@ -20,7 +21,7 @@ from school_system.models import (
     Student, Teacher, Book, User, Chair, Locker, FurnitureCategory
 )
 from school_system.core.exceptions import DatabaseException
-from school_system.gui.windows import LoginWindow, MainWindow
+from school_system.gui.windows.login_window import LoginWindow
 from school_system.gui.dialogs.message_dialog import show_error_message, show_info_message
 
 
@@ -34,7 +35,7 @@ class SchoolSystemApplication:
 
         self.settings = Settings()
         self.current_user: Optional[str] = None
-        self.main_window: Optional[MainWindow] = None
+        self.main_window = None
         self.login_window: Optional[LoginWindow] = None
 
         # Show login window
@@ -66,11 +67,20 @@ class SchoolSystemApplication:
             self.login_window.close()
             self.login_window = None
 
-        # Create and display the main window
+        # Create and display the main window; its module and the services behind it load on first login
         try:
+            startup_timeline.mark("login")
+            from school_system.gui.windows.main_window import MainWindow
+            startup_timeline.mark("main window import")
             self.main_window = MainWindow(None, username, role, self._on_logout)
             self.main_window.show()
+            startup_timeline.mark("main window shown")
+            startup_timeline.log("Login")
             logger.info("Main application window created")
+
+            # Once the first frame is painted, load the screens this role usually opens next
+            from school_system.gui.windows.view_registry import prewarm_views_for_role
+            QTimer.singleShot(0, lambda: prewarm_views_for_role(role))
         except Exception as e:
             logger.error(f"Failed to create main window: {e}")
             show_error_message("Error", f"Failed to create main window: {e}", None)
@@ -119,12 +129,13 @@ Developed for efficient school administration.
         if reply == QMessageBox.StandardButton.Yes:
             logger.info("Application closing")
 
-            # Clean up database connection
+            # Clean up database connections
+            try:
+                db_connection.stop_maintenance()
+            except Exception as e:
+                logger.error(f"Error stopping database maintenance: {e}")
             try:
-                db_session = get_db_session()
-                if db_session:
-                    db_session.close()
-                    logger.info("Database connection closed")
+                db_connection.close_connection()
             except Exception as e:
                 logger.error(f"Error closing database connection: {e}")
 
@@ -5,6 +5,7 @@ Main entry point for the School System Management application.
 This module initializes the application and starts the main event loop.
 """
 
+import multiprocessing
 import sys
 import os
 
@@ -12,11 +13,15 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+# First, so the startup timeline starts before PyQt and the database are loaded
+from school_system.config.startup import startup_timeline
+
 from PyQt6.QtWidgets import QMessageBox
 
 from school_system.config.logging import logger
 from school_system.config.database import load_db_config
-from school_system.database import initialize_database, get_db_session
+from school_system.database import initialize_database, db_connection
+from school_system.services.scan_station_service import get_qr_scan_index
 from school_system.src.application import SchoolSystemApplication
 
 
@@ -24,6 +29,7 @@ def main():
     """Main application entry point."""
     try:
         logger.info("Starting School System Management Application")
+        startup_timeline.mark("imports")
         
         # Load configuration
         config = load_db_config()
@@ -31,12 +37,13 @@ def main():
             logger.error("Failed to load database configuration")
             QMessageBox.critical(None, "Configuration Error", "Failed to load database configuration")
             return 1
+        startup_timeline.mark("config")
         
         # Initialize database if needed
         logger.info("Initializing database")
         try:
-            db_connection = initialize_database()
-            if not db_connection:
+            init_connection = initialize_database()
+            if not init_connection:
                 logger.error("Failed to initialize database")
                 return 1
         except Exception as e:
@@ -44,8 +51,23 @@ def main():
             QMessageBox.critical(None, "Database Error", f"Failed to initialize database: {e}")
             return 1
         
+        startup_timeline.mark("database")
+        
+        # Report the connection profile in effect and schedule WAL checkpoints
+        db_connection.start_maintenance()
+        startup_timeline.mark("maintenance")
+        
+        # Load the QR token index so the first desk scan does not pay for it
+        try:
+            get_qr_scan_index().warm()
+        except Exception as e:
+            logger.error(f"Failed to warm QR scan index: {e}")
+        startup_timeline.mark("scan index")
+        
         # Create and run the main application window
         app = SchoolSystemApplication()
+        startup_timeline.mark("login window")
+        startup_timeline.log()
         
         logger.info("Application started successfully")
         return app.run()
@@ -56,15 +78,18 @@ def main():
         return 1
     
     finally:
-        # Clean up database connection
+        # Clean up database connections
+        try:
+            db_connection.stop_maintenance()
+        except Exception as e:
+            logger.error(f"Error stopping database maintenance: {e}")
         try:
-            db_session = get_db_session()
-            if db_session:
-                db_session.close()
-                logger.info("Database connection closed")
+            db_connection.close_connection()
         except Exception as e:
             logger.error(f"Error closing database connection: {e}")
 
 
 if __name__ == "__main__":
+    # Needed by the QR batch process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -1 +1,28 @@
- 
+"""
+Shared test fixtures.
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+
+def create_test_database(path: str = ":memory:") -> sqlite3.Connection:
+    """
+    Create a database with the application schema at the given path.
+
+    Runs initialize_database() against a private connection so tests never
+    touch the real school_db file.
+
+    Args:
+        path: SQLite file path, or ":memory:" for a throwaway database.
+
+    Returns:
+        The open connection holding the initialized schema.
+    """
+    from school_system.database.connection import initialize_database
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON")
+    with patch('school_system.database.connection.create_db_connection', return_value=conn):
+        initialize_database()
+    return conn
@@ -0,0 +1,110 @@
+"""
+Unit tests for the batched audit log writer.
+"""
+
+import time
+import unittest
+from datetime import datetime
+
+from school_system.core.exceptions import ValidationError
+from school_system.database.audit_writer import AuditLogWriter
+from school_system.database.repositories.audit_log_repo import AuditLogRepository
+from school_system.database.repositories.user_activity_repo import UserActivityRepository
+from school_system.models.audit_log import AuditLog
+from school_system.models.user_activity import UserActivity
+from school_system.services.auth_service import AuthService
+from school_system.tests.fixtures import create_test_database
+
+
+class TestAuditLogWriter(unittest.TestCase):
+    """Tests for queueing, batched flushes, bad-row isolation and shutdown."""
+
+    def setUp(self):
+        """Create an in-memory database and repositories bound to it."""
+        self.conn = create_test_database()
+        self.audit_repository = AuditLogRepository()
+        self.audit_repository._db = self.conn
+        self.activity_repository = UserActivityRepository()
+        self.activity_repository._db = self.conn
+        self.writer = AuditLogWriter(batch_size=100, flush_interval=60)
+
+    def tearDown(self):
+        """Stop the writer and close the test database."""
+        self.writer.stop()
+        self.conn.close()
+
+    def count(self, table):
+        """Rows in table."""
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_records_wait_for_flush(self):
+        """Queued records are written together on flush, keeping the time they were queued."""
+        log = AuditLog(user_id='admin', action='borrow', details='Book 1')
+        log.created_at = datetime(2026, 1, 5, 9, 30)
+        self.writer.enqueue(self.audit_repository, log)
+        self.writer.enqueue(self.audit_repository, AuditLog(user_id='admin', action='return', details='Book 1'))
+        self.writer.enqueue(self.activity_repository, UserActivity(username='admin', activity_type='login',
+                                                                   details='Desk 2'))
+        self.assertEqual(self.count('audit_logs'), 0)
+        self.assertEqual(self.writer.queue_length, 3)
+
+        self.assertEqual(self.writer.flush(), 3)
+        self.assertEqual((self.count('audit_logs'), self.count('user_activities')), (2, 1))
+        self.assertEqual(
+            self.conn.execute("SELECT created_at FROM audit_logs WHERE action = 'borrow'").fetchone()[0],
+            '2026-01-05 09:30:00'
+        )
+        stats = self.writer.get_stats()
+        self.assertEqual((stats['queue_length'], stats['written'], stats['flushes']), (0, 3, 1))
+        self.assertGreater(stats['max_flush_ms'], 0)
+
+    def test_full_batch_flushes_in_background(self):
+        """Reaching batch_size wakes the writer thread without waiting for the interval."""
+        self.writer.batch_size = 3
+        for number in range(3):
+            self.writer.enqueue(self.audit_repository, AuditLog(user_id='admin', action='borrow',
+                                                                details=f'Book {number}'))
+        self.assertTrue(self.writer.is_running)
+        deadline = time.monotonic() + 5
+        while self.writer.get_stats()['written'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.count('audit_logs'), 3)
+
+    def test_bad_record_is_dropped_alone(self):
+        """A record the database rejects is dropped without losing the rest of its batch."""
+        self.writer.enqueue(self.audit_repository, AuditLog(user_id='admin', action='borrow', details='Book 1'))
+        self.writer.enqueue(self.audit_repository, AuditLog(user_id='ghost', action='borrow', details='Book 2'))
+        self.writer.enqueue(self.audit_repository, AuditLog(user_id='admin', action='return', details='Book 1'))
+
+        self.assertEqual(self.writer.flush(), 2)
+        self.assertEqual(self.count('audit_logs'), 2)
+        self.assertEqual(self.writer.get_stats()['dropped'], 1)
+
+    def test_stop_flushes_pending_records(self):
+        """Stopping writes whatever is still queued and ends the thread."""
+        self.writer.enqueue(self.audit_repository, AuditLog(user_id='admin', action='borrow', details='Book 1'))
+        self.writer.stop()
+        self.assertFalse(self.writer.is_running)
+        self.assertEqual(self.count('audit_logs'), 1)
+
+    def test_unknown_user_is_rejected_before_queueing(self):
+        """Explicit log and track calls for an unknown user raise instead of being dropped later."""
+        service = AuthService()
+        service.user_repository._db = self.conn
+        service.audit_log_repository = self.audit_repository
+        service.user_activity_repository = self.activity_repository
+        service.audit_writer = self.writer
+
+        with self.assertRaises(ValidationError):
+            service.log_user_action('ghost', 'borrow', 'Book 1')
+        with self.assertRaises(ValidationError):
+            service.track_user_activity('ghost', 'login', 'Desk 2')
+        self.assertEqual(self.writer.queue_length, 0)
+
+        service.log_user_action('admin', 'borrow', 'Book 1')
+        self.writer.stop()
+        self.assertEqual(self.count('audit_logs'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for BaseRepository pagination and streaming against a temporary database.
+"""
+
+import unittest
+
+from school_system.database.repositories.book_repo import BorrowedBookStudentRepository
+from school_system.database.repositories.student_repo import TotalReamsRepository
+from school_system.tests.fixtures import create_test_database
+
+
+class TestBaseRepositoryPaging(unittest.TestCase):
+    """Tests for keyset pagination and streaming iterators."""
+
+    def setUp(self):
+        """Create loans whose model primary key (student_id) is not unique."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.executemany(
+            "INSERT INTO students (student_id, name, stream) VALUES (?, ?, 'R')",
+            [('S1', 'Alice'), ('S2', 'Bob')]
+        )
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author) VALUES (?, ?, ?, 'Author')",
+            [(i, f'B{i:03d}', f'Title {i}') for i in range(1, 8)]
+        )
+        self.conn.executemany(
+            "INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on) VALUES (?, ?, '2024-01-01')",
+            [('S1' if i % 2 else 'S2', i) for i in range(1, 8)]
+        )
+        self.conn.commit()
+
+        self.repo = BorrowedBookStudentRepository()
+        self.repo._db = self.conn
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def test_keyset_pages_visit_every_row_once(self):
+        """Pages follow rowid, so duplicate student ids are neither skipped nor repeated."""
+        book_ids, after = [], None
+        while True:
+            loans, after = self.repo.paginate_keyset(after, limit=3)
+            book_ids.extend(loan.book_id for loan in loans)
+            if after is None:
+                break
+        self.assertEqual(book_ids, list(range(1, 8)))
+
+    def test_iterators_stream_in_batches(self):
+        """iter_all and iter_where yield models across several fetchmany batches."""
+        self.assertEqual([loan.book_id for loan in self.repo.iter_all(batch_size=2)], list(range(1, 8)))
+        self.assertEqual(sorted(loan.book_id for loan in self.repo.iter_where(batch_size=2, student_id='S2')),
+                         [2, 4, 6])
+        self.assertEqual([loan.book_id for loan in self.repo.paginate(2, offset=4)], [5, 6])
+
+    def test_row_builder_drops_columns_constructor_does_not_accept(self):
+        """Models without **kwargs can still be loaded from tables with extra columns."""
+        self.conn.execute("DELETE FROM total_reams")
+        self.conn.execute("INSERT INTO total_reams (id, total_available) VALUES (1, 40)")
+        self.conn.commit()
+        repo = TotalReamsRepository()
+        repo._db = self.conn
+
+        self.assertEqual([row.total_available for row in repo.iter_all()], [40])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,296 @@
+"""
+Unit tests for BookService set-based operations against a temporary database.
+"""
+
+import os
+import tempfile
+import unittest
+
+from school_system.services.book_service import BookService
+from school_system.tests.fixtures import create_test_database
+
+
+class BookServiceDatabaseTestCase(unittest.TestCase):
+    """Base case wiring a BookService to an in-memory database."""
+
+    def setUp(self):
+        """Create an in-memory database with books, a student and a teacher."""
+        self.conn = create_test_database()
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author, available) VALUES (?, ?, ?, ?, ?)",
+            [(i, f'B{i:03d}', f'Title {i}', 'Author', 1) for i in range(1, 6)]
+        )
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.execute("INSERT INTO students (student_id, name, stream) VALUES ('S1', 'Alice', 'R')")
+        self.conn.execute("INSERT INTO students (student_id, name, stream) VALUES ('S2', 'Bob', 'R')")
+        self.conn.execute("INSERT INTO teachers (teacher_id, teacher_name) VALUES ('T1', 'Mr T')")
+        self.conn.commit()
+
+        self.service = BookService()
+        for repo in self._repositories():
+            repo._db = self.conn
+
+    def _repositories(self):
+        """Repositories used by the service that must point at the test database."""
+        from school_system.database.repositories.base import BaseRepository
+        repos = [value for value in vars(self.service).values() if isinstance(value, BaseRepository)]
+        repos.extend(
+            value for value in vars(self.service.student_service).values() if isinstance(value, BaseRepository)
+        )
+        return repos
+
+    def tearDown(self):
+        """Write queued audit records, then close the test database."""
+        self.service.audit_writer.flush()
+        self.conn.close()
+
+
+class TestBorrowedBookIds(BookServiceDatabaseTestCase):
+    """Tests for the bulk availability lookup."""
+
+    def test_ids_cover_open_student_and_teacher_loans(self):
+        """Open loans from both tables are reported; returned loans are not."""
+        self.conn.executemany(
+            "INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on, returned_on) VALUES (?, ?, ?, ?)",
+            [('S1', 1, '2024-01-01', None), ('S2', 2, '2024-01-01', '2024-02-01')]
+        )
+        self.conn.execute(
+            "INSERT INTO borrowed_books_teacher (teacher_id, book_id, borrowed_on) VALUES ('T1', 3, '2024-01-05')"
+        )
+        self.conn.commit()
+
+        self.assertEqual(self.service.get_borrowed_book_ids(), {1, 3})
+
+        loans = self.service.get_borrowed_books()
+        self.assertEqual(
+            sorted((loan['user_type'], loan['book_id']) for loan in loans),
+            [('student', 1), ('teacher', 3)]
+        )
+
+
+
+class TestCatalogPage(BookServiceDatabaseTestCase):
+    """Tests for the keyset-paginated catalog."""
+
+    def _walk(self, page_size, **kwargs):
+        """Collect book numbers page by page, returning them with the page count."""
+        numbers, pages, after = [], 0, None
+        while True:
+            books, after = self.service.get_catalog_page(after, page_size, **kwargs)
+            numbers.extend(book.book_number for book in books)
+            pages += 1
+            if after is None:
+                return numbers, pages
+
+    def setUp(self):
+        """Add the class and subject short forms the books reference."""
+        super().setUp()
+        self.conn.executemany(
+            "INSERT INTO short_form_mappings (short_form, full_name, type) VALUES (?, ?, ?)",
+            [('F1', 'Form 1', 'class'), ('F2', 'Form 2', 'class'), ('Math', 'Mathematics', 'subject')]
+        )
+        self.conn.commit()
+
+    def test_pages_cover_catalog_once_in_sort_order(self):
+        """Duplicate and NULL sort values neither repeat nor drop rows across page boundaries."""
+        self.conn.executemany(
+            "UPDATE books SET class = ? WHERE id = ?",
+            [('F2', 1), (None, 2), ('F1', 3), ('F2', 4), (None, 5)]
+        )
+        self.conn.commit()
+
+        numbers, pages = self._walk(2, sort_by='class')
+        self.assertEqual(numbers, ['B002', 'B005', 'B003', 'B001', 'B004'])
+        self.assertEqual(pages, 3)
+
+        numbers, _ = self._walk(2, sort_by='class', descending=True)
+        self.assertEqual(numbers, ['B004', 'B001', 'B003', 'B005', 'B002'])
+
+    def test_filters_run_in_sql(self):
+        """Search, subject/category and QR filters combine."""
+        self.conn.execute("UPDATE books SET subject = 'Math' WHERE id = 1")
+        self.conn.execute("UPDATE books SET category = 'Math', qr_code = 'QR3' WHERE id = 3")
+        self.conn.commit()
+
+        self.assertEqual(self._walk(10, subject='Math')[0], ['B001', 'B003'])
+        self.assertEqual(self._walk(10, subject='Math', has_qr=False)[0], ['B001'])
+        self.assertEqual(self._walk(10, search='Title 4')[0], ['B004'])
+
+    def test_rejects_unknown_sort_column(self):
+        """Sort keys are whitelisted rather than interpolated."""
+        from school_system.core.exceptions import DatabaseException
+        with self.assertRaises(DatabaseException):
+            self.service.get_catalog_page(sort_by='title; DROP TABLE books')
+
+
+class TestBulkBorrow(BookServiceDatabaseTestCase):
+    """Tests for the single-transaction bulk borrow engine."""
+
+    def _open_loans(self):
+        """Open loans as (student_id, book_id) pairs."""
+        return sorted(self.conn.execute(
+            "SELECT student_id, book_id FROM borrowed_books_student WHERE returned_on IS NULL"
+        ).fetchall())
+
+    def _unavailable_ids(self):
+        """Ids of books flagged unavailable."""
+        return [row[0] for row in self.conn.execute("SELECT id FROM books WHERE available = 0 ORDER BY id")]
+
+    def test_class_set_is_lent_one_copy_per_student(self):
+        """Copies given by id or book number are lent together and flagged unavailable."""
+        result = self.service.bulk_borrow_books_for_students([1, 'B002'], ['S1', 'S2'])
+
+        self.assertTrue(result['success'])
+        self.assertEqual((result['successful_borrows'], result['failed_borrows']), (2, 0))
+        self.assertEqual(self._open_loans(), [('S1', 1), ('S2', 2)])
+        self.assertEqual(self._unavailable_ids(), [1, 2])
+        self.assertEqual(result['details'][0]['student_name'], 'Alice')
+
+    def test_best_effort_lends_what_it_can(self):
+        """A single copy goes to the first student and the rest are reported."""
+        result = self.service.bulk_borrow_books_for_students(3, ['S1', 'S2', 'S9'])
+
+        self.assertEqual((result['successful_borrows'], result['failed_borrows']), (1, 2))
+        self.assertEqual([d['status'] for d in result['details']], ['success', 'failed', 'failed'])
+        self.assertIn('already assigned', result['details'][1]['error'])
+        self.assertEqual(result['details'][2]['error'], 'Student not found')
+        self.assertEqual(self._open_loans(), [('S1', 3)])
+
+    def test_all_or_nothing_writes_nothing_on_failure(self):
+        """One unavailable copy rejects the whole batch."""
+        self.conn.execute("UPDATE books SET available = 0 WHERE id = 5")
+        self.conn.commit()
+
+        result = self.service.bulk_borrow_books_for_students([4, 5], ['S1', 'S2'], all_or_nothing=True)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['failed_borrows'], 2)
+        self.assertEqual(self._open_loans(), [])
+        self.assertEqual(self._unavailable_ids(), [5])
+        self.assertFalse(self.conn.in_transaction)
+
+
+class TestBulkReturn(BookServiceDatabaseTestCase):
+    """Tests for the set-based bulk return path."""
+
+    def setUp(self):
+        """Put four books on loan to students and a teacher."""
+        super().setUp()
+        self.conn.executemany(
+            "INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on) VALUES (?, ?, '2024-01-01')",
+            [('S1', 1), ('S2', 2), ('S2', 3)]
+        )
+        self.conn.execute(
+            "INSERT INTO borrowed_books_teacher (teacher_id, book_id, borrowed_on) VALUES ('T1', 4, '2024-01-05')"
+        )
+        self.conn.execute("UPDATE books SET available = 0 WHERE id IN (1, 2, 3, 4)")
+        self.conn.commit()
+
+    def _available_ids(self):
+        """Ids of books flagged available."""
+        return [row[0] for row in self.conn.execute("SELECT id FROM books WHERE available = 1 ORDER BY id")]
+
+    def test_valid_returns_apply_and_failures_are_reported(self):
+        """Returns for both borrower types apply together; bad items are listed."""
+        success, _, stats = self.service.bulk_return_books([
+            {'book_id': 1, 'borrower_id': 'S1', 'borrower_type': 'student', 'condition': 'Torn', 'fine_amount': 50},
+            {'book_id': 4, 'borrower_id': 'T1', 'borrower_type': 'teacher'},
+            {'book_id': 2, 'borrower_id': 'S1', 'borrower_type': 'student'},
+            {'book_id': 99, 'borrower_id': 'S1', 'borrower_type': 'student'},
+        ], 'admin')
+
+        self.assertTrue(success)
+        self.assertEqual((stats['success_count'], stats['error_count']), (2, 2))
+        self.assertIn("Book 99 not found", stats['errors'])
+        self.assertEqual(self._available_ids(), [1, 4, 5])
+        self.assertEqual(
+            self.conn.execute("SELECT return_condition, fine_amount, returned_by FROM borrowed_books_student "
+                              "WHERE book_id = 1").fetchone(),
+            ('Torn', 50.0, 'admin')
+        )
+        self.service.audit_writer.flush()
+        self.assertEqual(
+            self.conn.execute("SELECT COUNT(*) FROM audit_logs WHERE action = 'bulk_return'").fetchone()[0], 1
+        )
+
+    def test_distribution_session_returns_all_assigned_books(self):
+        """Every book assigned in the session is returned in one pass."""
+        self.conn.execute(
+            "INSERT INTO distribution_sessions (session_id, class, stream, subject, term, created_by) "
+            "VALUES (1, 'Form 4', 'Red', 'Math', 'T1', 'admin')"
+        )
+        self.conn.executemany(
+            "INSERT INTO distribution_students (session_id, student_id, book_id) VALUES (1, ?, ?)",
+            [('S1', 1), ('S2', 2)]
+        )
+        self.conn.commit()
+
+        self.assertTrue(self.service.return_via_distribution(1, 'admin'))
+        self.assertEqual(self._available_ids(), [1, 2, 5])
+        self.assertEqual(
+            self.conn.execute("SELECT COUNT(*) FROM borrowed_books_student WHERE returned_on IS NULL").fetchone()[0], 1
+        )
+
+
+class TestDistributionImport(BookServiceDatabaseTestCase):
+    """Tests for the staged distribution CSV import."""
+
+    def setUp(self):
+        """Create a session for five students and a CSV covering each import outcome."""
+        super().setUp()
+        self.conn.executemany(
+            "INSERT INTO students (student_id, name, stream) VALUES (?, ?, 'R')",
+            [('S3', 'Carol'), ('S4', 'Dan'), ('S5', 'Eve')]
+        )
+        self.conn.execute("UPDATE books SET available = 0 WHERE id = 3")
+        self.conn.execute(
+            "INSERT INTO distribution_sessions (session_id, class, stream, subject, term, created_by) "
+            "VALUES (1, 'Form 4', 'Red', 'Math', 'T1', 'admin')"
+        )
+        self.conn.executemany(
+            "INSERT INTO distribution_students (session_id, student_id, notes) VALUES (1, ?, 'old')",
+            [('S1',), ('S2',), ('S3',), ('S4',), ('S5',)]
+        )
+        self.conn.commit()
+
+        handle, self.csv_path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w', newline='', encoding='utf-8') as f:
+            f.write("student_id,book_number\n"
+                    "S1,B001\n"      # valid
+                    "S2,NEW-1\n"     # not in the catalog yet
+                    "S3,B003\n"      # unavailable
+                    "S4,B004\n"      # duplicate...
+                    "S5,B004\n"      # ...of this one
+                    ",B005\n"        # no student
+                    "S5, \n")        # blank book number, last row for S5 wins
+
+    def tearDown(self):
+        """Remove the CSV file."""
+        os.remove(self.csv_path)
+        super().tearDown()
+
+    def test_rows_are_classified_and_applied(self):
+        """Statistics match the per-row flow and only importable rows are written."""
+        stats = self.service.import_csv_with_unknown_books(1, self.csv_path, 'admin')
+
+        self.assertEqual(
+            (stats['valid_books'], stats['pending_books'], stats['duplicate_book_numbers'], stats['conflicts']),
+            (1, 1, 1, 3)
+        )
+        self.assertEqual(stats['status'], 'PARTIAL')
+        rows = dict((r[0], r[1:]) for r in self.conn.execute(
+            "SELECT student_id, book_number, book_id, notes FROM distribution_students WHERE session_id = 1"
+        ))
+        self.assertEqual(rows['S1'], ('B001', 1, None))
+        self.assertEqual(rows['S2'], ('NEW-1', None, 'Not in system'))
+        self.assertEqual(rows['S3'], (None, None, 'old'))
+        self.assertEqual(rows['S4'], (None, None, 'old'))
+        self.assertEqual(rows['S5'], (None, None, None))
+        self.assertEqual(
+            self.conn.execute("SELECT status FROM distribution_import_logs WHERE session_id = 1").fetchone()[0],
+            'PARTIAL'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Unit tests for table-version change tracking.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from PyQt6.QtWidgets import QApplication
+
+from school_system.database.change_tracking import ChangeTracker
+from school_system.database.migrations import MigrationManager
+from school_system.gui.base.widgets.search_box import MemoizedSearchBox
+
+
+class ChangeTrackingTestCase(unittest.TestCase):
+    """A migrated database file with a writer connection, like a second desk."""
+
+    def setUp(self):
+        """Create the database and a tracker polling it on its own connection."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'school.db')
+        self.writer = sqlite3.connect(self.path, isolation_level=None)
+        MigrationManager(self.writer).migrate()
+        self.tracker = ChangeTracker(lambda: sqlite3.connect(self.path, isolation_level=None))
+
+    def tearDown(self):
+        """Close connections and remove the database."""
+        self.tracker.close()
+        self.writer.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def add_book(self, number):
+        """Insert a book through the writer connection."""
+        self.writer.execute("INSERT INTO books (book_number, title, author) VALUES (?, 'Algebra', 'Smith')",
+                            (number,))
+
+
+class TestChangeTracker(ChangeTrackingTestCase):
+    """Tests for polling, version snapshots and listeners."""
+
+    def test_poll_reports_changed_tables(self):
+        """Commits by another connection are reported per table; idle polls skip the version read."""
+        changes = []
+        self.tracker.add_listener(changes.append)
+        self.assertTrue(self.tracker.is_available)
+        self.assertEqual(self.tracker.poll(), set())
+        reads = self.tracker.stats['version_reads']
+        self.assertEqual(self.tracker.poll(), set())
+        self.assertEqual(self.tracker.stats['version_reads'], reads)
+
+        self.add_book('B1')
+        self.assertEqual(self.tracker.poll(), {'books'})
+        self.writer.execute("UPDATE books SET title = 'Geometry'")
+        self.writer.execute("DELETE FROM books")
+        self.assertEqual(self.tracker.poll(), {'books'})
+        self.assertEqual(changes, [{'books'}, {'books'}])
+
+    def test_versions_track_dependencies(self):
+        """A snapshot stays current until one of its own tables changes."""
+        snapshot = self.tracker.versions(['books', 'students'])
+        self.writer.execute("INSERT INTO teachers (teacher_id, teacher_name) VALUES ('T1', 'Jane')")
+        self.assertTrue(self.tracker.is_current(snapshot))
+        self.add_book('B1')
+        self.assertFalse(self.tracker.is_current(snapshot))
+        self.assertEqual(self.tracker.versions(['books'])['books'], snapshot['books'] + 1)
+
+    def test_untracked_database(self):
+        """Without table_versions the tracker reports itself unavailable."""
+        path = os.path.join(self.tmpdir, 'legacy.db')
+        sqlite3.connect(path).close()
+        tracker = ChangeTracker(lambda: sqlite3.connect(path))
+        self.assertFalse(tracker.is_available)
+        self.assertIsNone(tracker.versions(['books']))
+        self.assertFalse(tracker.is_current(None))
+        tracker.close()
+
+
+class TestMemoizedSearchBox(ChangeTrackingTestCase):
+    """Tests for version-checked search memoization."""
+
+    def test_results_reused_until_table_changes(self):
+        """A cached result is served until a table the search reads changes."""
+        self.app = QApplication.instance() or QApplication([])
+        calls = []
+
+        def search(text):
+            calls.append(text)
+            return [row[0] for row in self.writer.execute("SELECT book_number FROM books")]
+
+        box = MemoizedSearchBox(search_func=search, tables=('books',), change_tracker=self.tracker)
+        self.assertEqual(box.search('alg'), [])
+        self.assertEqual(box.search('alg'), [])
+        self.writer.execute("INSERT INTO students (student_id, name, stream) VALUES ('S1', 'Alice', 'R')")
+        self.assertEqual(box.search('alg'), [])
+        self.assertEqual(len(calls), 1)
+
+        self.add_book('B1')
+        self.assertEqual(box.search('alg'), ['B1'])
+        self.assertEqual((box.cache_hits, box.cache_misses), (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for the ClassManagementService class/stream index.
+"""
+
+import gc
+import unittest
+
+from school_system.services.class_management_service import ClassManagementService
+from school_system.services.student_service import StudentService
+from school_system.tests.fixtures import create_test_database
+
+
+class TestClassIndex(unittest.TestCase):
+    """Tests for the cached class/stream index and its invalidation."""
+
+    def setUp(self):
+        """Create an in-memory database with students in two streams."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.executemany(
+            "INSERT INTO students (student_id, admission_number, name, stream, class, stream_name) "
+            "VALUES (?, ?, ?, 'R', ?, ?)",
+            [('S1', 'S1', 'Alice', 'Form 4', 'Red'),
+             ('S2', 'S2', 'Bob', 'Form 4', 'Blue'),
+             ('S3', 'S3', 'Carol', 'Form 4', 'Red'),
+             ('S4', 'S4', 'Dan', 'Grade 10', 'Red')]
+        )
+        self.conn.commit()
+
+        self.service = ClassManagementService()
+        self.service.student_service.student_repository._db = self.conn
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def test_index_is_reused_until_students_change(self):
+        """Lookups share one index build, and a student change forces a rebuild."""
+        self.assertEqual(self.service.get_class_stream_combinations(),
+                         [(4, 'Blue', 1), (4, 'Red', 2), (10, 'Red', 1)])
+        self.assertEqual([s.name for s in self.service.get_students_by_class_and_stream(4, 'Red')],
+                         ['Alice', 'Carol'])
+        self.assertEqual(self.service.get_all_streams(4), ['Blue', 'Red'])
+        self.assertEqual(self.service.cache_stats['misses'], 1)
+        self.assertEqual(self.service.cache_stats['hits'], 2)
+
+        self.service.student_service.delete_student('S1')
+
+        self.assertEqual([s.name for s in self.service.get_students_by_class_level(4)], ['Bob', 'Carol'])
+        self.assertEqual(self.service.cache_stats['misses'], 2)
+        self.assertEqual(self.service.cache_stats['invalidations'], 1)
+
+    def test_listener_does_not_keep_service_alive(self):
+        """Discarded services drop out of the change listener list."""
+        gc.collect()
+        StudentService.notify_students_changed('update', [])
+        before = len(StudentService._change_listeners)
+        ClassManagementService()
+        gc.collect()
+        StudentService.notify_students_changed('update', ['S1'])
+        self.assertEqual(len(StudentService._change_listeners), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
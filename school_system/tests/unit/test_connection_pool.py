@@ -0,0 +1,94 @@
+"""
+Unit tests for the SQLite connection pool.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from school_system.core.exceptions import DatabaseException
+from school_system.database.pool import ConnectionPool
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Unit tests for ConnectionPool checkout, return and limits."""
+
+    def setUp(self):
+        """Create a temporary database file for the pool."""
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.pool = ConnectionPool(
+            'test',
+            lambda: sqlite3.connect(self.db_path, check_same_thread=False),
+            pool_size=2, max_overflow=1, timeout=0.2
+        )
+
+    def tearDown(self):
+        """Close the pool and remove the database file."""
+        self.pool.close_all()
+        os.remove(self.db_path)
+
+    def test_connections_are_reused(self):
+        """A returned connection is handed out again."""
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        self.assertIs(self.pool.acquire(), conn)
+        self.assertEqual(self.pool.get_stats()['connections_created'], 1)
+
+    def test_overflow_connections_are_closed_on_return(self):
+        """Connections beyond pool_size are closed when released."""
+        conns = [self.pool.acquire() for _ in range(3)]
+        for conn in conns:
+            self.pool.release(conn)
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['open_connections'], 2)
+        self.assertEqual(stats['idle_connections'], 2)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_exhausted_pool_times_out(self):
+        """Checkout fails once pool_size + max_overflow connections are in use."""
+        conns = [self.pool.acquire() for _ in range(3)]
+        with self.assertRaises(DatabaseException):
+            self.pool.acquire()
+        self.assertEqual(self.pool.get_stats()['timeouts'], 1)
+        for conn in conns:
+            self.pool.release(conn)
+
+    def test_waiting_thread_gets_released_connection(self):
+        """A blocked checkout succeeds as soon as another thread returns a connection."""
+        pool = ConnectionPool(
+            'wait',
+            lambda: sqlite3.connect(self.db_path, check_same_thread=False),
+            pool_size=1, max_overflow=0, timeout=5.0
+        )
+        held = pool.acquire()
+        result = {}
+
+        def worker():
+            result['conn'] = pool.acquire()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        pool.release(held)
+        thread.join(5)
+        self.assertIs(result.get('conn'), held)
+        pool.release(held)
+        pool.close_all()
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        """Uncommitted work never leaks to the next borrower."""
+        conn = self.pool.acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        self.assertTrue(conn.in_transaction)
+        self.pool.release(conn)
+        conn = self.pool.acquire()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        self.pool.release(conn)
+
+
+if __name__ == '__main__':
+    unittest.main()
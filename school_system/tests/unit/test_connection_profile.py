@@ -0,0 +1,95 @@
+"""
+Unit tests for the SQLite connection profile and maintenance scheduler.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from school_system.core.exceptions import DatabaseException
+from school_system.database.profile import ConnectionProfile, DatabaseMaintenance
+
+
+class TestConnectionProfile(unittest.TestCase):
+    """Unit tests for applying and reporting PRAGMA settings."""
+
+    def setUp(self):
+        """Create a temporary database file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'profile.db')
+        self.profile = ConnectionProfile({
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -4000,
+            'temp_store': 'MEMORY'
+        })
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_apply_sets_wal_and_tuning(self):
+        """The profile's PRAGMAs are in effect after apply()."""
+        conn = sqlite3.connect(self.db_path)
+        self.profile.apply(conn)
+        settings = self.profile.effective_settings(conn)
+        conn.close()
+
+        self.assertEqual(settings['journal_mode'], 'wal')
+        self.assertEqual(settings['synchronous'], 1)  # NORMAL
+        self.assertEqual(settings['cache_size'], -4000)
+        self.assertEqual(settings['temp_store'], 2)  # MEMORY
+
+    def test_read_only_connection_skips_journal_mode(self):
+        """Query-only connections are not asked to change the journal mode."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA query_only = ON")
+        self.profile.apply(conn, read_only=True)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'delete')
+        conn.close()
+
+    def test_invalid_value_is_rejected(self):
+        """PRAGMA values are validated because they cannot be bound."""
+        with self.assertRaises(ValueError):
+            ConnectionProfile._format_value("WAL; DROP TABLE books")
+
+    def test_bad_value_is_skipped_and_negative_string_accepted(self):
+        """A rejected value is logged and skipped; a negative cache size may be a string."""
+        conn = sqlite3.connect(self.db_path)
+        ConnectionProfile({'cache_size': '-8000', 'temp_store': 'MEMORY; --'}).apply(conn)
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -8000)
+        conn.close()
+
+    def test_maintenance_runs_checkpoint_and_optimize(self):
+        """Manual maintenance runs update the counters."""
+        conn = sqlite3.connect(self.db_path)
+        self.profile.apply(conn)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+        conn.close()
+
+        maintenance = DatabaseMaintenance(lambda: sqlite3.connect(self.db_path))
+        result = maintenance.run_checkpoint()
+        maintenance.run_optimize()
+
+        self.assertIsNotNone(result)
+        self.assertEqual(result[0], 0)  # not blocked
+        self.assertEqual(maintenance.stats['checkpoints'], 1)
+        self.assertEqual(maintenance.stats['optimize_runs'], 1)
+        self.assertEqual(maintenance.stats['errors'], 0)
+
+    def test_maintenance_survives_connection_failure(self):
+        """A factory failure is counted, and stopping still returns normally."""
+        def factory():
+            raise DatabaseException("Failed to create database connection")
+
+        maintenance = DatabaseMaintenance(factory)
+        self.assertIsNone(maintenance.run_checkpoint())
+        maintenance.stop()
+        self.assertEqual(maintenance.stats['errors'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+"""
+Unit tests for DashboardDataManager fetch scheduling.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from PyQt6.QtWidgets import QApplication
+
+from school_system.database.change_tracking import ChangeTracker
+from school_system.database.migrations import MigrationManager
+from school_system.gui.dashboard_data_manager import DashboardDataManager
+from school_system.services.stats_service import StatsService
+
+
+class BlockingReportService:
+    """Report service whose analytics report waits until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def get_borrowing_analytics_report(self):
+        self.calls += 1
+        self.release.wait(5)
+        return {
+            'borrowing_summary_by_subject_stream_form': [{'total_borrowings': 2}, {'total_borrowings': 3}],
+            'inventory_summary': {'borrowed_books': 4},
+        }
+
+
+COUNTERS = {
+    'books_total': 5, 'books_available': 3, 'student_loans_open': 1, 'teacher_loans_open': 1,
+    'students_total': 40, 'teachers_total': 2, 'chairs_available': 7, 'lockers_available': 4,
+}
+
+
+class BlockingStatsService:
+    """Stats service whose counters read waits until released."""
+
+    count_borrowed = staticmethod(StatsService.count_borrowed)
+    count_active_users = staticmethod(StatsService.count_active_users)
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def get_counters(self):
+        self.calls += 1
+        self.release.wait(5)
+        return dict(COUNTERS)
+
+
+def make_stats_service():
+    """Stats service mock answering get_counters with COUNTERS."""
+    stats_service = MagicMock()
+    stats_service.get_counters.return_value = dict(COUNTERS)
+    stats_service.count_borrowed = StatsService.count_borrowed
+    stats_service.count_active_users = StatsService.count_active_users
+    return stats_service
+
+
+class TestDashboardDataManager(unittest.TestCase):
+    """Tests for shared sources, request coalescing and the bounded pool."""
+
+    def setUp(self):
+        """Create a manager whose fetches do not touch the database."""
+        self.app = QApplication.instance() or QApplication([])
+        patcher = patch('school_system.gui.dashboard_data_manager.db_connection', MagicMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = DashboardDataManager()
+
+    def tearDown(self):
+        """Stop the manager's pool."""
+        self.manager.shutdown()
+
+    def wait_until(self, condition, timeout=5.0):
+        """Process Qt events until condition() holds."""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "timed out waiting for fetches")
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_projections_share_one_coalesced_fetch(self):
+        """Counts derived from the stats counters read them once per refresh."""
+        service = BlockingStatsService()
+        self.manager.register_service('stats_service', service)
+        updates = []
+        self.manager.data_updated.connect(lambda key, data: updates.append((key, data)))
+
+        self.manager.get_data('total_books_count')
+        self.manager.get_data('total_borrowed_books_count')
+        self.manager.get_data('total_books_count', force_refresh=True)
+        self.assertTrue(self.manager.is_loading('total_borrowed_books_count'))
+        service.release.set()
+        self.wait_until(lambda: not self.manager.is_loading('total_books_count'))
+
+        self.assertEqual(service.calls, 1)
+        self.assertEqual(dict(updates)['total_books_count'], 5)
+        self.assertEqual(dict(updates)['total_borrowed_books_count'], 2)
+        self.assertEqual(len(updates), len(dict(updates)))
+        stats = self.manager.get_cache_stats()
+        self.assertEqual(stats['performance_stats']['coalesced_requests'], 2)
+        self.assertEqual(stats['fetch_timings']['stats_counters']['fetches'], 1)
+        self.assertEqual(stats['fetch_timings']['stats_counters']['coalesced'], 2)
+
+        # Invalidating a key refetches its source even within the source TTL
+        self.manager.invalidate_cache('total_books_count')
+        self.manager.get_data('total_books_count')
+        self.wait_until(lambda: not self.manager.is_loading('total_books_count'))
+        self.assertEqual(service.calls, 2)
+
+    def test_fresh_source_serves_other_keys(self):
+        """A key whose source was just fetched is answered without another fetch."""
+        stats_service = make_stats_service()
+        self.manager.register_service('stats_service', stats_service)
+
+        self.manager.get_data('available_books_count')
+        self.wait_until(lambda: not self.manager.is_loading('available_books_count'))
+        self.manager._cache.pop('total_books_count')
+
+        self.assertEqual(self.manager.get_data('total_books_count'), 5)
+        self.assertEqual(self.manager.get_data('available_books_count'), 3)
+        self.assertEqual(stats_service.get_counters.call_count, 1)
+
+    def test_each_key_has_one_definition(self):
+        """The borrowed count comes from the stats counters whichever service registers last."""
+        self.manager.register_service('report_service', BlockingReportService())
+        self.manager.register_service('stats_service', make_stats_service())
+        self.assertEqual(self.manager._data_registry['total_borrowed_books_count']['source'], 'stats_counters')
+        self.manager.register_service('report_service', BlockingReportService())
+        self.assertEqual(self.manager._data_registry['total_borrowed_books_count']['source'], 'stats_counters')
+
+    def test_stats_counters_serve_every_count(self):
+        """Registering the stats service answers all count keys from one counters read."""
+        stats_service = make_stats_service()
+        self.manager.register_service('stats_service', stats_service)
+
+        self.manager.get_data('active_users_count')
+        self.wait_until(lambda: not self.manager.is_loading('active_users_count'))
+        values = {key: self.manager.get_data(key) for key in (
+            'active_users_count', 'total_books_count', 'available_books_count',
+            'total_borrowed_books_count', 'available_chairs_count', 'available_lockers_count')}
+
+        self.assertEqual(values, {
+            'active_users_count': 42, 'total_books_count': 5, 'available_books_count': 3,
+            'total_borrowed_books_count': 2, 'available_chairs_count': 7, 'available_lockers_count': 4,
+        })
+        self.assertEqual(stats_service.get_counters.call_count, 1)
+
+    def test_pool_queues_beyond_cap(self):
+        """Fetches past the concurrency cap wait in the pool and show as queued."""
+        self.manager._thread_pool.setMaxThreadCount(1)
+        service = BlockingReportService()
+        self.manager.register_service('report_service', service)
+        self.manager.register_service('stats_service', make_stats_service())
+
+        self.manager.get_data('books_borrowed_today')
+        self.wait_until(lambda: service.calls == 1)
+        self.manager.get_data('total_teachers_count')
+        self.assertEqual(self.manager.get_cache_stats()['cache_stats']['queue_depth'], 1)
+
+        service.release.set()
+        self.wait_until(lambda: not self.manager.is_loading('total_teachers_count'))
+        stats = self.manager.get_cache_stats()
+        self.assertEqual(stats['cache_stats']['queue_depth'], 0)
+        self.assertEqual(stats['cache_stats']['active_workers'], 0)
+        self.assertEqual(self.manager.get_data('total_teachers_count'), 2)
+        self.assertGreater(stats['fetch_timings']['stats_counters']['last_queue_ms'], 0)
+
+
+class TestDashboardChangeInvalidation(unittest.TestCase):
+    """Tests for dropping cached data when the tables it was read from change."""
+
+    def setUp(self):
+        """Create a manager watching a real database file for changes."""
+        self.app = QApplication.instance() or QApplication([])
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'school.db')
+        self.writer = sqlite3.connect(path, isolation_level=None)
+        MigrationManager(self.writer).migrate()
+        self.tracker = ChangeTracker(lambda: sqlite3.connect(path, isolation_level=None))
+
+        patcher = patch('school_system.gui.dashboard_data_manager.db_connection',
+                        MagicMock(change_tracker=self.tracker))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = DashboardDataManager()
+
+    def tearDown(self):
+        """Stop the manager and remove the database."""
+        self.manager.shutdown()
+        self.tracker.close()
+        self.writer.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def wait_for(self, data_key):
+        """Process Qt events until no fetch for data_key is in flight."""
+        deadline = time.monotonic() + 5
+        while self.manager.is_loading(data_key):
+            self.assertLess(time.monotonic(), deadline, "timed out waiting for fetches")
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_change_to_read_table_refetches(self):
+        """Writes to a key's tables refresh it; writes elsewhere leave the cache alone."""
+        stats_service = make_stats_service()
+        report_service = MagicMock()
+        report_service.get_borrowed_books_report.return_value = []
+        self.manager.register_service('stats_service', stats_service)
+        self.manager.register_service('report_service', report_service)
+        updates = []
+        self.manager.data_updated.connect(lambda key, data: updates.append((key, data)))
+
+        self.manager.get_data('available_chairs_count')
+        self.manager.get_data('recent_activities')
+        self.wait_for('available_chairs_count')
+        self.wait_for('recent_activities')
+        entry = self.manager._cache['available_chairs_count']
+        self.assertIsNotNone(entry.table_versions)
+        self.assertFalse(entry.is_expired())
+
+        stats_service.get_counters.return_value = dict(COUNTERS, chairs_available=8)
+        self.writer.execute("INSERT INTO chairs (chair_id, color) VALUES ('C1', 'Blue')")
+        self.tracker.poll()
+        self.assertTrue(self.manager.is_loading('available_chairs_count'))
+        self.wait_for('available_chairs_count')
+
+        self.assertEqual(self.manager.get_data('available_chairs_count'), 8)
+        self.assertEqual(stats_service.get_counters.call_count, 2)
+        self.assertEqual(report_service.get_borrowed_books_report.call_count, 1)
+        self.assertIn(('available_chairs_count', 8), updates)
+        # Every key on the counters source was dropped and refreshed with it
+        self.assertIn(('available_lockers_count', 4), updates)
+        counter_keys = [key for key, entry in self.manager._data_registry.items()
+                        if entry.get('source') == 'stats_counters']
+        self.assertEqual(self.manager.get_cache_stats()['performance_stats']['change_invalidations'],
+                         len(counter_keys))
+
+
+if __name__ == '__main__':
+    unittest.main()
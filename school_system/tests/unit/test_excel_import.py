@@ -0,0 +1,90 @@
+"""
+Unit tests for the streamed, batched Excel imports.
+"""
+
+import os
+import tempfile
+import unittest
+
+import openpyxl
+
+from school_system.services.student_service import StudentService
+from school_system.services.teacher_service import TeacherService
+from school_system.tests.fixtures import create_test_database
+
+
+def write_workbook(rows):
+    """Write rows (header first) to a temporary .xlsx file and return its path."""
+    handle, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(handle)
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+    return path
+
+
+class TestStreamingExcelImport(unittest.TestCase):
+    """Tests for chunked inserts, progress reporting and rollback."""
+
+    def setUp(self):
+        """Create an in-memory database and services bound to it."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.commit()
+        self.paths = []
+
+        self.student_service = StudentService()
+        self.student_service.student_repository._db = self.conn
+        self.student_service.student_repository.DEFAULT_BATCH_SIZE = 2
+        self.teacher_service = TeacherService()
+        self.teacher_service.teacher_repository._db = self.conn
+
+    def tearDown(self):
+        """Close the test database and remove the workbooks."""
+        self.conn.close()
+        for path in self.paths:
+            os.remove(path)
+
+    def workbook(self, rows):
+        """Write a workbook that is removed after the test."""
+        path = write_workbook(rows)
+        self.paths.append(path)
+        return path
+
+    def test_students_are_inserted_in_chunks_with_progress(self):
+        """Title Case headers map onto the model, blank rows are skipped and progress follows each chunk."""
+        path = self.workbook([
+            ('Student_ID', 'Admission_Number', 'Name', 'Stream', 'Created_At'),
+            ('S1', 'A1', 'Alice', 'R', '2024-01-01'),
+            ('S2', 'A2', 'Bob', 'R', None),
+            (None, None, None, None, None),
+            ('S3', 'A3', 'Carol', 'R', None),
+        ])
+        progress = []
+
+        imported = self.student_service.import_students_from_excel(
+            path, progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        self.assertEqual(imported, 3)
+        self.assertEqual(progress, [(2, 4), (3, 4)])
+        self.assertEqual(
+            self.conn.execute("SELECT student_id, admission_number, name FROM students ORDER BY student_id").fetchall(),
+            [('S1', 'A1', 'Alice'), ('S2', 'A2', 'Bob'), ('S3', 'A3', 'Carol')]
+        )
+
+    def test_failed_row_rolls_back_whole_import(self):
+        """A rejected row leaves no partial import behind."""
+        path = self.workbook([
+            ('teacher_id', 'teacher_name', 'department'),
+            ('T1', 'Jane', 'Science'),
+            ('T1', 'Duplicate', 'Maths'),
+        ])
+
+        self.assertEqual(self.teacher_service.import_teachers_from_excel(path), 0)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM teachers").fetchone()[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Unit tests for the FTS5 search indexes.
+"""
+
+import unittest
+
+from school_system.database.repositories.book_repo import BookRepository
+from school_system.database.repositories.furniture_repo import ChairRepository
+from school_system.database.repositories.student_repo import StudentRepository
+from school_system.database.repositories.teacher_repo import TeacherRepository
+from school_system.database.search import build_match_query, create_search_indexes
+from school_system.tests.fixtures import create_test_database
+
+
+class TestFullTextSearch(unittest.TestCase):
+    """Tests for trigger sync, ranked prefix search and the search filters."""
+
+    def setUp(self):
+        """Create an in-memory database with a few books, students and teachers."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author, isbn) VALUES (?, ?, ?, ?, ?)",
+            [(1, 'KLB/MA/1', 'Algebra Basics', 'Otieno', '978-1'),
+             (2, 'KLB/MA/2', 'Advanced Mathematics', 'Algernon Smith', None),
+             (3, 'KLB/BI/1', 'Biology', 'Wanjiru', '978-2')]
+        )
+        self.conn.executemany(
+            "INSERT INTO students (student_id, admission_number, name, stream, class, stream_name) "
+            "VALUES (?, ?, ?, 'R', ?, ?)",
+            [('S1', 'A100', 'Amina Otieno', 'Form 1', 'Red'), ('S2', 'A200', 'Brian Kamau', 'Form 2', 'Blue')]
+        )
+        self.conn.execute("INSERT INTO teachers (teacher_id, teacher_name, department) VALUES ('T1', 'Jane Doe', 'Sciences')")
+        self.conn.commit()
+
+        self.books = BookRepository()
+        self.books._db = self.conn
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def titles(self, query):
+        """Titles returned by search_books, in rank order."""
+        return [book.title for book in self.books.search_books(query)]
+
+    def test_match_query_quotes_tokens_as_prefixes(self):
+        """Punctuation splits tokens and cannot inject FTS syntax."""
+        self.assertEqual(build_match_query('alg "OR* 97-'), '"alg"* "OR"* "97"*')
+        self.assertIsNone(build_match_query(' -_ '))
+
+    def test_ranked_prefix_search(self):
+        """Every word must prefix-match; a title hit outranks an author-only hit."""
+        self.assertEqual(self.titles('alg'), ['Algebra Basics', 'Advanced Mathematics'])
+        self.assertEqual(self.titles('alg math'), ['Advanced Mathematics'])
+        self.assertEqual(self.titles('klb bi'), ['Biology'])
+        self.assertEqual(self.titles('--'), [])
+
+    def test_triggers_keep_index_in_sync(self):
+        """Inserts, updates of indexed columns and deletes reach the index."""
+        self.conn.execute("INSERT INTO books (id, book_number, title, author) VALUES (4, 'KLB/CH/1', 'Chemistry', 'Mwangi')")
+        self.conn.execute("UPDATE books SET title = 'Botany' WHERE id = 3")
+        self.conn.execute("UPDATE books SET available = 0 WHERE id = 1")
+        self.conn.execute("DELETE FROM books WHERE id = 2")
+        self.conn.commit()
+
+        self.assertEqual(self.titles('chem'), ['Chemistry'])
+        self.assertEqual(self.titles('biology'), [])
+        self.assertEqual(self.titles('bot'), ['Botany'])
+        self.assertEqual(self.titles('alg'), ['Algebra Basics'])
+
+    def test_existing_rows_indexed_on_upgrade(self):
+        """Creating the index on a populated database fills it from the table."""
+        for name in ('teachers_fts_ai', 'teachers_fts_ad', 'teachers_fts_au'):
+            self.conn.execute(f"DROP TRIGGER {name}")
+        self.conn.execute("DROP TABLE teachers_fts")
+        self.conn.execute("INSERT INTO teachers (teacher_id, teacher_name, department) VALUES ('T2', 'John Smith', 'Languages')")
+        create_search_indexes(self.conn.cursor())
+
+        teachers = TeacherRepository()
+        teachers._db = self.conn
+        self.assertEqual([t.teacher_id for t in teachers.full_text_search('lang')], ['T2'])
+        self.assertEqual([t.teacher_id for t in teachers.full_text_search('jane sci')], ['T1'])
+
+    def test_page_filters_use_index(self):
+        """Catalog and student pages filter through the index and keep their sort order."""
+        books, _ = self.books.fetch_catalog_page(search='klb ma', sort_by='title')
+        self.assertEqual([b.book_number for b in books], ['KLB/MA/2', 'KLB/MA/1'])
+
+        students = StudentRepository()
+        students._db = self.conn
+        page, _ = students.fetch_student_page(search='form 2')
+        self.assertEqual([s.student_id for s in page], ['S2'])
+        page, _ = students.fetch_student_page(search='otie')
+        self.assertEqual([s.student_id for s in page], ['S1'])
+
+    def test_page_search_without_tokens_matches_nothing(self):
+        """Punctuation-only search text filters out every row instead of dropping the filter."""
+        for text in ('@@', '-', '"'):
+            books, cursor = self.books.fetch_catalog_page(search=text)
+            self.assertEqual((books, cursor), ([], None))
+        books, _ = self.books.fetch_catalog_page(search='  ')
+        self.assertEqual(len(books), self.conn.execute("SELECT COUNT(*) FROM books").fetchone()[0])
+
+    def test_find_containing_escapes_wildcards(self):
+        """Small-table substring search treats % and _ literally."""
+        self.conn.executemany(
+            "INSERT INTO chairs (chair_id, location, form, color) VALUES (?, ?, 'F1', 'Blue')",
+            [('1', 'Lab_1'), ('2', 'Lab 12'), ('3', 'Hall')]
+        )
+        chairs = ChairRepository()
+        chairs._db = self.conn
+
+        self.assertEqual([c.chair_id for c in chairs.find_containing(('chair_id', 'location'), 'lab_')], [1])
+        self.assertEqual(len(chairs.find_containing(('chair_id', 'location'), 'LAB')), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Unit tests for the versioned schema migrations.
+"""
+
+import sqlite3
+import unittest
+
+from school_system.core.exceptions import DatabaseException
+from school_system.database.migrations import Migration, MigrationManager
+from school_system.database.migrations.schema_migrations import SCHEMA_MIGRATIONS
+from school_system.tests.fixtures import create_test_database
+
+
+class TestMigrationManager(unittest.TestCase):
+    """Tests for version tracking, pending-only runs and rollback."""
+
+    def setUp(self):
+        """Create an in-memory database with the application schema."""
+        self.conn = create_test_database()
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def test_current_schema_is_one_read(self):
+        """A migrated database is at the latest version and re-checking it runs one statement."""
+        manager = MigrationManager(self.conn)
+        self.assertEqual(manager.current_version(), SCHEMA_MIGRATIONS[-1].version)
+
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        self.assertEqual(manager.migrate(), [])
+        self.conn.set_trace_callback(None)
+        self.assertEqual(statements, ["SELECT MAX(version) FROM schema_version"])
+
+    def test_revision_loans_get_reminder_days_on_insert(self):
+        """Revision book loans written after migrating get their reminder period from the trigger."""
+        self.conn.execute("PRAGMA foreign_keys = OFF")
+        self.conn.executemany("INSERT INTO books (id, book_number, title, author, revision) "
+                              "VALUES (?, ?, 'Title', 'Author', ?)",
+                              [(1, 'B1', 1), (2, 'B2', 0)])
+        self.conn.executemany("INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on) "
+                              "VALUES ('S1', ?, '2024-01-01')", [(1,), (2,)])
+        self.conn.commit()
+
+        self.assertEqual(
+            self.conn.execute("SELECT book_id, reminder_days FROM borrowed_books_student ORDER BY book_id").fetchall(),
+            [(1, 7), (2, None)]
+        )
+
+    def test_only_pending_migrations_run(self):
+        """New migrations run once, in order, and are recorded."""
+        calls = []
+        migrations = list(SCHEMA_MIGRATIONS) + [
+            Migration(101, "second", lambda cursor: calls.append(101)),
+            Migration(100, "first", lambda cursor: cursor.execute("CREATE TABLE extra (id INTEGER)")),
+        ]
+        manager = MigrationManager(self.conn, migrations)
+
+        self.assertEqual([m.version for m in manager.pending()], [100, 101])
+        self.assertEqual(manager.migrate(), [100, 101])
+        self.assertEqual(manager.migrate(), [])
+        self.assertEqual(calls, [101])
+        self.assertEqual(manager.current_version(), 101)
+
+    def test_failed_migration_rolls_back(self):
+        """A failing step leaves neither its changes nor earlier steps of the same run."""
+        def fail(cursor):
+            raise sqlite3.OperationalError("boom")
+
+        migrations = list(SCHEMA_MIGRATIONS) + [
+            Migration(100, "ok", lambda cursor: cursor.execute("CREATE TABLE extra (id INTEGER)")),
+            Migration(101, "broken", fail),
+        ]
+        manager = MigrationManager(self.conn, migrations)
+
+        with self.assertRaises(DatabaseException):
+            manager.migrate()
+        self.assertEqual(manager.current_version(), SCHEMA_MIGRATIONS[-1].version)
+        self.assertIsNone(self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'extra'").fetchone())
+
+    def test_upgrades_unversioned_database(self):
+        """A database from before schema_version gains its missing columns and indexes."""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE teachers (teacher_id TEXT PRIMARY KEY, teacher_name TEXT)")
+        conn.execute("INSERT INTO teachers VALUES ('T1', 'Jane Doe')")
+        conn.commit()
+
+        applied = MigrationManager(conn).migrate()
+
+        self.assertEqual(applied, [m.version for m in SCHEMA_MIGRATIONS])
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(teachers)")]
+        self.assertIn('department', columns)
+        self.assertEqual(conn.execute(
+            "SELECT rowid FROM teachers_fts WHERE teachers_fts MATCH 'jane'").fetchall(), [(1,)])
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
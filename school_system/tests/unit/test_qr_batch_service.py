@@ -0,0 +1,84 @@
+"""
+Unit tests for QRBatchService.
+"""
+
+import tempfile
+import unittest
+
+from school_system.services.qr_batch_service import QRBatchService
+from school_system.utils.qr_cache import QRImageCache
+from school_system.tests.fixtures import create_test_database
+
+
+class TestQRBatchService(unittest.TestCase):
+    """Tests for batch QR generation, chunked writes and cancellation."""
+
+    def setUp(self):
+        """Create an in-memory database with books and students, one of each already coded."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author, qr_code) VALUES (?, ?, ?, 'Author', ?)",
+            [(i, f'B{i:03d}', f'Title {i}', 'EXISTING' if i == 1 else None) for i in range(1, 8)]
+        )
+        self.conn.executemany(
+            "INSERT INTO students (student_id, admission_number, name, stream, qr_code) VALUES (?, ?, ?, 'R', ?)",
+            [('S1', 'S1', 'Alice', 'EXISTING'), ('S2', 'S2', 'Bob', None), ('S3', None, 'Carol', '')]
+        )
+        self.conn.commit()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.image_cache = QRImageCache(self.tmp.name)
+
+    def tearDown(self):
+        """Close the test database and remove the image cache."""
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def service(self, max_workers):
+        """Build a service bound to the test database with small chunks."""
+        service = QRBatchService(max_workers=max_workers, image_cache=self.image_cache)
+        service.book_repository._db = self.conn
+        service.student_repository._db = self.conn
+        service.RENDER_CHUNK_SIZE = 2
+        service.WRITE_CHUNK_SIZE = 4
+        return service
+
+    def book_codes(self):
+        """Map book id to stored QR code."""
+        return dict(self.conn.execute("SELECT id, qr_code FROM books"))
+
+    def test_books_rendered_in_process_pool(self):
+        """Book images are rendered into the cache by worker processes and short codes written in chunks."""
+        progress = []
+        result = self.service(max_workers=2).generate_missing_book_codes(
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        self.assertEqual(result, {'total': 6, 'generated': 6, 'cancelled': False})
+        self.assertEqual(progress, [(4, 6), (6, 6)])
+        codes = self.book_codes()
+        self.assertEqual(codes[1], 'EXISTING')
+        for book_id in range(2, 8):
+            self.assertRegex(codes[book_id], r'^BK[0-9A-F]{14}$')
+            with open(self.image_cache.path_for(codes[book_id]), 'rb') as f:
+                self.assertEqual(f.read(8), b'\x89PNG\r\n\x1a\n')
+
+    def test_cancel_keeps_stored_codes(self):
+        """Cancelling stops the run but keeps the chunks already rendered."""
+        result = self.service(max_workers=1).generate_missing_book_codes(is_cancelled=lambda: True)
+
+        self.assertEqual(result, {'total': 6, 'generated': 2, 'cancelled': True})
+        self.assertEqual(sum(1 for code in self.book_codes().values() if code is None), 4)
+
+    def test_student_codes(self):
+        """Students without a code get a 16-character code; existing codes are kept."""
+        result = self.service(max_workers=1).generate_missing_student_codes()
+
+        self.assertEqual(result['generated'], 2)
+        codes = dict(self.conn.execute("SELECT student_id, qr_code FROM students"))
+        self.assertEqual(codes['S1'], 'EXISTING')
+        self.assertEqual([len(codes['S2']), len(codes['S3'])], [16, 16])
+
+
+if __name__ == '__main__':
+    unittest.main()
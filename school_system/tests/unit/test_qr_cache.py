@@ -0,0 +1,72 @@
+"""
+Unit tests for the on-disk QR image cache.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from school_system.utils.qr_cache import QRImageCache, warm_qr_cache
+from school_system.utils.qr_generator import QRGenerator
+
+
+class TestQRImageCache(unittest.TestCase):
+    """Tests for content addressing and LRU eviction."""
+
+    def setUp(self):
+        """Create an empty cache directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.tmp.cleanup()
+
+    def test_images_are_rendered_once_per_code_and_settings(self):
+        """A second lookup reads the file; different render settings get their own file."""
+        cache = QRImageCache(self.tmp.name)
+        png = cache.get_png('BK0123456789ABCD')
+
+        with patch.object(cache.generator, 'generate_qr_code', side_effect=AssertionError("rendered twice")):
+            self.assertEqual(QRImageCache(self.tmp.name, generator=cache.generator).get_png('BK0123456789ABCD'), png)
+        self.assertEqual(png[:8], b'\x89PNG\r\n\x1a\n')
+        larger = QRImageCache(self.tmp.name, generator=QRGenerator(box_size=20))
+        self.assertNotEqual(larger.path_for('BK0123456789ABCD'), cache.path_for('BK0123456789ABCD'))
+
+    def test_least_recently_used_images_are_evicted(self):
+        """Going over max_bytes removes the images read longest ago."""
+        probe = QRImageCache(self.tmp.name)
+        size = len(probe.get_png('probe'))
+        os.remove(probe.path_for('probe'))
+
+        cache = QRImageCache(self.tmp.name, max_bytes=int(size * 3.5))
+        for code in ('A', 'B', 'C'):
+            cache.get_png(code)
+        # Make A the most recently used, so B is the oldest
+        past = time.time() - 60
+        for code, age in (('A', 0), ('B', 20), ('C', 10)):
+            os.utime(cache.path_for(code), (past + 60 - age, past + 60 - age))
+        cache.get_png('D')
+
+        present = {code for code in 'ABCD' if os.path.exists(cache.path_for(code))}
+        self.assertEqual(present, {'A', 'C', 'D'})
+
+    def test_warm_chunks_leave_size_tracking_to_the_caller(self):
+        """Worker chunks never scan the directory; the caller's cache scans it once and then counts."""
+        cache = QRImageCache(self.tmp.name)
+        with patch.object(QRImageCache, '_files', side_effect=AssertionError("scanned in a chunk")):
+            pairs, written = warm_qr_cache(self.tmp.name, [(1, 'A'), (2, 'B')])
+        self.assertEqual(pairs, [(1, 'A'), (2, 'B')])
+        self.assertEqual(written, sum(os.path.getsize(cache.path_for(code)) for code in 'AB'))
+
+        with patch.object(QRImageCache, '_files', wraps=cache._files) as scan:
+            cache.record_write(written)
+            _, more = warm_qr_cache(self.tmp.name, [(3, 'C')])
+            cache.record_write(more)
+        self.assertEqual(scan.call_count, 1)
+        self.assertEqual(cache._size, written + more)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Query plan regression checks for the hot repository and report queries.
+
+Each hot call is run against a test database with SQL tracing on, and every
+statement it issues is run through EXPLAIN QUERY PLAN. A plan step that
+scans a whole table instead of searching or scanning an index fails the
+test, so a query change or a dropped index that loses its index shows up here.
+"""
+
+import re
+import unittest
+
+from school_system.database.repositories.book_repo import (
+    BookRepository, BorrowedBookStudentRepository, BorrowedBookTeacherRepository, DistributionStudentRepository
+)
+from school_system.database.repositories.student_repo import StudentRepository
+from school_system.services.report_service import ReportService
+from school_system.tests.fixtures import create_test_database
+
+# "SCAN books" or "SCAN bbs", with no index after it
+FULL_SCAN = re.compile(r'^SCAN \S+$')
+
+
+class TestHotQueryPlans(unittest.TestCase):
+    """No hot query may fall back to a full table scan."""
+
+    def setUp(self):
+        """Create an in-memory database and repositories bound to it."""
+        self.conn = create_test_database()
+        self.conn.executemany(
+            "INSERT INTO short_form_mappings (short_form, full_name, type) VALUES (?, ?, ?)",
+            [('R', 'Red', 'class'), ('F1', 'Form 1', 'class'), ('MA', 'Mathematics', 'subject')]
+        )
+        self.conn.execute("INSERT INTO books (id, book_number, title, author, subject, class) "
+                          "VALUES (1, 'B001', 'Algebra', 'Smith', 'MA', 'F1')")
+        self.conn.execute("INSERT INTO students (student_id, admission_number, name, stream, class, stream_name) "
+                          "VALUES ('S1', 'A1', 'Alice', 'R', 'Form 1', 'Red')")
+        self.conn.execute("INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on) "
+                          "VALUES ('S1', 1, '2026-01-05')")
+        self.conn.commit()
+
+        self.books = self.bind(BookRepository())
+        self.student_loans = self.bind(BorrowedBookStudentRepository())
+        self.teacher_loans = self.bind(BorrowedBookTeacherRepository())
+        self.students = self.bind(StudentRepository())
+        self.distribution = self.bind(DistributionStudentRepository())
+        self.reports = ReportService()
+        for name in ('book_repository', 'student_repository', 'borrowed_book_repo'):
+            self.bind(getattr(self.reports, name))
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def bind(self, repository):
+        """Point a repository at the test database."""
+        repository._db = self.conn
+        return repository
+
+    def hot_calls(self):
+        """(name, callable) for every query shape that runs on the busy paths."""
+        return [
+            ('available books', self.books.get_available_books),
+            ('borrowed book ids', self.books.get_borrowed_book_ids),
+            ('borrow status', lambda: self.books.get_borrow_status([1])),
+            ('open loans', self.books.get_open_loans),
+            ('scan lend', lambda: self.books.lend_scanned_book(1, 'BK1')),
+            ('catalog by subject', lambda: self.books.fetch_catalog_page(subject='MA')),
+            ('catalog by class', lambda: self.books.fetch_catalog_page(class_name='F1')),
+            ('student open loans', lambda: self.student_loans.get_borrowed_books_by_student('S1')),
+            ('book open loans', lambda: self.student_loans.get_borrowed_books_by_book(1)),
+            ('overdue loans', lambda: self.student_loans.get_overdue_books(14)),
+            ('open loan details', lambda: list(self.student_loans.iter_open_loans_with_details())),
+            ('teacher open loans', lambda: self.teacher_loans.get_borrowed_books_by_teacher('T1')),
+            ('students by class', lambda: self.students.fetch_student_page(class_name='Form 1')),
+            ('students by stream', lambda: self.students.fetch_student_page(class_name='Form 1', stream_name='Red')),
+            ('admission number', lambda: self.students.find_by_field('admission_number', 'A1')),
+            ('distribution session', lambda: self.distribution.get_assigned_books(1)),
+            ('class stream totals', self.reports._get_class_stream_totals),
+            ('subject summary', self.reports._get_borrowing_summary_by_subject_stream_form),
+        ]
+
+    def test_hot_queries_use_indexes(self):
+        """Every statement issued by a hot call is answered from an index."""
+        for name, call in self.hot_calls():
+            statements = []
+            self.conn.set_trace_callback(statements.append)
+            try:
+                call()
+            finally:
+                self.conn.set_trace_callback(None)
+
+            queries = [sql for sql in statements if sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'WITH'))]
+            with self.subTest(call=name):
+                self.assertTrue(queries, "call issued no queries")
+                for sql in queries:
+                    plan = [row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+                    scans = [step for step in plan if FULL_SCAN.match(step)]
+                    self.assertEqual(scans, [], f"full scan in {' '.join(sql.split())}\nplan: {plan}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Unit tests for ReportService reports computed in SQL.
+"""
+
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from school_system.services.report_service import ReportService
+from school_system.tests.fixtures import create_test_database
+
+
+class TestBorrowedBooksReport(unittest.TestCase):
+    """Tests for the set-based borrowed books report."""
+
+    def setUp(self):
+        """Create an in-memory database with a few loans."""
+        self.conn = create_test_database()
+        self.conn.execute("PRAGMA foreign_keys = OFF")
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author, available) VALUES (?, ?, ?, ?, ?)",
+            [(1, 'B001', 'Algebra', 'Smith', 0),
+             (2, 'B002', 'Biology', 'Jones', 0),
+             (3, 'B003', 'Chemistry', 'Brown', 1)]
+        )
+        self.conn.executemany(
+            "INSERT INTO students (student_id, name, stream) VALUES (?, ?, ?)",
+            [('S1', 'Alice', 'Red'), ('S2', 'Bob', 'Blue')]
+        )
+        today = date.today()
+        self.conn.executemany(
+            "INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on, returned_on) VALUES (?, ?, ?, ?)",
+            [('S1', 1, (today - timedelta(days=10)).isoformat(), None),
+             ('S2', 2, (today - timedelta(days=3)).isoformat(), None),
+             ('S2', 3, (today - timedelta(days=20)).isoformat(), today.isoformat()),
+             ('S9', 3, today.isoformat(), None)]
+        )
+        self.conn.commit()
+
+        self.service = ReportService()
+        self.service.borrowed_book_repo._db = self.conn
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def test_report_contains_only_open_loans(self):
+        """Returned loans are excluded and days borrowed come from SQL."""
+        report = self.service.get_borrowed_books_report()
+        by_book = {row['book_number']: row for row in report}
+
+        self.assertEqual(set(by_book), {'B001', 'B002', 'B003'})
+        self.assertEqual(by_book['B001']['student_name'], 'Alice')
+        self.assertEqual(by_book['B001']['days_borrowed'], 10)
+        self.assertEqual(by_book['B002']['days_borrowed'], 3)
+        self.assertEqual(by_book['B001']['book'].title, 'Algebra')
+
+    def test_unknown_student_falls_back_to_id(self):
+        """Loans for students missing from the students table keep a readable name."""
+        report = self.service.get_borrowed_books_report()
+        orphan = [row for row in report if row['student_id'] == 'S9'][0]
+        self.assertEqual(orphan['student_name'], 'Student S9')
+
+    def test_report_pages_newest_first(self):
+        """limit/offset page through rows ordered by most recent loan."""
+        first = self.service.get_borrowed_books_report(limit=1)
+        second = self.service.get_borrowed_books_report(limit=1, offset=1)
+        self.assertEqual(first[0]['book_number'], 'B003')
+        self.assertEqual(second[0]['book_number'], 'B002')
+
+
+class TestBorrowingAnalytics(unittest.TestCase):
+    """Tests for the aggregate queries behind the borrowing analytics report."""
+
+    def setUp(self):
+        """Create 150 students, more than the old per-student caps allowed for."""
+        self.conn = create_test_database()
+        self.conn.execute("PRAGMA foreign_keys = OFF")
+        self.conn.executemany(
+            "INSERT INTO students (student_id, admission_number, name, stream, class, stream_name) "
+            "VALUES (?, ?, ?, 'R', ?, ?)",
+            [(f'S{i:03d}', f'S{i:03d}', f'Student {i}', 'Form 4' if i % 2 else 'Form 3', 'Red')
+             for i in range(150)]
+        )
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author, subject, class, available) "
+            "VALUES (?, ?, ?, 'Author', ?, 'Form 4', ?)",
+            [(1, 'B001', 'Algebra', 'Mathematics', 0),
+             (2, 'B002', 'Grammar', 'English', 0),
+             (3, 'B003', 'Poems', 'English', 1)]
+        )
+        self.conn.executemany(
+            "INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on, returned_on) VALUES (?, ?, ?, ?)",
+            [('S001', 1, '2024-01-01', None),
+             ('S001', 2, '2024-01-01', None),
+             ('S003', 3, '2023-01-01', '2023-02-01')]
+        )
+        self.conn.commit()
+
+        self.service = ReportService()
+        self.service.book_repository._db = self.conn
+        self.service.borrowed_book_repo._db = self.conn
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def test_sections_cover_every_student(self):
+        """Counts are complete and each section reports its timing."""
+        analytics = self.service.get_borrowing_analytics_report()
+
+        not_borrowed = analytics['students_not_borrowed_any_books']
+        self.assertEqual(not_borrowed['total_students_not_borrowed'], 148)
+        self.assertEqual(len(not_borrowed['all_students_not_borrowed']), 148)
+
+        by_form = {row['form']: row for row in analytics['borrowing_percentage_by_class']}
+        self.assertEqual(by_form['Form 4']['total_students'], 75)
+        self.assertEqual(by_form['Form 4']['students_borrowed'], 1)
+        self.assertEqual(by_form['Form 4']['total_borrowings'], 2)
+
+        summary = {(row['form'], row['subject']): row for row in analytics['borrowing_summary_by_subject_stream_form']}
+        self.assertEqual(set(summary), {('Form 4', 'Mathematics'), ('Form 4', 'English')})
+        self.assertEqual(summary[('Form 4', 'English')]['books_borrowed'][0]['book_number'], 'B002')
+
+        self.assertEqual(analytics['inventory_summary']['borrowed_books'], 2)
+        self.assertEqual(set(analytics['section_timings']), set(analytics) - {'section_timings'})
+
+    def test_class_stream_totals_queried_once(self):
+        """The per-stream summary and the per-form percentages share one totals query."""
+        with patch.object(self.service, '_get_class_stream_totals',
+                          wraps=self.service._get_class_stream_totals) as totals:
+            analytics = self.service.get_borrowing_analytics_report()
+
+        self.assertEqual(totals.call_count, 1)
+        self.assertTrue(analytics['borrowing_percentage_by_class'])
+
+    def test_not_borrowed_by_subject_uses_loan_history(self):
+        """A returned loan still counts as having borrowed the subject."""
+        groups = {(row['form'], row['subject']): row
+                  for row in self.service._get_students_not_borrowed_by_stream_subject()}
+
+        english = [s['student_id'] for s in groups[('Form 4', 'English')]['students_not_borrowed']]
+        self.assertEqual(groups[('Form 4', 'English')]['count'], 73)
+        self.assertNotIn('S001', english)
+        self.assertNotIn('S003', english)
+        self.assertEqual(groups[('Form 3', 'Mathematics')]['count'], 75)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Unit tests for the read-only row types used by bulk reads.
+"""
+
+import unittest
+
+from school_system.database.repositories.book_repo import BookRepository
+from school_system.database.repositories.student_repo import StudentRepository
+from school_system.models.rows import BookRow, StudentRow, make_row_builder
+from school_system.models.student import Student
+from school_system.tests.fixtures import create_test_database
+
+
+class TestRowBuilder(unittest.TestCase):
+    """Tests for building rows from cursor columns."""
+
+    def test_columns_map_by_name_with_aliases(self):
+        """Columns are matched by name, 'class' becomes class_name and missing fields are None."""
+        build = make_row_builder(BookRow, ('title', 'id', 'class', 'revision', 'book_number', 'author'))
+        row = build(('Physics', 7, 'F3', 1, 'B007', 'Smith'))
+
+        self.assertEqual((row.id, row.title, row.class_name, row.isbn), (7, 'Physics', 'F3', None))
+        self.assertEqual(row.book_type, 'revision')
+        with self.assertRaises(AttributeError):
+            row.title = 'Changed'
+        self.assertFalse(hasattr(row, '__dict__'))
+
+    def test_student_stream_matches_model(self):
+        """The legacy stream value is derived exactly as the Student model does it."""
+        columns = ('student_id', 'name', 'stream', 'admission_number', 'class', 'stream_name')
+        values = ('S1', 'Alice', 'old', 'S1', 'Form 4', 'Red')
+        row = make_row_builder(StudentRow, columns)(values)
+        student = Student(**dict(zip(columns, values)))
+
+        self.assertEqual(row.stream, student.stream)
+        self.assertEqual(row.stream, '4 Red')
+
+
+class TestRepositoryRows(unittest.TestCase):
+    """Tests for the repository bulk read paths."""
+
+    def setUp(self):
+        """Create an in-memory database with a book and a student."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.execute("INSERT INTO students (student_id, name, stream, class, stream_name) "
+                          "VALUES ('S1', 'Alice', 'R', NULL, NULL)")
+        self.conn.execute("INSERT INTO books (id, book_number, title, author) VALUES (1, 'B001', 'Title', 'Author')")
+        self.conn.commit()
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def test_repositories_return_row_types(self):
+        """get_all_rows and iter_rows build rows, while get_all still builds models."""
+        books, students = BookRepository(), StudentRepository()
+        books._db = students._db = self.conn
+
+        self.assertIsInstance(books.get_all_rows()[0], BookRow)
+        self.assertEqual([s.stream for s in students.iter_rows(student_id='S1')], ['R'])
+        self.assertIsInstance(students.get_all()[0], Student)
+
+
+if __name__ == '__main__':
+    unittest.main()
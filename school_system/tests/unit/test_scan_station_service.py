@@ -0,0 +1,138 @@
+"""
+Unit tests for the scan station service and its QR token index.
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from school_system.services.book_service import BookService
+from school_system.services.scan_station_service import QRScanIndex, ScanStationService, get_qr_scan_index
+from school_system.services.student_service import StudentService
+from school_system.tests.fixtures import create_test_database
+
+
+class TestScanStation(unittest.TestCase):
+    """Tests for index warming, scan borrow/return and stale index entries."""
+
+    def setUp(self):
+        """Create an in-memory database with coded books and students and a service bound to it."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author, qr_code, available) VALUES (?, ?, ?, 'Author', ?, 1)",
+            [(1, 'B001', 'Algebra', 'BK1'), (2, 'B002', 'Biology', 'BK2'), (3, 'B003', 'Chemistry', None)]
+        )
+        self.conn.executemany(
+            "INSERT INTO students (student_id, admission_number, name, stream, qr_code) VALUES (?, ?, ?, 'R', ?)",
+            [('S1', 'A1', 'Alice', 'ST1'), ('S2', 'A2', 'Bob', 'ST2')]
+        )
+        self.conn.commit()
+
+        self.index = QRScanIndex()
+        self.index.book_repository._db = self.conn
+        self.index.student_repository._db = self.conn
+        self.index.warm()
+        self.service = ScanStationService(index=self.index)
+        self.service.book_repository._db = self.conn
+        self.service.loan_repository._db = self.conn
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def open_loans(self):
+        """(student_id, book_id) of every open loan."""
+        return self.conn.execute(
+            "SELECT student_id, book_id FROM borrowed_books_student WHERE returned_on IS NULL ORDER BY book_id"
+        ).fetchall()
+
+    def test_borrow_and_return(self):
+        """A scan borrow lends the book once; the scan return closes the loan."""
+        result = self.service.borrow('BK1', 'ST1')
+
+        self.assertTrue(result['success'])
+        self.assertEqual((result['book_title'], result['student_name']), ('Algebra', 'Alice'))
+        self.assertIsInstance(result['latency_ms'], float)
+        self.assertEqual(self.open_loans(), [('S1', 1)])
+        self.assertEqual(self.conn.execute("SELECT available FROM books WHERE id = 1").fetchone()[0], 0)
+
+        again = self.service.borrow('BK1', 'ST2')
+        self.assertFalse(again['success'])
+        self.assertEqual(again['message'], "Book is already on loan")
+
+        self.assertFalse(self.service.return_book('BK1', 'ST2')['success'])
+        self.assertTrue(self.service.return_book('BK1', 'ST1', 'Fair', returned_by='librarian')['success'])
+        self.assertEqual(self.open_loans(), [])
+        self.assertEqual(
+            self.conn.execute("SELECT return_condition, returned_by FROM borrowed_books_student").fetchone(),
+            ('Fair', 'librarian')
+        )
+        self.assertEqual(self.conn.execute("SELECT available FROM books WHERE id = 1").fetchone()[0], 1)
+
+    def test_codes_changed_after_warming(self):
+        """New codes are read through and a reassigned code never lends the old book."""
+        self.conn.execute("UPDATE books SET qr_code = 'BK1-OLD' WHERE id = 1")
+        self.conn.execute("UPDATE books SET qr_code = 'BK1' WHERE id = 3")
+        self.conn.commit()
+
+        result = self.service.borrow('BK1', 'ST1')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['book_title'], 'Chemistry')
+        self.assertEqual(self.open_loans(), [('S1', 3)])
+        self.assertEqual(self.index.lookup_book('BK1-OLD'), (1, 'Algebra'))
+
+    def test_student_change_listener_refreshes_tokens(self):
+        """A student change drops the old card token; a rejected card rolls the book back."""
+        self.conn.execute("UPDATE students SET qr_code = 'ST1-NEW' WHERE student_id = 'S1'")
+        self.conn.commit()
+        StudentService.notify_students_changed('update', ['S1'])
+
+        self.assertEqual(self.index.lookup_student('ST1-NEW'), ('S1', 'Alice'))
+        self.assertFalse(self.service.borrow('BK2', 'ST1')['success'])
+
+        # Changed without notification: the index still holds ST2 until the insert rejects it
+        self.conn.execute("UPDATE students SET qr_code = 'ST2-NEW' WHERE student_id = 'S2'")
+        self.conn.commit()
+        result = self.service.borrow('BK2', 'ST2')
+        self.assertFalse(result['success'])
+        self.assertEqual(result['message'], "No student with QR code ST2")
+        self.assertEqual(self.open_loans(), [])
+        self.assertEqual(self.conn.execute("SELECT available FROM books WHERE id = 2").fetchone()[0], 1)
+
+    def test_book_change_listener_refreshes_tokens(self):
+        """A book QR change or delete drops the old token from the index."""
+        self.conn.execute("UPDATE books SET qr_code = 'BK1-NEW' WHERE id = 1")
+        self.conn.execute("DELETE FROM books WHERE id = 2")
+        self.conn.commit()
+        BookService.notify_books_changed('qr', [1])
+        BookService.notify_books_changed('delete', [2])
+
+        self.assertEqual(self.index._books, {'BK1-NEW': (1, 'Algebra')})
+        self.assertEqual(self.index.lookup_book('BK1-NEW'), (1, 'Algebra'))
+
+    def test_return_rechecks_book_token(self):
+        """A stale book token is re-read on return instead of closing the old book's loan."""
+        self.assertTrue(self.service.borrow('BK1', 'ST1')['success'])
+        self.assertTrue(self.service.borrow('BK2', 'ST1')['success'])
+        # Swapped without notification, so the index still maps BK1 to book 1
+        self.conn.execute("UPDATE books SET qr_code = 'TMP' WHERE id = 1")
+        self.conn.execute("UPDATE books SET qr_code = 'BK1' WHERE id = 2")
+        self.conn.execute("UPDATE books SET qr_code = 'BK2' WHERE id = 1")
+        self.conn.commit()
+
+        result = self.service.return_book('BK1', 'ST1')
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['book_title'], 'Biology')
+        self.assertEqual(self.open_loans(), [('S1', 1)])
+
+    def test_shared_index_is_created_once(self):
+        """Concurrent first calls get the same index."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            indexes = list(executor.map(lambda _: get_qr_scan_index(), range(16)))
+        self.assertTrue(all(index is indexes[0] for index in indexes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for the startup timeline and the lazy view registry.
+"""
+
+import importlib
+import inspect
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from school_system.config.startup import StartupTimeline
+from school_system.gui.windows import view_registry
+
+
+class TestStartupTimeline(unittest.TestCase):
+    """Tests for stage marks and the logged timeline."""
+
+    def test_log_reports_stages_since_last_log(self):
+        """Each log covers only the stages marked after the previous one."""
+        timeline = StartupTimeline()
+        timeline.mark("config")
+        timeline.mark("database")
+        with patch('school_system.config.startup.logger') as logger:
+            timeline.log()
+            timeline.mark("main window")
+            timeline.log("Login")
+            timeline.log("Login")
+
+        first, second = [call.args[0] for call in logger.info.call_args_list]
+        self.assertTrue(first.startswith("Startup timeline"))
+        self.assertIn("config +", first)
+        self.assertIn("database +", first)
+        self.assertTrue(second.startswith("Login timeline"))
+        self.assertNotIn("database", second)
+        self.assertLessEqual(timeline.elapsed_ms("config"), timeline.elapsed_ms("main window"))
+        with self.assertRaises(KeyError):
+            timeline.elapsed_ms("never")
+
+
+class TestViewRegistry(unittest.TestCase):
+    """Tests for lazy view loading."""
+
+    def test_registered_views_resolve(self):
+        """Every registered view names a class that exists in its module."""
+        for view_id, (module_name, class_name) in view_registry.VIEW_REGISTRY.items():
+            with self.subTest(view=view_id):
+                self.assertTrue(hasattr(importlib.import_module(module_name), class_name))
+        for views in view_registry.LIKELY_VIEWS.values():
+            self.assertTrue(set(views) <= set(view_registry.VIEW_REGISTRY))
+
+    def test_main_window_opens_views_through_registry(self):
+        """The main window does not import registered view modules itself."""
+        source = inspect.getsource(importlib.import_module('school_system.gui.windows.main_window'))
+        for view_id, (module_name, class_name) in view_registry.VIEW_REGISTRY.items():
+            with self.subTest(view=view_id):
+                self.assertNotIn(f"from {module_name} import", source)
+
+    def test_prewarm_loads_views(self):
+        """Pre-warming imports the views so opening them does not."""
+        view_registry.prewarm_views(['book_intake', 'unknown']).join(timeout=30)
+        self.assertTrue(view_registry.is_view_loaded('book_intake'))
+        self.assertEqual(view_registry.load_view_class('book_intake').__name__, 'BookIntakeWindow')
+
+    def test_login_path_does_not_import_screens(self):
+        """Importing the application loads the login window but not the main window."""
+        code = (
+            "import sys; import school_system.src.application; "
+            "print(any(m in sys.modules for m in ("
+            "'school_system.gui.windows.main_window', "
+            "'school_system.gui.windows.student_window.view_students_window', "
+            "'openpyxl', 'sqlalchemy')))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                env={**os.environ, 'QT_QPA_PLATFORM': 'offscreen'})
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False', result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
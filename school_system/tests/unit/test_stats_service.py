@@ -0,0 +1,83 @@
+"""
+Unit tests for the trigger-maintained stats counters.
+"""
+
+import unittest
+
+from school_system.services.stats_service import StatsService
+from school_system.tests.fixtures import create_test_database
+
+
+class TestStatsService(unittest.TestCase):
+    """Tests for counter maintenance, O(1) reads, verification and rebuilds."""
+
+    def setUp(self):
+        """Create an in-memory database and a service bound to it."""
+        self.conn = create_test_database()
+        self.service = StatsService()
+        self.service.stats_repository._db = self.conn
+
+    def tearDown(self):
+        """Close the test database."""
+        self.conn.close()
+
+    def test_triggers_keep_counters_exact(self):
+        """Inserts, updates and deletes on every source table move the counters."""
+        self.conn.executescript("""
+            INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class');
+            INSERT INTO books (id, book_number, title, author, available) VALUES
+                (1, 'B1', 'Algebra', 'Smith', 1), (2, 'B2', 'Biology', 'Jones', 0), (3, 'B3', 'Chemistry', 'Lee', NULL);
+            INSERT INTO students (student_id, name, stream) VALUES ('S1', 'Alice', 'R'), ('S2', 'Bob', 'R');
+            INSERT INTO teachers (teacher_id, teacher_name) VALUES ('T1', 'Jane');
+            INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on) VALUES ('S1', 2, '2026-01-05');
+            INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on, returned_on)
+                VALUES ('S2', 1, '2026-01-01', '2026-01-03');
+            INSERT INTO borrowed_books_teacher (teacher_id, book_id, borrowed_on) VALUES ('T1', 1, '2026-01-06');
+            INSERT INTO chairs (chair_id, color, assigned) VALUES ('C1', 'Black', 0), ('C2', 'Black', 1);
+            INSERT INTO lockers (locker_id, color, assigned) VALUES ('L1', 'Black', 0);
+        """)
+        counters = self.service.get_counters()
+        self.assertEqual(counters['books_total'], 3)
+        self.assertEqual(counters['books_available'], 2)
+        self.assertEqual(self.service.get_total_borrowed_count(), 2)
+        self.assertEqual(self.service.get_active_users_count(), 3)
+        self.assertEqual(self.service.get_available_chairs_count(), 1)
+        self.assertEqual(self.service.get_available_lockers_count(), 1)
+
+        self.conn.executescript("""
+            UPDATE books SET available = 0 WHERE id = 1;
+            UPDATE books SET title = 'Algebra II' WHERE id = 1;
+            UPDATE borrowed_books_student SET returned_on = '2026-01-07' WHERE student_id = 'S1';
+            UPDATE chairs SET assigned = 0 WHERE chair_id = 'C2';
+            DELETE FROM borrowed_books_teacher;
+            DELETE FROM students WHERE student_id = 'S2';
+        """)
+        self.assertEqual(self.service.get_available_books_count(), 1)
+        self.assertEqual(self.service.get_total_borrowed_count(), 0)
+        self.assertEqual(self.service.get_total_students_count(), 1)
+        self.assertEqual(self.service.get_available_chairs_count(), 2)
+        self.assertEqual(self.service.verify_counters(), {})
+
+    def test_counts_are_one_read(self):
+        """Reading every counter issues a single query, whatever the table sizes."""
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        self.service.get_counters()
+        self.conn.set_trace_callback(None)
+        self.assertEqual(statements, ["SELECT name, value FROM stats_counters"])
+
+    def test_verify_and_rebuild_repair_drift(self):
+        """A counter that drifted is reported by verify and corrected by rebuild."""
+        self.conn.execute("INSERT INTO teachers (teacher_id, teacher_name) VALUES ('T1', 'Jane')")
+        self.conn.execute("UPDATE stats_counters SET value = 99 WHERE name = 'teachers_total'")
+        self.conn.commit()
+
+        self.assertEqual(self.service.verify_counters(), {'teachers_total': (99, 1)})
+        self.assertEqual(self.service.rebuild_counters()['teachers_total'], 1)
+        self.assertEqual(self.service.verify_counters(), {})
+        with self.assertRaises(KeyError):
+            self.service.get_counter('unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
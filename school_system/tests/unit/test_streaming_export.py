@@ -0,0 +1,88 @@
+"""
+Unit tests for the streamed book and loan exports.
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+
+import openpyxl
+
+from school_system.services.book_service import BookService
+from school_system.tests.fixtures import create_test_database
+
+
+class TestStreamingExport(unittest.TestCase):
+    """Tests for exports written straight from repository cursors."""
+
+    def setUp(self):
+        """Create an in-memory database with books and loans, and a temporary output directory."""
+        self.conn = create_test_database()
+        self.conn.execute("INSERT INTO short_form_mappings (short_form, full_name, type) VALUES ('R', 'Red', 'class')")
+        self.conn.execute("INSERT INTO students (student_id, name, stream) VALUES ('S1', 'Alice', 'R')")
+        self.conn.executemany(
+            "INSERT INTO books (id, book_number, title, author, revision) VALUES (?, ?, ?, 'Author', ?)",
+            [(1, 'B001', 'Algebra', 0), (2, 'B002', 'Biology', 1), (3, 'B003', 'Chemistry', 0)]
+        )
+        self.conn.executemany(
+            "INSERT INTO borrowed_books_student (student_id, book_id, borrowed_on, returned_on) VALUES ('S1', ?, ?, ?)",
+            [(1, '2024-01-01', '2024-01-05'), (2, '2024-02-01', None)]
+        )
+        self.conn.commit()
+
+        self.service = BookService()
+        self.service.book_repository._db = self.conn
+        self.service.import_export_service.EXPORT_CHUNK_SIZE = 2
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Close the test database and remove the output files."""
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def sheet_rows(self, filename):
+        """Read back every row of an exported workbook."""
+        workbook = openpyxl.load_workbook(filename, read_only=True)
+        try:
+            return list(workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+    def test_catalog_exports_to_excel_and_csv(self):
+        """Every book is written across several chunks, with the book type derived from revision."""
+        excel_file = os.path.join(self.tmp.name, 'books.xlsx')
+        csv_file = os.path.join(self.tmp.name, 'books.csv')
+
+        self.assertTrue(self.service.export_books_to_excel(excel_file))
+        self.assertTrue(self.service.export_books_to_csv(csv_file))
+
+        rows = self.sheet_rows(excel_file)
+        self.assertEqual(rows[0][:3], ('Book_Number', 'Title', 'Author'))
+        self.assertEqual([(row[0], row[10]) for row in rows[1:]],
+                         [('B001', 'course'), ('B002', 'revision'), ('B003', 'course')])
+        with open(csv_file, newline='', encoding='utf-8') as f:
+            books = list(csv.DictReader(f))
+        self.assertEqual([(b['book_number'], b['book_type'], b['isbn']) for b in books],
+                         [('B001', 'course', ''), ('B002', 'revision', ''), ('B003', 'course', '')])
+
+    def test_loan_export_open_loans_and_history(self):
+        """The default export keeps open loans; include_returned adds returned ones."""
+        open_file = os.path.join(self.tmp.name, 'open.xlsx')
+        history_file = os.path.join(self.tmp.name, 'history.xlsx')
+
+        self.assertTrue(self.service.export_borrowed_books_to_excel(open_file))
+        self.assertTrue(self.service.export_borrowed_books_to_excel(history_file, include_returned=True))
+
+        self.assertEqual(self.sheet_rows(open_file), [
+            ('Book_ID', 'Book_Number', 'Student_ID', 'Borrowed_Date', 'Status'),
+            (2, 'B002', 'S1', '2024-02-01', 'Active'),
+        ])
+        self.assertEqual(sorted(self.sheet_rows(history_file)[1:]), [
+            (1, 'B001', 'S1', '2024-01-01', '2024-01-05', 'Returned'),
+            (2, 'B002', 'S1', '2024-02-01', None, 'Active'),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
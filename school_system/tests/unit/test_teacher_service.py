@@ -256,23 +256,23 @@ class TestTeacherService(unittest.TestCase):
             {'teacher_id': 'TC001', 'teacher_name': 'John Doe', 'department': 'Mathematics'},
             {'teacher_id': 'TC002', 'teacher_name': 'Jane Smith', 'department': 'Science'}
         ]
-        mock_import_export.import_from_excel.return_value = excel_data
+        mock_import_export.iter_excel_rows.return_value = iter(excel_data)
+        inserted_rows = []
 
-        # Mock created teachers
-        created_teachers = [
-            Teacher(**data) for data in excel_data
-        ]
-        self.mock_repository.create.side_effect = created_teachers
+        def insert_many(columns, rows, **kwargs):
+            inserted_rows.extend(rows)
+            return len(inserted_rows)
+
+        self.mock_repository.insert_many.side_effect = insert_many
 
         # Call service
         result = self.teacher_service.import_teachers_from_excel('test.xlsx')
 
         # Verify
-        self.assertEqual(len(result), 2)
-        self.assertEqual(result[0].teacher_id, 'TC001')
-        self.assertEqual(result[1].teacher_id, 'TC002')
-        mock_import_export.import_from_excel.assert_called_once_with('test.xlsx')
-        self.assertEqual(self.mock_repository.create.call_count, 2)
+        self.assertEqual(result, 2)
+        self.assertEqual(inserted_rows, [('TC001', 'John Doe', 'Mathematics'),
+                                         ('TC002', 'Jane Smith', 'Science')])
+        mock_import_export.iter_excel_rows.assert_called_once_with('test.xlsx')
 
     def test_export_teachers_to_excel(self):
         """Test exporting teachers to Excel."""
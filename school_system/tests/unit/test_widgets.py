@@ -6,10 +6,10 @@ This module contains test stubs for all widget components.
 
 import unittest
 from unittest.mock import Mock, patch
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QTableView
 from PyQt6.QtCore import Qt
 from school_system.gui.base.widgets import (
-    CustomTableWidget, SortFilterProxyModel, VirtualScrollModel,
+    CustomTableWidget, SortFilterProxyModel, VirtualScrollModel, KeysetPagedModel,
     SearchBox, AdvancedSearchBox, MemoizedSearchBox,
     ModernStatusBar, ProgressIndicator
 )
@@ -158,6 +158,94 @@ class TestVirtualScrollModel(unittest.TestCase):
         self.assertEqual(data, "R0C0")
 
 
+class TestKeysetPagedModel(unittest.TestCase):
+    """Test cases for KeysetPagedModel."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.app = QApplication([])
+        # Kept out of the closure's reach of self so the model is freed in tearDown
+        calls = self.calls = []
+        
+        def page_fetcher(after, limit, sort_key, descending):
+            calls.append((after, sort_key, descending))
+            values = sorted(range(25), reverse=descending)
+            start = 0 if after is None else after
+            page = values[start:start + limit]
+            next_after = start + limit if start + limit < len(values) else None
+            return page, next_after
+        
+        self.model = KeysetPagedModel(
+            page_fetcher, lambda value: [f"Item {value}", value * 2], ["Name", "Double"],
+            page_size=10, sort_keys={0: 'name'}
+        )
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        del self.model
+        self.app.quit()
+    
+    def test_pages_load_on_demand(self):
+        """Test that rows are only fetched one page at a time."""
+        self.model.refresh()
+        self.assertEqual(self.model.rowCount(), 10)
+        self.assertTrue(self.model.canFetchMore())
+        
+        self.model.fetchMore()
+        self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 25)
+        self.assertFalse(self.model.canFetchMore())
+        self.assertEqual(self.model.data(self.model.index(24, 1)), 48)
+        self.assertEqual(self.model.record(3), 3)
+    
+    def test_sort_reloads_from_fetcher(self):
+        """Test that header sorting is delegated to the page fetcher."""
+        self.model.refresh()
+        self.model.sort(0, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.calls[-1], (None, 'name', True))
+        self.assertEqual(self.model.data(self.model.index(0, 0)), "Item 24")
+        
+        # Columns without a sort key are ignored
+        self.model.sort(1, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(self.calls[-1], (None, 'name', True))
+    
+    def test_filters_captured_once_per_result_set(self):
+        """Test that every page of a result set uses the filters read at reset."""
+        seen = []
+        current = {'search': 'first'}
+        
+        def page_fetcher(after, limit, sort_key, descending, search=None):
+            seen.append(search)
+            start = 0 if after is None else after
+            return list(range(start, min(start + limit, 25))), (start + limit if start + limit < 25 else None)
+        
+        model = KeysetPagedModel(page_fetcher, lambda value: [value], ["Value"], page_size=10,
+                                 filter_provider=lambda: dict(current))
+        model.refresh()
+        current['search'] = 'second'
+        model.fetchMore()
+        self.assertEqual(seen, ['first', 'first'])
+        
+        model.refresh()
+        self.assertEqual(seen[-1], 'second')
+    
+    def test_unsortable_header_keeps_active_indicator(self):
+        """Test that clicking a column without a sort key restores the indicator."""
+        view = QTableView()
+        view.setModel(self.model)
+        self.addCleanup(view.setModel, None)
+        header = view.horizontalHeader()
+        self.model.bind_sort_header(header)
+        
+        header.setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(self.calls[-1], (None, 'name', False))
+        
+        header.setSortIndicator(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(header.sortIndicatorSection(), 0)
+        self.assertEqual(header.sortIndicatorOrder(), Qt.SortOrder.AscendingOrder)
+        self.assertEqual(self.calls[-1], (None, 'name', False))
+
+
 class TestSearchBox(unittest.TestCase):
     """Test cases for SearchBox."""
     
@@ -218,6 +306,29 @@ class TestMemoizedSearchBox(unittest.TestCase):
         self.search_box.clear_cache()
         # Cache clearing would need more specific assertions
         self.assertTrue(True)
+    
+    def test_search_results_and_failures_are_emitted(self):
+        """Test that debounced searches emit memoized results, or the error if the search raises."""
+        calls = []
+        
+        def search(text):
+            calls.append(text)
+            if text == "bad":
+                raise ValueError("no index")
+            return [text.upper()]
+        
+        self.search_box.set_search_function(search)
+        results, failures = [], []
+        self.search_box.search_results_ready.connect(lambda text, found: results.append((text, found)))
+        self.search_box.search_failed.connect(lambda text, error: failures.append((text, error)))
+        
+        for text in ("alg", "alg", "bad"):
+            self.search_box.search_input.setText(text)
+            self.search_box._emit_search_text()
+        
+        self.assertEqual(results, [("alg", ["ALG"]), ("alg", ["ALG"])])
+        self.assertEqual(failures, [("bad", "no index")])
+        self.assertEqual(calls, ["alg", "bad"])
 
 
 class TestModernStatusBar(unittest.TestCase):
@@ -8,9 +8,10 @@ validation utilities, and export utilities.
 
 # Import utility modules for easy access
 from .qr_generator import QRGenerator
+from .qr_cache import QRImageCache, get_qr_image_cache
 from .file_handler import FileHandler
 from .date_utils import DateUtils
 from .validation_utils import ValidationUtils
 from .export_utils import ExportUtils
 
-__all__ = ['QRGenerator', 'FileHandler', 'DateUtils', 'ValidationUtils', 'ExportUtils']
+__all__ = ['QRGenerator', 'QRImageCache', 'get_qr_image_cache', 'FileHandler', 'DateUtils', 'ValidationUtils', 'ExportUtils']
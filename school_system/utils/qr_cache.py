@@ -0,0 +1,188 @@
+"""
+QR Image Cache
+
+Rendered QR code images are kept on disk instead of in the database. The
+database stores only the short code; the PNG for it is rendered the first
+time it is needed and saved under a hash of the code and render settings.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .qr_generator import QRGenerator
+
+
+class QRImageCache:
+    """A content-addressed, size-bounded cache of QR code PNGs."""
+
+    # Size the cache is trimmed back under; eviction stops at 90% of it
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    # Subdirectory of PathManager.get_cache_path() used by default
+    SUBDIRECTORY = "qr"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None,
+                 generator: Optional[QRGenerator] = None, track_size: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the images; defaults to a "qr" folder in the
+                application cache directory, resolved on first use
+            max_bytes: Total size above which least recently used images are removed
+            generator: Generator used to render missing images
+            track_size: If False, writes are only counted in bytes_written and
+                never trigger a scan or eviction; the owner of the cache
+                passes that count to record_write instead
+        """
+        self.generator = generator or QRGenerator()
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.track_size = track_size
+        self.bytes_written = 0
+        self._cache_dir = cache_dir
+        self._size: Optional[int] = None  # Bytes on disk, measured on the first write
+        self._lock = threading.Lock()
+
+    @property
+    def cache_dir(self) -> str:
+        """Directory holding the cached images."""
+        if self._cache_dir is None:
+            # Imported here so worker processes that pass cache_dir skip the config package
+            from school_system.config.path_manager import get_path_manager
+            self._cache_dir = os.path.join(get_path_manager().get_cache_path(), self.SUBDIRECTORY)
+        return self._cache_dir
+
+    def key(self, data: str) -> str:
+        """Hash identifying the image for data under this cache's render settings."""
+        generator = self.generator
+        content = f"{generator.version}|{generator.box_size}|{generator.border}|{data}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def path_for(self, data: str) -> str:
+        """Location of the cached image for data, whether or not it exists yet."""
+        key = self.key(data)
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    def get_png(self, data: str) -> bytes:
+        """
+        Get the PNG image of the QR code for data, rendering it if it is not cached.
+
+        Reading an image marks it as recently used.
+        """
+        path = self.path_for(data)
+        try:
+            with open(path, 'rb') as file:
+                png = file.read()
+            os.utime(path)
+            return png
+        except FileNotFoundError:
+            pass
+
+        png = self.generator.generate_qr_code(data).getvalue()
+        self._store(path, png)
+        return png
+
+    def get_path(self, data: str) -> str:
+        """Get the path of the PNG image of the QR code for data, rendering it if needed."""
+        self.get_png(data)
+        return self.path_for(data)
+
+    def _store(self, path: str, png: bytes):
+        """Write an image atomically, then evict old images if the cache is over its limit."""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                file.write(png)
+            # Replacing is atomic, so readers in other threads or processes never see a partial file
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.bytes_written += len(png)
+        if self.track_size:
+            self.record_write(len(png))
+
+    def record_write(self, written: int):
+        """
+        Count bytes added to the cache directory, evicting old images if it is over its limit.
+
+        Also used for images rendered into the directory by worker processes.
+        The directory is scanned only the first time, to learn its size.
+        """
+        with self._lock:
+            if self._size is None:
+                # The scan already includes the bytes just written
+                self._size = sum(size for _, size, _ in self._files())
+            else:
+                self._size += written
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _files(self) -> Iterator[Tuple[float, int, str]]:
+        """Yield (mtime, size, path) for every cached image."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith('.png'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, entry.path
+
+    def _evict(self):
+        """Remove least recently used images until the cache is at 90% of max_bytes."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+
+# Global cache instance
+_qr_image_cache: Optional[QRImageCache] = None
+
+
+def get_qr_image_cache() -> QRImageCache:
+    """Get the global QRImageCache instance (singleton)."""
+    global _qr_image_cache
+    if _qr_image_cache is None:
+        _qr_image_cache = QRImageCache()
+    return _qr_image_cache
+
+
+def warm_qr_cache(cache_dir: str, codes: Sequence[Tuple[object, str]]) -> Tuple[List[Tuple[object, str]], int]:
+    """
+    Render the images for a batch of (key, code) pairs into the cache at cache_dir.
+
+    Module-level so it can run in a worker process. A code that fails to
+    render is skipped; it is rendered again when first displayed. The cache
+    here does not track its size, so a chunk never scans the directory; the
+    caller passes the byte count to its own cache's record_write.
+
+    Returns:
+        The pairs unchanged, and the number of bytes written.
+    """
+    cache = QRImageCache(cache_dir, track_size=False)
+    for _, code in codes:
+        try:
+            cache.get_png(code)
+        except Exception:
+            pass
+    return list(codes), cache.bytes_written
@@ -7,6 +7,7 @@ purposes in the school system, such as student IDs, book barcodes, etc.
 
 import qrcode
 import io
+import base64
 from typing import Optional, Union
 from PIL import Image
 
@@ -116,3 +117,19 @@ class QRGenerator:
             qr_img.save(img_bytes, format='PNG')
             img_bytes.seek(0)
             return img_bytes
+
+
+def render_qr_data_uri(data: str, generator: Optional[QRGenerator] = None) -> str:
+    """
+    Render data as a QR code PNG and return it as a data URI for one-off display or export.
+
+    Args:
+        data: The data to encode in the QR code
+        generator: Generator to use; a default QRGenerator if None
+
+    Returns:
+        A "data:image/png;base64,..." string.
+    """
+    qr_bytes = (generator or QRGenerator()).generate_qr_code(data)
+    return f"data:image/png;base64,{base64.b64encode(qr_bytes.getvalue()).decode('utf-8')}"
+